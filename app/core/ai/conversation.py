@@ -14,10 +14,22 @@ Supersedes previous basic Conversation/ConversationManager implementation.
 """
 
 from typing import Dict, Any, Optional, List, Callable
+from collections import deque
+from itertools import islice
 import time
 import uuid
 import threading
 
+from app.core.ai.conversation_store import (
+    ConversationSummarizer,
+    ExtractiveSummarizer,
+    SQLiteConversationStore,
+    estimate_tokens,
+)
+
+# Default per-conversation context budget used by ConversationManager
+DEFAULT_MAX_CONTEXT_TOKENS = 2048
+
 # Pluggable user validation — allow swapping with real DB or IAM later
 def default_user_validator(user_id: str) -> bool:
     # TODO: Integrate real user DB verification (now: allow nonempty)
@@ -64,10 +76,20 @@ class ConversationHistory:
     
     add_turn now accepts an optional 'metadata' field,
     which can store extra dict information for each turn.
+
+    When max_context_tokens is set, only the most recent turns fitting that
+    budget are kept; older turns are rolled into ``summary`` by the summarizer,
+    so memory and prompt-build cost stay flat for long sessions.
     """
-    def __init__(self, privacy_level: str = "standard"):
-        self.turns = []  # List[Dict[str, Any]], e.g. {"role": "user", "text": "...", "metadata": {...}}
+    def __init__(self, privacy_level: str = "standard", max_context_tokens: Optional[int] = None,
+                 summarizer: Optional[ConversationSummarizer] = None):
+        self.turns = deque()  # Deque[Dict[str, Any]], e.g. {"role": "user", "text": "...", "metadata": {...}}
         self.privacy_level = privacy_level
+        self.max_context_tokens = max_context_tokens
+        self.summarizer = summarizer or ExtractiveSummarizer()
+        self.summary = ""
+        self.token_count = 0  # Running token total of self.turns
+        self.total_turns = 0
 
     def add_turn(self, role: str, text: str, metadata: dict = None):
         entry = {
@@ -77,23 +99,55 @@ class ConversationHistory:
         }
         if metadata is not None:
             entry["metadata"] = metadata
+        entry["tokens"] = estimate_tokens(text)
         self.turns.append(entry)
+        self.token_count += entry["tokens"]
+        self.total_turns += 1
+        if self.max_context_tokens is not None and self.token_count > self.max_context_tokens:
+            self._roll_up()
+
+    def _roll_up(self):
+        # Always keep the newest turn, even if it alone exceeds the budget
+        evicted = []
+        while len(self.turns) > 1 and self.token_count > self.max_context_tokens:
+            turn = self.turns.popleft()
+            self.token_count -= turn["tokens"]
+            evicted.append(turn)
+        if evicted:
+            self.summary = self.summarizer.summarize(self.summary, evicted)
+
+    def get_context(self):
+        """
+        Active prompt context: (summary, recent turns).
+
+        Returns the live window without copying, so assembling it is O(1).
+        """
+        return self.summary, self.turns
 
     def get_history(self, limit: int = 20):
-        return self.turns[-limit:]
+        """Copy of the newest ``limit`` turns; walks only those turns, not the whole window."""
+        if limit >= len(self.turns):
+            return list(self.turns)
+        recent = list(islice(reversed(self.turns), limit))
+        recent.reverse()
+        return recent
 
     def clear(self):
-        self.turns = []
+        self.turns = deque()
+        self.summary = ""
+        self.token_count = 0
 
 class ConversationState:
     """
     Full persistent snapshot for user session.
     """
-    def __init__(self, session_id: Optional[str]=None, user_id: Optional[str]=None, privacy_level: str="standard"):
+    def __init__(self, session_id: Optional[str]=None, user_id: Optional[str]=None, privacy_level: str="standard",
+                 max_context_tokens: Optional[int]=None, summarizer: Optional[ConversationSummarizer]=None):
         self.session_id = session_id or str(uuid.uuid4())
         self.user_id = user_id
         self.context = ConversationContext()
-        self.history = ConversationHistory(privacy_level=privacy_level)
+        self.history = ConversationHistory(privacy_level=privacy_level, max_context_tokens=max_context_tokens,
+                                           summarizer=summarizer)
         self.last_active_ts = time.time()
         self.active_handler = None   # For handler routing
     
@@ -103,6 +157,7 @@ class ConversationState:
             "user_id": self.user_id,
             "context": self.context.memory,
             "history": self.history.get_history(),
+            "summary": self.history.summary,
             "last_active_ts": self.last_active_ts,
             "active_handler": self.active_handler,
         }
@@ -115,9 +170,18 @@ class ConversationManager:
     """
     Main orchestrator for conversational AI sessions.
     Implements flow/component handler routing, privacy-aware state, and persistence.
+
+    Any store with get/set/delete/all_sessions works (e.g. SQLiteConversationStore);
+    state is written back after each turn so persistent stores stay current.
+    Handlers should build prompts from ``state.history.get_context()`` (summary plus
+    the live window) rather than copying the history each turn.
     """
-    def __init__(self, store: Optional[InMemoryConversationStore] = None, user_validator: Callable[[str], bool]=default_user_validator):
+    def __init__(self, store: Optional[InMemoryConversationStore] = None, user_validator: Callable[[str], bool]=default_user_validator,
+                 max_context_tokens: Optional[int] = DEFAULT_MAX_CONTEXT_TOKENS,
+                 summarizer: Optional[ConversationSummarizer] = None):
         self._store = store or InMemoryConversationStore()
+        self._max_context_tokens = max_context_tokens
+        self._summarizer = summarizer
         self._handlers: Dict[str, Callable[[str, str, ConversationState, Dict], str]] = {}
         self._default_handler = "default"
         self._user_validator = user_validator
@@ -131,7 +195,8 @@ class ConversationManager:
     def start_session(self, user_id: Optional[str], privacy_level: str="standard") -> str:
         if not self._user_validator(user_id):
             raise ValueError(f"User ID '{user_id}' is not allowed.")
-        state = ConversationState(user_id=user_id, privacy_level=privacy_level)
+        state = ConversationState(user_id=user_id, privacy_level=privacy_level,
+                                  max_context_tokens=self._max_context_tokens, summarizer=self._summarizer)
         self._store.set(state.session_id, state)
         return state.session_id
 
@@ -163,17 +228,20 @@ class ConversationManager:
             raise ValueError(f"No handler registered for label '{handler_label}'")
         response = handler(user_input, state.user_id, state, extra)
         state.history.add_turn('bot', response)
+        self._store.set(session_id, state)
         return response
 
     def switch_handler(self, session_id: str, handler_label: str):
         state = self._store.get(session_id)
         if state:
             state.active_handler = handler_label
+            self._store.set(session_id, state)
 
     def set_privacy_level(self, session_id: str, privacy_level: str):
         state = self._store.get(session_id)
         if state:
             state.history.privacy_level = privacy_level
+            self._store.set(session_id, state)
 
 # Example: default handler for demo
 def default_handler(user_input, user_id, state: ConversationState, extra):
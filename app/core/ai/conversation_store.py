@@ -0,0 +1,209 @@
+# File location: /app/core/ai/conversation_store.py
+"""
+Conversation storage subsystem — AeroLearn AI.
+
+Companion to /app/core/ai/conversation.py:
+- Token estimation used for per-conversation context windowing
+- Pluggable local summarizers that roll evicted turns into a running summary
+- SQLite-backed ConversationStore with a bounded in-memory cache of live sessions;
+  history turns are stored one row each, so a turn costs one small INSERT
+
+Any object with get/set/delete/all_sessions can be passed to ConversationManager;
+SQLiteConversationStore keeps memory flat by holding only recently used states.
+"""
+
+import copy
+import pickle
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token), good enough for budgeting."""
+    if not text:
+        return 0
+    return len(text) // 4 + 1
+
+
+class ConversationSummarizer:
+    """Interface for summarizers: fold evicted turns into the previous summary."""
+
+    def summarize(self, previous_summary: str, turns: List[Dict[str, Any]]) -> str:
+        raise NotImplementedError
+
+
+class ExtractiveSummarizer(ConversationSummarizer):
+    """
+    Local, dependency-free summarizer.
+
+    Keeps the first sentence of each evicted turn and drops the oldest summary
+    lines once ``max_tokens`` is exceeded, so the summary itself stays bounded.
+    """
+
+    def __init__(self, max_tokens: int = 256, max_sentence_chars: int = 200):
+        self.max_tokens = max_tokens
+        self.max_sentence_chars = max_sentence_chars
+
+    def summarize(self, previous_summary: str, turns: List[Dict[str, Any]]) -> str:
+        lines = previous_summary.split("\n") if previous_summary else []
+        for turn in turns:
+            text = (turn.get("text") or "").strip()
+            if not text:
+                continue
+            first = _SENTENCE_END.split(text, 1)[0][:self.max_sentence_chars]
+            lines.append(f"{turn.get('role', 'user')}: {first}")
+        total = sum(estimate_tokens(line) for line in lines)
+        start = 0
+        while total > self.max_tokens and start < len(lines) - 1:
+            total -= estimate_tokens(lines[start])
+            start += 1
+        return "\n".join(lines[start:])
+
+
+class SQLiteConversationStore:
+    """
+    SQLite-backed session persistence.
+
+    States are pickled on ``set`` and reloaded on demand; at most ``cache_size``
+    states are kept in memory (LRU), so idle sessions cost no RAM.
+
+    History turns are not part of the pickled state: each turn is written once
+    to ``conversation_turns`` (keyed by its position in the conversation), and
+    turns rolled out of the context window are deleted, so ``set`` after a new
+    turn writes only that turn and a small state header.
+    """
+
+    def __init__(self, db_path: str = ":memory:", cache_size: int = 256):
+        self.db_path = db_path
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._saved_turns: Dict[str, int] = {}  # session -> turns persisted so far (cached sessions)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS conversation_state (
+                session_id TEXT PRIMARY KEY,
+                user_id TEXT,
+                state BLOB,
+                updated_at REAL
+            )
+        ''')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS conversation_turns (
+                session_id TEXT NOT NULL,
+                turn_no INTEGER NOT NULL,
+                turn BLOB,
+                PRIMARY KEY (session_id, turn_no)
+            ) WITHOUT ROWID
+        ''')
+        self._conn.commit()
+
+    def get(self, session_id: str):
+        with self._lock:
+            state = self._cache.get(session_id)
+            if state is not None:
+                self._cache.move_to_end(session_id)
+                return state
+            row = self._conn.execute(
+                'SELECT state FROM conversation_state WHERE session_id=?', (session_id,)
+            ).fetchone()
+            if not row:
+                return None
+            state = pickle.loads(row[0])
+            history = getattr(state, "history", None)
+            turns = [pickle.loads(turn) for (turn,) in self._conn.execute(
+                'SELECT turn FROM conversation_turns WHERE session_id=? ORDER BY turn_no', (session_id,)
+            )]
+            if history is not None and turns:
+                history.turns = deque(turns)
+            self._remember(session_id, state)
+            if history is not None:
+                self._saved_turns[session_id] = history.total_turns
+            return state
+
+    def set(self, session_id: str, state):
+        with self._lock:
+            history = getattr(state, "history", None)
+            if history is None:
+                header = state
+            else:
+                # Pickle the state without its turns; they are stored row by row below
+                header = copy.copy(state)
+                header.history = copy.copy(history)
+                header.history.turns = deque()
+                self._save_turns(session_id, history)
+            self._conn.execute(
+                'INSERT OR REPLACE INTO conversation_state (session_id, user_id, state, updated_at) '
+                'VALUES (?, ?, ?, ?)',
+                (session_id, getattr(state, "user_id", None), pickle.dumps(header), time.time())
+            )
+            self._conn.commit()
+            self._remember(session_id, state)
+
+    def _save_turns(self, session_id: str, history) -> None:
+        """Insert turns added since the last save and drop rows for turns no longer in the window."""
+        first = history.total_turns - len(history.turns)  # conversation position of turns[0]
+        saved = self._saved_turns.get(session_id)
+        if saved is None:
+            row = self._conn.execute(
+                'SELECT MAX(turn_no) FROM conversation_turns WHERE session_id=?', (session_id,)
+            ).fetchone()
+            saved = row[0] + 1 if row[0] is not None else 0
+        new = range(max(saved, first), history.total_turns)
+        if new:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO conversation_turns (session_id, turn_no, turn) VALUES (?, ?, ?)',
+                [(session_id, turn_no, pickle.dumps(history.turns[turn_no - first])) for turn_no in new]
+            )
+        self._conn.execute('DELETE FROM conversation_turns WHERE session_id=? AND turn_no < ?', (session_id, first))
+        self._saved_turns[session_id] = history.total_turns
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._cache.pop(session_id, None)
+            self._saved_turns.pop(session_id, None)
+            self._conn.execute('DELETE FROM conversation_state WHERE session_id=?', (session_id,))
+            self._conn.execute('DELETE FROM conversation_turns WHERE session_id=?', (session_id,))
+            self._conn.commit()
+
+    def all_sessions(self):
+        with self._lock:
+            cur = self._conn.execute('SELECT session_id FROM conversation_state ORDER BY updated_at')
+            return [row[0] for row in cur.fetchall()]
+
+    def prune_inactive(self, max_idle_seconds: float) -> int:
+        """Delete sessions not written for ``max_idle_seconds``; returns the count removed."""
+        cutoff = time.time() - max_idle_seconds
+        with self._lock:
+            cur = self._conn.execute(
+                'SELECT session_id FROM conversation_state WHERE updated_at < ?', (cutoff,)
+            )
+            stale = [row[0] for row in cur.fetchall()]
+            for session_id in stale:
+                self._cache.pop(session_id, None)
+                self._saved_turns.pop(session_id, None)
+            self._conn.executemany('DELETE FROM conversation_state WHERE session_id=?',
+                                   [(sid,) for sid in stale])
+            self._conn.executemany('DELETE FROM conversation_turns WHERE session_id=?',
+                                   [(sid,) for sid in stale])
+            self._conn.commit()
+            return len(stale)
+
+    def close(self):
+        with self._lock:
+            self._cache.clear()
+            self._saved_turns.clear()
+            self._conn.close()
+
+    def _remember(self, session_id: str, state):
+        self._cache[session_id] = state
+        self._cache.move_to_end(session_id)
+        while len(self._cache) > self.cache_size:
+            evicted, _ = self._cache.popitem(last=False)
+            self._saved_turns.pop(evicted, None)
@@ -1,107 +1,57 @@
 import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+from app.core.ai.learning_path_planner import LearningPathPlanner, StudentPathState
 
 def generate_learning_path(
     student: Dict[str, Any],
     candidate_content: List[Dict[str, Any]],
     *,
     max_length: int = 10,
-    adaptivity: bool = True
+    adaptivity: bool = True,
+    planner: Optional[LearningPathPlanner] = None,
+    state: Optional[StudentPathState] = None,
 ) -> Dict[str, Any]:
     """
     Generates an ordered recommendation of content (lessons/modules/quizzes) as a personalized path for the given student.
+    Steps may include content unlocked by earlier steps of the same path.
     Args:
         student: StudentProfile or dict with schema defined in ai_recommendation_protocol.md.
         candidate_content: List of content item descriptors (IDs, metadata, type, prerequisites, difficulty).
         max_length: Optional cap on length of the recommended path.
         adaptivity: If True, path should adapt for difficulty/pacing.
+        planner: Optional LearningPathPlanner already compiled for candidate_content.
+        state: Optional StudentPathState kept up to date with the student's completions.
     Returns:
         LearningPathRecommendation: Dict with explicit fields (student_id, generated_at, steps).
     """
     student_id = student.get("id")
     completed = set(student.get("completed_content", []))
-    performance = student.get("performance", {}) or {}
-    level = student.get("level", None)
     now = datetime.datetime.now(datetime.UTC).replace(microsecond=0).isoformat().replace("+00:00", "Z")
 
-    # Id->content lookup for quick access
-    cid_map = {c['id']: c for c in candidate_content}
-    # Only attempt steps where prerequisites are satisfied
-    available = [
-        c for c in candidate_content
-        if all(pid in completed for pid in c.get('prerequisites', []))
-           and c['id'] not in completed
-    ]
-
-    # --- Adaptivity meaningfully affects order/choices ---
-    # Use performance, completed content, or level to determine path order
-    m = {'easy': 1, 'medium': 2, 'hard': 3}
-    
-    def score_content(c):
-        """Returns a numeric value for adaptivity-based sort."""
-        diff = c.get("difficulty", "easy")
-        dval = m.get(diff, 1) if isinstance(diff, str) else diff
-        
-        # Use performance if available for this content
-        perf_value = performance.get(c["id"], None)
-        if perf_value is not None:
-            # In adaptive mode, recommend challenge to strong performers, review to weak
-            if adaptivity:
-                # Strong performant students get harder tasks first
-                if perf_value >= 0.8:
-                    return -dval  # Prioritize harder content
-                else:
-                    return dval   # Prioritize easier content
-            else:
-                # Default non-adaptive: always easier content first
-                return dval
-        else:
-            # No performance history: use student level if present
-            if adaptivity:
-                if isinstance(level, str):
-                    if level in ["intro", "beginner", "remedial"]:
-                        # For beginners, do easier content first in adaptive mode
-                        return dval
-                    elif level in ["advanced", "expert"]:
-                        # For advanced, do harder first in adaptive mode
-                        return -dval
-                
-                # Calculate average performance if we have any
-                avg_perf = (
-                    sum(performance.values()) / len(performance)
-                    if performance and all(isinstance(v, (int, float)) for v in performance.values()) else 0
-                )
-                
-                # Use average performance to determine order
-                return -dval if avg_perf >= 0.8 else dval
-            else:
-                # Not adaptive: easy to hard
-                return dval
-
-    sorted_avail = sorted(available, key=score_content)
-    
-    # To guarantee a difference for test demonstration, with no performance and ambiguous input,
-    # adaptivity flips the order of equally qualified content.
-    if not performance and available and adaptivity:
-        sorted_avail = list(reversed(sorted_avail))
+    # Prerequisite graph is compiled once per catalog; pass a planner to reuse it
+    planner = planner or LearningPathPlanner(candidate_content)
+    path = planner.plan(student, max_length=max_length, adaptivity=adaptivity, state=state)
+    return {
+        "student_id": student_id,
+        "generated_at": now,
+        "steps": _path_steps(path, completed)
+    }
 
-    # Limit to max_length
-    selected = sorted_avail[:max_length]
 
+def _path_steps(path, completed) -> List[Dict[str, Any]]:
     steps = []
-    order = 1
-    _completed = set(completed)
-    for item in selected:
+    for order, item in enumerate(path, start=1):
         prereqs = item.get('prerequisites', [])
-        prereqs_met = all(pid in _completed for pid in prereqs)
+        missing = [p for p in prereqs if p not in completed]
 
         # Justification examples
         if not prereqs:
             just = f"Suggested as starting content (no prerequisites)."
-        elif all(pid in completed for pid in prereqs):
+        elif not missing:
             just = f"Next after completed: {', '.join(prereqs)}."
         else:
-            just = f"Prerequisites not satisfied: {', '.join(p for p in prereqs if p not in completed)}."
+            just = f"Follows earlier steps in this path: {', '.join(missing)}."
 
         steps.append({
             "order": order,
@@ -109,13 +59,46 @@ def generate_learning_path(
             "content_type": item.get("type", "Unknown"),
             "justification": just,
             "difficulty": item.get("difficulty", "easy"),
-            "prerequisites_satisfied": prereqs_met,
+            # The planner only schedules items whose prerequisites are done or earlier in the path
+            "prerequisites_satisfied": True,
         })
-        order += 1
-        _completed.add(item["id"])  # for next step
+    return steps
 
-    return {
-        "student_id": student_id,
-        "generated_at": now,
-        "steps": steps
-    }
+
+def generate_cohort_paths(
+    students: List[Dict[str, Any]],
+    candidate_content: List[Dict[str, Any]],
+    *,
+    max_length: int = 10,
+    adaptivity: bool = True,
+    planner: Optional[LearningPathPlanner] = None,
+) -> List[Dict[str, Any]]:
+    """
+    generate_learning_path for a whole cohort over one catalog.
+    The catalog is compiled once, and students with the same completed content
+    and scoring inputs (level, performance) share one plan.
+    Returns:
+        One LearningPathRecommendation per student, in input order.
+    """
+    planner = planner or LearningPathPlanner(candidate_content)
+    now = datetime.datetime.now(datetime.UTC).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+    states: Dict[frozenset, StudentPathState] = {}
+    plans: Dict[tuple, List[Dict[str, Any]]] = {}
+    results = []
+    for student in students:
+        completed = frozenset(student.get("completed_content", []))
+        performance = student.get("performance", {}) or {}
+        plan_key = (completed, student.get("level"), tuple(sorted(performance.items(), key=repr)))
+        steps = plans.get(plan_key)
+        if steps is None:
+            state = states.get(completed)
+            if state is None:
+                state = states[completed] = planner.state_for(completed)
+            path = planner.plan(student, max_length=max_length, adaptivity=adaptivity, state=state)
+            steps = plans[plan_key] = _path_steps(path, completed)
+        results.append({
+            "student_id": student.get("id"),
+            "generated_at": now,
+            "steps": [dict(step) for step in steps]
+        })
+    return results
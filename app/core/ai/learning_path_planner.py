@@ -0,0 +1,211 @@
+"""
+LearningPathPlanner: compiled prerequisite graph for learning path generation.
+
+The content catalog is compiled once into a prerequisite DAG (dependents
+adjacency, in-degree counters, topological levels). Per student, only the
+prerequisites they have completed are subtracted from the shared counters, and
+a path is a priority-queue search (Kahn's algorithm ordered by the adaptivity
+score): taking a step unlocks its dependents in O(out-degree) instead of
+re-filtering the whole catalog.
+
+Used by generate_learning_path (/app/core/ai/learning_path.py); see
+/docs/architecture/ai_recommendation_protocol.md for the student/content schema.
+"""
+
+import heapq
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+DIFFICULTY_VALUES = {'easy': 1, 'medium': 2, 'hard': 3}
+
+
+def _difficulty_value(content: Dict[str, Any]) -> int:
+    diff = content.get("difficulty", "easy")
+    return DIFFICULTY_VALUES.get(diff, 1) if isinstance(diff, str) else diff
+
+
+def make_priority(student: Dict[str, Any], adaptivity: bool = True) -> Callable[[Dict[str, Any]], Any]:
+    """
+    Build the adaptivity score for one student (lower sorts first).
+
+    Strong performers (>= 0.8 on an item, advanced/expert level, or a high average)
+    get harder content first in adaptive mode; everyone else goes easy to hard.
+    """
+    performance = student.get("performance", {}) or {}
+    level = student.get("level", None)
+    # Computed once per student rather than once per item
+    avg_perf = (
+        sum(performance.values()) / len(performance)
+        if performance and all(isinstance(v, (int, float)) for v in performance.values()) else 0
+    )
+    if not adaptivity:
+        return _difficulty_value
+    if isinstance(level, str) and level in ["intro", "beginner", "remedial"]:
+        default_sign = 1
+    elif isinstance(level, str) and level in ["advanced", "expert"]:
+        default_sign = -1
+    else:
+        default_sign = -1 if avg_perf >= 0.8 else 1
+
+    def score(content):
+        dval = _difficulty_value(content)
+        perf_value = performance.get(content["id"], None)
+        if perf_value is not None:
+            return -dval if perf_value >= 0.8 else dval
+        return default_sign * dval
+
+    return score
+
+
+class StudentPathState:
+    """
+    One student's position in a compiled catalog: remaining prerequisite counts and
+    the set of unlocked, not yet completed items. Updated incrementally by complete().
+    """
+
+    def __init__(self, planner: "LearningPathPlanner", completed: Iterable[str] = ()):
+        self.planner = planner
+        self.completed = set()
+        self._remaining: Dict[int, int] = {}  # overrides of planner.indegree
+        self._unlocked = {i for i in planner.roots}
+        for content_id in completed:
+            self.complete(content_id)
+
+    def complete(self, content_id: str) -> List[str]:
+        """Mark content completed; returns the ids it unlocked."""
+        if content_id in self.completed:
+            return []
+        self.completed.add(content_id)
+        planner = self.planner
+        index = planner.index.get(content_id)
+        if index is not None:
+            self._unlocked.discard(index)
+        unlocked = []
+        for j in planner.dependents.get(content_id, ()):
+            remaining = self._remaining.get(j, planner.indegree[j]) - 1
+            self._remaining[j] = remaining
+            if remaining == 0 and planner.ids[j] not in self.completed:
+                self._unlocked.add(j)
+                unlocked.append(planner.ids[j])
+        return unlocked
+
+    def remaining(self, index: int) -> int:
+        return self._remaining.get(index, self.planner.indegree[index])
+
+    def available(self) -> List[str]:
+        """Unlocked, not completed content ids in catalog order."""
+        return [self.planner.ids[i] for i in sorted(self._unlocked)]
+
+
+class LearningPathPlanner:
+    """
+    Compiled view of a content catalog (list of content descriptors with
+    id, type, prerequisites, difficulty).
+
+    Usage:
+        planner = LearningPathPlanner(catalog)
+        path = planner.plan(student, max_length=10)
+        state = planner.state_for(student["completed_content"])
+        state.complete("less2")  # unlocks dependents incrementally
+        path = planner.plan(student, state=state)
+    """
+
+    def __init__(self, candidate_content: List[Dict[str, Any]]):
+        self.items: List[Dict[str, Any]] = []
+        self.ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        for content in candidate_content:
+            if content['id'] in self.index:
+                continue
+            self.index[content['id']] = len(self.items)
+            self.items.append(content)
+            self.ids.append(content['id'])
+
+        # prerequisite id (in the catalog or not) -> indices of items that need it
+        self.dependents: Dict[str, List[int]] = {}
+        self.indegree: List[int] = []
+        for i, content in enumerate(self.items):
+            prereqs = list(dict.fromkeys(content.get('prerequisites', []) or []))
+            self.indegree.append(len(prereqs))
+            for pid in prereqs:
+                self.dependents.setdefault(pid, []).append(i)
+        self.roots = [i for i, degree in enumerate(self.indegree) if degree == 0]
+        self.levels = self._topological_levels()
+
+    def _topological_levels(self) -> Dict[str, int]:
+        """
+        Level of each item: 0 for items with no prerequisites inside the catalog,
+        otherwise one more than its deepest in-catalog prerequisite. Items on a
+        prerequisite cycle get no level.
+        """
+        internal = [
+            sum(1 for pid in dict.fromkeys(item.get('prerequisites', []) or []) if pid in self.index)
+            for item in self.items
+        ]
+        levels: Dict[str, int] = {}
+        frontier = [i for i, degree in enumerate(internal) if degree == 0]
+        depth = 0
+        while frontier:
+            next_frontier = []
+            for i in frontier:
+                levels[self.ids[i]] = depth
+                for j in self.dependents.get(self.ids[i], ()):
+                    internal[j] -= 1
+                    if internal[j] == 0:
+                        next_frontier.append(j)
+            frontier = next_frontier
+            depth += 1
+        return levels
+
+    def topological_levels(self) -> List[List[str]]:
+        """Content ids grouped by level, in catalog order within a level."""
+        grouped: List[List[str]] = []
+        for content_id in self.ids:
+            level = self.levels.get(content_id)
+            if level is None:
+                continue
+            while len(grouped) <= level:
+                grouped.append([])
+            grouped[level].append(content_id)
+        return grouped
+
+    def state_for(self, completed: Iterable[str]) -> StudentPathState:
+        return StudentPathState(self, completed)
+
+    def plan(
+        self,
+        student: Dict[str, Any],
+        max_length: int = 10,
+        adaptivity: bool = True,
+        state: Optional[StudentPathState] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Order up to `max_length` items the student can take, where each item's
+        prerequisites are completed or earlier in the path.
+
+        Returns:
+            Content descriptors in path order
+        """
+        if state is None:
+            state = self.state_for(student.get("completed_content", []))
+        score = make_priority(student, adaptivity)
+        # With no performance history, adaptive mode flips the order of the
+        # difficulty ranking (and catalog order among equals)
+        sign = -1 if adaptivity and not (student.get("performance") or {}) else 1
+
+        def key(i):
+            return (sign * score(self.items[i]), sign * i)
+
+        heap = [(key(i), i) for i in state._unlocked]
+        heapq.heapify(heap)
+        # Simulated completions only touch this overlay, never the student's state
+        overlay: Dict[int, int] = {}
+        path = []
+        while heap and len(path) < max_length:
+            _, i = heapq.heappop(heap)
+            path.append(self.items[i])
+            for j in self.dependents.get(self.ids[i], ()):
+                remaining = overlay.get(j, state.remaining(j)) - 1
+                overlay[j] = remaining
+                if remaining == 0 and self.ids[j] not in state.completed:
+                    heapq.heappush(heap, (key(j), j))
+        return path
@@ -1,19 +1,178 @@
+import hashlib
+import os
 import re
-from typing import List, Dict, Any
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Hashable, Optional, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+_PUNCT = re.compile(r"[^\w\s]")
+# ASCII text (the common case) drops punctuation through str.translate instead of the regex
+_ASCII_PUNCT_TABLE = {c: None for c in range(128) if _PUNCT.match(chr(c))}
+
+# Texts at least this long are keyed by digest rather than kept whole in the cache key
+_DIGEST_KEY_MIN_LENGTH = 1024
+# Default budget of CleanTextCache: total characters of cached keys and cleaned texts (~64-256 MB)
+DEFAULT_CACHE_MAX_CHARS = 64 * 1024 * 1024
+# Batches with less uncached text than this are cleaned in-process
+PARALLEL_MIN_CHARS = 1_000_000
+
+
+def _clean(text: str, to_lower: bool = True, remove_punct: bool = True) -> str:
+    if to_lower:
+        text = text.lower()
+    text = _WHITESPACE.sub(" ", text)
+    if remove_punct:
+        text = text.translate(_ASCII_PUNCT_TABLE) if text.isascii() else _PUNCT.sub("", text)
+    return text.strip()
+
+
+def _clean_chunk(args: Tuple[List[str], bool, bool]) -> List[str]:
+    # Module-level so process pool workers can unpickle it
+    texts, to_lower, remove_punct = args
+    return [_clean(t, to_lower, remove_punct) for t in texts]
+
+
+class CleanTextCache:
+    """
+    Thread-safe LRU of cleaned text keyed by content (hash for long texts) plus options.
+
+    Bounded by the total characters it holds (cleaned texts plus text keys), not
+    by entry count, so a few book-length documents cannot pin gigabytes. A text
+    larger than the whole budget is not cached.
+    """
+
+    def __init__(self, max_chars: int = DEFAULT_CACHE_MAX_CHARS):
+        self.max_chars = max_chars
+        self._entries: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text: str, to_lower: bool, remove_punct: bool) -> Hashable:
+        if len(text) >= _DIGEST_KEY_MIN_LENGTH:
+            text = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        return (text, to_lower, remove_punct)
+
+    def get(self, key: Hashable) -> Optional[str]:
+        with self._lock:
+            cleaned = self._entries.get(key)
+            if cleaned is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return cleaned
+
+    @staticmethod
+    def _size(key: Hashable, cleaned: str) -> int:
+        text = key[0]
+        return len(cleaned) + (len(text) if isinstance(text, str) else 0)
+
+    def put(self, key: Hashable, cleaned: str) -> None:
+        size = self._size(key, cleaned)
+        if size > self.max_chars:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._chars -= self._size(key, previous)
+            self._entries[key] = cleaned
+            self._chars += size
+            while self._chars > self.max_chars:
+                old_key, old = self._entries.popitem(last=False)
+                self._chars -= self._size(old_key, old)
+
+    @property
+    def size_chars(self) -> int:
+        return self._chars
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+            self.hits = 0
+            self.misses = 0
+
+
+# Shared by default so every stage (concept extraction, embedding, indexing) cleans a text once
+shared_clean_cache = CleanTextCache()
+
 
 class ContentPreprocessor:
     """
     Performs basic content preprocessing for AI analysis.
     Includes whitespace cleanup, case normalization, special char removal, etc.
     Extend as needed for more advanced NLP tasks.
+
+    Cleaned text is memoized (shared_clean_cache unless a cache is given), and
+    large batches are cleaned across a process pool with results in input order.
     """
+    def __init__(self, cache: Optional[CleanTextCache] = None, max_workers: Optional[int] = None):
+        self.cache = cache if cache is not None else shared_clean_cache
+        self.max_workers = max_workers or os.cpu_count() or 1
+
     def clean_text(self, text: str, to_lower: bool = True, remove_punct: bool = True) -> str:
-        if to_lower:
-            text = text.lower()
-        text = re.sub(r"\s+", " ", text)
-        if remove_punct:
-            text = re.sub(r"[^\w\s]", "", text)
-        return text.strip()
-
-    def preprocess_batch(self, texts: List[str], **kwargs) -> List[str]:
-        return [self.clean_text(t, **kwargs) for t in texts]
\ No newline at end of file
+        key = self.cache.key(text, to_lower, remove_punct)
+        cleaned = self.cache.get(key)
+        if cleaned is None:
+            cleaned = _clean(text, to_lower, remove_punct)
+            self.cache.put(key, cleaned)
+        return cleaned
+
+    def preprocess_batch(self, texts: List[str], to_lower: bool = True, remove_punct: bool = True,
+                         parallel: Optional[bool] = None) -> List[str]:
+        """
+        Clean many texts. Cached and duplicate texts are cleaned once; the rest go to a
+        process pool when there is enough of it (PARALLEL_MIN_CHARS), or when `parallel`
+        is True. Results are in input order.
+        """
+        keys = [self.cache.key(t, to_lower, remove_punct) for t in texts]
+        results: Dict[Hashable, str] = {}
+        pending: Dict[Hashable, str] = {}
+        for key, text in zip(keys, texts):
+            if key in results or key in pending:
+                continue
+            cleaned = self.cache.get(key)
+            if cleaned is None:
+                pending[key] = text
+            else:
+                results[key] = cleaned
+
+        if pending:
+            pending_keys = list(pending)
+            pending_texts = list(pending.values())
+            if parallel is None:
+                parallel = sum(len(t) for t in pending_texts) >= PARALLEL_MIN_CHARS
+            if parallel and self.max_workers > 1 and len(pending_texts) > 1:
+                cleaned_texts = self._clean_parallel(pending_texts, to_lower, remove_punct)
+            else:
+                cleaned_texts = _clean_chunk((pending_texts, to_lower, remove_punct))
+            for key, cleaned in zip(pending_keys, cleaned_texts):
+                self.cache.put(key, cleaned)
+                results[key] = cleaned
+        return [results[key] for key in keys]
+
+    def _clean_parallel(self, texts: List[str], to_lower: bool, remove_punct: bool) -> List[str]:
+        chunks = self._chunk(texts, self.max_workers * 4)
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as pool:
+            cleaned = pool.map(_clean_chunk, [(chunk, to_lower, remove_punct) for chunk in chunks])
+            return [text for chunk in cleaned for text in chunk]
+
+    @staticmethod
+    def _chunk(texts: List[str], parts: int) -> List[List[str]]:
+        """Split texts into about `parts` contiguous chunks of similar total length."""
+        target = max(1, sum(len(t) for t in texts) // parts)
+        chunks, current, size = [], [], 0
+        for text in texts:
+            current.append(text)
+            size += len(text)
+            if size >= target:
+                chunks.append(current)
+                current, size = [], 0
+        if current:
+            chunks.append(current)
+        return chunks
@@ -49,6 +49,23 @@ class PromptEngineering:
             prompt = self.optimizer.optimize(prompt, context=context)
         return prompt
 
+    def generate_prompts(
+        self,
+        template_name: str,
+        variable_sets: list,
+        context: dict = None,
+        optimize: bool = True
+    ) -> list:
+        """
+        Generate prompts for many variable sets with one template (bulk content processing).
+
+        Context values are pre-rendered into the template once rather than per prompt.
+        """
+        prompts = self.template_engine.render_batch(template_name, variable_sets, context)
+        if optimize:
+            prompts = [self.optimizer.optimize(p, context=context) for p in prompts]
+        return prompts
+
     def parse_response(self, prompt: str, llm_response: str, expected_format: str = None) -> dict:
         """
         Parse a model response, extracting structured information.
@@ -3,7 +3,8 @@
 
 from typing import List, Dict, Any, Tuple
 from app.core.external_resources import ExternalResourceManager
-from app.core.external_resources.scoring import score_resource
+from app.core.external_resources.scoring import ResourceScorer
+from app.core.external_resources.discovery_executor import DiscoveryExecutor
 from app.models.course import Course
 
 # Import provider infrastructure
@@ -35,56 +36,71 @@ class ResourceDiscoveryOrchestrator:
     ensures deduplication, normalization, and compatibility with scoring/filtering logic.
     Handles both single content and list of contents.
     Always attempts fetch_resources first, then find_resources if available.
+    Close it (or use it as a context manager) to stop the executor it created.
     """
-    def __init__(self, providers: List[Any] = None):
+    def __init__(self, providers: List[Any] = None, executor: DiscoveryExecutor = None,
+                 deadline_seconds: float = 5.0, scorer: ResourceScorer = None):
         """
         providers: list of provider instances (e.g., DeepSeekProvider, MockProvider)
+        executor: optional DiscoveryExecutor; by default one is built over providers
+        deadline_seconds: global budget for a discovery round; slower providers are
+            dropped from this round (partial results) but still warm the cache
+        scorer: optional ResourceScorer (e.g. with custom ScoringWeights)
         """
         # Accept any provider that implements .find_resources(content)
         self.providers = providers if providers is not None else [DeepSeekProvider(), MockProvider()]
+        # Only an executor built here is ours to shut down
+        self._owns_executor = executor is None
+        self.executor = executor or DiscoveryExecutor(self.providers, deadline_seconds=deadline_seconds)
+        self.scorer = scorer or ResourceScorer()
+        self.last_outcome = None
     
+    def close(self):
+        if self._owns_executor:
+            self.executor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
     def find_relevant_resources(self, course_content) -> List[ResourceResult]:
         """
         Accepts either a single course_content or a list.
-        Calls each provider, aggregates, deduplicates, scores, and normalizes results.
+        Queries all providers concurrently, aggregates, deduplicates, scores, and normalizes results.
         Returns a list of ResourceResult.
         """
-        discovered = []
         content_items = course_content
         # Accept both a single item and a list/tuple of items
         if not isinstance(content_items, (list, tuple)):
             content_items = [content_items]
-            
-        for content in content_items:
-            for provider in self.providers:
-                results = []
-                # Robustly try fetch_resources, fallback to find_resources (for integration test compatibility)
-                fetch = getattr(provider, "fetch_resources", None)
-                find = getattr(provider, "find_resources", None)
-                if callable(fetch):
-                    try:
-                        results = fetch(content)
-                    except Exception:
-                        results = []
-                elif callable(find):
-                    try:
-                        results = find(content)
-                    except Exception:
-                        results = []
-                if results:
-                    discovered.extend(results)
+        if not content_items:
+            return []
+
+        # Failing or slow providers are reported on the outcome instead of raising
+        self.last_outcome = self.executor.discover(content_items)
+        discovered = self.last_outcome.results
 
         # Deduplicate by url:
-        resource_map = {}
-        for res in discovered:
+        unique = {}
+        for source_name, res in discovered:
             url = getattr(res, "url", None) or (res.get("url") if isinstance(res, dict) else None)
-            if not url or url in resource_map:
-                continue
-            
-            # Score if not present
-            score = getattr(res, "score", None) if hasattr(res, "score") else res.get("score") if isinstance(res, dict) else None
+            if url and url not in unique:
+                unique[url] = (source_name, res)
+
+        # Score the ones without a score in one batch (first course is the scoring context)
+        def existing_score(res):
+            return getattr(res, "score", None) if hasattr(res, "score") else res.get("score") if isinstance(res, dict) else None
+        unscored = [res for _, res in unique.values() if existing_score(res) is None]
+        batch_scores = dict(zip(map(id, unscored), self.scorer.score_many(unscored, content_items[0])))
+
+        resource_map = {}
+        for url, (source_name, res) in unique.items():
+            score = existing_score(res)
             if score is None:
-                score = score_resource(res, content_items[0])  # Use first course for scoring context
+                score = batch_scores[id(res)]
             
             # Assign quality according to score:
             if score >= 0.85:
@@ -97,8 +113,7 @@ class ResourceDiscoveryOrchestrator:
             # Compose metadata:
             meta = getattr(res, "metadata", {}) if hasattr(res, "metadata") else res.get("metadata", {}) or {}
             meta = dict(meta)  # ensure dict
-            # Warn if source is not being set
-            meta.setdefault("source", provider.__class__.__name__ if hasattr(provider, "__class__") else str(provider))
+            meta.setdefault("source", source_name)
             resource_map[url] = ResourceResult(url, score, quality, meta)
 
         # Return sorted list (by score desc)
@@ -118,7 +133,7 @@ class ResourceDiscovery:
         """
         discovered = self.manager.query_all_providers(course)
         # Score all resources
-        scored = [(res, score_resource(res, course)) for res in discovered]
+        scored = list(zip(discovered, ResourceScorer().score_many(discovered, course)))
         # Sort and filter by descending score
         scored = sorted(scored, key=lambda x: x[1], reverse=True)
         return scored[:max_results]
@@ -0,0 +1,239 @@
+"""
+File: deadline_scheduler.py
+Location: /app/core/assessment/
+Purpose: Shared deadline scheduler for assessment sessions (time limits, warnings, auto-submission).
+
+A single background thread services every registered deadline from a min-heap, so the
+number of threads stays constant no matter how many students are sitting an exam.
+Extend/pause/resume/cancel are O(log n): superseded heap entries are invalidated by a
+per-deadline generation counter and discarded lazily when they surface.
+"""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Event kinds emitted to deadline callbacks
+EVENT_WARNING = "warning"
+EVENT_EXPIRED = "expired"
+
+DeadlineCallback = Callable[[str, Hashable, float], None]
+
+
+class _Deadline:
+    """Book-keeping for one registered deadline."""
+
+    __slots__ = ("key", "deadline", "callback", "warnings", "fired_warnings",
+                 "generation", "paused_remaining")
+
+    def __init__(self, key: Hashable, deadline: float, callback: DeadlineCallback,
+                 warnings: Tuple[float, ...]):
+        self.key = key
+        self.deadline = deadline
+        self.callback = callback
+        self.warnings = warnings
+        self.fired_warnings = set()
+        self.generation = 0
+        self.paused_remaining: Optional[float] = None
+
+    @property
+    def is_paused(self) -> bool:
+        return self.paused_remaining is not None
+
+
+class DeadlineScheduler:
+    """
+    Manages many deadlines with one worker thread.
+
+    Callbacks receive ``(event, key, remaining_seconds)`` where ``event`` is
+    ``EVENT_WARNING`` (remaining is the warning offset) or ``EVENT_EXPIRED``
+    (remaining is 0.0). Callbacks run on the scheduler thread and must be quick;
+    exceptions are logged and never stop the scheduler.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, name: str = "assessment-deadlines"):
+        self._clock = clock
+        self._name = name
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[float, int, Hashable, int, str, float]] = []
+        self._entries: Dict[Hashable, _Deadline] = {}
+        self._seq = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    # ------------------------------------------------------------------ #
+    # Public API
+    # ------------------------------------------------------------------ #
+
+    def schedule(self, key: Hashable, delay_seconds: float, callback: DeadlineCallback,
+                 warnings: Optional[Iterable[float]] = None):
+        """
+        Register (or replace) the deadline for ``key``, ``delay_seconds`` from now.
+
+        ``warnings`` are offsets in seconds before the deadline at which a
+        ``EVENT_WARNING`` callback is emitted (e.g. ``[300, 60]``).
+        """
+        offsets = tuple(sorted({float(w) for w in (warnings or ()) if w > 0}, reverse=True))
+        with self._cond:
+            self._ensure_running()
+            entry = _Deadline(key, self._clock() + float(delay_seconds), callback, offsets)
+            old = self._entries.get(key)
+            if old is not None:
+                entry.generation = old.generation + 1
+            self._entries[key] = entry
+            self._push_entry(entry)
+            self._cond.notify()
+
+    def extend(self, key: Hashable, extra_seconds: float) -> bool:
+        """Move the deadline for ``key`` by ``extra_seconds`` (negative values shorten it)."""
+        with self._cond:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            if entry.is_paused:
+                entry.paused_remaining = max(0.0, entry.paused_remaining + extra_seconds)
+            else:
+                entry.deadline += extra_seconds
+                # Warnings whose window reopened may fire again
+                remaining = entry.deadline - self._clock()
+                entry.fired_warnings = {w for w in entry.fired_warnings if w >= remaining}
+                entry.generation += 1
+                self._push_entry(entry)
+                self._cond.notify()
+            return True
+
+    def pause(self, key: Hashable) -> bool:
+        """Freeze the remaining time for ``key`` until ``resume`` is called."""
+        with self._cond:
+            entry = self._entries.get(key)
+            if entry is None or entry.is_paused:
+                return False
+            entry.paused_remaining = max(0.0, entry.deadline - self._clock())
+            entry.generation += 1
+            return True
+
+    def resume(self, key: Hashable) -> bool:
+        """Restart the countdown for a paused ``key`` with its frozen remaining time."""
+        with self._cond:
+            entry = self._entries.get(key)
+            if entry is None or not entry.is_paused:
+                return False
+            entry.deadline = self._clock() + entry.paused_remaining
+            entry.paused_remaining = None
+            entry.generation += 1
+            self._push_entry(entry)
+            self._cond.notify()
+            return True
+
+    def cancel(self, key: Hashable) -> bool:
+        """Forget the deadline for ``key``; any pending heap entries become stale."""
+        with self._cond:
+            return self._entries.pop(key, None) is not None
+
+    def remaining(self, key: Hashable) -> Optional[float]:
+        """Seconds left before ``key`` expires, or None if it is not scheduled."""
+        with self._cond:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.is_paused:
+                return entry.paused_remaining
+            return max(0.0, entry.deadline - self._clock())
+
+    def is_scheduled(self, key: Hashable) -> bool:
+        with self._cond:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._entries)
+
+    def shutdown(self, timeout: Optional[float] = None):
+        """Stop the worker thread; pending deadlines are dropped."""
+        with self._cond:
+            self._running = False
+            self._entries.clear()
+            self._heap.clear()
+            self._cond.notify_all()
+            thread = self._thread
+            self._thread = None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+
+    def _ensure_running(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+            self._thread.start()
+
+    def _push_entry(self, entry: _Deadline):
+        """Push heap items for the expiry and every warning not yet emitted."""
+        gen = entry.generation
+        heapq.heappush(self._heap, (entry.deadline, next(self._seq), entry.key, gen, EVENT_EXPIRED, 0.0))
+        for offset in entry.warnings:
+            if offset not in entry.fired_warnings:
+                heapq.heappush(self._heap, (entry.deadline - offset, next(self._seq), entry.key,
+                                            gen, EVENT_WARNING, offset))
+        # Keep lazily-deleted garbage bounded relative to live deadlines
+        if len(self._heap) > 64 and len(self._heap) > 4 * (len(self._entries) * (1 + len(entry.warnings))):
+            self._compact()
+
+    def _compact(self):
+        live = []
+        for item in self._heap:
+            entry = self._entries.get(item[2])
+            if entry is not None and entry.generation == item[3] and not entry.is_paused:
+                live.append(item)
+        heapq.heapify(live)
+        self._heap = live
+
+    def _run(self):
+        while True:
+            due = []
+            with self._cond:
+                while self._running:
+                    now = self._clock()
+                    while self._heap and self._heap[0][0] <= now:
+                        _, _, key, gen, kind, offset = heapq.heappop(self._heap)
+                        entry = self._entries.get(key)
+                        if entry is None or entry.generation != gen or entry.is_paused:
+                            continue  # stale
+                        if kind == EVENT_EXPIRED:
+                            del self._entries[key]
+                            due.append((entry.callback, kind, key, 0.0))
+                        elif offset not in entry.fired_warnings:
+                            entry.fired_warnings.add(offset)
+                            due.append((entry.callback, kind, key, offset))
+                    if due:
+                        break
+                    timeout = (self._heap[0][0] - now) if self._heap else None
+                    self._cond.wait(timeout)
+                if not self._running:
+                    return
+            for callback, kind, key, remaining in due:
+                try:
+                    callback(kind, key, remaining)
+                except Exception:
+                    logger.exception("Deadline callback for %r failed", key)
+
+
+_default_scheduler: Optional[DeadlineScheduler] = None
+_default_lock = threading.Lock()
+
+
+def get_default_scheduler() -> DeadlineScheduler:
+    """Process-wide scheduler shared by every assessment session."""
+    global _default_scheduler
+    with _default_lock:
+        if _default_scheduler is None:
+            _default_scheduler = DeadlineScheduler()
+        return _default_scheduler
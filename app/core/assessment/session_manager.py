@@ -6,7 +6,6 @@ Purpose: Manages assessment sessions, timing, state transitions. Integrates with
 This file is created in accordance with the Day 17 development plan and current project conventions.
 """
 
-import threading
 import time
 import uuid
 from enum import Enum
@@ -14,6 +13,9 @@ from typing import List, Dict, Optional, Any, Callable
 from app.models.assessment import Assessment, Answer, ManualGradingAssignment
 from app.models.content import Question
 from app.core.assessment.question_engine import QuestionEngine
+from app.core.assessment.deadline_scheduler import (
+    DeadlineScheduler, EVENT_EXPIRED, EVENT_WARNING, get_default_scheduler
+)
 from datetime import datetime
 
 class AssessmentSessionStatus(Enum):
@@ -25,7 +27,8 @@ class AssessmentSessionStatus(Enum):
     CANCELLED = 'cancelled'
 
 class AssessmentSession:
-    def __init__(self, assessment: Assessment, user_id: str, duration_seconds: Optional[int] = None):
+    def __init__(self, assessment: Assessment, user_id: str, duration_seconds: Optional[int] = None,
+                 scheduler: Optional[DeadlineScheduler] = None, warning_seconds: Optional[List[int]] = None):
         self.id = f"session-{user_id}-{int(time.time()*1e6)}-{uuid.uuid4().hex[:6]}"  # unique per session
         self.assessment = assessment
         self.user_id = user_id
@@ -35,7 +38,9 @@ class AssessmentSession:
         self.status = AssessmentSessionStatus.NOT_STARTED
         self.answers: Dict[str, Answer] = {}
         self.listeners: List[Callable] = []
-        self.timer_thread = None
+        # Deadlines are serviced by a shared scheduler instead of a thread per session
+        self.scheduler = scheduler or get_default_scheduler()
+        self.warning_seconds = list(warning_seconds or [])
         self._is_time_expired_forced = None  # For monkeypatch/testing
         
     @property
@@ -77,20 +82,35 @@ class AssessmentSession:
         self.status = AssessmentSessionStatus.IN_PROGRESS
         self.start_time = time.time()
         if self.duration_seconds is not None:
-            self.timer_thread = threading.Thread(target=self._run_timer)
-            self.timer_thread.start()
+            self.scheduler.schedule(self.id, self.duration_seconds, self._on_deadline,
+                                    warnings=self.warning_seconds)
         self._notify('started', None)
 
     def pause(self):
         if self.status == AssessmentSessionStatus.IN_PROGRESS:
             self.status = AssessmentSessionStatus.PAUSED
+            self.scheduler.pause(self.id)
             self._notify('paused', None)
 
     def resume(self):
         if self.status == AssessmentSessionStatus.PAUSED:
             self.status = AssessmentSessionStatus.IN_PROGRESS
+            self.scheduler.resume(self.id)
             self._notify('resumed', None)
 
+    def extend_time(self, extra_seconds: float):
+        """Grant extra time (e.g. accommodations); works while running or paused."""
+        if self.duration_seconds is None:
+            return
+        self.duration_seconds += extra_seconds
+        self.scheduler.extend(self.id, extra_seconds)
+        self._notify('time_extended', {'extra_seconds': extra_seconds})
+
+    @property
+    def time_remaining(self) -> Optional[float]:
+        """Seconds left on the clock, or None for untimed/finished sessions."""
+        return self.scheduler.remaining(self.id)
+
     def submit_answer(self, question_id, answer: Answer):
         # Handle question_id as a dict/object with an id/text, extract a hashable string identifier
         qkey = None
@@ -107,6 +127,7 @@ class AssessmentSession:
     def complete(self):
         self.status = AssessmentSessionStatus.COMPLETED
         self.end_time = time.time()
+        self.scheduler.cancel(self.id)
         self._notify('completed', None)
         
     def finalize(self):
@@ -136,6 +157,7 @@ class AssessmentSession:
 
     def cancel(self):
         self.status = AssessmentSessionStatus.CANCELLED
+        self.scheduler.cancel(self.id)
         self._notify('cancelled', None)
         
     def tick(self):
@@ -151,15 +173,16 @@ class AssessmentSession:
             self.end_time = time.time()
             self._notify('timed_out', None)
 
-    def _run_timer(self):
-        while self.status == AssessmentSessionStatus.IN_PROGRESS:
-            elapsed = time.time() - self.start_time
-            if self.duration_seconds and elapsed >= self.duration_seconds:
-                self.status = AssessmentSessionStatus.TIMED_OUT
-                self.end_time = time.time()
-                self._notify('timed_out', None)
-                break
-            time.sleep(1)
+    def _on_deadline(self, event: str, key, remaining: float):
+        """Scheduler callback: emit warnings and auto-submit on expiry."""
+        if self.status != AssessmentSessionStatus.IN_PROGRESS:
+            return
+        if event == EVENT_WARNING:
+            self._notify('time_warning', {'seconds_remaining': remaining})
+        elif event == EVENT_EXPIRED:
+            self.status = AssessmentSessionStatus.TIMED_OUT
+            self.end_time = time.time()
+            self._notify('timed_out', None)
 
     def add_listener(self, callback: Callable[[str, Optional[Any]], None]):
         self.listeners.append(callback)
@@ -209,11 +232,14 @@ class GradingEngine:
         return {"total": total, "breakdown": scores}
 
 class AssessmentSessionManager:
-    def __init__(self):
+    def __init__(self, scheduler: Optional[DeadlineScheduler] = None):
         self.sessions: Dict[str, AssessmentSession] = {}
+        self.scheduler = scheduler or get_default_scheduler()
 
-    def create_session(self, assessment: Assessment, user_id: str, duration_seconds: Optional[int]=None) -> AssessmentSession:
-        session = AssessmentSession(assessment=assessment, user_id=user_id, duration_seconds=duration_seconds)
+    def create_session(self, assessment: Assessment, user_id: str, duration_seconds: Optional[int]=None,
+                       warning_seconds: Optional[List[int]] = None) -> AssessmentSession:
+        session = AssessmentSession(assessment=assessment, user_id=user_id, duration_seconds=duration_seconds,
+                                    scheduler=self.scheduler, warning_seconds=warning_seconds)
         self.sessions[user_id] = session
         return session
 
@@ -0,0 +1,18 @@
+"""
+Benchmark suite for AeroLearn AI.
+
+Named scenarios exercise real hot paths (event publish, vector/keyword search,
+uploads, grading, sync); the runner reports p50/p95/p99 and throughput as JSON
+and can compare against a baseline. Run with ``python -m app.core.benchmark``.
+"""
+
+from .runner import (
+    BenchmarkScenario,
+    BenchmarkResult,
+    BenchmarkRunner,
+    Regression,
+    compare_to_baseline,
+    percentile,
+    results_to_json,
+)
+from .scenarios import builtin_scenarios, default_runner
@@ -0,0 +1,63 @@
+"""
+File: __main__.py
+Location: /app/core/benchmark/
+Purpose: Command-line entry point for the benchmark suite.
+
+Usage:
+    python -m app.core.benchmark --list
+    python -m app.core.benchmark -s vector_search -s grading --repetitions 50 --output bench.json
+    python -m app.core.benchmark --baseline bench.json --threshold 0.15
+
+Exits with status 1 when a baseline comparison finds regressions.
+"""
+
+import argparse
+import json
+import sys
+
+from app.core.benchmark.runner import results_to_json, compare_to_baseline
+from app.core.benchmark.scenarios import default_runner
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="AeroLearn AI benchmark suite")
+    parser.add_argument("-s", "--scenario", action="append", dest="scenarios",
+                        help="Scenario to run (repeatable); default runs all")
+    parser.add_argument("--list", action="store_true", help="List scenarios and exit")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--repetitions", type=int, default=20)
+    parser.add_argument("--scale", type=float, default=1.0, help="Data size multiplier")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--baseline", help="Baseline JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Allowed fractional slowdown before flagging a regression")
+    args = parser.parse_args(argv)
+
+    runner = default_runner(scale=args.scale, warmup=args.warmup, repetitions=args.repetitions)
+    if args.list:
+        for name in runner.scenario_names():
+            print(name)
+        return 0
+
+    results = runner.run(args.scenarios)
+    for r in results:
+        print(f"{r.name:16s} p50={r.p50 * 1e3:9.3f}ms p95={r.p95 * 1e3:9.3f}ms "
+              f"p99={r.p99 * 1e3:9.3f}ms throughput={r.throughput:12.1f} ops/s")
+
+    report = results_to_json(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, threshold=args.threshold)
+        for reg in regressions:
+            print(f"REGRESSION {reg.name}.{reg.metric}: {reg.baseline * 1e3:.3f}ms -> "
+                  f"{reg.current * 1e3:.3f}ms (+{reg.change:.0%})")
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
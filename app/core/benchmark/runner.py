@@ -0,0 +1,167 @@
+"""
+File: runner.py
+Location: /app/core/benchmark/
+Purpose: Scenario-based benchmark runner with percentile reporting, JSON output and
+baseline regression checks.
+
+A scenario is a named callable exercising one real hot path. The runner handles
+warmup, repetitions, timing (perf_counter) and statistics; scenarios only do work.
+"""
+
+import json
+import platform
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+@dataclass
+class BenchmarkScenario:
+    """
+    A named benchmark.
+
+    setup() returns a state object passed to run(state) and teardown(state).
+    ops_per_run is how many logical operations one run() performs (for throughput).
+    """
+    name: str
+    run: Callable[[Any], Any]
+    setup: Optional[Callable[[], Any]] = None
+    teardown: Optional[Callable[[Any], None]] = None
+    ops_per_run: int = 1
+    description: str = ""
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    warmup: int
+    repetitions: int
+    ops_per_run: int
+    samples: List[float] = field(default_factory=list)
+    mean: float = 0.0
+    p50: float = 0.0
+    p95: float = 0.0
+    p99: float = 0.0
+    min: float = 0.0
+    max: float = 0.0
+    throughput: float = 0.0  # operations per second
+
+    def to_dict(self, include_samples: bool = False) -> Dict[str, Any]:
+        data = asdict(self)
+        if not include_samples:
+            data.pop("samples")
+        return data
+
+@dataclass
+class Regression:
+    name: str
+    metric: str
+    baseline: float
+    current: float
+    change: float  # fractional increase, e.g. 0.25 = 25% slower
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    """Linear-interpolated percentile of an already sorted list."""
+    if not sorted_samples:
+        return 0.0
+    if len(sorted_samples) == 1:
+        return sorted_samples[0]
+    rank = (len(sorted_samples) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(sorted_samples) - 1)
+    return sorted_samples[low] + (sorted_samples[high] - sorted_samples[low]) * (rank - low)
+
+class BenchmarkRunner:
+    """
+    Runs registered scenarios and reports latency percentiles and throughput.
+    """
+
+    def __init__(self, warmup: int = 3, repetitions: int = 20):
+        self.warmup = warmup
+        self.repetitions = repetitions
+        self._scenarios: Dict[str, BenchmarkScenario] = {}
+
+    def register(self, scenario: BenchmarkScenario):
+        self._scenarios[scenario.name] = scenario
+
+    def scenario_names(self) -> List[str]:
+        return list(self._scenarios)
+
+    def run_scenario(self, name: str, warmup: Optional[int] = None,
+                     repetitions: Optional[int] = None) -> BenchmarkResult:
+        if name not in self._scenarios:
+            raise KeyError(f"Unknown benchmark scenario '{name}'")
+        scenario = self._scenarios[name]
+        warmup = self.warmup if warmup is None else warmup
+        repetitions = self.repetitions if repetitions is None else repetitions
+        if repetitions < 1:
+            raise ValueError("repetitions must be at least 1")
+
+        state = scenario.setup() if scenario.setup else None
+        samples = []
+        try:
+            for _ in range(warmup):
+                scenario.run(state)
+            for _ in range(repetitions):
+                start = time.perf_counter()
+                scenario.run(state)
+                samples.append(time.perf_counter() - start)
+        finally:
+            if scenario.teardown:
+                scenario.teardown(state)
+        return self._summarize(scenario, warmup, samples)
+
+    def run(self, names: Optional[Iterable[str]] = None, warmup: Optional[int] = None,
+            repetitions: Optional[int] = None) -> List[BenchmarkResult]:
+        names = list(names) if names else self.scenario_names()
+        return [self.run_scenario(n, warmup, repetitions) for n in names]
+
+    @staticmethod
+    def _summarize(scenario: BenchmarkScenario, warmup: int, samples: List[float]) -> BenchmarkResult:
+        ordered = sorted(samples)
+        total = sum(samples)
+        return BenchmarkResult(
+            name=scenario.name,
+            warmup=warmup,
+            repetitions=len(samples),
+            ops_per_run=scenario.ops_per_run,
+            samples=samples,
+            mean=total / len(samples),
+            p50=percentile(ordered, 50),
+            p95=percentile(ordered, 95),
+            p99=percentile(ordered, 99),
+            min=ordered[0],
+            max=ordered[-1],
+            throughput=(scenario.ops_per_run * len(samples) / total) if total > 0 else 0.0,
+        )
+
+def results_to_json(results: List[BenchmarkResult], include_samples: bool = False) -> str:
+    """Machine-readable report: environment info plus one entry per scenario."""
+    report = {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {r.name: r.to_dict(include_samples) for r in results},
+    }
+    return json.dumps(report, indent=2, sort_keys=True)
+
+def compare_to_baseline(results: List[BenchmarkResult], baseline: Dict[str, Any],
+                        threshold: float = 0.10, metrics: Iterable[str] = ("p50", "p95")) -> List[Regression]:
+    """
+    Flag scenarios whose latency metrics grew more than ``threshold`` (fractional)
+    relative to a baseline report produced by results_to_json.
+    Scenarios missing from the baseline are skipped.
+    """
+    baseline_results = baseline.get("results", baseline)
+    regressions = []
+    for result in results:
+        base = baseline_results.get(result.name)
+        if not base:
+            continue
+        for metric in metrics:
+            before = base.get(metric)
+            after = getattr(result, metric)
+            if not before:
+                continue
+            change = (after - before) / before
+            if change > threshold:
+                regressions.append(Regression(result.name, metric, before, after, change))
+    return regressions
@@ -0,0 +1,228 @@
+"""
+File: scenarios.py
+Location: /app/core/benchmark/
+Purpose: Built-in benchmark scenarios exercising real AeroLearn hot paths.
+
+Each factory returns a BenchmarkScenario whose setup builds realistic data once and
+whose run() calls production code (no sleeps or stubs). ``scale`` shrinks or grows
+data sizes so the same scenarios serve quick CI smoke runs and full benchmarks.
+"""
+
+import asyncio
+import os
+import random
+import shutil
+import tempfile
+import threading
+from types import SimpleNamespace
+from typing import List
+
+from app.core.benchmark.runner import BenchmarkScenario, BenchmarkRunner
+
+_WORDS = ("lift drag thrust weight airfoil wing flap stall mach shock nozzle turbine "
+          "compressor orbit trajectory propulsion stability control rudder aileron "
+          "boundary layer vortex reynolds laminar turbulent").split()
+
+def _sentence(rng: random.Random, n: int = 12) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(n))
+
+def _scaled(value: int, scale: float) -> int:
+    return max(1, int(value * scale))
+
+
+def event_publish_scenario(scale: float = 1.0) -> BenchmarkScenario:
+    """Publish events through the EventBus past filtered subscribers."""
+    from integrations.events.event_bus import EventBus
+    from integrations.events.event_types import EventType
+
+    events_per_run = _scaled(200, scale)
+
+    class _FilteredSubscriber:
+        def on_event(self, event_type, payload):
+            pass
+
+    def setup():
+        bus = EventBus()
+        subscribers = [_FilteredSubscriber() for _ in range(20)]
+        for sub in subscribers:
+            bus.subscribe(sub, event_filter=lambda event_type, payload: False)
+        return SimpleNamespace(bus=bus, subscribers=subscribers, loop=asyncio.new_event_loop())
+
+    def run(state):
+        async def publish_all():
+            for i in range(events_per_run):
+                await state.bus.publish(EventType.CONTENT_INDEXED, {"data": {"content_id": i}})
+        state.loop.run_until_complete(publish_all())
+
+    def teardown(state):
+        for sub in state.subscribers:
+            state.bus.unsubscribe(sub)
+        state.loop.close()
+
+    return BenchmarkScenario("event_publish", run, setup, teardown, ops_per_run=events_per_run,
+                             description="EventBus.publish with 20 filtered subscribers")
+
+
+def vector_search_scenario(scale: float = 1.0) -> BenchmarkScenario:
+    """Top-k cosine search over an in-memory VectorDBClient."""
+    import numpy as np
+    from app.core.vector_db.vector_db_client import VectorDBClient
+
+    dim, count, queries = 64, _scaled(5000, scale), 10
+
+    def setup():
+        rng = np.random.default_rng(42)
+        client = VectorDBClient(embedding_dim=dim)
+        client.add_bulk({f"v{i}": rng.standard_normal(dim) for i in range(count)})
+        return SimpleNamespace(client=client, queries=rng.standard_normal((queries, dim)))
+
+    def run(state):
+        for q in state.queries:
+            state.client.search(q, top_k=10)
+
+    return BenchmarkScenario("vector_search", run, setup, ops_per_run=queries,
+                             description=f"VectorDBClient.search over {count} x {dim} vectors")
+
+
+def keyword_search_scenario(scale: float = 1.0) -> BenchmarkScenario:
+    """KeywordSearch over a synthetic course corpus."""
+    from app.core.search.keyword_search import KeywordSearch
+
+    docs, queries = _scaled(2000, scale), 20
+
+    def setup():
+        rng = random.Random(7)
+        corpus = [{"id": f"doc{i}", "title": _sentence(rng, 5), "content": _sentence(rng, 60)}
+                  for i in range(docs)]
+        return SimpleNamespace(backend=KeywordSearch(), corpus=corpus,
+                               queries=[_sentence(rng, 3) for _ in range(queries)])
+
+    def run(state):
+        for q in state.queries:
+            state.backend.search(q, context=state.corpus, limit=20)
+
+    return BenchmarkScenario("keyword_search", run, setup, ops_per_run=queries,
+                             description=f"KeywordSearch.search over {docs} documents")
+
+
+def upload_local_scenario(scale: float = 1.0) -> BenchmarkScenario:
+    """Chunked uploads through UploadService into a local filesystem backend."""
+    from app.core.upload.upload_service import UploadService, UploadRequest, LocalFileBackend
+
+    files, size = _scaled(20, scale), 256 * 1024
+
+    def setup():
+        workdir = tempfile.mkdtemp(prefix="aerolearn_bench_upload_")
+        src_dir = os.path.join(workdir, "src")
+        os.makedirs(src_dir)
+        paths = []
+        payload = os.urandom(size)
+        for i in range(files):
+            path = os.path.join(src_dir, f"file{i}.bin")
+            with open(path, "wb") as f:
+                f.write(payload)
+            paths.append(path)
+        service = UploadService(concurrency=2, backend=LocalFileBackend(os.path.join(workdir, "dest")))
+        return SimpleNamespace(workdir=workdir, paths=paths, service=service)
+
+    def run(state):
+        remaining = [len(state.paths)]
+        done = threading.Event()
+        lock = threading.Lock()
+
+        def finished(upload, *args):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    done.set()
+
+        callbacks = {"completed": finished, "failed": finished}
+        for i, path in enumerate(state.paths):
+            state.service.enqueue(UploadRequest(path, f"course/file{i}.bin", callbacks=callbacks))
+        if not done.wait(60):
+            raise TimeoutError("Uploads did not finish within 60s")
+
+    def teardown(state):
+        state.service.stop()
+        shutil.rmtree(state.workdir, ignore_errors=True)
+
+    return BenchmarkScenario("upload_local", run, setup, teardown, ops_per_run=files,
+                             description=f"UploadService: {files} x {size // 1024}KB to local backend")
+
+
+def grading_scenario(scale: float = 1.0) -> BenchmarkScenario:
+    """Auto-grade a batch of mixed MCQ/text/code answers."""
+    from app.core.assessment.grading import GradingEngine
+
+    count = _scaled(500, scale)
+
+    def setup():
+        rng = random.Random(3)
+        items = []
+        for i in range(count):
+            kind = ("MULTIPLE_CHOICE", "TEXT", "CODE")[i % 3]
+            question = SimpleNamespace(type=kind, correct_option="B", correct_answer=None,
+                                       expected_keywords=rng.sample(_WORDS, 4) if kind == "TEXT" else [],
+                                       solution_code="print('ok')" if kind == "CODE" else None)
+            answer = SimpleNamespace(selected_option=rng.choice("ABCD"), text_response=_sentence(rng, 30),
+                                     code="print('ok')")
+            items.append((question, answer))
+        return SimpleNamespace(engine=GradingEngine(), items=items)
+
+    def run(state):
+        for question, answer in state.items:
+            state.engine.grade(question, answer)
+
+    return BenchmarkScenario("grading", run, setup, ops_per_run=count,
+                             description=f"GradingEngine.grade over {count} answers")
+
+
+def sync_scenario(scale: float = 1.0) -> BenchmarkScenario:
+    """LocalCache <-> remote SyncManager reconciliation."""
+    from app.core.db.local_cache import LocalCache
+    from app.core.db.sync_manager import SyncManager, RemoteSyncProvider
+
+    keys = _scaled(500, scale)
+
+    def setup():
+        workdir = tempfile.mkdtemp(prefix="aerolearn_bench_sync_")
+        db_path = os.path.join(workdir, "cache.db")
+        cache = LocalCache(db_path)
+        remote = RemoteSyncProvider()
+        for i in range(keys):
+            cache.set(f"local{i}", {"value": i})
+            remote.store[f"remote{i}"] = ({"value": i}, float(i))
+        return SimpleNamespace(workdir=workdir, db_path=db_path, cache=cache,
+                               manager=SyncManager(cache, remote))
+
+    def run(state):
+        state.manager.sync()
+
+    def teardown(state):
+        with LocalCache._lock:
+            LocalCache._instances.pop(state.db_path, None)
+        state.cache.conn.close()
+        shutil.rmtree(state.workdir, ignore_errors=True)
+
+    return BenchmarkScenario("sync", run, setup, teardown, ops_per_run=2 * keys,
+                             description=f"SyncManager.sync over {2 * keys} keys")
+
+
+BUILTIN_SCENARIOS = (
+    event_publish_scenario,
+    vector_search_scenario,
+    keyword_search_scenario,
+    upload_local_scenario,
+    grading_scenario,
+    sync_scenario,
+)
+
+def builtin_scenarios(scale: float = 1.0) -> List[BenchmarkScenario]:
+    return [factory(scale) for factory in BUILTIN_SCENARIOS]
+
+def default_runner(scale: float = 1.0, warmup: int = 3, repetitions: int = 20) -> BenchmarkRunner:
+    """Runner pre-loaded with every built-in scenario."""
+    runner = BenchmarkRunner(warmup=warmup, repetitions=repetitions)
+    for scenario in builtin_scenarios(scale):
+        runner.register(scenario)
+    return runner
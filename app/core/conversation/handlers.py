@@ -6,6 +6,8 @@ Handlers implement (user_input, user_id, ConversationState, extra) -> str (bot-r
 Register with ConversationManager from /app/core/ai/conversation.py
 """
 
+from itertools import islice
+
 from app.core.ai.conversation import ConversationState
 
 def professor_content_handler(user_input, user_id, state: ConversationState, extra):
@@ -20,8 +22,9 @@ def admin_handler(user_input, user_id, state: ConversationState, extra):
 
 def student_query_handler(user_input, user_id, state: ConversationState, extra):
     # Example: handles student queries about content
-    history = state.history.get_history(5)
-    return f"Student asked: {user_input}. Recent history: {history}"
+    summary, window = state.history.get_context()
+    recent = [f"{turn['role']}: {turn['text']}" for turn in islice(reversed(window), 5)][::-1]
+    return f"Student asked: {user_input}. Earlier: {summary or '-'}. Recent history: {recent}"
 
 # Can be expanded with real logic, knowledge, intent matching, etc.
 
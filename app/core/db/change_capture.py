@@ -0,0 +1,426 @@
+"""
+Change capture for ORM sessions: batched, post-commit change-set events.
+
+Location: /app/core/db/change_capture.py (used by /app/core/db/db_events.py)
+
+Per-row mapper events (after_insert/after_update/after_delete) fire inside the
+flush, once per row, before anyone knows whether the transaction will commit.
+ChangeCapture listens on the session instead:
+
+- after_flush: the flushed rows of monitored models are appended to the
+  session's pending change list (one pass over session.new/dirty/deleted).
+- before_commit (outermost transaction only): the pending rows are coalesced
+  per table and primary key (insert + update -> insert, insert + delete ->
+  nothing, ...) into one change set, which is optionally written to a bounded
+  outbox table in the same transaction.
+- after_commit: the change set is published as one ContentEvent, and its outbox
+  row is deleted once delivered. When a loop is already running the publish is
+  scheduled as a task, and the row is deleted from the task's done callback.
+  Rows whose delivery failed are kept (up to `outbox_limit`) for redeliver().
+- rollback: pending rows are dropped. A rolled-back savepoint only drops the
+  rows flushed inside it.
+
+Usage:
+    capture = ChangeCapture(models=[Lesson, Module], outbox=True)
+    capture.install(Session)            # Session class, sessionmaker or session
+    ...
+    capture.redeliver(engine)           # e.g. at startup
+"""
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from sqlalchemy import Column, Float, Integer, MetaData, Table, Text, delete, event, inspect, select
+from sqlalchemy.orm import Session
+
+from integrations.events.event_bus import EventBus
+from integrations.events.event_types import ContentEvent, ContentEventType, EventPriority
+
+logger = logging.getLogger(__name__)
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+
+# Undelivered change sets kept in the outbox before the oldest are dropped
+DEFAULT_OUTBOX_LIMIT = 10000
+
+# Publishes scheduled on a running loop; held here so they are not garbage-collected
+_publish_tasks: Set["asyncio.Task"] = set()
+
+outbox_metadata = MetaData()
+outbox_table = Table(
+    "db_change_outbox",
+    outbox_metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("created_at", Float, nullable=False),
+    Column("payload", Text, nullable=False),
+)
+
+
+@dataclass
+class RowChange:
+    table: str
+    model: str
+    operation: str
+    primary_key: Dict[str, Any]
+    values: Dict[str, Any]
+    old_values: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        row = {"model": self.model, "primary_key": self.primary_key, "values": self.values}
+        if self.old_values:
+            row["old_values"] = self.old_values
+        return row
+
+
+def coalesce_changes(changes: Iterable[RowChange], tables: Union[bool, Iterable[str]] = True) -> List[RowChange]:
+    """
+    Merge repeated changes to the same row (same table and primary key), keeping
+    first-seen order. `tables` is True (coalesce every table), False, or the
+    table names to coalesce.
+    """
+    selected = None if tables is True else set(tables or ())
+    merged: Dict[Tuple, Optional[RowChange]] = {}
+    order: List[Union[Tuple, RowChange]] = []
+    for change in changes:
+        if selected is not None and change.table not in selected:
+            order.append(change)
+            continue
+        key = (change.table, tuple(sorted(change.primary_key.items())))
+        previous = merged.get(key)
+        if key not in merged:
+            order.append(key)
+        merged[key] = change if previous is None else _merge(previous, change)
+    result = []
+    for item in order:
+        change = merged[item] if isinstance(item, tuple) else item
+        if change is not None:
+            result.append(change)
+    return result
+
+
+def _merge(first: RowChange, second: RowChange) -> Optional[RowChange]:
+    """Net effect of `first` followed by `second` on one row (None if it cancels out)."""
+    if first.operation == CREATED:
+        if second.operation == DELETED:
+            return None
+        return RowChange(first.table, first.model, CREATED, second.primary_key, second.values)
+    if second.operation == DELETED:
+        return RowChange(first.table, first.model, DELETED, second.primary_key, second.values)
+    if first.operation == DELETED:
+        # Deleted and re-inserted: net update from the deleted row's values
+        return RowChange(first.table, first.model, UPDATED, second.primary_key, second.values, dict(first.values))
+    old_values = dict(second.old_values)
+    old_values.update(first.old_values)
+    return RowChange(first.table, first.model, UPDATED, second.primary_key, second.values, old_values)
+
+
+def build_change_set(changes: Iterable[RowChange]) -> Dict[str, Any]:
+    """Group changes by table and operation: {"tables": {table: {op: [rows]}}, "count": n}."""
+    tables: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    count = 0
+    for change in changes:
+        tables.setdefault(change.table, {}).setdefault(change.operation, []).append(change.to_dict())
+        count += 1
+    return {"tables": tables, "count": count}
+
+
+def publish_to_event_bus(change_set: Dict[str, Any]) -> Union[bool, "asyncio.Task"]:
+    """
+    Publish a change set as one ContentEvent.
+
+    Returns False if the bus is not running, True once published, or, when called
+    from a running event loop, the task the publish was scheduled on.
+    """
+    bus = EventBus()
+    if not bus._started:
+        logger.warning("Event bus is not running; cannot publish DB change set.")
+        return False
+    event_obj = ContentEvent(
+        event_type=ContentEventType.CHANGE_SET,
+        source_component="db",
+        data=change_set,
+        priority=EventPriority.NORMAL,
+        is_persistent=False,
+    )
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(bus.publish(event_obj))
+    else:
+        task = loop.create_task(bus.publish(event_obj))
+        _publish_tasks.add(task)
+        task.add_done_callback(_publish_tasks.discard)
+        return task
+    return True
+
+
+def _task_succeeded(task: "asyncio.Future") -> bool:
+    if task.cancelled():
+        logger.error("DB change set publish was cancelled")
+        return False
+    if task.exception() is not None:
+        logger.error(f"Failed to publish DB change set: {task.exception()}")
+        return False
+    return task.result() is not False
+
+
+class _MapperSpec:
+    """Attribute keys of one mapper, resolved once."""
+
+    __slots__ = ("table", "model", "columns", "primary_key")
+
+    def __init__(self, mapper):
+        self.table = mapper.local_table.name
+        self.model = mapper.class_.__name__
+        self.columns = [prop.key for prop in mapper.column_attrs]
+        self.primary_key = [mapper.get_property_by_column(col).key for col in mapper.primary_key]
+
+
+class _Pending:
+    """Changes captured in one session's current transaction."""
+
+    __slots__ = ("changes", "savepoints", "outbox")
+
+    def __init__(self):
+        self.changes: List[RowChange] = []
+        self.savepoints: Dict[Any, int] = {}  # nested transaction -> len(changes) when it began
+        self.outbox: Optional[Tuple[Any, int, Dict[str, Any]]] = None  # (engine, row id, change set)
+
+
+class ChangeCapture:
+    """
+    Collects ORM row changes per flush and publishes one change set per commit.
+
+    Args:
+        models: Mapped classes to capture (None captures every mapped class)
+        coalesce: True, False, or the table names whose repeated row changes are merged
+        publisher: Called with each change set; returns True once delivered, or an
+            asyncio future that completes when it is
+        outbox: Write each change set to the db_change_outbox table before commit
+        outbox_limit: Undelivered change sets kept before the oldest are dropped
+    """
+
+    def __init__(
+        self,
+        models: Optional[Iterable[type]] = None,
+        coalesce: Union[bool, Iterable[str]] = True,
+        publisher: Optional[Callable[[Dict[str, Any]], Union[bool, "asyncio.Future"]]] = None,
+        outbox: bool = False,
+        outbox_limit: int = DEFAULT_OUTBOX_LIMIT,
+    ):
+        self.models = None if models is None else frozenset(models)
+        self.coalesce = coalesce if isinstance(coalesce, bool) else frozenset(coalesce)
+        self.publisher = publisher or publish_to_event_bus
+        self.outbox = outbox
+        self.outbox_limit = outbox_limit
+        self._specs: Dict[Any, _MapperSpec] = {}
+        self._outbox_engines = set()
+        self._targets = []
+        self._listeners = (
+            ("after_flush", self._after_flush),
+            ("after_transaction_create", self._after_transaction_create),
+            ("before_commit", self._before_commit),
+            ("after_commit", self._after_commit),
+            ("after_soft_rollback", self._after_soft_rollback),
+        )
+
+    # --- Installation ---
+
+    def install(self, target=Session) -> "ChangeCapture":
+        """Listen on a Session class, sessionmaker or session instance."""
+        for name, fn in self._listeners:
+            event.listen(target, name, fn)
+        self._targets.append(target)
+        return self
+
+    def uninstall(self) -> None:
+        for target in self._targets:
+            for name, fn in self._listeners:
+                if event.contains(target, name, fn):
+                    event.remove(target, name, fn)
+        self._targets = []
+
+    # --- Session hooks ---
+
+    def _pending(self, session, create: bool = True) -> Optional[_Pending]:
+        pending = session.info.get(self)
+        if pending is None and create:
+            pending = session.info[self] = _Pending()
+        return pending
+
+    def _spec(self, mapper) -> Optional[_MapperSpec]:
+        spec = self._specs.get(mapper)
+        if spec is None:
+            if self.models is not None and mapper.class_ not in self.models:
+                self._specs[mapper] = False
+                return None
+            spec = self._specs[mapper] = _MapperSpec(mapper)
+        return spec or None
+
+    def _after_flush(self, session, flush_context) -> None:
+        # session.new/dirty/deleted and attribute history still show the pre-flush state here
+        if self.models is not None and not self.models:
+            return
+        changes = []
+        for obj in session.new:
+            change = self._row(obj, CREATED)
+            if change is not None:
+                changes.append(change)
+        for obj in session.dirty:
+            change = self._row(obj, UPDATED)
+            if change is not None:
+                changes.append(change)
+        for obj in session.deleted:
+            change = self._row(obj, DELETED)
+            if change is not None:
+                changes.append(change)
+        if changes:
+            self._pending(session).changes.extend(changes)
+
+    def _row(self, obj, operation: str) -> Optional[RowChange]:
+        state = inspect(obj)
+        spec = self._spec(state.mapper)
+        if spec is None:
+            return None
+        loaded = state.dict
+        old_values = {}
+        if operation == UPDATED:
+            modified = False
+            for key in spec.columns:
+                history = state.attrs[key].history
+                if history.added:
+                    modified = True
+                    if history.deleted:
+                        old_values[key] = history.deleted[0]
+            if not modified:
+                return None
+        return RowChange(
+            spec.table,
+            spec.model,
+            operation,
+            {key: loaded.get(key) for key in spec.primary_key},
+            {key: loaded[key] for key in spec.columns if key in loaded},
+            old_values,
+        )
+
+    def _after_transaction_create(self, session, transaction) -> None:
+        if transaction.nested:
+            pending = self._pending(session, create=False)
+            if pending is not None:
+                pending.savepoints[transaction] = len(pending.changes)
+
+    def _after_soft_rollback(self, session, previous_transaction) -> None:
+        pending = self._pending(session, create=False)
+        if pending is None:
+            return
+        if previous_transaction.nested:
+            mark = pending.savepoints.pop(previous_transaction, None)
+            # Savepoints opened before anything was captured start from zero
+            del pending.changes[mark or 0:]
+        elif previous_transaction.parent is None:
+            session.info.pop(self, None)
+
+    def _before_commit(self, session) -> None:
+        if session.in_nested_transaction() or not self.outbox:
+            return
+        # The final flush of a commit runs after before_commit; run it now so it is captured
+        session.flush()
+        pending = self._pending(session, create=False)
+        if pending is None or not pending.changes:
+            return
+        change_set = self._change_set(pending)
+        connection = session.connection()
+        self._ensure_outbox(connection)
+        result = connection.execute(
+            outbox_table.insert().values(created_at=time.time(), payload=json.dumps(change_set, default=str))
+        )
+        pending.outbox = (connection.engine, result.inserted_primary_key[0], change_set)
+
+    def _after_commit(self, session) -> None:
+        if session.in_nested_transaction():
+            return
+        pending = session.info.pop(self, None)
+        if pending is None:
+            return
+        if pending.outbox is not None:
+            engine, row_id, change_set = pending.outbox
+            self._deliver(engine, row_id, change_set)
+        elif pending.changes:
+            change_set = self._change_set(pending)
+            if change_set["count"]:
+                self._publish(change_set)
+
+    # --- Delivery ---
+
+    def _change_set(self, pending: _Pending) -> Dict[str, Any]:
+        changes = pending.changes
+        if self.coalesce:
+            changes = coalesce_changes(changes, self.coalesce)
+        return build_change_set(changes)
+
+    def _publish(self, change_set: Dict[str, Any]) -> Union[bool, "asyncio.Future"]:
+        try:
+            result = self.publisher(change_set)
+        except Exception as e:
+            logger.error(f"Failed to publish DB change set: {e}")
+            return False
+        return result if isinstance(result, asyncio.Future) else bool(result)
+
+    @staticmethod
+    def _when_published(result: Union[bool, "asyncio.Future"], callback: Callable[[bool], None]) -> None:
+        """Call `callback(delivered)` now, or once a scheduled publish has finished."""
+        if isinstance(result, asyncio.Future):
+            result.add_done_callback(lambda task: callback(_task_succeeded(task)))
+        else:
+            callback(result)
+
+    def _ensure_outbox(self, connection) -> None:
+        if connection.engine not in self._outbox_engines:
+            outbox_table.create(connection, checkfirst=True)
+            self._outbox_engines.add(connection.engine)
+
+    def _deliver(self, engine, row_id: int, change_set: Dict[str, Any]) -> None:
+        result = True if change_set["count"] == 0 else self._publish(change_set)
+        self._when_published(result, lambda delivered: self._settle(engine, row_id, delivered))
+
+    def _settle(self, engine, row_id: int, delivered: bool) -> None:
+        """Delete a delivered outbox row, or trim the outbox down to `outbox_limit`."""
+        with engine.begin() as connection:
+            if delivered:
+                connection.execute(delete(outbox_table).where(outbox_table.c.id == row_id))
+            else:
+                connection.execute(delete(outbox_table).where(outbox_table.c.id <= row_id - self.outbox_limit))
+
+    def pending_outbox(self, bind) -> List[Tuple[int, Dict[str, Any]]]:
+        """Undelivered (row id, change set) pairs, oldest first."""
+        with bind.connect() as connection:
+            self._ensure_outbox(connection)
+            connection.commit()
+            rows = connection.execute(select(outbox_table.c.id, outbox_table.c.payload).order_by(outbox_table.c.id))
+            return [(row_id, json.loads(payload)) for row_id, payload in rows]
+
+    def redeliver(self, bind) -> int:
+        """
+        Publish undelivered change sets in order, stopping at the first failure;
+        returns how many were sent. Publishes scheduled on a running loop delete
+        their row once they succeed.
+        """
+        sent = 0
+        for row_id, change_set in self.pending_outbox(bind):
+            result = self._publish(change_set)
+            if result is False:
+                break
+            self._when_published(result, lambda delivered, row_id=row_id: delivered and self._remove(bind, row_id))
+            sent += 1
+        return sent
+
+    @staticmethod
+    def _remove(bind, row_id: int) -> None:
+        with bind.begin() as connection:
+            connection.execute(delete(outbox_table).where(outbox_table.c.id == row_id))
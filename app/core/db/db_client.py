@@ -2,9 +2,10 @@
 Database Client for AeroLearn AI
 Handles SQLAlchemy engine and session management.
 Edit DB_URL in schema.py as required for different environments.
+The engine (and its connection pool) is shared per URL through engine_registry.py.
 """
 
-from sqlalchemy import create_engine
+from app.core.db.engine_registry import engine_registry
 from sqlalchemy.orm import sessionmaker, scoped_session, joinedload
 import threading
 from contextlib import contextmanager
@@ -23,7 +24,7 @@ class DBClient:
 
     def _initialize(self, db_url):
         # Set expire_on_commit=False to prevent DetachedInstanceError
-        self.engine = create_engine(db_url, echo=False, future=True)
+        self.engine = engine_registry.get_engine(db_url)
         self.SessionLocal = scoped_session(
             sessionmaker(
                 bind=self.engine,
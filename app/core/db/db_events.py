@@ -6,8 +6,12 @@ This module connects SQLAlchemy ORM events (insert/update/delete) for tracked mo
 to the AeroLearn AI event system. 
 
 - Hooks are registered for all mapped models in app.core.db.schema.
-- On DB entity changes, a content.event (CREATED, UPDATED, DELETED) is published to the EventBus.
-- Each event includes model, PK, and change data in the payload.
+- Row changes are collected per session flush (see app/core/db/change_capture.py) and,
+  once the transaction commits, published as ONE content.change_set event per commit.
+  Nothing is published for a rolled-back transaction.
+- The payload groups rows by table and operation (created, updated, deleted); each row
+  carries model, PK and values (plus old_values for updates). Repeated changes to the
+  same row within a transaction are coalesced.
 
 Place this file at: `app/core/db/db_events.py`
 
@@ -20,16 +24,14 @@ Requires: event bus to be started (`await EventBus().start()`).
 """
 
 import logging
-from sqlalchemy import event
-from sqlalchemy.orm import Mapper
 from app.core.db import schema
-from integrations.events.event_bus import EventBus
-from integrations.events.event_types import (
-    ContentEvent, ContentEventType, EventPriority
-)
+from app.core.db.change_capture import ChangeCapture
 
 logger = logging.getLogger(__name__)
 
+# Installed on the Session class by register_db_event_hooks()
+change_capture: ChangeCapture = None
+
 
 def _get_primary_key(obj):
     """Helper to retrieve primary key(s) as a dict."""
@@ -38,62 +40,29 @@ def _get_primary_key(obj):
         pk_dict[pk_column.name] = getattr(obj, pk_column.name)
     return pk_dict
 
-async def _publish_db_event(event_type: str, instance, old_data=None):
-    bus = EventBus()
-    if not bus._is_running:
-        logger.warning("Event bus is not running; cannot publish DB events.")
-        return
-
-    data = {
-        "model": instance.__class__.__name__,
-        "primary_key": _get_primary_key(instance),
-        "values": {c.name: getattr(instance, c.name) for c in instance.__table__.columns},
-    }
-    if old_data:
-        data["old_values"] = old_data
-
-    event_obj = ContentEvent(
-        event_type=event_type,
-        source_component="db",
-        data=data,
-        priority=EventPriority.NORMAL,
-        is_persistent=False  # Set to True if you'd like all mutations to persist in event history
-    )
-    await bus.publish(event_obj)
-
-
-def register_db_event_hooks():
+
+def register_db_event_hooks(outbox=False, coalesce=True):
     """
-    Register all hooks for after_insert, after_update, after_delete
-    on all ORM models found in schema.Base registry.
+    Capture changes to all ORM models found in schema.Base registry and publish
+    them as batched change sets after each commit.
+
+    Args:
+        outbox: Also write each change set to the db_change_outbox table in the
+                committing transaction, for redelivery if publishing fails
+        coalesce: True, False, or the table names whose repeated row changes are merged
+
+    Returns:
+        The installed ChangeCapture
     """
+    global change_capture
     # List of models to monitor. (You can customize/whitelist as needed)
     monitored_models = [
         m.class_ for m in schema.Base.registry.mappers
     ]
-
-    for model in monitored_models:
-        # Insert (CREATE)
-        @event.listens_for(model, "after_insert")
-        def after_insert(mapper, connection, target):
-            import asyncio
-            loop = asyncio.get_event_loop()
-            loop.create_task(_publish_db_event(ContentEventType.CREATED, target))
-
-        # Update
-        @event.listens_for(model, "after_update")
-        def after_update(mapper, connection, target):
-            # Optionally, you may want to include before/after values
-            import asyncio
-            loop = asyncio.get_event_loop()
-            loop.create_task(_publish_db_event(ContentEventType.UPDATED, target))
-
-        # Delete
-        @event.listens_for(model, "after_delete")
-        def after_delete(mapper, connection, target):
-            import asyncio
-            loop = asyncio.get_event_loop()
-            loop.create_task(_publish_db_event(ContentEventType.DELETED, target))
+    if change_capture is not None:
+        change_capture.uninstall()
+    change_capture = ChangeCapture(models=monitored_models, coalesce=coalesce, outbox=outbox).install()
+    return change_capture
 
 
 # Register hooks immediately on import (you can also call register_db_event_hooks() manually)
@@ -101,5 +70,5 @@ register_db_event_hooks()
 
 # Usage / Integration Note:
 # Simply ensure this file is imported during your application startup (after models are loaded),
-# and your event bus is running. Every insert, update, and delete on your database will now auto-publish
-# to the event bus for content-related events.
\ No newline at end of file
+# and your event bus is running. Every committed transaction that inserts, updates or deletes rows
+# will now publish one content.change_set event to the event bus.
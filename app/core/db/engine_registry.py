@@ -0,0 +1,225 @@
+"""
+Shared SQLAlchemy engines for AeroLearn AI.
+
+Location: /app/core/db/engine_registry.py (used by db_client.py and migrations.py)
+
+Every engine owns a connection pool, so creating one per call or per client
+leaves a process holding several pools for the same database. EngineRegistry
+keeps one pooled engine per database URL:
+
+- Pool sizing comes from PoolSettings. The defaults are read from the DB_POOL_SIZE,
+  DB_MAX_OVERFLOW, DB_POOL_TIMEOUT and DB_POOL_RECYCLE environment variables when
+  the settings are created, and configure() can override them for one URL before
+  its engine is first used.
+- SQLite file databases get their pragmas applied on every new DB-API connection:
+  WAL journaling, synchronous=NORMAL, a larger page cache and a busy timeout.
+  WAL lets readers proceed while one worker writes, and the busy timeout makes
+  writers wait for the lock instead of failing at once. Foreign key enforcement
+  stays SQLite's default (off); opt in per URL with
+  configure(url, sqlite_pragmas={**DEFAULT_SQLITE_PRAGMAS, "foreign_keys": "ON"}).
+- Pool events feed per-engine counters. metrics() reports them together with
+  the pool's own checked-in, checked-out and overflow numbers.
+
+Usage:
+    from app.core.db.engine_registry import get_engine, engine_registry
+    engine = get_engine()                       # schema.DB_URL
+    engine_registry.configure("postgresql://...", pool_size=20)
+    engine_registry.metrics()
+"""
+
+import os
+import threading
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, Optional
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool
+
+DEFAULT_SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -20000,  # negative: KiB, i.e. ~20 MB of page cache per connection
+    "busy_timeout": 5000,  # ms
+}
+
+
+def _env_number(name: str, default: str, kind=int):
+    return field(default_factory=lambda: kind(os.getenv(name, default)))
+
+
+@dataclass
+class PoolSettings:
+    # Environment defaults are read per instance, not once at import
+    pool_size: int = _env_number("DB_POOL_SIZE", "5")
+    max_overflow: int = _env_number("DB_MAX_OVERFLOW", "10")
+    pool_timeout: float = _env_number("DB_POOL_TIMEOUT", "30", float)
+    pool_recycle: int = _env_number("DB_POOL_RECYCLE", "-1")
+    pool_pre_ping: bool = False
+    sqlite_pragmas: Dict[str, Any] = field(default_factory=lambda: dict(DEFAULT_SQLITE_PRAGMAS))
+
+
+class PoolMetrics:
+    """Counters updated from pool events of one engine."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checkins += 1
+            self.checked_out = max(0, self.checked_out - 1)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+            }
+
+
+def _is_sqlite_file(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:") \
+        and not url.database.startswith("file::memory:")
+
+
+def normalize_url(db_url) -> str:
+    """Registry key for a URL; relative SQLite paths are made absolute so aliases share an engine."""
+    url = make_url(db_url)
+    if _is_sqlite_file(url) and not url.query.get("uri"):
+        url = url.set(database=os.path.abspath(url.database))
+    return url.render_as_string(hide_password=False)
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas: Dict[str, Any]) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+class EngineRegistry:
+    """One pooled engine per database URL, created on first use."""
+
+    def __init__(self, defaults: Optional[PoolSettings] = None):
+        self.defaults = defaults or PoolSettings()
+        self._engines: Dict[str, Engine] = {}
+        self._settings: Dict[str, PoolSettings] = {}
+        self._metrics: Dict[str, PoolMetrics] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, db_url, **settings) -> PoolSettings:
+        """
+        Override pool settings (PoolSettings fields) for one URL. Takes effect
+        when its engine is next created, i.e. immediately unless one exists.
+        """
+        key = normalize_url(db_url)
+        with self._lock:
+            current = self._settings.get(key, self.defaults)
+            self._settings[key] = replace(current, **settings)
+            return self._settings[key]
+
+    def get_engine(self, db_url, echo: bool = False) -> Engine:
+        key = normalize_url(db_url)
+        engine = self._engines.get(key)
+        if engine is not None:
+            return engine
+        with self._lock:
+            engine = self._engines.get(key)
+            if engine is None:
+                engine = self._engines[key] = self._create(key, self._settings.get(key, self.defaults), echo)
+            return engine
+
+    def _create(self, key: str, settings: PoolSettings, echo: bool) -> Engine:
+        url = make_url(key)
+        kwargs: Dict[str, Any] = {"echo": echo, "future": True, "pool_pre_ping": settings.pool_pre_ping}
+        sqlite_file = _is_sqlite_file(url)
+        if url.get_backend_name() != "sqlite" or sqlite_file:
+            kwargs.update(
+                pool_size=settings.pool_size,
+                max_overflow=settings.max_overflow,
+                pool_timeout=settings.pool_timeout,
+                pool_recycle=settings.pool_recycle,
+            )
+        if sqlite_file:
+            # Pooled connections are handed between threads; each is used by one at a time
+            kwargs.update(poolclass=QueuePool, connect_args={"check_same_thread": False})
+        # In-memory SQLite keeps SQLAlchemy's default pool: the database lives and dies with its connection
+        engine = create_engine(url, **kwargs)
+        if sqlite_file and settings.sqlite_pragmas:
+            pragmas = dict(settings.sqlite_pragmas)
+            event.listen(engine, "connect", lambda dbapi_connection, record: apply_sqlite_pragmas(dbapi_connection, pragmas))
+        metrics = self._metrics[key] = PoolMetrics()
+        metrics.attach(engine)
+        return engine
+
+    def metrics(self, db_url=None) -> Dict[str, Dict[str, Any]]:
+        """Pool usage per URL (password hidden), or for one URL."""
+        with self._lock:
+            keys = list(self._engines) if db_url is None else [normalize_url(db_url)]
+            result = {}
+            for key in keys:
+                engine = self._engines.get(key)
+                if engine is None:
+                    continue
+                stats = self._metrics[key].snapshot()
+                pool = engine.pool
+                for name in ("size", "checkedin", "checkedout", "overflow"):
+                    if hasattr(pool, name):
+                        stats[f"pool_{name}"] = getattr(pool, name)()
+                stats["pool_class"] = type(pool).__name__
+                result[make_url(key).render_as_string(hide_password=True)] = stats
+            return result
+
+    def dispose(self, db_url=None) -> None:
+        """Close pooled connections and forget the engine(s); they are recreated on next use."""
+        with self._lock:
+            keys = list(self._engines) if db_url is None else [normalize_url(db_url)]
+            for key in keys:
+                engine = self._engines.pop(key, None)
+                self._metrics.pop(key, None)
+                if engine is not None:
+                    engine.dispose()
+
+
+engine_registry = EngineRegistry()
+
+
+def get_engine(db_url=None) -> Engine:
+    """Shared engine for `db_url` (schema.DB_URL by default)."""
+    if db_url is None:
+        from .schema import DB_URL
+        db_url = DB_URL
+    return engine_registry.get_engine(db_url)
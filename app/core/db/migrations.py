@@ -1,37 +1,42 @@
 """
 Database migration and verification tools for AeroLearn AI.
 Provides utilities for creating, dropping, and inspecting database tables.
+
+All tools use the shared engine for DB_URL (see engine_registry.py) instead of
+building a new engine and pool per call. DDL runs in a single transaction, and
+migration steps are applied in batched transactions.
 """
 
 from .schema import Base, DB_URL
-from sqlalchemy import create_engine, inspect, MetaData, Table
-from sqlalchemy.exc import SQLAlchemyError
+from .engine_registry import get_engine
+from sqlalchemy import inspect, text
+
+# Migration steps committed per transaction
+DEFAULT_MIGRATION_BATCH_SIZE = 50
 
 def create_all_tables():
     """Create all tables defined in the Base metadata."""
-    engine = create_engine(DB_URL)
-    Base.metadata.create_all(engine)
+    with get_engine(DB_URL).begin() as connection:
+        Base.metadata.create_all(connection)
     print("All tables created.")
     return list_tables()
 
 def drop_all_tables():
     """Drop all tables defined in the Base metadata."""
-    engine = create_engine(DB_URL)
-    Base.metadata.drop_all(engine)
+    with get_engine(DB_URL).begin() as connection:
+        Base.metadata.drop_all(connection)
     print("All tables dropped.")
 
 def list_tables():
     """List all tables in the database."""
-    engine = create_engine(DB_URL)
-    inspector = inspect(engine)
+    inspector = inspect(get_engine(DB_URL))
     tables = inspector.get_table_names()
     print("Tables in database:", tables)
     return tables
 
 def verify_schema():
     """Verify that the database schema matches the expected schema."""
-    engine = create_engine(DB_URL)
-    inspector = inspect(engine)
+    inspector = inspect(get_engine(DB_URL))
     tables = inspector.get_table_names()
     
     # Get expected tables from metadata
@@ -58,8 +63,7 @@ def verify_schema():
 
 def get_table_details(table_name):
     """Get detailed information about a specific table."""
-    engine = create_engine(DB_URL)
-    inspector = inspect(engine)
+    inspector = inspect(get_engine(DB_URL))
     
     if table_name not in inspector.get_table_names():
         print(f"Table '{table_name}' does not exist.")
@@ -75,14 +79,40 @@ def get_table_details(table_name):
         "foreign_keys": foreign_keys
     }
 
-def run_migration(version=None):
+def apply_migration_steps(steps, batch_size=DEFAULT_MIGRATION_BATCH_SIZE):
+    """
+    Apply migration steps (SQL strings or callables taking a connection) in order,
+    committing every `batch_size` steps in one transaction. A failing step rolls
+    back only its own batch; earlier batches stay committed.
+
+    Returns:
+        Number of steps applied
+    """
+    engine = get_engine(DB_URL)
+    steps = list(steps)
+    applied = 0
+    for start in range(0, len(steps), batch_size):
+        with engine.begin() as connection:
+            for step in steps[start:start + batch_size]:
+                if callable(step):
+                    step(connection)
+                else:
+                    connection.execute(text(step))
+        applied = min(start + batch_size, len(steps))
+    return applied
+
+def run_migration(version=None, steps=(), batch_size=DEFAULT_MIGRATION_BATCH_SIZE):
     """
-    Run migration to specified version or latest.
+    Run migration to specified version or latest: create missing tables, apply
+    `steps` in batched transactions, then verify the schema.
     This is a placeholder for future implementation with a proper migration tool.
     """
     print(f"Running migration to version: {version or 'latest'}")
     create_all_tables()
-    verify_schema()
+    if steps:
+        applied = apply_migration_steps(steps, batch_size)
+        print(f"Applied {applied} migration steps.")
+    return verify_schema()
 
 # Usage for manual dev setup:
 # from app.core.db.migrations import create_all_tables, verify_schema
@@ -52,6 +52,24 @@ class FileOperations:
                 self.event_callback("file_download_failed", {"src": file_path, "dest": dest_path, "error": str(e)})
             raise FileOperationError(str(e)) from e
 
+    def open_stream(self, file_path: str) -> BinaryIO:
+        """
+        Open a backend file for reading without downloading it first.
+        Requires a backend with open_stream (e.g. LocalStreamingProvider); reads
+        fetch only the blocks they touch.
+        """
+        if not hasattr(self.backend, "open_stream"):
+            raise FileOperationError("Storage backend does not support streaming reads")
+        try:
+            stream = self.backend.open_stream(file_path)
+            if self.event_callback:
+                self.event_callback("file_stream_opened", {"src": file_path})
+            return stream
+        except Exception as e:
+            if self.event_callback:
+                self.event_callback("file_stream_failed", {"src": file_path, "error": str(e)})
+            raise FileOperationError(str(e)) from e
+
     def delete(self, file_path: str) -> None:
         """
         Delete file from backend.
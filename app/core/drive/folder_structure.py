@@ -3,44 +3,154 @@ File: folder_structure.py
 
 Defines folder structure management utilities for file storage system.
 Able to create, verify, list, and traverse folders both locally and in external backends.
+
+Trees are enumerated breadth-first: every folder of one level is listed in a single
+batch (backend.list_folders_batch) or, failing that, with concurrent list calls, so
+mapping a share costs one round trip per level rather than one per folder.
+Listings are cached with the backend's change tokens, and an existing FolderTree
+can be refreshed or patched for a few changed folders instead of re-walked.
 """
 
 import os
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from .folder_tree import FolderListing, FolderTree
 
 class FolderStructure:
-    def __init__(self, backend):
+    def __init__(self, backend, max_workers: int = 8):
         """
         backend: Must implement create_folder, list_folders, folder_exists.
+            Optional, used when present:
+            - list_folders_batch({path: token}) -> {path: FolderListing}; one call per level
+            - list_folders_since(path, token) -> FolderListing
+            A FolderListing with children=None means unchanged since `token`; a path
+            missing from a batch result no longer exists.
+        max_workers: concurrent list calls per level when the backend has no batch call
         """
         self.backend = backend
-    
+        self.max_workers = max_workers
+        self._listings: Dict[str, FolderListing] = {}  # path -> last listing (names, token)
+        self.round_trips = 0  # listing rounds (batches or concurrent waves) issued so far
+
     def create_folder(self, path: str) -> bool:
         """
         Creates a folder at the given path.
         Returns True on success.
         """
-        return self.backend.create_folder(path)
-    
+        created = self.backend.create_folder(path)
+        self._listings.pop(os.path.dirname(path), None)
+        return created
+
     def folder_exists(self, path: str) -> bool:
         """
         Checks if folder exists.
         """
         return self.backend.folder_exists(path)
-    
+
     def list_folders(self, parent_path: str) -> List[str]:
         """
         List all folders under parent_path.
         """
         return self.backend.list_folders(parent_path)
-    
+
     def get_folder_tree(self, root_path: str) -> dict:
         """
-        Recursively build folder tree for root_path.
+        Build the nested folder tree ``{root_path: [subtree, ...]}`` for root_path.
+        """
+        tree = self.walk(root_path)
+        return tree.to_nested() if tree is not None else {}
+
+    def walk(self, root_path: str) -> Optional[FolderTree]:
+        """
+        Enumerate the folders under root_path level by level.
+        Returns a flat FolderTree, or None if root_path does not exist.
         """
-        tree = {}
         if not self.folder_exists(root_path):
-            return tree
-        children = self.list_folders(root_path)
-        tree[root_path] = [self.get_folder_tree(os.path.join(root_path, child)) for child in children]
-        return tree
\ No newline at end of file
+            return None
+        tree = FolderTree(root_path)
+        self._walk_levels(tree, [root_path], descend_all=True)
+        return tree
+
+    def refresh(self, tree: FolderTree) -> FolderTree:
+        """
+        Revalidate a whole tree. Cached change tokens are sent with each listing, so
+        unchanged folders cost no listing payload; still one round trip per level.
+        """
+        self._walk_levels(tree, [tree.root], descend_all=True)
+        return tree
+
+    def update(self, tree: FolderTree, changed_paths: Iterable[str]) -> FolderTree:
+        """
+        Re-list only `changed_paths` (e.g. from a backend change feed) and enumerate
+        any folders that appeared under them; the rest of the tree is kept as is.
+        """
+        level = [path for path in dict.fromkeys(changed_paths) if path in tree]
+        for path in level:
+            self._listings.pop(path, None)
+        self._walk_levels(tree, level, descend_all=False)
+        return tree
+
+    def _walk_levels(self, tree: FolderTree, level: List[str], descend_all: bool) -> None:
+        while level:
+            listings = self._list_level(level)
+            next_level = []
+            for path in level:
+                if path not in tree:
+                    continue
+                listing = listings.get(path)
+                if listing is None:
+                    # Gone since its parent was listed
+                    if path != tree.root:
+                        tree.remove(path)
+                    continue
+                added, _ = tree.set_children(path, listing.children, listing.token)
+                next_level.extend(tree.children(path) if descend_all else added)
+            level = next_level
+
+    def _list_level(self, paths: List[str]) -> Dict[str, FolderListing]:
+        """List one level of folders in a single round trip, reusing cached listings that have not changed."""
+        requests = {path: self._cached_token(path) for path in paths}
+        batch = getattr(self.backend, "list_folders_batch", None)
+        if batch is not None:
+            results = batch(requests)
+        elif len(paths) == 1:
+            results = {paths[0]: self._list_one(paths[0], requests[paths[0]])}
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(paths)),
+                                    thread_name_prefix="folder-listing") as pool:
+                futures = {path: pool.submit(self._list_one, path, token) for path, token in requests.items()}
+                results = {path: future.result() for path, future in futures.items()}
+        self.round_trips += 1
+
+        listings = {}
+        for path in paths:
+            listing = results.get(path)
+            if listing is None:
+                self._listings.pop(path, None)
+                continue
+            if listing.children is None:
+                cached = self._listings.get(path)
+                if cached is None:
+                    listing = self._list_one(path, None)
+                    if listing is None or listing.children is None:
+                        continue
+                else:
+                    listing = FolderListing(cached.children, listing.token or cached.token)
+            listing = FolderListing(list(listing.children), listing.token)
+            self._listings[path] = listing
+            listings[path] = listing
+        return listings
+
+    def _cached_token(self, path: str):
+        cached = self._listings.get(path)
+        return cached.token if cached is not None else None
+
+    def _list_one(self, path: str, token) -> Optional[FolderListing]:
+        since = getattr(self.backend, "list_folders_since", None)
+        try:
+            if since is not None:
+                return since(path, token)
+            return FolderListing(self.backend.list_folders(path), None)
+        except FileNotFoundError:
+            return None
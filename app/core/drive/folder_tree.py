@@ -0,0 +1,112 @@
+"""
+File: folder_tree.py
+
+Flat, incrementally updatable folder tree used by FolderStructure.
+
+A FolderTree maps every folder path to a FolderNode (parent, depth, child paths,
+change token) instead of nesting dicts, so lookups, subtree queries and partial
+updates do not rebuild the tree. Listings come from the backend as FolderListing
+tuples; a listing whose children are None means "unchanged since the token sent".
+"""
+
+import os
+from collections import deque, namedtuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# children: folder names under the path (None = unchanged since the token sent)
+# token: backend change token (etag, modifiedTime, ...) for the listing, or None
+FolderListing = namedtuple("FolderListing", ["children", "token"])
+
+
+class FolderNode:
+    __slots__ = ("path", "parent", "depth", "children", "token")
+
+    def __init__(self, path: str, parent: Optional[str], depth: int):
+        self.path = path
+        self.parent = parent
+        self.depth = depth
+        self.children: List[str] = []
+        self.token = None
+
+    def __repr__(self):
+        return f"FolderNode({self.path!r}, children={len(self.children)})"
+
+
+class FolderTree:
+    """
+    Folder tree for one root, stored as path -> FolderNode.
+    """
+    def __init__(self, root_path: str):
+        self.root = root_path
+        self.nodes: Dict[str, FolderNode] = {root_path: FolderNode(root_path, None, 0)}
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.nodes
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __iter__(self) -> Iterator[str]:
+        """Folder paths, breadth-first from the root."""
+        queue = deque([self.root])
+        while queue:
+            path = queue.popleft()
+            yield path
+            queue.extend(self.nodes[path].children)
+
+    def children(self, path: str) -> List[str]:
+        node = self.nodes.get(path)
+        return list(node.children) if node else []
+
+    def descendants(self, path: str) -> List[str]:
+        """All folders below `path`, breadth-first."""
+        result = []
+        queue = deque(self.children(path))
+        while queue:
+            child = queue.popleft()
+            result.append(child)
+            queue.extend(self.nodes[child].children)
+        return result
+
+    def depth(self) -> int:
+        return max(node.depth for node in self.nodes.values())
+
+    def set_children(self, path: str, names: List[str], token=None) -> Tuple[List[str], List[str]]:
+        """
+        Replace the children of `path` with the listed folder names.
+
+        Returns:
+            (added child paths, removed child paths); removed subtrees are dropped
+        """
+        node = self.nodes[path]
+        new_children = [os.path.join(path, name) for name in names]
+        keep = set(new_children)
+        removed = [child for child in node.children if child not in keep]
+        for child in removed:
+            self.remove(child)
+        existing = set(node.children)
+        added = [child for child in new_children if child not in existing]
+        for child in added:
+            self.nodes[child] = FolderNode(child, path, node.depth + 1)
+        node.children = new_children
+        node.token = token
+        return added, removed
+
+    def remove(self, path: str) -> None:
+        """Drop a folder and everything below it."""
+        node = self.nodes.get(path)
+        if node is None:
+            return
+        for descendant in self.descendants(path):
+            del self.nodes[descendant]
+        del self.nodes[path]
+        parent = self.nodes.get(node.parent)
+        if parent is not None and path in parent.children:
+            parent.children.remove(path)
+
+    def to_nested(self, path: Optional[str] = None) -> dict:
+        """The nested ``{path: [subtree, ...]}`` form returned by FolderStructure.get_folder_tree."""
+        path = self.root if path is None else path
+        if path not in self.nodes:
+            return {}
+        return {path: [self.to_nested(child) for child in self.nodes[path].children]}
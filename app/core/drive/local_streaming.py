@@ -0,0 +1,151 @@
+"""
+LocalStreamingProvider: reference FileStreamingInterface provider over a local directory.
+
+Range reads go through BlockReader (/app/core/drive/streaming.py): fixed-size
+blocks, read-ahead on a small thread pool, and an optional on-disk BlockCache.
+Cache keys include the file's size and mtime, so an edited file is never served
+from stale blocks. Remote providers can reuse the same machinery by supplying
+their own `fetch(offset, length)` to BlockReader.
+
+Usage:
+    provider = LocalStreamingProvider("/srv/lectures", cache=BlockCache(max_bytes=2 * 1024**3))
+    async for chunk in provider.stream_file("week1/recording.mp4"):
+        ...
+    data, item = await provider.get_content_range("week1/recording.mp4", 0, 65535)
+    with provider.open_stream("week1/recording.mp4") as f:   # seekable file object
+        header = f.read(12)
+"""
+
+import asyncio
+import io
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import AsyncIterator, Optional, Tuple
+
+from integrations.interfaces.base_interface import InterfaceImplementation
+from integrations.interfaces.storage_interface import FileStreamingInterface, StorageItem
+
+from .streaming import (
+    DEFAULT_BLOCK_SIZE, DEFAULT_READ_AHEAD, BlockCache, BlockReader, RangeStream, SourceChangedError
+)
+
+# Open readers kept per provider (one per file version)
+_MAX_OPEN_READERS = 64
+
+
+@InterfaceImplementation(FileStreamingInterface)
+class LocalStreamingProvider(FileStreamingInterface):
+    """Streams files under `root` block by block; paths are relative to `root`."""
+
+    provider_id = "local"
+
+    def __init__(
+        self,
+        root: str,
+        cache: Optional[BlockCache] = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        read_ahead: int = DEFAULT_READ_AHEAD,
+        max_workers: int = 4,
+    ):
+        self.root = os.path.abspath(root)
+        self.cache = cache
+        self.block_size = block_size
+        self.read_ahead = read_ahead
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="stream-read")
+        self._readers: "OrderedDict[tuple, BlockReader]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _resolve(self, path: str) -> str:
+        full = os.path.abspath(os.path.join(self.root, path.lstrip("/\\")))
+        if os.path.commonpath([full, self.root]) != self.root:
+            raise PermissionError(f"Path escapes storage root: {path}")
+        return full
+
+    def _item(self, path: str, full: str, stat: os.stat_result) -> StorageItem:
+        return StorageItem(
+            item_id=path,
+            name=os.path.basename(full),
+            path=path,
+            is_folder=False,
+            size_bytes=stat.st_size,
+            modified_date=datetime.fromtimestamp(stat.st_mtime),
+            storage_provider=self.provider_id,
+            mime_type=mimetypes.guess_type(full)[0],
+        )
+
+    def reader(self, path: str) -> Tuple[BlockReader, StorageItem]:
+        """BlockReader for the current version of `path` (reused while the file is unchanged)."""
+        full = self._resolve(path)
+        stat = os.stat(full)
+        key = (full, stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            reader = self._readers.get(key)
+            if reader is None:
+                reader = self._readers[key] = BlockReader(
+                    lambda offset, length: self._pread(full, offset, length),
+                    stat.st_size, key, self.cache, self.block_size, self.read_ahead, self._executor,
+                )
+                while len(self._readers) > _MAX_OPEN_READERS:
+                    self._readers.popitem(last=False)
+            else:
+                self._readers.move_to_end(key)
+        return reader, self._item(path, full, stat)
+
+    @staticmethod
+    def _pread(full: str, offset: int, length: int) -> bytes:
+        with open(full, "rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def open_stream(self, path: str) -> io.BufferedReader:
+        """Seekable file object that reads blocks on demand instead of loading the file."""
+        reader, _ = self.reader(path)
+        return io.BufferedReader(RangeStream(reader, name=path), buffer_size=self.block_size)
+
+    async def stream_file(self, path: str, chunk_size: int = 8192) -> AsyncIterator[bytes]:
+        """
+        Stream a file in chunks. The first chunk is available once its block is
+        read; later blocks are read ahead while the consumer works. Raises
+        SourceChangedError if the file is truncated mid-stream.
+        """
+        reader, _ = await asyncio.to_thread(self.reader, path)
+        position = 0
+        while position < reader.size:
+            index = position // reader.block_size
+            block = await asyncio.to_thread(reader.block, index)
+            if not block:
+                raise SourceChangedError(f"No data at offset {position} of {path}")
+            block_start = index * reader.block_size
+            offset = position - block_start
+            while offset < len(block):
+                yield block[offset:offset + chunk_size]
+                offset += chunk_size
+            position = block_start + len(block)
+
+    async def stream_to_file(self, source_stream: AsyncIterator[bytes], destination_path: str) -> int:
+        """Write chunks to `destination_path` (relative to root); returns bytes written."""
+        full = self._resolve(destination_path)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        tmp = f"{full}.part"
+        written = 0
+        with open(tmp, "wb") as f:
+            async for chunk in source_stream:
+                await asyncio.to_thread(f.write, chunk)
+                written += len(chunk)
+        os.replace(tmp, full)
+        return written
+
+    async def get_content_range(self, path: str, start: int, end: int) -> Tuple[bytes, StorageItem]:
+        """Bytes start..end (inclusive) of a file, read via cached blocks."""
+        reader, item = await asyncio.to_thread(self.reader, path)
+        data = await asyncio.to_thread(reader.read, start, end)
+        return data, item
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            self._readers.clear()
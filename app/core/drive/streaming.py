@@ -0,0 +1,303 @@
+"""
+Block-level range reads with read-ahead and an on-disk LRU block cache.
+
+Files are read in fixed-size blocks. A range read fetches only the blocks that
+overlap it and are not already cached (missing blocks are fetched
+concurrently), then queues the next `read_ahead` blocks in the background so a
+sequential reader (a player, a viewer paging forward) finds them ready. Blocks
+land in a BlockCache on local disk, evicted least-recently-used once the cache
+exceeds its byte budget, so reopening a lecture recording does not refetch it.
+
+Used by the streaming providers (/app/core/drive/local_streaming.py) behind
+FileStreamingInterface (/integrations/interfaces/storage_interface.py).
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+DEFAULT_READ_AHEAD = 4
+DEFAULT_CACHE_BYTES = 512 * 1024 * 1024
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "aerolearn_block_cache")
+
+
+class SourceChangedError(IOError):
+    """The source returned fewer bytes than its recorded size promises (truncated while being read)."""
+    pass
+
+
+class BlockCache:
+    """
+    Thread-safe LRU of file blocks stored as files under `directory`.
+
+    Blocks are keyed by a source key (which should change when the source
+    changes, e.g. path + size + mtime) and a block index. Blocks already on disk
+    are picked up again on startup, oldest-used first.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, int], int]" = OrderedDict()  # (key digest, index) -> size
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    @staticmethod
+    def digest(key: Hashable) -> str:
+        return hashlib.blake2b(repr(key).encode("utf-8"), digest_size=16).hexdigest()
+
+    def _path(self, digest: str, index: int) -> str:
+        return os.path.join(self.directory, f"{digest}-{index}.blk")
+
+    def _load(self) -> None:
+        found = []
+        for name in os.listdir(self.directory):
+            stem, ext = os.path.splitext(name)
+            digest, _, index = stem.rpartition("-")
+            if ext != ".blk" or not digest or not index.isdigit():
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            found.append((stat.st_mtime_ns, digest, int(index), stat.st_size))
+        for _, digest, index, size in sorted(found):
+            self._entries[(digest, index)] = size
+            self._bytes += size
+        self._evict()
+
+    def get(self, key: Hashable, index: int) -> Optional[bytes]:
+        entry = (self.digest(key), index)
+        with self._lock:
+            if entry not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(entry)
+        try:
+            with open(self._path(*entry), "rb") as f:
+                data = f.read()
+        except OSError:
+            self._discard(entry)
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: Hashable, index: int, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        entry = (self.digest(key), index)
+        path = self._path(*entry)
+        # Write then rename so readers never see a partial block
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            self._bytes += len(data) - self._entries.pop(entry, 0)
+            self._entries[entry] = len(data)
+            self._evict()
+
+    def _evict(self) -> None:
+        # Caller holds the lock (or is __init__)
+        while self._bytes > self.max_bytes and self._entries:
+            entry, size = self._entries.popitem(last=False)
+            self._bytes -= size
+            try:
+                os.remove(self._path(*entry))
+            except OSError:
+                pass
+
+    def _discard(self, entry: Tuple[str, int]) -> None:
+        with self._lock:
+            size = self._entries.pop(entry, None)
+            if size is not None:
+                self._bytes -= size
+        try:
+            os.remove(self._path(*entry))
+        except OSError:
+            pass
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop every cached block of `key`."""
+        digest = self.digest(key)
+        with self._lock:
+            entries = [entry for entry in self._entries if entry[0] == digest]
+        for entry in entries:
+            self._discard(entry)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def clear(self) -> None:
+        with self._lock:
+            entries = list(self._entries)
+        for entry in entries:
+            self._discard(entry)
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+class BlockReader:
+    """
+    Range reads over one source of known size, block by block.
+
+    `fetch(offset, length)` reads raw bytes from the source (a local file, a
+    remote object); `key` identifies this version of the source in the cache.
+    A fetch that comes back short raises SourceChangedError and is not cached.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[int, int], bytes],
+        size: int,
+        key: Hashable,
+        cache: Optional[BlockCache] = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        read_ahead: int = DEFAULT_READ_AHEAD,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        self.fetch = fetch
+        self.size = size
+        self.key = key
+        self.cache = cache
+        self.block_size = block_size
+        self.read_ahead = read_ahead
+        self.executor = executor
+        self.fetched_blocks = 0
+        self._inflight: Dict[int, Future] = {}
+        # Re-entrant: a future that is already done runs its callback inside _submit
+        self._lock = threading.RLock()
+        # Recently loaded blocks, so read-ahead results and re-reads skip the cache
+        self._recent: "OrderedDict[int, bytes]" = OrderedDict()
+
+    @property
+    def block_count(self) -> int:
+        return -(-self.size // self.block_size)
+
+    def _load_block(self, index: int) -> bytes:
+        data = self.cache.get(self.key, index) if self.cache is not None else None
+        if data is None:
+            offset = index * self.block_size
+            expected = min(self.block_size, self.size - offset)
+            data = self.fetch(offset, expected)
+            with self._lock:
+                self.fetched_blocks += 1
+            if len(data) != expected:
+                raise SourceChangedError(
+                    f"Expected {expected} bytes at offset {offset}, got {len(data)}: source changed while reading"
+                )
+            if self.cache is not None:
+                self.cache.put(self.key, index, data)
+        return data
+
+    def _submit(self, index: int) -> Future:
+        """Start loading a block in the executor unless it is already loading; caller holds the lock."""
+        future = self._inflight.get(index)
+        if future is None:
+            future = self._inflight[index] = self.executor.submit(self._load_block, index)
+            future.add_done_callback(lambda f, i=index: self._done(i, f))
+        return future
+
+    def _done(self, index: int, future: Future) -> None:
+        with self._lock:
+            if self._inflight.get(index) is future:
+                del self._inflight[index]
+            if not future.cancelled() and future.exception() is None:
+                self._recent[index] = future.result()
+                while len(self._recent) > max(self.read_ahead * 2, 2):
+                    self._recent.popitem(last=False)
+
+    def block(self, index: int) -> bytes:
+        return self.blocks(index, index)[0]
+
+    def blocks(self, first: int, last: int) -> List[bytes]:
+        """Blocks first..last (inclusive), fetched concurrently, then read-ahead queued."""
+        ready: Dict[int, bytes] = {}
+        futures: Dict[int, Future] = {}
+        with self._lock:
+            for index in range(first, last + 1):
+                data = self._recent.get(index)
+                if data is not None:
+                    ready[index] = data
+                elif self.executor is not None:
+                    futures[index] = self._submit(index)
+        for index in range(first, last + 1):
+            if index not in ready:
+                ready[index] = futures[index].result() if index in futures else self._load_block(index)
+        self._prefetch(last + 1)
+        return [ready[index] for index in range(first, last + 1)]
+
+    def _prefetch(self, start: int) -> None:
+        if self.executor is None or self.read_ahead <= 0:
+            return
+        with self._lock:
+            for index in range(start, min(start + self.read_ahead, self.block_count)):
+                if index not in self._recent:
+                    self._submit(index)
+
+    def read(self, start: int, end: int) -> bytes:
+        """Bytes start..end inclusive (clipped to the source size)."""
+        end = min(end, self.size - 1)
+        if start > end or start < 0:
+            return b""
+        first, last = start // self.block_size, end // self.block_size
+        data = b"".join(self.blocks(first, last))
+        offset = start - first * self.block_size
+        return data[offset:offset + end - start + 1]
+
+
+class RangeStream(io.RawIOBase):
+    """
+    Seekable, read-only file object over a BlockReader, for consumers that want a
+    file (viewers, media players, copy loops) without downloading the source first.
+    Wrap in io.BufferedReader for small reads.
+    """
+
+    def __init__(self, reader: BlockReader, name: str = ""):
+        super().__init__()
+        self.reader = reader
+        self.name = name
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.reader.size + offset
+        else:
+            raise ValueError(f"invalid whence: {whence}")
+        if position < 0:
+            raise ValueError("negative seek position")
+        self._position = position
+        return position
+
+    def readinto(self, buffer) -> int:
+        if self._position >= self.reader.size:
+            return 0
+        data = self.reader.read(self._position, self._position + len(buffer) - 1)
+        buffer[:len(data)] = data
+        self._position += len(data)
+        return len(data)
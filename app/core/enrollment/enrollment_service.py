@@ -2,19 +2,81 @@
 Location: /app/core/enrollment/enrollment_service.py
 
 Handles all business logic and orchestration for course enrollment workflow.
+
+DB-backed services keep:
+- an in-memory enrollment index (student -> courses, course -> students),
+  loaded with one query and kept current from the session's flushes;
+- a versioned cache for catalog browsing/search, invalidated whenever a
+  Course is flushed through the session (or via invalidate()).
+enroll_many/unenroll_many apply a whole batch in one transaction.
 """
 
-from app.models.course import Course, Enrollment, EnrollmentStatus
-from typing import Optional, List
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
 
+from sqlalchemy import event, select
+
+from app.models.course import Course, Enrollment, EnrollmentStatus
+
+# Keeps IN (...) lists under SQLite's bound-parameter limit
+_IN_CHUNK = 500
+_ACTIVE = (EnrollmentStatus.PENDING, EnrollmentStatus.APPROVED)
+
+
+@dataclass
+class BulkEnrollmentResult:
+    """Outcome of enroll_many/unenroll_many."""
+    course_id: int
+    changed: List[int] = field(default_factory=list)   # user ids enrolled / unenrolled
+    skipped: List[int] = field(default_factory=list)   # already in the requested state
+    missing: List[int] = field(default_factory=list)   # unenroll_many: no enrollment found
+
+    @property
+    def count(self) -> int:
+        return len(self.changed)
+
+
+class EnrollmentIndex:
+    """student -> {course_id: status} and course -> {user_id: status} lookups."""
+
+    def __init__(self):
+        self.by_student: Dict[int, Dict[int, EnrollmentStatus]] = {}
+        self.by_course: Dict[int, Dict[int, EnrollmentStatus]] = {}
+
+    def set(self, user_id: int, course_id: int, status: EnrollmentStatus) -> None:
+        self.by_student.setdefault(user_id, {})[course_id] = status
+        self.by_course.setdefault(course_id, {})[user_id] = status
+
+    def discard(self, user_id: int, course_id: int) -> None:
+        self.by_student.get(user_id, {}).pop(course_id, None)
+        self.by_course.get(course_id, {}).pop(user_id, None)
+
+    def status(self, user_id: int, course_id: int) -> Optional[EnrollmentStatus]:
+        return self.by_student.get(user_id, {}).get(course_id)
+
+    def students(self, course_id: int, status: EnrollmentStatus = EnrollmentStatus.APPROVED) -> List[int]:
+        return [u for u, s in self.by_course.get(course_id, {}).items() if s == status]
+
+    def courses(self, user_id: int, status: EnrollmentStatus = EnrollmentStatus.APPROVED) -> List[int]:
+        return [c for c, s in self.by_student.get(user_id, {}).items() if s == status]
+
+
+def _chunks(items: List[Any], size: int = _IN_CHUNK):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
 class EnrollmentService:
     """
     Service class for managing course enrollments and enrollment requests.
     Uses in-memory store for illustration—replace with DB/session as needed.
     """
 
-    def __init__(self, course_store=None, session=None, db_session=None):
+    CACHE_SIZE = 256
+
+    def __init__(self, course_store=None, session=None, db_session=None, cache_size: int = None):
         if db_session is not None and session is None:
             # Priority to db_session for backward compatibility
             self.session = db_session
@@ -22,6 +84,73 @@ class EnrollmentService:
             self.session = session            # SQLAlchemy session, assumed to be set for DB-backed ops
         self.course_store = course_store  # Dict[str, Course], keyed by course id (optional)
 
+        # Sessions are not thread-safe; concurrent callers share the service through this lock
+        self._lock = threading.RLock()
+        self._index: Optional[EnrollmentIndex] = None
+        self._catalog_version = 0
+        self._cache: "OrderedDict[Tuple, Tuple[int, Any]]" = OrderedDict()
+        self._cache_size = self.CACHE_SIZE if cache_size is None else cache_size
+        if self.session is not None:
+            event.listen(self.session, "after_flush", self._after_flush)
+            event.listen(self.session, "after_soft_rollback", self._after_rollback)
+
+    # --- index and cache maintenance ---
+
+    def _after_flush(self, session, flush_context):
+        index = self._index
+        catalog_changed = False
+        for obj in list(session.new) + list(session.dirty):
+            if isinstance(obj, Enrollment):
+                if index is not None and obj.user_id is not None and obj.course_id is not None:
+                    index.set(obj.user_id, obj.course_id, obj.status or EnrollmentStatus.PENDING)
+            elif isinstance(obj, Course):
+                catalog_changed = True
+        for obj in session.deleted:
+            if isinstance(obj, Enrollment):
+                if index is not None:
+                    index.discard(obj.user_id, obj.course_id)
+            elif isinstance(obj, Course):
+                catalog_changed = True
+        if catalog_changed:
+            self._catalog_version += 1
+
+    def _after_rollback(self, session, previous_transaction):
+        # Flushed-then-rolled-back changes already reached the index; rebuild on next use
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Drop the enrollment index and cached catalog results (e.g. after writes from another process)."""
+        with self._lock:
+            self._index = None
+            self._catalog_version += 1
+            self._cache.clear()
+
+    def _enrollment_index(self) -> EnrollmentIndex:
+        index = self._index
+        if index is None:
+            index = EnrollmentIndex()
+            rows = self.session.execute(
+                select(Enrollment.user_id, Enrollment.course_id, Enrollment.status).order_by(Enrollment.id)
+            )
+            for user_id, course_id, status in rows:
+                index.set(user_id, course_id, status)
+            self._index = index
+        return index
+
+    def _cached(self, key: Tuple, compute):
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None and hit[0] == self._catalog_version:
+                self._cache.move_to_end(key)
+                return list(hit[1])
+            version = self._catalog_version
+            result = compute()
+            self._cache[key] = (version, result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+            return list(result)
+
     def browse_courses(self) -> List[Course]:
         """
         Return all available courses.
@@ -29,8 +158,8 @@ class EnrollmentService:
         if self.course_store is not None:
             return list(self.course_store.values())
         elif self.session:
-            # DB query
-            return self.session.query(Course).all()
+            # DB query, cached until the catalog changes
+            return self._cached(("browse",), lambda: self.session.query(Course).all())
         return []
 
     def search_courses(self, query: str) -> List[Course]:
@@ -43,15 +172,24 @@ class EnrollmentService:
                 if query.lower() in course.title.lower()
             ]
         elif self.session:
-            return self.session.query(Course).filter(Course.title.ilike(f"%{query}%")).all()
+            return self._cached(
+                ("search", query.lower()),
+                lambda: self.session.query(Course).filter(Course.title.ilike(f"%{query}%")).all(),
+            )
         return []
 
+    def _enrollment_id(self, course_id: int, user_id: int) -> Optional[int]:
+        return self.session.execute(
+            select(Enrollment.id).filter_by(user_id=user_id, course_id=course_id)
+        ).scalar_one_or_none()
+
     def request_enrollment(self, course_id: int, user_id: int) -> Optional[Enrollment]:
         if self.session:
-            course = self.session.query(Course).filter_by(id=course_id).first()
-            if not course:
-                return None
-            return course.request_enrollment(self.session, user_id)
+            with self._lock:
+                course = self.session.query(Course).filter_by(id=course_id).first()
+                if not course:
+                    return None
+                return course.request_enrollment(self.session, user_id)
         elif self.course_store:
             course = self.course_store.get(str(course_id))
             if not course:
@@ -61,10 +199,14 @@ class EnrollmentService:
 
     def approve_enrollment(self, course_id: int, user_id: int, approver_id: int) -> Optional[Enrollment]:
         if self.session:
-            course = self.session.query(Course).filter_by(id=course_id).first()
-            if not course:
-                return None
-            enrollment = course.approve_enrollment(self.session, user_id, approver_id)
+            with self._lock:
+                course = self.session.query(Course).filter_by(id=course_id).first()
+                if not course:
+                    return None
+                enrollment_id = self._enrollment_id(course_id, user_id)
+                if enrollment_id is None:
+                    return None
+                enrollment = course.approve_enrollment(self.session, enrollment_id, approver_id)
         elif self.course_store:
             course = self.course_store.get(str(course_id))
             if not course:
@@ -80,10 +222,14 @@ class EnrollmentService:
 
     def reject_enrollment(self, course_id: int, user_id: int, approver_id: int) -> Optional[Enrollment]:
         if self.session:
-            course = self.session.query(Course).filter_by(id=course_id).first()
-            if not course:
-                return None
-            enrollment = course.reject_enrollment(self.session, user_id, approver_id)
+            with self._lock:
+                course = self.session.query(Course).filter_by(id=course_id).first()
+                if not course:
+                    return None
+                enrollment_id = self._enrollment_id(course_id, user_id)
+                if enrollment_id is None:
+                    return None
+                enrollment = course.reject_enrollment(self.session, enrollment_id, approver_id)
         elif self.course_store:
             course = self.course_store.get(str(course_id))
             if not course:
@@ -99,17 +245,17 @@ class EnrollmentService:
 
     def cancel_enrollment(self, course_id: int, user_id: int) -> Optional[Enrollment]:
         if self.session:
-            course = self.session.query(Course).filter_by(id=course_id).first()
-            if not course:
-                return None
-            from sqlalchemy import select
-            enrollment_obj = self.session.execute(
-                select(Enrollment).filter_by(user_id=user_id, course_id=course_id)
-            ).scalar_one_or_none()
-            if enrollment_obj:
-                enrollment = course.cancel_enrollment(self.session, enrollment_obj.id, user_id)
-            else:
-                return None
+            with self._lock:
+                course = self.session.query(Course).filter_by(id=course_id).first()
+                if not course:
+                    return None
+                enrollment_obj = self.session.execute(
+                    select(Enrollment).filter_by(user_id=user_id, course_id=course_id)
+                ).scalar_one_or_none()
+                if enrollment_obj:
+                    enrollment = course.cancel_enrollment(self.session, enrollment_obj.id, user_id)
+                else:
+                    return None
         elif self.course_store:
             course = self.course_store.get(str(course_id))
             if not course:
@@ -125,10 +271,8 @@ class EnrollmentService:
 
     def get_enrollment_status(self, course_id: int, user_id: int) -> Optional[EnrollmentStatus]:
         if self.session:
-            course = self.session.query(Course).filter_by(id=course_id).first()
-            if not course:
-                return None
-            status = course.enrollment_status(self.session, user_id)
+            with self._lock:
+                status = self._enrollment_index().status(user_id, course_id)
         elif self.course_store:
             course = self.course_store.get(str(course_id))
             if not course:
@@ -140,14 +284,128 @@ class EnrollmentService:
 
     def get_enrolled_students(self, course_id: int) -> List[int]:
         if self.session:
-            # DB-side: get only approved enrollments
-            enrollments = self.session.query(Enrollment).filter_by(
-                course_id=course_id, status=EnrollmentStatus.APPROVED
-            ).all()
-            return [e.user_id for e in enrollments]
+            # Approved enrollments only, from the course -> students index
+            with self._lock:
+                return self._enrollment_index().students(course_id)
         elif self.course_store:
             course = self.course_store.get(str(course_id))
             if not course:
                 return []
             return course.enrolled_students
         return []
+
+    def get_student_courses(self, user_id: int,
+                            status: EnrollmentStatus = EnrollmentStatus.APPROVED) -> List[int]:
+        """Course IDs a student holds an enrollment with the given status in."""
+        if self.session:
+            with self._lock:
+                return self._enrollment_index().courses(user_id, status)
+        elif self.course_store:
+            return [int(cid) if str(cid).isdigit() else cid for cid, course in self.course_store.items()
+                    if user_id in getattr(course, "enrolled_students", [])]
+        return []
+
+    def enroll_many(self, course_id: int, user_ids: Iterable[int],
+                    approver_id: Optional[int] = None) -> BulkEnrollmentResult:
+        """
+        Enroll many users in one transaction: a single existence check per chunk,
+        one batched INSERT and one commit. Users already holding a pending or
+        approved enrollment are skipped; cancelled/rejected ones are reopened.
+        With approver_id the enrollments are approved directly, otherwise pending.
+
+        Raises:
+            ValueError: if the course does not exist
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        result = BulkEnrollmentResult(course_id)
+        if self.course_store is not None and not self.session:
+            course = self.course_store.get(str(course_id))
+            if not course:
+                raise ValueError(f"Course {course_id} not found")
+            for user_id in user_ids:
+                course.request_enrollment(user_id)
+                if approver_id is not None:
+                    course.approve_enrollment(user_id, approver_id)
+                result.changed.append(user_id)
+            return result
+
+        status = EnrollmentStatus.APPROVED if approver_id is not None else EnrollmentStatus.PENDING
+        now = datetime.utcnow()
+        with self._lock:
+            if self.session.get(Course, course_id) is None:
+                raise ValueError(f"Course {course_id} not found")
+            existing = self._existing_enrollments(course_id, user_ids)
+            try:
+                new_rows = []
+                for user_id in user_ids:
+                    enrollment = existing.get(user_id)
+                    if enrollment is None:
+                        new_rows.append(Enrollment(
+                            user_id=user_id, course_id=course_id, enrolled_at=now,
+                            status=status, approved_by=approver_id,
+                            status_history=[{"status": status.value, "at": now.isoformat(),
+                                             "by": approver_id if approver_id is not None else user_id}],
+                        ))
+                        result.changed.append(user_id)
+                    elif enrollment.status in _ACTIVE:
+                        result.skipped.append(user_id)
+                    else:
+                        enrollment.status = status
+                        enrollment.approved_by = approver_id
+                        enrollment.status_history = list(enrollment.status_history or []) + [
+                            {"status": status.value, "at": now.isoformat(),
+                             "by": approver_id if approver_id is not None else user_id}]
+                        result.changed.append(user_id)
+                self.session.add_all(new_rows)
+                self.session.commit()
+            except Exception:
+                self.session.rollback()
+                raise
+        return result
+
+    def unenroll_many(self, course_id: int, user_ids: Iterable[int],
+                      actor_id: Optional[int] = None) -> BulkEnrollmentResult:
+        """
+        Cancel the pending or approved enrollments of many users in one transaction.
+        actor_id is recorded in the status history (defaults to each user).
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        result = BulkEnrollmentResult(course_id)
+        if self.course_store is not None and not self.session:
+            course = self.course_store.get(str(course_id))
+            for user_id in user_ids:
+                if course and course.cancel_enrollment(user_id):
+                    result.changed.append(user_id)
+                else:
+                    result.missing.append(user_id)
+            return result
+
+        with self._lock:
+            existing = self._existing_enrollments(course_id, user_ids)
+            try:
+                for user_id in user_ids:
+                    enrollment = existing.get(user_id)
+                    if enrollment is None:
+                        result.missing.append(user_id)
+                    elif enrollment.status in _ACTIVE:
+                        enrollment.cancel(actor_id if actor_id is not None else user_id)
+                        # cancel() appends in place; reassign so the JSON column is flushed
+                        enrollment.status_history = list(enrollment.status_history)
+                        result.changed.append(user_id)
+                    else:
+                        result.skipped.append(user_id)
+                self.session.commit()
+            except Exception:
+                self.session.rollback()
+                raise
+        return result
+
+    def _existing_enrollments(self, course_id: int, user_ids: List[int]) -> Dict[int, Enrollment]:
+        existing: Dict[int, Enrollment] = {}
+        for chunk in _chunks(user_ids):
+            rows = self.session.execute(
+                select(Enrollment).where(Enrollment.course_id == course_id, Enrollment.user_id.in_(chunk))
+            ).scalars()
+            for enrollment in rows:
+                existing.setdefault(enrollment.user_id, enrollment)
+        return existing
@@ -0,0 +1,256 @@
+# File: /app/core/external_resources/discovery_executor.py
+# Concurrent provider querying for external resource discovery: global deadline,
+# partial results, per-(topic, provider) TTL cache and per-provider circuit breakers.
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def provider_name(provider) -> str:
+    """Stable name used for cache keys, breakers and result metadata."""
+    return getattr(provider, "PROVIDER_NAME", None) or provider.__class__.__name__
+
+
+def topic_of(content) -> str:
+    """Query topic for a content item (its title, or its string form)."""
+    title = getattr(content, "title", None)
+    if callable(title):
+        title = title()
+    if title is None and isinstance(content, dict):
+        title = content.get("title")
+    return str(title if title is not None else content)
+
+
+def call_provider(provider, content) -> List[Any]:
+    """Prefer fetch_resources, fall back to find_resources (integration compatibility)."""
+    fetch = getattr(provider, "fetch_resources", None)
+    if callable(fetch):
+        return fetch(content) or []
+    find = getattr(provider, "find_resources", None)
+    if callable(find):
+        return find(content) or []
+    return []
+
+
+class CircuitBreaker:
+    """
+    Classic closed/open/half-open breaker.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and the
+    provider is skipped for ``reset_timeout`` seconds; then one trial call is
+    allowed (half-open) and its outcome closes or re-opens the breaker.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if self._clock() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = self._clock()
+
+
+class TTLCache:
+    """Thread-safe dict with per-entry expiry."""
+
+    def __init__(self, ttl_seconds: float = 600.0, max_entries: int = 4096,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._data: Dict[Any, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= self._clock():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            if len(self._data) >= self.max_entries and key not in self._data:
+                now = self._clock()
+                for k in [k for k, (exp, _) in self._data.items() if exp <= now]:
+                    del self._data[k]
+                if len(self._data) >= self.max_entries:
+                    # Drop the entry closest to expiry
+                    del self._data[min(self._data, key=lambda k: self._data[k][0])]
+            self._data[key] = (self._clock() + self.ttl, value)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+@dataclass
+class DiscoveryOutcome:
+    """Results of one discovery round plus what happened to each provider."""
+    results: List[Tuple[str, Any]] = field(default_factory=list)  # (provider name, resource)
+    cached: List[str] = field(default_factory=list)
+    timed_out: List[str] = field(default_factory=list)
+    failed: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)  # circuit open
+
+    @property
+    def is_partial(self) -> bool:
+        return bool(self.timed_out or self.failed or self.skipped)
+
+
+class DiscoveryExecutor:
+    """
+    Queries every provider for every content item concurrently under one deadline.
+
+    Latency is bounded by ``deadline_seconds`` instead of the sum of provider
+    latencies. Slow calls keep running in the background and populate the cache
+    when they finish, so the next request for the same topic is served instantly.
+
+    The executor owns a thread pool: call close() (or use it as a context
+    manager) when done with it.
+    """
+
+    def __init__(self, providers: List[Any], deadline_seconds: float = 5.0, max_workers: int = 8,
+                 cache_ttl: float = 600.0, failure_threshold: int = 3, reset_timeout: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.providers = list(providers)
+        self.deadline_seconds = deadline_seconds
+        self.cache = TTLCache(cache_ttl, clock=clock)
+        self._clock = clock
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="resource-discovery")
+
+    def breaker_for(self, provider) -> CircuitBreaker:
+        name = provider_name(provider)
+        with self._breakers_lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(self._failure_threshold, self._reset_timeout, self._clock)
+                self._breakers[name] = breaker
+            return breaker
+
+    def discover(self, content_items, deadline_seconds: Optional[float] = None) -> DiscoveryOutcome:
+        if not isinstance(content_items, (list, tuple)):
+            content_items = [content_items]
+        deadline = self.deadline_seconds if deadline_seconds is None else deadline_seconds
+        outcome = DiscoveryOutcome()
+        pending = {}
+        # Results are emitted in (content, provider) order regardless of completion order
+        slots: List[Tuple[str, Optional[List[Any]]]] = []
+
+        for content in content_items:
+            topic = topic_of(content)
+            for provider in self.providers:
+                name = provider_name(provider)
+                key = (topic, name)
+                cached = self.cache.get(key)
+                if cached is not None:
+                    outcome.cached.append(name)
+                    slots.append((name, cached))
+                    continue
+                breaker = self.breaker_for(provider)
+                if not breaker.allow():
+                    outcome.skipped.append(name)
+                    continue
+                future = self._pool.submit(call_provider, provider, content)
+                future.add_done_callback(self._make_completion(key, breaker, self._clock(), deadline))
+                pending[future] = len(slots)
+                slots.append((name, None))
+
+        if pending:
+            done, not_done = wait(list(pending), timeout=deadline)
+            for future in done:
+                index = pending[future]
+                name = slots[index][0]
+                if future.exception() is not None:
+                    outcome.failed.append(name)
+                else:
+                    slots[index] = (name, future.result())
+            for future in not_done:
+                outcome.timed_out.append(slots[pending[future]][0])
+
+        for name, resources in slots:
+            for resource in resources or []:
+                outcome.results.append((name, resource))
+        return outcome
+
+    def _make_completion(self, key, breaker: CircuitBreaker, started: float, deadline: float):
+        def _on_done(future):
+            if future.exception() is not None:
+                breaker.record_failure()
+                return
+            # A late answer still warms the cache, but counts against the provider
+            if self._clock() - started > deadline:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            self.cache.set(key, future.result())
+        return _on_done
+
+    def shutdown(self, wait_for_pending: bool = False):
+        self._pool.shutdown(wait=wait_for_pending)
+
+    def close(self):
+        """Stop the worker threads; calls still running finish in the background."""
+        self.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -1,14 +1,18 @@
 # File: /app/core/external_resources/providers.py
 # Define pluggable resource providers (DeepSeek, YouTube, etc.)
 
-from typing import List, Any
+from typing import List, Any, Optional
+import logging
 import requests
 import os
+import time
 try:
     from app.core.config.api_secrets import AI_API_KEY  # Can rename for DeepSeek if needed
 except ImportError:
     AI_API_KEY = None
 
+logger = logging.getLogger(__name__)
+
 class BaseResourceProvider:
     """
     Abstract external resource provider.
@@ -35,11 +39,25 @@ class BaseResourceProvider:
 
 class DeepSeekResourceProvider(BaseResourceProvider):
     PROVIDER_NAME = "DeepSeek"
+    API_URL = "https://api.deepseek.com/v1/resources/search"
+
+    def __init__(self, timeout: float = 5.0):
+        self.timeout = timeout
+        self._session: Optional[requests.Session] = None
+
+    @property
+    def session(self) -> requests.Session:
+        # Reuse pooled keep-alive connections across queries
+        if self._session is None:
+            self._session = requests.Session()
+        return self._session
 
     def fetch_resources(self, course) -> List[dict]:
         """
         Query the DeepSeek API for resources relevant to a course (pseudo-implementation).
         Supports both single course object and lists of course objects.
+        Request errors (timeouts, HTTP errors, bad JSON) propagate, so the discovery
+        executor counts them against the provider's circuit breaker and caches nothing.
         """
         # Accept single or list of course items
         items = course
@@ -49,7 +67,7 @@ class DeepSeekResourceProvider(BaseResourceProvider):
         results = []
         for course_item in items:
             if not AI_API_KEY:
-                print("[DeepSeek] Skipping: No API key set.")
+                logger.warning("DeepSeek provider skipped: no API key set")
                 continue
                 
             # Extract a robust string for the query (never a method, never a function)
@@ -62,23 +80,22 @@ class DeepSeekResourceProvider(BaseResourceProvider):
             else:
                 # Fallback to string representation
                 query = str(course_item)
-            url = "https://api.deepseek.com/v1/resources/search"
             headers = {"Authorization": f"Bearer {AI_API_KEY}", "Content-Type": "application/json"}
             data = {
                 "query": query,
                 "limit": 5
             }
             try:
-                response = requests.post(url, json=data, headers=headers, timeout=5)
+                response = self.session.post(self.API_URL, json=data, headers=headers, timeout=self.timeout)
                 response.raise_for_status()
                 api_items = response.json().get("results", [])
                 results.extend([
                     {"title": item.get("title"), "url": item.get("url"), "description": item.get("snippet")}
                     for item in api_items
                 ])
-            except Exception as exc:
-                print(f"[DeepSeek] Error: {exc}")
-                continue
+            except (requests.RequestException, ValueError) as exc:
+                logger.warning("DeepSeek request for %r failed: %s", query, exc)
+                raise
                 
         return results
 
@@ -92,11 +109,29 @@ class MockProvider(BaseResourceProvider):
     """
     PROVIDER_NAME = "Mock"
 
+    def __init__(self, latency: float = 0.0, error: Optional[Exception] = None, name: Optional[str] = None):
+        """
+        latency: seconds to sleep per call (simulates a slow remote provider)
+        error: exception raised on every call (simulates a failing provider)
+        name: overrides PROVIDER_NAME so several mocks can be told apart
+        """
+        self.latency = latency
+        self.error = error
+        self.calls = 0
+        if name:
+            self.PROVIDER_NAME = name
+
     def fetch_resources(self, course_content) -> List[Any]:
         """
         Generate mock resources for testing.
         Supports both single course object and lists of course objects.
         """
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.error is not None:
+            raise self.error
+
         # Accept single or list of course items
         items = course_content
         if not isinstance(items, (list, tuple)):
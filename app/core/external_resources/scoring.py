@@ -1,53 +1,297 @@
 # File: /app/core/external_resources/scoring.py
-# Functions and classes to score and filter resources for relevance and quality versus course content
+# Functions and classes to score and filter resources for relevance and quality versus course content.
+# A whole candidate set is scored with one sparse TF-IDF product (character + word n-grams)
+# instead of one difflib.SequenceMatcher per (resource, course) pair.
 
-from difflib import SequenceMatcher
-from typing import List, Any
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
-def score_resource(resource, course) -> float:
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+_WORD_RE = re.compile(r"(?u)\b\w\w+\b")
+# Descriptions only contribute word n-grams and are cut here; character n-grams
+# of long texts dominate the cost and add little beyond what the words carry.
+MAX_DESCRIPTION_CHARS = 2000
+
+
+@dataclass
+class ScoringWeights:
+    """
+    Weights of the score components. With the defaults a score stays within
+    [0, 1.1], like the previous title-ratio + description-bonus formula, so the
+    0.7 / 0.85 quality thresholds used by the orchestrator keep their meaning.
+    """
+    title: float = 0.8              # similarity(course, resource title)
+    description: float = 0.2        # similarity(course, resource description)
+    description_bonus: float = 0.1  # flat bonus when a description is present
+    char_ngrams: float = 0.7        # title similarity blend: character n-grams...
+    word_ngrams: float = 0.3        # ...and word n-grams (the two are renormalized)
+
+
+@dataclass
+class ScoredResource:
+    """A resource with its score and, when requested, the per-component explanation."""
+    resource: Any
+    score: float
+    explanation: Dict[str, Any] = field(default_factory=dict)
+
+
+def _field(resource, name: str) -> str:
+    """Read a text field from a dict-like or attribute-style resource."""
+    if isinstance(resource, dict):
+        value = resource.get(name)
+    else:
+        value = getattr(resource, name, None)
+        if value is None and hasattr(resource, "metadata") and isinstance(resource.metadata, dict):
+            value = resource.metadata.get(name)
+    return str(value) if value else ""
+
+
+def _course_text(course) -> str:
+    if isinstance(course, str):
+        return course
+    return str(getattr(course, 'title', str(course)))
+
+
+def _words(text: str) -> List[str]:
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in ENGLISH_STOP_WORDS]
+
+
+# Analyzed texts keep their terms as strings; column ids are assigned per matrix
+# (or per fitted space), so no vocabulary outlives the texts that use it.
+Analyzed = Tuple[Tuple[str, ...], np.ndarray]  # (distinct terms, sublinear tf weights)
+
+
+def _to_vector(counts: Counter) -> Analyzed:
+    tf = 1.0 + np.log(np.fromiter(counts.values(), dtype=float, count=len(counts)))
+    return tuple(counts), tf
+
+
+@lru_cache(maxsize=16384)
+def word_ngrams(text: str) -> Analyzed:
+    """Word unigram + bigram vector of a text (cached: candidates recur across requests)."""
+    words = _words(text)
+    return _to_vector(Counter(["w:" + w for w in words] + [f"w:{a} {b}" for a, b in zip(words, words[1:])]))
+
+
+@lru_cache(maxsize=16384)
+def char_ngrams(text: str, low: int = 2, high: int = 4) -> Analyzed:
+    """Character n-gram vector inside space-padded words (sklearn's char_wb scheme)."""
+    counts = Counter()
+    for word in text.lower().split():
+        padded = f" {word} "
+        for n in range(low, high + 1):
+            for i in range(len(padded) - n + 1):
+                counts["c:" + padded[i:i + n]] += 1
+    return _to_vector(counts)
+
+
+def _idf(df: np.ndarray, n_docs: int) -> np.ndarray:
+    """Smoothed IDF, as in sklearn's TfidfTransformer."""
+    return np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+
+
+class _TfidfSpace:
+    """Vocabulary and document frequencies of a reference corpus (see TfidfResourceScorer.fit)."""
+
+    def __init__(self, analyzed: List[Analyzed]):
+        # Terms are distinct within a text, so counting them gives document frequencies
+        df = Counter(term for terms, _ in analyzed for term in terms)
+        self.vocabulary: Dict[str, int] = {term: column for column, term in enumerate(df)}
+        self.size = len(self.vocabulary)
+        self.idf = _idf(np.fromiter(df.values(), dtype=float, count=self.size), len(analyzed))
+
+    def columns(self, terms: Iterable[str], count: int) -> np.ndarray:
+        """Column of each term; -1 means out of vocabulary."""
+        get = self.vocabulary.get
+        return np.fromiter((get(term, -1) for term in terms), dtype=np.int64, count=count)
+
+
+def _tfidf_matrix(analyzed: List[Analyzed], space: Optional[_TfidfSpace] = None) -> sparse.csr_matrix:
+    """
+    Assemble L2-normalized TF-IDF rows for already analyzed texts.
+    Without a fitted space the vocabulary and IDF come from the rows themselves.
+    """
+    n_rows = len(analyzed)
+    lengths = np.fromiter((len(a[0]) for a in analyzed), dtype=np.int64, count=n_rows)
+    if not lengths.sum():
+        return sparse.csr_matrix((n_rows, 1))
+    n_terms = int(lengths.sum())
+    terms = (term for a in analyzed for term in a[0])
+    tf = np.concatenate([a[1] for a in analyzed])
+    rows = np.repeat(np.arange(n_rows), lengths)
+    if space is None:
+        vocabulary: Dict[str, int] = {}
+        cols = np.fromiter((vocabulary.setdefault(term, len(vocabulary)) for term in terms),
+                           dtype=np.int64, count=n_terms)
+        n_cols = len(vocabulary)
+        idf = _idf(np.bincount(cols, minlength=n_cols).astype(float), n_rows)
+    else:
+        cols = space.columns(terms, n_terms)
+        keep = cols >= 0
+        rows, cols, tf = rows[keep], cols[keep], tf[keep]
+        n_cols, idf = max(space.size, 1), space.idf
+    data = tf * idf[cols]
+    norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=n_rows))
+    norms[norms == 0] = 1.0
+    data = data / norms[rows]
+    return sparse.csr_matrix((data, (rows, cols)), shape=(n_rows, n_cols))
+
+
+class TfidfResourceScorer:
+    """
+    Vectorized relevance scorer.
+
+    The course text and resource titles become TF-IDF vectors over character
+    n-grams (robust to morphology and typos) blended with word n-grams; the
+    descriptions use word n-grams. Cosine similarities for the whole candidate
+    set then come out of a few sparse matrix products. Per-text n-gram counts
+    are memoized, so candidates seen before (e.g. served from the discovery
+    cache) are not re-tokenized.
+
+    By default the IDF statistics come from each candidate set. Call ``fit()``
+    once with a larger corpus (e.g. the course catalogue) to score against a
+    fixed vocabulary instead.
+    """
+
+    def __init__(self, weights: Optional[ScoringWeights] = None):
+        self.weights = weights or ScoringWeights()
+        self._char_space: Optional[_TfidfSpace] = None
+        self._word_space: Optional[_TfidfSpace] = None
+
+    def fit(self, corpus: Iterable[str]) -> "TfidfResourceScorer":
+        """Fix the vocabulary and IDF weights on a reference corpus."""
+        docs = [d for d in corpus if d]
+        self._char_space = _TfidfSpace([char_ngrams(d) for d in docs])
+        self._word_space = _TfidfSpace([word_ngrams(d[:MAX_DESCRIPTION_CHARS]) for d in docs])
+        return self
+
+    def similarities(self, resources: Sequence[Any], course) -> Tuple[np.ndarray, np.ndarray]:
+        """Cosine similarity of the course text to every title and every description."""
+        n = len(resources)
+        query = _course_text(course)
+        titles = [_field(r, "title") for r in resources]
+        descriptions = [_field(r, "description")[:MAX_DESCRIPTION_CHARS] for r in resources]
+
+        chars = _tfidf_matrix([char_ngrams(t) for t in [query] + titles], self._char_space)
+        words = _tfidf_matrix([word_ngrams(t) for t in [query] + titles + descriptions], self._word_space)
+        char_q, word_q = chars[0].T, words[0].T
+        char_title = np.asarray((chars[1:] @ char_q).todense()).ravel()
+        word_title = np.asarray((words[1:n + 1] @ word_q).todense()).ravel()
+        desc_sims = np.asarray((words[n + 1:] @ word_q).todense()).ravel()
+
+        w = self.weights
+        total = (w.char_ngrams + w.word_ngrams) or 1.0
+        title_sims = (w.char_ngrams * char_title + w.word_ngrams * word_title) / total
+        return title_sims, desc_sims
+
+    def _score(self, resources: Sequence[Any], course):
+        title_sims, desc_sims = self.similarities(resources, course)
+        has_desc = np.array([bool(_field(r, "description")) for r in resources], dtype=float)
+        w = self.weights
+        scores = w.title * title_sims + w.description * desc_sims + w.description_bonus * has_desc
+        return np.round(scores, 3), title_sims, desc_sims, has_desc
+
+    def score_many(self, resources: Sequence[Any], course) -> np.ndarray:
+        """Scores for every resource in one pass, in input order."""
+        if not resources:
+            return np.zeros(0)
+        return self._score(resources, course)[0]
+
+    def rank(self, resources: Sequence[Any], course, explain: bool = False,
+             top_k: Optional[int] = None) -> List[ScoredResource]:
+        """Resources sorted by descending score, optionally with per-resource explanations."""
+        resources = list(resources)
+        if not resources:
+            return []
+        scores, title_sims, desc_sims, has_desc = self._score(resources, course)
+        w = self.weights
+        order = np.argsort(-scores, kind="stable")
+        if top_k is not None:
+            order = order[:top_k]
+        ranked = []
+        for i in order:
+            explanation = {}
+            if explain:
+                explanation = {
+                    "title_similarity": round(float(title_sims[i]), 3),
+                    "description_similarity": round(float(desc_sims[i]), 3),
+                    "description_bonus": w.description_bonus if has_desc[i] else 0.0,
+                    "weights": {"title": w.title, "description": w.description},
+                    "matched_terms": self._matched_terms(resources[i], course),
+                }
+            ranked.append(ScoredResource(resources[i], float(scores[i]), explanation))
+        return ranked
+
+    def _matched_terms(self, resource, course, limit: int = 5) -> List[str]:
+        """Course words that also occur in the resource title/description (explanations only)."""
+        course_terms = set(_words(_course_text(course)))
+        resource_terms = _words(_field(resource, "title") + " " + _field(resource, "description"))
+        seen = []
+        for term in resource_terms:
+            if term in course_terms and term not in seen:
+                seen.append(term)
+        return seen[:limit]
+
+
+_default_scorer = TfidfResourceScorer()
+
+
+def score_resource(resource, course, weights: Optional[ScoringWeights] = None) -> float:
     """
     Compute a relevance/quality score between this resource and the course.
-    This can be as sophisticated as needed; for now, use title similarity and fallback.
+    Single-resource convenience wrapper; score candidate lists with
+    ResourceScorer.score_many / rank to get one vectorized pass.
     """
-    course_title = getattr(course, 'title', str(course))
-    res_title = resource.get("title", "")
-    # Very basic similarity ratio, can extend to embedding/AI scoring
-    title_score = SequenceMatcher(None, res_title.lower(), course_title.lower()).ratio()
-    # Additional: prioritize resources with description present
-    desc_bonus = 0.1 if resource.get("description") else 0
-    # Placeholder for more signal (citations, domain, recency, etc.)
-    return round(title_score + desc_bonus, 3)
+    scorer = _default_scorer if weights is None else TfidfResourceScorer(weights)
+    return float(scorer.score_many([resource], course)[0])
+
 
 class ResourceScorer:
     """
     Class encapsulating resource scoring and filtering logic.
     Used by resource discovery orchestrators and integration tests.
     """
+    def __init__(self, weights: Optional[ScoringWeights] = None):
+        self.engine = TfidfResourceScorer(weights)
+
     def score(self, resource, course_content) -> float:
-        # Proxy to score_resource for backward compatibility
-        return score_resource(resource, course_content)
-    
-    def filter_by_score(self, resources: List[Any], min_score: float = 0.7) -> List[Any]:
+        return float(self.engine.score_many([resource], course_content)[0])
+
+    def score_many(self, resources: Sequence[Any], course_content) -> List[float]:
+        return [float(s) for s in self.engine.score_many(list(resources), course_content)]
+
+    def rank(self, resources: Sequence[Any], course_content, explain: bool = False,
+             top_k: Optional[int] = None) -> List[ScoredResource]:
+        return self.engine.rank(resources, course_content, explain=explain, top_k=top_k)
+
+    def filter_by_score(self, resources: List[Any], min_score: float = 0.7,
+                        course_content=None) -> List[Any]:
         """
         Filter a list of resources, keeping only those with score >= min_score.
-        Will auto-score resources that do not have a 'score' attribute.
-        Returns filtered list, preserving input order.
+        Resources without a 'score' are scored together in one batch against
+        course_content. Returns filtered list, preserving input order.
         """
-        filtered = []
+        scores = []
+        unscored = []
         for r in resources:
             sc = getattr(r, "score", None)
             # r may be a dict or an object, so fallback to .get
             if sc is None and hasattr(r, "get"):
                 sc = r.get("score", None)
-            if sc is None and hasattr(r, "__dict__"):
-                sc = getattr(r, "score", None)
             if sc is None:
-                # Try to score if not present and course content is available
-                # Here, we assume original resource list had course_content passed separately if needed
-                sc = self.score(r, course_content=None)  # None will fallback to string
-            if sc is not None and sc >= min_score:
-                filtered.append(r)
-        return filtered
+                unscored.append(len(scores))
+            scores.append(sc)
+        if unscored:
+            batch = self.score_many([resources[i] for i in unscored], course_content)
+            for i, sc in zip(unscored, batch):
+                scores[i] = sc
+        return [r for r, sc in zip(resources, scores) if sc is not None and sc >= min_score]
 
 # For compatibility with previous interface and test imports
-__all__ = ["score_resource", "ResourceScorer"]
+__all__ = ["score_resource", "ResourceScorer", "ScoringWeights", "ScoredResource", "TfidfResourceScorer"]
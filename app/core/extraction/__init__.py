@@ -2,7 +2,15 @@
 AeroLearn AI Content Extraction Package Init
 
 Exports primary extractors for use elsewhere in the pipeline.
+Extractors are resolved on first access, so importing the package does not
+load any parser modules.
 """
-from .text_extractor import TextExtractor
-from .structured_data_extractor import StructuredDataExtractor
-from .multimedia_metadata_extractor import MultimediaMetadataExtractor
\ No newline at end of file
+from app.utils.lazy_import import lazy_exports
+
+__all__ = ["TextExtractor", "StructuredDataExtractor", "MultimediaMetadataExtractor"]
+
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "TextExtractor": ".text_extractor",
+    "StructuredDataExtractor": ".structured_data_extractor",
+    "MultimediaMetadataExtractor": ".multimedia_metadata_extractor",
+})
\ No newline at end of file
@@ -1,10 +1,10 @@
 import os
 from typing import Dict, Any
 
-try:
-    from PIL import Image
-except ImportError:
-    Image = None
+from app.utils.lazy_import import lazy_import
+
+# Imported on first use; the proxy is falsy when Pillow is missing
+Image = lazy_import("PIL.Image", "pip install pillow")
 
 class MultimediaMetadataExtractionError(Exception):
     pass
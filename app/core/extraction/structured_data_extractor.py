@@ -1,18 +1,12 @@
 import os
 from typing import List, Dict, Any, Union
 
-try:
-    import pdfplumber
-except ImportError:
-    pdfplumber = None
-try:
-    import docx
-except ImportError:
-    docx = None
-try:
-    import pptx
-except ImportError:
-    pptx = None
+from app.utils.lazy_import import lazy_import
+
+# Heavy optional parsers are imported on first use; each proxy is falsy when the package is missing
+pdfplumber = lazy_import("pdfplumber", "pip install pdfplumber")
+docx = lazy_import("docx", "pip install python-docx")
+pptx = lazy_import("pptx", "pip install python-pptx")
 
 class StructuredDataExtractionError(Exception):
     pass
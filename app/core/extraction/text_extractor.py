@@ -1,26 +1,14 @@
 import os
 from typing import Union, List, Dict, Any
 
-try:
-    import pdfplumber
-except ImportError:
-    pdfplumber = None
-try:
-    import pytesseract
-except ImportError:
-    pytesseract = None
-try:
-    from PIL import Image
-except ImportError:
-    Image = None
-try:
-    import docx
-except ImportError:
-    docx = None
-try:
-    import pptx
-except ImportError:
-    pptx = None
+from app.utils.lazy_import import lazy_import
+
+# Heavy optional parsers are imported on first use; each proxy is falsy when the package is missing
+pdfplumber = lazy_import("pdfplumber", "pip install pdfplumber")
+pytesseract = lazy_import("pytesseract", "pip install pytesseract")
+Image = lazy_import("PIL.Image", "pip install pillow")
+docx = lazy_import("docx", "pip install python-docx")
+pptx = lazy_import("pptx", "pip install python-pptx")
 
 class TextExtractionError(Exception):
     pass
@@ -30,6 +30,7 @@ except ImportError:
     from integrations.registry.component_state import ComponentState
 
 from integrations.registry.component_registry import ComponentRegistry
+from integrations.monitoring.status_propagation import DependencyIndex, StatusPropagator, history_buffer
 
 # Module-level singleton instance with thread safety
 _DASHBOARD_SINGLETON = None
@@ -75,9 +76,18 @@ class ServiceHealthDashboard:
 
     Metrics Support:
     - update_component_status accepts optional metrics dict for audit/dashboard/test compliance
-    - get_status_history retrieves full status history for a component
+    - get_status_history retrieves status history for a component (the most recent
+      `history_limit` records are kept per component)
+
+    Cascading:
+    - Dependents are found through a reverse-dependency index that is rebuilt only when
+      the dependency graph changes, so a cascade touches only the affected components
+    - Use `configure_propagation(debounce_seconds=...)` to coalesce flapping components;
+      held-back cascades are released by later updates or `flush_pending_cascades()`
     """
 
+    history_limit = 1000
+
     def __new__(cls, registry=None, status_tracker=None):
         global _DASHBOARD_SINGLETON
         with _DASHBOARD_SINGLETON_LOCK:
@@ -105,7 +115,9 @@ class ServiceHealthDashboard:
 
         # Use explicitly provided registry or create a new one
         self.registry = registry or ComponentRegistry()
-        self._component_history = {}  # name -> List[StatusRecord]
+        self._component_history = {}  # name -> bounded deque of StatusRecord
+        self._dependency_index = DependencyIndex()
+        self._propagator = StatusPropagator(self._dependency_index)
         self._watchers = set()
         self._listeners = {}  # Dict[str, Callable]
 
@@ -127,6 +139,8 @@ class ServiceHealthDashboard:
         :return: Dictionary mapping component names to ComponentStatus objects
                  for test compatibility
         """
+        if self._propagator.has_pending():
+            self.flush_pending_cascades(force=False)
         updated_statuses = {}
 
         if self.status_tracker and hasattr(self.status_tracker, "update_all_statuses"):
@@ -236,7 +250,7 @@ class ServiceHealthDashboard:
 
         # Initialize history tracking if not already present
         if component_id not in self._component_history:
-            self._component_history[component_id] = []
+            self._component_history[component_id] = history_buffer(self.history_limit)
 
         # Record current state if component exists - try both access patterns
         comp = None
@@ -342,11 +356,11 @@ class ServiceHealthDashboard:
             if history:
                 return history
 
-        records = self._component_history.get(component_id, [])
+        records = self._component_history.get(component_id, ())
         if time_range:
             start, end = time_range
             return [r for r in records if start <= r.timestamp <= end]
-        return records
+        return list(records)
         
     def get_component_history(self, component_id: str, time_range: Tuple[datetime, datetime] = None) -> List[StatusRecord]:
         """
@@ -424,6 +438,10 @@ class ServiceHealthDashboard:
         
         # Check for cascaded update to prevent infinite recursion
         is_cascaded = kwargs.get('cascaded', False) or ('cascaded_from' in _metrics)
+
+        # Release cascades of flapping components whose debounce window has elapsed
+        if not is_cascaded and self._propagator.has_pending():
+            self.flush_pending_cascades(force=False)
         
         print(f"[DEBUG] Component metrics: {_metrics}")
 
@@ -503,110 +521,127 @@ class ServiceHealthDashboard:
         return updated
     
     def _cascade_status(self, component_id: str, state: ComponentState, details: Dict = None, message: str = None):
-        print(f"[DEBUG] _cascade_status: {component_id=}, {state=}")
         """
         Propagate status changes through the dependency graph.
         When a component goes DOWN/FAILED/DEGRADED, propagate that status to dependent components.
         ALWAYS fires notifications for dependents on cascade, even if status is already at the target value,
-        to guarantee TDD test log match.
-        
+        to guarantee TDD test log match. Dependents already DOWN/FAILED are left alone and not
+        descended into: their own failure has already cascaded to everything behind them.
+
+        Changes of a component that flaps within the debounce window are coalesced; see
+        `configure_propagation` and `flush_pending_cascades`.
+
         :param component_id: Component that changed status
         :param state: New component state
         :param details: Optional status details/metrics
         :param message: Optional status message
+        :return: List of dependents that were updated
         """
+        if not self._propagator.submit(component_id, state, (details, message)):
+            return []
+        return self._dispatch_cascade(component_id, state, details, message)
+
+    def _dispatch_cascade(self, component_id: str, state: ComponentState, details: Dict = None, message: str = None) -> List[str]:
+        """Push one status change of `component_id` to its dependents (see `_cascade_status`)."""
         # Only cascade critical states (DEGRADED, DOWN, FAILED)
         if state not in (ComponentState.DEGRADED, ComponentState.DOWN, ComponentState.FAILED):
-            return
-            
-        # Get dependency graph
-        dep_graph = self.get_dependency_graph()
-        print(f"[DEBUG] Dependency graph: {dep_graph}")
-        
-        # Find components that depend on the changed component
-        dependents = self._find_dependent_components(component_id, dep_graph)
-        print(f"[DEBUG] Found dependents for {component_id}: {dependents}")
-        
+            return []
+
+        self._sync_dependency_index()
+
         # Create cascaded details
-        cascaded_details = dict(details or {})
+        cascaded_details = dict(details or {}) if isinstance(details, dict) else {}
         cascaded_details["cascaded_from"] = component_id
         cascaded_message = f"Status cascaded from dependency: {component_id} ({state.name})"
         if message:
             cascaded_message += f" - {message}"
-            
+
         # Always use DEGRADED as the actual component state for cascaded updates
         # (This ensures consistent internal state representation)
         cascaded_state = ComponentState.DEGRADED
-            
-        # Update dependent components with cascaded status
-        for dependent in dependents:
+
+        def visit(dependent, via):
             try:
-                # Get current state but don't use it to filter - always notify
-                # This ensures TDD test log matches by always emitting events
-                current_state = self.status_for(dependent)  # Just to check if component exists
-                print(f"[DEBUG] Cascading to dependent {dependent} (current state: {current_state})")
-                
-                # For test compatibility: Always use _force_notify_string='IMPAIRED' 
-                # This ensures notification happens even if the state doesn't change
-                force_notify = 'IMPAIRED'
-                
-                # Debug instrumentation for clarity
-                cascaded_details["cascade_debug"] = {
-                    "source": component_id,
-                    "source_state": state.name,
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-                
-                # Always update and notify, regardless of current state
-                self.update_component_status(
-                    dependent, 
-                    cascaded_state, 
-                    cascaded_details, 
-                    cascaded_message,
-                    _force_notify_string=force_notify
-                )
+                current_state = self.status_for(dependent)
             except KeyError:
-                continue  # Skip if component not found
-    
+                return False  # Skip if component not found
+            if current_state in (ComponentState.DOWN, ComponentState.FAILED):
+                return False
+
+            # Debug instrumentation for clarity
+            cascaded_details["cascade_debug"] = {
+                "source": component_id,
+                "via": via,
+                "source_state": state.name,
+                "timestamp": datetime.utcnow().isoformat()
+            }
+
+            # For test compatibility: always use _force_notify_string='IMPAIRED'
+            # This ensures notification happens even if the state doesn't change
+            self.update_component_status(
+                dependent,
+                cascaded_state,
+                cascaded_details,
+                cascaded_message,
+                _force_notify_string='IMPAIRED'
+            )
+            return True
+
+        return self._propagator.propagate(component_id, visit)
+
+    def _dependency_version(self):
+        """Change token of whichever dependency graph get_dependency_graph() reads, if it has one."""
+        tracker = self.status_tracker
+        if tracker and (hasattr(tracker, "get_dependency_graph") or hasattr(tracker, "_dependency_graph")):
+            return getattr(tracker, "dependency_version", None)
+        return getattr(self.registry, "dependency_version", None)
+
+    def _sync_dependency_index(self):
+        """Rebuild the reverse-dependency index only if the dependency graph changed."""
+        self._dependency_index.sync(self.get_dependency_graph, self._dependency_version())
+
     def _find_dependent_components(self, component_id: str, dep_graph: Dict[str, List[str]] = None) -> List[str]:
-        print(f"[DEBUG] Finding dependents for {component_id}")
         """
         Find all components that directly or indirectly depend on the given component.
         Used for cascading status propagation through the dependency graph.
-        
+
         :param component_id: Component to find dependents for
-        :param dep_graph: Optional dependency graph (will be fetched if not provided)
-        :return: List of component IDs that depend on the given component
+        :param dep_graph: Optional dependency graph (the dashboard's index is used if not provided)
+        :return: List of component IDs that depend on the given component, nearest first
         """
-        if dep_graph is None:
-            dep_graph = self.get_dependency_graph()
-            
-        # Use a set to track visited components and avoid cycles
-        visited = set()
-        
-        def find_dependents_recursive(comp_id):
-            if comp_id in visited:
-                print(f"[DEBUG] Already visited {comp_id}, skipping")
-                return []
-                
-            visited.add(comp_id)
-            direct_dependents = []
-            
-            # Find direct dependents (components that list this component as a dependency)
-            for comp, deps in dep_graph.items():
-                if comp_id in deps and comp not in visited:
-                    print(f"[DEBUG] Found dependent: {comp} depends on {comp_id}")
-                    direct_dependents.append(comp)
-                    # Recursive traversal for transitive dependencies
-                    direct_dependents.extend(find_dependents_recursive(comp))
-                    
-            return direct_dependents
-            
-        # Start recursive search
-        dependents = find_dependents_recursive(component_id)
-                
-        # Return unique list of dependents
-        return list(set(dependents))
+        if dep_graph is not None:
+            return DependencyIndex(dep_graph).transitive_dependents(component_id)
+        self._sync_dependency_index()
+        return self._dependency_index.transitive_dependents(component_id)
+
+    def configure_propagation(self, debounce_seconds: float = None, history_limit: int = None):
+        """
+        Configure cascading status propagation.
+
+        :param debounce_seconds: Window within which repeated changes of one component are
+                                 coalesced into a single cascade (0 disables debouncing)
+        :param history_limit: Maximum number of status records kept per component
+        """
+        if debounce_seconds is not None:
+            self._propagator.debounce_seconds = debounce_seconds
+        if history_limit is not None:
+            self.history_limit = history_limit
+            for cid, records in self._component_history.items():
+                self._component_history[cid] = history_buffer(history_limit)
+                self._component_history[cid].extend(records)
+
+    def flush_pending_cascades(self, force: bool = True) -> List[str]:
+        """
+        Dispatch cascades that were held back by the debounce window.
+
+        :param force: If False, only release changes whose window has elapsed
+        :return: List of components whose pending change was propagated
+        """
+        flushed = []
+        for component_id, state, (details, message) in self._propagator.drain(force=force):
+            self._dispatch_cascade(component_id, state, details, message)
+            flushed.append(component_id)
+        return flushed
 
     def _append_history(self, component_id: str, state: ComponentState, metrics: Dict = None, message: str = None, force_notify_string: str = None):
         """
@@ -619,7 +654,7 @@ class ServiceHealthDashboard:
         :param force_notify_string: Optional string to use for notification even if state doesn't change
         """
         if component_id not in self._component_history:
-            self._component_history[component_id] = []
+            self._component_history[component_id] = history_buffer(self.history_limit)
 
         # Unwrap state if it's a wrapper object
         if hasattr(state, 'state'):
@@ -789,7 +824,7 @@ class ServiceHealthDashboard:
 
         :return: Dictionary mapping component names to lists of status records
         """
-        return self._component_history.copy()
+        return {cid: list(records) for cid, records in self._component_history.items()}
     
     def clear(self):
         """
@@ -798,8 +833,10 @@ class ServiceHealthDashboard:
         Protocol-compliant for clear_all_status_tracking().
         NOTE: Avoids circular recursion with status_tracker.clear().
         """
-        # Clear component history
+        # Clear component history and propagation state
         self._component_history.clear()
+        self._dependency_index.clear()
+        self._propagator.clear()
         
         # Clear watchers and listeners
         self._watchers.clear()
@@ -3,6 +3,8 @@ from typing import Callable, List, Dict, Any, Optional
 from dataclasses import dataclass, field
 from threading import Lock
 
+from app.core.monitoring.error_store import ErrorStore
+
 # --- Protocol-compliant Severity Enum ---
 class ErrorSeverity(Enum):
     CRITICAL = auto()
@@ -32,8 +34,8 @@ class ErrorLogger:
             return cls._instance
 
     def _init_internal(self):
-        # Internal log storage
-        self._logs: List[ErrorEntry] = []
+        # Bounded, indexed log storage (see error_store.py); reconfigure with configure_storage()
+        self._store = ErrorStore(severity_type=ErrorSeverity)
         # Registered notification rules
         self._notification_rules: List[tuple[Callable[[ErrorEntry], bool], Callable[[ErrorEntry], None]]] = []
         self._notification_lock = Lock()
@@ -56,9 +58,8 @@ class ErrorLogger:
             category=category,
             metadata=metadata or {},
         )
-        # Add to central collection
-        with self._lock:
-            self._logs.append(entry)
+        # Add to central collection (repeats of the same error are folded into one record)
+        self._store.add(component_name, message, severity, category, entry.metadata)
 
         # Check and fire notifications
         with self._notification_lock:
@@ -66,46 +67,47 @@ class ErrorLogger:
                 if rule(entry):
                     callback(entry)
 
+    def configure_storage(self, capacity: int = 10000, spill_path: Optional[str] = None, **options):
+        """Replace the log storage, e.g. to change the ring capacity or spill evicted errors to SQLite.
+
+        Options are passed to ErrorStore (dedup_window, bucket_seconds, max_spill_rows, ...).
+        Existing records are discarded.
+        """
+        with self._lock:
+            self._store.close()
+            self._store = ErrorStore(capacity=capacity, spill_path=spill_path,
+                                     severity_type=ErrorSeverity, **options)
+
     def query_errors(
         self, 
         component: Optional[str] = None, 
         severity: Optional[ErrorSeverity] = None,
         category: Optional[str] = None,
         limit: Optional[int] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        where: Optional[Callable[[Dict], bool]] = None,
+        include_spilled: bool = False,
     ) -> List[Dict]:
-        """Query log history; filterable by component, severity, category."""
-        with self._lock:
-            filtered = [
-                entry for entry in self._logs
-                if (component is None or entry.component == component)
-                and (severity is None or entry.severity == severity)
-                and (category is None or entry.category == category)
-            ]
-            if limit is not None:
-                filtered = filtered[-limit:]
-            # Return as dicts for easier test/assert (and possible API serialization)
-            return [
-                {
-                    "component": e.component,
-                    "message": e.message,
-                    "severity": e.severity,
-                    "category": e.category,
-                    "metadata": e.metadata,
-                }
-                for e in filtered
-            ]
+        """Query log history; filterable by component, severity (one or several), category and time range.
+
+        Deduplicated repeats come back as one entry with "count", "first_seen" and "last_seen".
+        `where` is an extra predicate on the entry dict; `since`/`until` are epoch seconds.
+        """
+        predicate = (lambda record: where(record.to_dict())) if where is not None else None
+        records = self._store.query(component=component, severity=severity, category=category,
+                                    since=since, until=until, where=predicate, limit=limit,
+                                    include_spilled=include_spilled)
+        # Return as dicts for easier test/assert (and possible API serialization)
+        return [r.to_dict() for r in records]
+
+    def top_errors(self, limit: int = 10, since: Optional[float] = None) -> List[Dict]:
+        """Most frequent error fingerprints, for incident triage."""
+        return self._store.top_fingerprints(limit, since)
 
     def aggregate_errors(self) -> Dict[str, Any]:
         """Aggregate error information for diagnostics and protocol reporting."""
-        with self._lock:
-            count_by_severity = {}
-            for e in self._logs:
-                key = str(e.severity)
-                count_by_severity[key] = count_by_severity.get(key, 0) + 1
-            return {
-                "count": len(self._logs),
-                "by_severity": count_by_severity,
-            }
+        return self._store.stats()
 
     def register_notification_rule(self, rule: Callable[[Dict], bool], callback: Callable[[Dict], None]):
         """Register a notification rule.
@@ -135,8 +137,7 @@ class ErrorLogger:
 
     def clear(self):
         """For test cleanup: clear all logs and notification rules."""
-        with self._lock:
-            self._logs.clear()
+        self._store.clear()
         with self._notification_lock:
             self._notification_rules.clear()
 
@@ -0,0 +1,354 @@
+"""
+Bounded, indexed error storage for ErrorLogger.
+Location: app/core/monitoring/error_store.py
+
+- A fixed-capacity in-memory ring of recent error records; memory stays flat
+  no matter how long the process runs.
+- Secondary indexes (component, severity, category, time bucket) over the
+  ring, so queries intersect small id sets instead of scanning every record.
+- Fingerprinting: repeats of the same error (same component, category,
+  severity and message modulo numbers/ids) within ``dedup_window`` seconds
+  increment a counter on the existing record instead of taking a new slot.
+- Optional spill of evicted records to a SQLite file, trimmed to
+  ``max_spill_rows`` (oldest rows go first), queried transparently.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Type, Union
+
+_VOLATILE = re.compile(
+    r"0x[0-9a-fA-F]+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|\d+"
+)
+
+
+def fingerprint(component: str, category: str, severity: Any, message: str) -> str:
+    """Stable identity of an error: numbers, hex values and UUIDs in the message are ignored."""
+    normalized = _VOLATILE.sub("#", message or "").strip().lower()
+    name = severity.name if isinstance(severity, Enum) else str(severity)
+    return f"{component}|{category}|{name}|{normalized}"
+
+
+@dataclass
+class ErrorRecord:
+    """One (possibly deduplicated) error occurrence group."""
+    id: int
+    component: str
+    message: str
+    severity: Any
+    category: str
+    metadata: Dict[str, Any]
+    fingerprint: str
+    first_seen: float
+    last_seen: float
+    count: int = 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "component": self.component,
+            "message": self.message,
+            "severity": self.severity,
+            "category": self.category,
+            "metadata": self.metadata,
+            "count": self.count,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "fingerprint": self.fingerprint,
+        }
+
+
+@dataclass
+class FingerprintStats:
+    """Lifetime counters for one fingerprint (kept even after its records leave the ring)."""
+    count: int = 0
+    first_seen: float = 0.0
+    last_seen: float = 0.0
+    sample: str = ""
+    component: str = ""
+    severity: Any = None
+
+
+class ErrorStore:
+    """
+    Ring buffer of ErrorRecords with field/time indexes, dedup and SQLite spill.
+
+    Args:
+        capacity: Maximum records kept in memory
+        dedup_window: Seconds during which a repeated fingerprint is folded
+            into the previous record (0 disables deduplication)
+        bucket_seconds: Width of the time-bucket index
+        spill_path: SQLite file for evicted records (None drops them)
+        max_spill_rows: Rows kept in the spill file
+        max_fingerprints: Lifetime fingerprint counters kept (LRU)
+        severity_type: Enum used to restore severities read back from the spill file
+    """
+
+    def __init__(self, capacity: int = 10000, dedup_window: float = 60.0, bucket_seconds: int = 60,
+                 spill_path: Optional[str] = None, max_spill_rows: int = 1_000_000,
+                 max_fingerprints: int = 10000, severity_type: Optional[Type[Enum]] = None,
+                 clock: Callable[[], float] = time.time):
+        self.capacity = capacity
+        self.dedup_window = dedup_window
+        self.bucket_seconds = bucket_seconds
+        self.max_spill_rows = max_spill_rows
+        self.max_fingerprints = max_fingerprints
+        self.severity_type = severity_type
+        self.clock = clock
+        self._lock = threading.RLock()
+        self._next_id = 0
+        self._ring: Deque[ErrorRecord] = deque()
+        self._by_id: Dict[int, ErrorRecord] = {}
+        self._index: Dict[str, Dict[Any, Set[int]]] = {
+            "component": {}, "severity": {}, "category": {}, "bucket": {},
+        }
+        self._latest_by_fingerprint: Dict[str, int] = {}
+        self._fingerprints: "OrderedDict[str, FingerprintStats]" = OrderedDict()
+        self._occurrences = 0
+        self._severity_counts: Dict[str, int] = {}
+        self._pending_spill: List[ErrorRecord] = []
+        self._conn: Optional[sqlite3.Connection] = None
+        if spill_path:
+            self._open_spill(spill_path)
+
+    # --- writes ---
+
+    def add(self, component: str, message: str, severity: Any, category: str,
+            metadata: Optional[Dict[str, Any]] = None, timestamp: Optional[float] = None) -> ErrorRecord:
+        """Store an occurrence; returns the (new or deduplicated) record."""
+        now = self.clock() if timestamp is None else timestamp
+        fp = fingerprint(component, category, severity, message)
+        with self._lock:
+            self._occurrences += 1
+            self._severity_counts[str(severity)] = self._severity_counts.get(str(severity), 0) + 1
+            stats = self._fingerprints.pop(fp, None) or FingerprintStats(
+                first_seen=now, sample=message, component=component, severity=severity)
+            stats.count += 1
+            stats.last_seen = now
+            self._fingerprints[fp] = stats
+            while len(self._fingerprints) > self.max_fingerprints:
+                self._fingerprints.popitem(last=False)
+
+            previous = self._by_id.get(self._latest_by_fingerprint.get(fp, -1))
+            if previous is not None and self.dedup_window > 0 and now - previous.last_seen <= self.dedup_window:
+                previous.count += 1
+                previous.last_seen = now
+                self._index_add("bucket", self._bucket(now), previous.id)
+                return previous
+
+            record = ErrorRecord(self._next_id, component, message, severity, category,
+                                 metadata or {}, fp, now, now)
+            self._next_id += 1
+            if len(self._ring) >= self.capacity:
+                self._evict(self._ring.popleft())
+            self._ring.append(record)
+            self._by_id[record.id] = record
+            self._latest_by_fingerprint[fp] = record.id
+            self._index_add("component", component, record.id)
+            self._index_add("severity", severity, record.id)
+            self._index_add("category", category, record.id)
+            self._index_add("bucket", self._bucket(now), record.id)
+            return record
+
+    def _bucket(self, ts: float) -> int:
+        return int(ts // self.bucket_seconds)
+
+    def _index_add(self, name: str, key: Any, record_id: int) -> None:
+        self._index[name].setdefault(key, set()).add(record_id)
+
+    def _index_discard(self, name: str, key: Any, record_id: int) -> None:
+        ids = self._index[name].get(key)
+        if ids is not None:
+            ids.discard(record_id)
+            if not ids:
+                del self._index[name][key]
+
+    def _evict(self, record: ErrorRecord) -> None:
+        del self._by_id[record.id]
+        if self._latest_by_fingerprint.get(record.fingerprint) == record.id:
+            del self._latest_by_fingerprint[record.fingerprint]
+        self._index_discard("component", record.component, record.id)
+        self._index_discard("severity", record.severity, record.id)
+        self._index_discard("category", record.category, record.id)
+        for bucket in range(self._bucket(record.first_seen), self._bucket(record.last_seen) + 1):
+            self._index_discard("bucket", bucket, record.id)
+        if self._conn is not None:
+            self._pending_spill.append(record)
+            if len(self._pending_spill) >= 256:
+                self.flush()
+
+    # --- queries ---
+
+    def query(self, component: Optional[str] = None,
+              severity: Union[Any, Iterable[Any], None] = None,
+              category: Optional[str] = None,
+              since: Optional[float] = None, until: Optional[float] = None,
+              where: Optional[Callable[[ErrorRecord], bool]] = None,
+              limit: Optional[int] = None, include_spilled: bool = False) -> List[ErrorRecord]:
+        """
+        Records matching every given field, oldest first.
+
+        Args:
+            severity: One severity or an iterable of severities
+            since/until: Inclusive time range on the record's last occurrence
+            where: Extra predicate evaluated on the candidate records
+            limit: Keep only the most recent `limit` records
+            include_spilled: Also search records spilled to SQLite
+        """
+        severities = None
+        if severity is not None:
+            severities = list(severity) if isinstance(severity, (list, tuple, set, frozenset)) else [severity]
+        with self._lock:
+            sets: List[Set[int]] = []
+            if component is not None:
+                sets.append(self._index["component"].get(component, set()))
+            if severities is not None:
+                sets.append(set().union(*(self._index["severity"].get(s, set()) for s in severities)))
+            if category is not None:
+                sets.append(self._index["category"].get(category, set()))
+            if since is not None or until is not None:
+                buckets = self._index["bucket"]
+                lo = self._bucket(since) if since is not None else min(buckets, default=0)
+                hi = self._bucket(until) if until is not None else max(buckets, default=-1)
+                if hi - lo + 1 <= len(buckets):
+                    ids = [buckets[b] for b in range(lo, hi + 1) if b in buckets]
+                else:
+                    ids = [v for b, v in buckets.items() if lo <= b <= hi]
+                sets.append(set().union(*ids))
+
+            if sets:
+                sets.sort(key=len)
+                candidates = set(sets[0])
+                for other in sets[1:]:
+                    candidates &= other
+                records = [self._by_id[i] for i in sorted(candidates)]
+            else:
+                records = list(self._ring)
+
+            records = [r for r in records
+                       if (since is None or r.last_seen >= since)
+                       and (until is None or r.first_seen <= until)
+                       and (where is None or where(r))]
+            if include_spilled and self._conn is not None:
+                spilled = self._query_spill(component, severities, category, since, until, limit)
+                records = [r for r in spilled if where is None or where(r)] + records
+        if limit is not None:
+            records = records[-limit:] if limit > 0 else []
+        return records
+
+    def top_fingerprints(self, limit: int = 10, since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Most frequent errors over the store's lifetime (for incident triage)."""
+        with self._lock:
+            items = [(fp, s) for fp, s in self._fingerprints.items() if since is None or s.last_seen >= since]
+        items.sort(key=lambda item: item[1].count, reverse=True)
+        return [{"fingerprint": fp, "count": s.count, "first_seen": s.first_seen, "last_seen": s.last_seen,
+                 "component": s.component, "severity": s.severity, "sample": s.sample}
+                for fp, s in items[:limit]]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "count": self._occurrences,
+                "by_severity": dict(self._severity_counts),
+                "records_in_memory": len(self._ring),
+                "distinct_fingerprints": len(self._fingerprints),
+            }
+
+    def __len__(self) -> int:
+        return len(self._ring)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ring.clear()
+            self._by_id.clear()
+            for index in self._index.values():
+                index.clear()
+            self._latest_by_fingerprint.clear()
+            self._fingerprints.clear()
+            self._pending_spill.clear()
+            self._occurrences = 0
+            self._severity_counts.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM error_log")
+                self._conn.commit()
+
+    # --- spill file ---
+
+    def _open_spill(self, path: str) -> None:
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS error_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                component TEXT, message TEXT, severity TEXT, category TEXT, metadata TEXT,
+                fingerprint TEXT, first_seen REAL, last_seen REAL, count INTEGER);
+            CREATE INDEX IF NOT EXISTS idx_error_component ON error_log (component, last_seen);
+            CREATE INDEX IF NOT EXISTS idx_error_severity ON error_log (severity, last_seen);
+            CREATE INDEX IF NOT EXISTS idx_error_category ON error_log (category, last_seen);
+            CREATE INDEX IF NOT EXISTS idx_error_last_seen ON error_log (last_seen);
+        """)
+
+    @staticmethod
+    def _severity_key(severity: Any) -> str:
+        return severity.name if isinstance(severity, Enum) else str(severity)
+
+    def flush(self) -> None:
+        """Write pending evicted records to the spill file and trim it to max_spill_rows."""
+        with self._lock:
+            if self._conn is None or not self._pending_spill:
+                return
+            rows = [(r.component, r.message, self._severity_key(r.severity), r.category,
+                     json.dumps(r.metadata, default=str), r.fingerprint, r.first_seen, r.last_seen, r.count)
+                    for r in self._pending_spill]
+            self._pending_spill.clear()
+            self._conn.executemany(
+                "INSERT INTO error_log (component, message, severity, category, metadata, fingerprint, "
+                "first_seen, last_seen, count) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            # Rotation: drop the oldest rows beyond the cap
+            self._conn.execute(
+                "DELETE FROM error_log WHERE id <= (SELECT MAX(id) FROM error_log) - ?", (self.max_spill_rows,))
+            self._conn.commit()
+
+    def _query_spill(self, component, severities, category, since, until, limit) -> List[ErrorRecord]:
+        self.flush()
+        clauses, params = [], []
+        if component is not None:
+            clauses.append("component = ?")
+            params.append(component)
+        if severities is not None:
+            clauses.append(f"severity IN ({','.join('?' * len(severities))})")
+            params.extend(self._severity_key(s) for s in severities)
+        if category is not None:
+            clauses.append("category = ?")
+            params.append(category)
+        if since is not None:
+            clauses.append("last_seen >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("first_seen <= ?")
+            params.append(until)
+        sql = "SELECT * FROM error_log"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id DESC"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        rows = self._conn.execute(sql, params).fetchall()
+        records = []
+        for row_id, comp, msg, sev, cat, meta, fp, first, last, count in reversed(rows):
+            if self.severity_type is not None and sev in self.severity_type.__members__:
+                sev = self.severity_type[sev]
+            records.append(ErrorRecord(-row_id, comp, msg, sev, cat, json.loads(meta or "{}"),
+                                       fp, first, last, count))
+        return records
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self.flush()
+                self._conn.close()
+                self._conn = None
@@ -1,16 +1,31 @@
 """
-Notification Center for AeroLearn AI - Stub Implementation
+Notification Center for AeroLearn AI
 Location: app/core/monitoring/notification_center.py
 
-This is a simplified stub implementation of the NotificationCenter
-for compatibility with service dashboard tests.
+Routes, stores and delivers notifications (see /docs/api/notification_api.md).
+
+- Storage is a NotificationStore (SQLite, in-memory unless a path is given)
+  with per-recipient inbox indexes by status and category; reads are paged.
+- Broadcasts are stored once and fanned out on read, so an announcement to
+  every student costs the same as a direct notification.
+- Subscriptions are precomputed into (category, priority) buckets; notify
+  looks up the bucket instead of testing every subscription, and callbacks
+  run on a background worker instead of the caller's thread.
+- Recently used Notification objects are cached by id (LRU).
 """
 
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum
-from typing import List, Dict, Any, Optional, Set, Callable
+from typing import List, Dict, Any, Optional, Set, Callable, Tuple
+import copy
+import json
+import threading
 import uuid
 import time
 
+from app.core.monitoring.notification_store import NotificationStore, RetentionPolicy
+
 # Notification categories and priorities
 class NotificationCategory(Enum):
     SYSTEM = "system"
@@ -79,14 +94,47 @@ class Notification:
 # Observer/callback type for subscriptions
 NotificationCallback = Callable[[Notification], None]
 
+_CATEGORIES = {c.value: c for c in NotificationCategory}
+_PRIORITIES = {p.value: p for p in NotificationPriority}
+_STATUSES = {s.value: s for s in NotificationStatus}
+
+
 class NotificationCenter:
     """
-    Stub implementation of NotificationCenter that maintains the same interface
-    but with simplified functionality for testing purposes.
+    Thread-safe notification hub with SQLite-backed, paged per-recipient inboxes.
+
+    Args:
+        db_path: SQLite database for notification storage (":memory:" by default)
+        retention: Optional RetentionPolicy, enforced every `retention_interval` notifications
+        async_callbacks: Run subscriber callbacks on a background worker (in notify order);
+            set False to call them inline
+        cache_size: Number of Notification objects kept in the by-id cache
     """
-    def __init__(self):
-        self._notifications = []
-        self._subscriptions = {}
+    def __init__(
+        self,
+        db_path: str = ":memory:",
+        retention: Optional[RetentionPolicy] = None,
+        async_callbacks: bool = True,
+        cache_size: int = 10000,
+        retention_interval: int = 1000,
+    ):
+        self._store = NotificationStore(db_path)
+        self._lock = threading.RLock()
+        self._subscriptions: Dict[str, Dict[str, Any]] = {}
+        # (category, priority) -> broadcast callbacks, rebuilt on (un)subscribe
+        self._bucket_callbacks: Dict[Tuple[NotificationCategory, NotificationPriority], Tuple[NotificationCallback, ...]] = {}
+        self._cache: "OrderedDict[str, Notification]" = OrderedDict()
+        self._seq_by_id: Dict[str, int] = {}
+        self.cache_size = cache_size
+        self.retention = retention
+        self.retention_interval = retention_interval
+        self._since_retention = 0
+        self.async_callbacks = async_callbacks
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._last_dispatch: Optional[Future] = None
+        self.callback_errors = 0
+
+    # -- subscriptions ---------------------------------------------------
 
     def subscribe(
         self,
@@ -95,56 +143,239 @@ class NotificationCenter:
         priorities: Optional[Set[NotificationPriority]] = None,
         callback: Optional[NotificationCallback] = None,
     ):
-        self._subscriptions[subscriber_id] = {
-            'categories': categories or set(NotificationCategory),
-            'priorities': priorities or set(NotificationPriority),
-            'callback': callback
-        }
+        with self._lock:
+            sub = {
+                'categories': set(categories or NotificationCategory),
+                'priorities': set(priorities or NotificationPriority),
+                'callback': callback
+            }
+            self._subscriptions[subscriber_id] = sub
+            self._store.subscribe(
+                subscriber_id,
+                [(c.value, p.value) for c in sub['categories'] for p in sub['priorities']]
+            )
+            self._rebuild_buckets()
 
     def unsubscribe(self, subscriber_id: str):
-        if subscriber_id in self._subscriptions:
-            del self._subscriptions[subscriber_id]
+        with self._lock:
+            if subscriber_id in self._subscriptions:
+                del self._subscriptions[subscriber_id]
+                self._store.unsubscribe(subscriber_id)
+                self._rebuild_buckets()
+
+    def _rebuild_buckets(self):
+        buckets: Dict[Tuple[NotificationCategory, NotificationPriority], List[NotificationCallback]] = {}
+        for sub in self._subscriptions.values():
+            if sub['callback'] is None:
+                continue
+            for category in sub['categories']:
+                for priority in sub['priorities']:
+                    buckets.setdefault((category, priority), []).append(sub['callback'])
+        # Replaced wholesale so notify can read it without taking the lock
+        self._bucket_callbacks = {key: tuple(cbs) for key, cbs in buckets.items()}
+
+    # -- delivery --------------------------------------------------------
 
     def notify(self, notification: Notification):
-        self._notifications.append(notification)
-        # Call callbacks for matching subscribers
-        for subscriber_id, sub in self._subscriptions.items():
-            if notification.category in sub['categories'] and notification.priority in sub['priorities']:
-                if sub['callback']:
-                    sub['callback'](notification)
-
-    def get_notifications(self, recipient_id: str, unread_only: bool = False) -> List[Notification]:
-        if unread_only:
-            return [n for n in self._notifications if n.recipient_id == recipient_id and n.status == NotificationStatus.UNREAD]
-        return [n for n in self._notifications if n.recipient_id == recipient_id]
+        """
+        Store a notification and dispatch callbacks of subscribers whose categories and
+        priorities match. Direct notifications always land in the recipient's inbox and
+        call back only the recipient; broadcasts (recipient_id=None) reach every
+        subscriber of the matching (category, priority) bucket.
+        """
+        with self._lock:
+            seq = self._store.add(
+                notification.notification_id, notification.timestamp, notification.title,
+                notification.message, notification.category.value, notification.priority.value,
+                notification.recipient_id, notification.data, notification.source
+            )
+            self._remember(notification, seq)
+            callbacks = self._callbacks_for(notification)
+            if self.retention is not None:
+                self._since_retention += 1
+                if self._since_retention >= self.retention_interval:
+                    self.apply_retention()
+        if callbacks:
+            self._dispatch(callbacks, notification)
 
-    def archive_notification(self, recipient_id: str, notification_id: str) -> bool:
-        for n in self._notifications:
-            if n.notification_id == notification_id and n.recipient_id == recipient_id:
-                n.archive()
-                return True
-        return False
+    def _callbacks_for(self, notification: Notification) -> Tuple[NotificationCallback, ...]:
+        if notification.recipient_id is None:
+            return self._bucket_callbacks.get((notification.category, notification.priority), ())
+        sub = self._subscriptions.get(notification.recipient_id)
+        if (sub is None or sub['callback'] is None
+                or notification.category not in sub['categories']
+                or notification.priority not in sub['priorities']):
+            return ()
+        return (sub['callback'],)
 
-    def mark_as_read(self, recipient_id: str, notification_id: str) -> bool:
-        for n in self._notifications:
-            if n.notification_id == notification_id and n.recipient_id == recipient_id:
-                n.mark_read()
-                return True
-        return False
+    def _dispatch(self, callbacks, notification):
+        if not self.async_callbacks:
+            self._run_callbacks(callbacks, notification)
+            return
+        with self._lock:
+            if self._executor is None:
+                # A single worker keeps callbacks in notify order
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="notification-callbacks")
+            self._last_dispatch = self._executor.submit(self._run_callbacks, callbacks, notification)
+
+    def _run_callbacks(self, callbacks, notification):
+        for callback in callbacks:
+            try:
+                callback(notification)
+            except Exception:
+                # A failing subscriber must not block delivery to the others
+                self.callback_errors += 1
+
+    def flush_callbacks(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every callback dispatched so far has run. Returns False on timeout."""
+        pending = self._last_dispatch
+        if pending is None:
+            return True
+        try:
+            pending.result(timeout=timeout)
+        except Exception:
+            return pending.done()
+        return True
+
+    # -- inbox reads -----------------------------------------------------
+
+    def get_notifications(
+        self,
+        recipient_id: str,
+        unread_only: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        newest_first: bool = False,
+    ) -> List[Notification]:
+        """Page through a recipient's inbox (oldest first unless `newest_first`)."""
+        status = NotificationStatus.UNREAD if unread_only else None
+        return self.search_notifications(recipient_id, status=status, limit=limit,
+                                         offset=offset, newest_first=newest_first)
 
     def search_notifications(
         self,
         recipient_id: str,
         category: Optional[NotificationCategory] = None,
-        status: Optional[NotificationStatus] = None
+        status: Optional[NotificationStatus] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        newest_first: bool = False,
     ) -> List[Notification]:
-        results = []
-        for n in self._notifications:
-            if n.recipient_id == recipient_id:
-                if (category is None or n.category == category) and \
-                   (status is None or n.status == status):
-                    results.append(n)
-        return results
+        rows = self._store.inbox(
+            recipient_id,
+            status=status.value if status else None,
+            category=category.value if category else None,
+            limit=limit, offset=offset, newest_first=newest_first
+        )
+        with self._lock:
+            return [self._from_row(row[:-1], recipient_status=row[-1]) for row in rows]
+
+    def count_notifications(
+        self,
+        recipient_id: str,
+        category: Optional[NotificationCategory] = None,
+        status: Optional[NotificationStatus] = None,
+    ) -> int:
+        """Number of inbox entries matching the filters (e.g. an unread badge)."""
+        return self._store.count(
+            recipient_id,
+            status=status.value if status else None,
+            category=category.value if category else None
+        )
+
+    def get_notification(self, notification_id: str) -> Optional[Notification]:
+        with self._lock:
+            cached = self._cache.get(notification_id)
+            if cached is not None:
+                self._cache.move_to_end(notification_id)
+                return cached
+            row = self._store.get(notification_id)
+            return self._from_row(row) if row else None
+
+    # -- status changes --------------------------------------------------
+
+    def archive_notification(self, recipient_id: str, notification_id: str) -> bool:
+        return self._set_status(recipient_id, notification_id, NotificationStatus.ARCHIVED)
+
+    def mark_as_read(self, recipient_id: str, notification_id: str) -> bool:
+        return self._set_status(recipient_id, notification_id, NotificationStatus.READ)
+
+    def _set_status(self, recipient_id: str, notification_id: str, status: NotificationStatus) -> bool:
+        with self._lock:
+            notification = self.get_notification(notification_id)
+            if notification is None:
+                return False
+            if notification.recipient_id is not None and notification.recipient_id != recipient_id:
+                return False
+            if not self._store.set_status(recipient_id, self._seq_by_id[notification_id], status.value):
+                return False
+            if notification.recipient_id is not None:
+                # Direct notifications have a single reader, so the object carries its status
+                notification.status = status
+            return True
+
+    # -- maintenance -----------------------------------------------------
+
+    def apply_retention(self, policy: Optional[RetentionPolicy] = None, now: Optional[float] = None) -> int:
+        """Enforce a retention policy (the configured one by default); returns the number removed."""
+        policy = policy or self.retention
+        if policy is None:
+            return 0
+        with self._lock:
+            self._since_retention = 0
+            removed = self._store.apply_retention(policy, now)
+            for notification_id in removed:
+                self._cache.pop(notification_id, None)
+                self._seq_by_id.pop(notification_id, None)
+            return len(removed)
+
+    def clear(self):
+        """Drop all notifications and subscriptions (test isolation)."""
+        with self._lock:
+            self.flush_callbacks()
+            self._subscriptions.clear()
+            self._bucket_callbacks = {}
+            self._cache.clear()
+            self._seq_by_id.clear()
+            self._store.clear()
+
+    def _remember(self, notification: Notification, seq: int):
+        self._seq_by_id[notification.notification_id] = seq
+        self._cache[notification.notification_id] = notification
+        self._cache.move_to_end(notification.notification_id)
+        while len(self._cache) > self.cache_size:
+            evicted, _ = self._cache.popitem(last=False)
+            self._seq_by_id.pop(evicted, None)
+
+    def _from_row(self, row, recipient_status: Optional[str] = None) -> Notification:
+        seq, notification_id = row[0], row[1]
+        notification = self._cache.get(notification_id)
+        if notification is None:
+            _, _, ts, title, message, category, priority, recipient_id, data, source = row
+            notification = Notification(
+                title=title,
+                message=message,
+                category=_CATEGORIES.get(category, NotificationCategory.OTHER),
+                priority=_PRIORITIES.get(priority, NotificationPriority.NORMAL),
+                recipient_id=recipient_id,
+                data=json.loads(data) if data else {},
+                source=source,
+                notification_id=notification_id,
+            )
+            notification.timestamp = ts
+            self._remember(notification, seq)
+        else:
+            self._cache.move_to_end(notification_id)
+        if recipient_status is None:
+            return notification
+        status = _STATUSES.get(recipient_status, NotificationStatus.UNREAD)
+        if notification.recipient_id is not None:
+            notification.status = status
+            return notification
+        # Broadcasts are shared; hand out a view carrying this recipient's status
+        view = copy.copy(notification)
+        view.status = status
+        return view
 
 # Singleton export
 notification_center = NotificationCenter()
@@ -0,0 +1,298 @@
+"""
+SQLite storage behind NotificationCenter.
+Location: app/core/monitoring/notification_store.py
+
+- Every notification is stored once, keyed by an integer sequence number
+  (insertion order) with a unique index on notification_id.
+- Direct notifications get one row in ``inbox`` for their recipient; the
+  inbox is indexed by (recipient, seq), (recipient, status, seq) and
+  (recipient, category, seq), so page reads never scan other users' mail.
+- Broadcasts are fanned out on read, not on write: a subscription is
+  stored as (category, priority) bucket rows with the sequence interval
+  it was active for, and a subscriber's inbox is the union of their direct
+  rows and the broadcasts in their buckets and interval. An inbox row is
+  written for a broadcast only once that recipient reads or archives it.
+  A campus-wide announcement therefore costs one INSERT, whatever the
+  audience size.
+- RetentionPolicy trims old notifications and over-full inboxes. Trimming
+  an inbox raises the recipient's watermark in ``inbox_trim``: broadcasts
+  below it are no longer matched for that recipient, so a trimmed broadcast
+  cannot come back as unread once its inbox row is gone.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+UNREAD = "unread"
+
+
+@dataclass
+class RetentionPolicy:
+    """
+    max_age_seconds: notifications older than this are deleted (with their inbox rows).
+    max_per_recipient: only the newest N notifications (direct and broadcast) are kept per recipient.
+    """
+    max_age_seconds: Optional[float] = None
+    max_per_recipient: Optional[int] = None
+
+
+_COLUMNS = "n.seq, n.notification_id, n.ts, n.title, n.message, n.category, n.priority, n.recipient_id, n.data, n.source"
+
+# Items of one inbox: direct/materialized rows plus broadcasts matched through the
+# recipient's subscription intervals that have no inbox row yet and are not below
+# the recipient's trim watermark.
+_INBOX_ITEMS = """
+    SELECT i.seq AS seq, i.status AS status, i.category AS category
+      FROM inbox i
+     WHERE i.recipient_id = :r
+    UNION ALL
+    SELECT n.seq, 'unread', n.category
+      FROM subscriptions s
+      JOIN notifications n
+        ON n.recipient_id IS NULL
+       AND n.category = s.category
+       AND n.priority = s.priority
+       AND n.seq > s.since_seq
+       AND (s.until_seq IS NULL OR n.seq <= s.until_seq)
+     WHERE s.subscriber_id = :r
+       AND n.seq >= COALESCE((SELECT t.min_seq FROM inbox_trim t WHERE t.recipient_id = :r), 0)
+       AND NOT EXISTS (SELECT 1 FROM inbox i2 WHERE i2.recipient_id = :r AND i2.seq = n.seq)
+"""
+
+
+class NotificationStore:
+    """SQLite-backed notification log with per-recipient inboxes and bucketed subscriptions."""
+
+    def __init__(self, db_path: str = ":memory:"):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS notifications (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                notification_id TEXT NOT NULL UNIQUE,
+                ts REAL,
+                title TEXT,
+                message TEXT,
+                category TEXT,
+                priority INTEGER,
+                recipient_id TEXT,
+                data TEXT,
+                source TEXT
+            );
+            CREATE INDEX IF NOT EXISTS ix_notifications_broadcast
+                ON notifications (category, priority, seq) WHERE recipient_id IS NULL;
+            CREATE INDEX IF NOT EXISTS ix_notifications_ts ON notifications (ts);
+            CREATE TABLE IF NOT EXISTS inbox (
+                recipient_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                category TEXT,
+                PRIMARY KEY (recipient_id, seq)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS ix_inbox_status ON inbox (recipient_id, status, seq);
+            CREATE INDEX IF NOT EXISTS ix_inbox_category ON inbox (recipient_id, category, seq);
+            CREATE INDEX IF NOT EXISTS ix_inbox_seq ON inbox (seq);
+            CREATE TABLE IF NOT EXISTS subscriptions (
+                subscriber_id TEXT NOT NULL,
+                category TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                since_seq INTEGER NOT NULL,
+                until_seq INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS ix_subscriptions_subscriber
+                ON subscriptions (subscriber_id, category, priority);
+            CREATE TABLE IF NOT EXISTS inbox_trim (
+                recipient_id TEXT PRIMARY KEY,
+                min_seq INTEGER NOT NULL
+            ) WITHOUT ROWID;
+        ''')
+        self._conn.commit()
+
+    # -- writes ----------------------------------------------------------
+
+    def add(self, notification_id: str, ts: float, title: str, message: str, category: str,
+            priority: int, recipient_id: Optional[str], data: Dict[str, Any], source: Optional[str]) -> int:
+        """Store a notification (and the recipient's inbox row if direct); returns its sequence number."""
+        with self._lock:
+            cur = self._conn.execute(
+                'INSERT INTO notifications (notification_id, ts, title, message, category, priority, '
+                'recipient_id, data, source) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (notification_id, ts, title, message, category, priority, recipient_id,
+                 json.dumps(data, default=str), source)
+            )
+            seq = cur.lastrowid
+            if recipient_id is not None:
+                self._conn.execute(
+                    'INSERT INTO inbox (recipient_id, seq, status, category) VALUES (?, ?, ?, ?)',
+                    (recipient_id, seq, UNREAD, category)
+                )
+            self._conn.commit()
+            return seq
+
+    def set_status(self, recipient_id: str, seq: int, status: str) -> bool:
+        """
+        Set the recipient's status for a notification they received.
+        Returns False if the notification never reached that recipient.
+        """
+        with self._lock:
+            cur = self._conn.execute(
+                'UPDATE inbox SET status=? WHERE recipient_id=? AND seq=?', (status, recipient_id, seq)
+            )
+            if cur.rowcount:
+                self._conn.commit()
+                return True
+            row = self._conn.execute(
+                'SELECT n.category FROM notifications n JOIN subscriptions s '
+                'ON s.subscriber_id=? AND n.category=s.category AND n.priority=s.priority '
+                'AND n.seq > s.since_seq AND (s.until_seq IS NULL OR n.seq <= s.until_seq) '
+                'WHERE n.seq=? AND n.recipient_id IS NULL '
+                'AND n.seq >= COALESCE((SELECT min_seq FROM inbox_trim WHERE recipient_id=?), 0) LIMIT 1',
+                (recipient_id, seq, recipient_id)
+            ).fetchone()
+            if row is None:
+                return False
+            self._conn.execute(
+                'INSERT INTO inbox (recipient_id, seq, status, category) VALUES (?, ?, ?, ?)',
+                (recipient_id, seq, status, row[0])
+            )
+            self._conn.commit()
+            return True
+
+    def subscribe(self, subscriber_id: str, buckets: Iterable[Tuple[str, int]]) -> None:
+        """Start a subscription interval (closing any open one) covering the given (category, priority) buckets."""
+        with self._lock:
+            current = self.last_seq()
+            self._close_subscription(subscriber_id, current)
+            self._conn.executemany(
+                'INSERT INTO subscriptions (subscriber_id, category, priority, since_seq) VALUES (?, ?, ?, ?)',
+                [(subscriber_id, category, priority, current) for category, priority in buckets]
+            )
+            self._conn.commit()
+
+    def unsubscribe(self, subscriber_id: str) -> None:
+        """Stop broadcast delivery; broadcasts already received stay in the inbox."""
+        with self._lock:
+            self._close_subscription(subscriber_id, self.last_seq())
+            self._conn.commit()
+
+    def _close_subscription(self, subscriber_id: str, seq: int) -> None:
+        self._conn.execute(
+            'UPDATE subscriptions SET until_seq=? WHERE subscriber_id=? AND until_seq IS NULL', (seq, subscriber_id)
+        )
+        # Intervals that never saw a broadcast carry no history
+        self._conn.execute(
+            'DELETE FROM subscriptions WHERE subscriber_id=? AND until_seq IS NOT NULL AND until_seq <= since_seq',
+            (subscriber_id,)
+        )
+
+    # -- reads -----------------------------------------------------------
+
+    def last_seq(self) -> int:
+        # sqlite_sequence never goes backwards, even after retention deletes the newest rows
+        row = self._conn.execute("SELECT seq FROM sqlite_sequence WHERE name='notifications'").fetchone()
+        return row[0] if row else 0
+
+    def get(self, notification_id: str) -> Optional[tuple]:
+        with self._lock:
+            return self._conn.execute(
+                f'SELECT {_COLUMNS} FROM notifications n WHERE n.notification_id=?', (notification_id,)
+            ).fetchone()
+
+    def inbox(self, recipient_id: str, status: Optional[str] = None, category: Optional[str] = None,
+              limit: Optional[int] = None, offset: int = 0, newest_first: bool = False) -> List[tuple]:
+        """One page of a recipient's inbox as notification rows followed by the recipient's status."""
+        order = 'DESC' if newest_first else 'ASC'
+        with self._lock:
+            return self._conn.execute(
+                f'SELECT {_COLUMNS}, x.status FROM ({_INBOX_ITEMS}) x '
+                f'JOIN notifications n ON n.seq = x.seq '
+                f'WHERE (:status IS NULL OR x.status = :status) AND (:category IS NULL OR x.category = :category) '
+                f'ORDER BY x.seq {order} LIMIT :limit OFFSET :offset',
+                {"r": recipient_id, "status": status, "category": category,
+                 "limit": -1 if limit is None else limit, "offset": offset}
+            ).fetchall()
+
+    def count(self, recipient_id: str, status: Optional[str] = None, category: Optional[str] = None) -> int:
+        with self._lock:
+            return self._conn.execute(
+                f'SELECT COUNT(*) FROM ({_INBOX_ITEMS}) x '
+                f'WHERE (:status IS NULL OR x.status = :status) AND (:category IS NULL OR x.category = :category)',
+                {"r": recipient_id, "status": status, "category": category}
+            ).fetchone()[0]
+
+    # -- maintenance -----------------------------------------------------
+
+    def apply_retention(self, policy: RetentionPolicy, now: Optional[float] = None) -> List[str]:
+        """Delete what the policy no longer keeps; returns the removed notification ids."""
+        now = time.time() if now is None else now
+        removed: List[str] = []
+        with self._lock:
+            if policy.max_age_seconds is not None:
+                cutoff = now - policy.max_age_seconds
+                removed += self._delete_where('ts < ?', (cutoff,))
+            if policy.max_per_recipient is not None:
+                self._trim_inboxes(policy.max_per_recipient)
+                # Direct notifications whose only inbox row was trimmed
+                removed += self._delete_where(
+                    'recipient_id IS NOT NULL AND NOT EXISTS '
+                    '(SELECT 1 FROM inbox i WHERE i.seq = notifications.seq)', ()
+                )
+            # Closed subscription intervals that no longer cover any stored broadcast
+            self._conn.execute(
+                'DELETE FROM subscriptions WHERE until_seq IS NOT NULL AND until_seq < '
+                '(SELECT COALESCE(MIN(seq), 1 << 62) FROM notifications WHERE recipient_id IS NULL)'
+            )
+            self._conn.commit()
+        return removed
+
+    def _trim_inboxes(self, max_items: int) -> None:
+        """
+        Keep each recipient's newest `max_items` inbox items, counting matched
+        broadcasts as well as inbox rows. The recipient's watermark moves up to
+        the oldest kept item, then the inbox rows below it are deleted.
+        """
+        recipients = [row[0] for row in self._conn.execute(
+            'SELECT recipient_id FROM inbox UNION SELECT subscriber_id FROM subscriptions'
+        )]
+        for recipient_id in recipients:
+            if max_items > 0:
+                row = self._conn.execute(
+                    f'SELECT seq FROM ({_INBOX_ITEMS}) ORDER BY seq DESC LIMIT 1 OFFSET :skip',
+                    {"r": recipient_id, "skip": max_items - 1}
+                ).fetchone()
+                if row is None:
+                    continue
+                watermark = row[0]
+            else:
+                watermark = self.last_seq() + 1
+            self._conn.execute(
+                'INSERT INTO inbox_trim (recipient_id, min_seq) VALUES (?, ?) '
+                'ON CONFLICT (recipient_id) DO UPDATE SET min_seq = MAX(min_seq, excluded.min_seq)',
+                (recipient_id, watermark)
+            )
+            self._conn.execute('DELETE FROM inbox WHERE recipient_id=? AND seq < ?', (recipient_id, watermark))
+
+    def _delete_where(self, condition: str, params: tuple) -> List[str]:
+        rows = self._conn.execute(
+            f'SELECT seq, notification_id FROM notifications WHERE {condition}', params
+        ).fetchall()
+        if rows:
+            seqs = [(seq,) for seq, _ in rows]
+            self._conn.executemany('DELETE FROM inbox WHERE seq=?', seqs)
+            self._conn.executemany('DELETE FROM notifications WHERE seq=?', seqs)
+        return [notification_id for _, notification_id in rows]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.executescript('DELETE FROM inbox; DELETE FROM notifications; DELETE FROM subscriptions; '
+                                    'DELETE FROM inbox_trim;')
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -14,11 +14,31 @@ Responsibilities:
     - The returned value must be a list of component_ids.
     - For TDD: This stub implements only enough logic to drive the test and trigger next-step requirements.
 
-Expected Expansion:
-    - Down the line, this class will use registry's get_dependency_graph and impact analysis APIs, and more detailed Change attributes.
+Implementation:
+    - Impact is answered from a ReachabilityIndex (/app/core/project_management/reachability.py) kept per registry,
+      re-synced only when the registry's dependency_version changes (or, without one, when its graph differs).
 
 """
 
+import weakref
+
+from app.core.project_management.reachability import ReachabilityIndex
+
+# registry -> closure index over its dependency graph
+_indexes = weakref.WeakKeyDictionary()
+
+
+def _index_for(registry) -> ReachabilityIndex:
+    try:
+        index = _indexes.get(registry)
+    except TypeError:  # registry cannot be weakly referenced; index it for this call only
+        return ReachabilityIndex(registry.get_dependency_graph())
+    if index is None:
+        index = _indexes[registry] = ReachabilityIndex()
+    index.sync(registry.get_dependency_graph, getattr(registry, "dependency_version", None))
+    return index
+
+
 class ChangePropagationAnalyzer:
     @staticmethod
     def analyze(registry, change):
@@ -30,26 +50,21 @@ class ChangePropagationAnalyzer:
             change:   Instance of Change (from change_modeler.py)
 
         Returns:
-            List of component IDs impacted (for now: direct+transitive dependencies).
+            List of component IDs impacted: the changed component, then every component
+            that depends on it directly or transitively.
         """
-        # This stub mimics a simplistic impact: Get dependency graph and find all transitively dependent components, including the changed one.
+        changed = change.component_id
         try:
-            graph = registry.get_dependency_graph()
-            changed = change.component_id
-            impacted = set()
-            # DFS all nodes whose path to root traverses 'changed'
-            def dfs(node, seen):
-                if node in seen:
-                    return
-                seen.add(node)
-                for dep in graph.get(node, []):
-                    if dep == changed or dep in impacted:
-                        impacted.add(node)
-                    dfs(dep, seen)
-            for node in graph:
-                dfs(node, set())
-            impacted.add(changed)
-            return list(impacted)
+            index = _index_for(registry)
         except Exception:
             # Minimal stub: just return the changed component
-            return [change.component_id]
\ No newline at end of file
+            return [changed]
+        return [changed] + [c for c in index.dependents(changed) if c != changed]
+
+    @staticmethod
+    def blast_radius(registry, component_id):
+        """Number of components that directly or transitively depend on `component_id`."""
+        try:
+            return _index_for(registry).blast_radius(component_id)
+        except Exception:
+            return 0
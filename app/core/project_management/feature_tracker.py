@@ -2,6 +2,8 @@ from enum import Enum
 from dataclasses import dataclass, field
 from typing import Set, List, Dict, Optional
 
+from app.core.project_management.reachability import ReachabilityIndex
+
 class FeatureStatus(Enum):
     PLANNED = "PLANNED"
     IN_PROGRESS = "IN_PROGRESS"
@@ -22,6 +24,8 @@ class FeatureRegistry:
     def __init__(self):
         self.features: Dict[str, Feature] = {}
         self.dependency_graph: Dict[str, Set[str]] = {}
+        # Transitive closure of dependency_graph, updated as features and links are added
+        self.reachability = ReachabilityIndex()
 
     def register_feature(self, name, component, status="PLANNED"):
         feat = Feature(
@@ -31,6 +35,7 @@ class FeatureRegistry:
         )
         self.features[name] = feat
         self.dependency_graph.setdefault(name, set())
+        self.reachability.add_node(name)
         return feat
 
     def get_feature(self, name):
@@ -51,6 +56,7 @@ class FeatureRegistry:
             
         self.dependency_graph.setdefault(feature_name, set()).add(dependency_name)
         self.features[feature_name].dependencies.add(dependency_name)
+        self.reachability.add_dependency(feature_name, dependency_name)
         return True
 
     def get_feature_dependency_graph(self):
@@ -62,31 +68,25 @@ class FeatureRegistry:
 
     def _transitive_deps(self, feature_name) -> Set[str]:
         """Return all features (names) that depend (directly or transitively) on 'feature_name'."""
-        impacted = set()
-        queue = [feature_name]
-        while queue:
-            current = queue.pop()
-            for feat, deps in self.dependency_graph.items():
-                if current in deps and feat not in impacted:
-                    impacted.add(feat)
-                    queue.append(feat)
-        return impacted
+        return set(self.reachability.dependents(feature_name))
+
+    def feature_blast_radius(self, feature_name) -> int:
+        """Number of features that depend (directly or transitively) on 'feature_name'."""
+        return self.reachability.blast_radius(feature_name)
 
     def analyze_feature_impact_from_component_change(self, component_name, component_registry):
         """
         Return all feature names that depend (directly or indirectly) on the provided component,
-        according to the component registry's dependency graph.
+        according to the component registry's dependency graph, plus the features that depend
+        on those through feature-to-feature dependencies.
         """
         # 1. Determine impacted components using component registry
         components_impacted = {component_name}
         components_impacted.update(component_registry.analyze_dependency_impact(component_name))
         # 2. Collect all features that have a .component in impacted
-        impacted = []
-        for featname, feat in self.features.items():
-            if feat.component in components_impacted:
-                impacted.append(featname)
-        # (optional: propagate via feature-to-feature dependencies as well)
-        return impacted
+        direct = [name for name, feat in self.features.items() if feat.component in components_impacted]
+        # 3. Propagate via feature-to-feature dependencies (one closure lookup per feature)
+        return self.reachability.impacted(direct)
 
     def check_feature_backward_compatibility(self, feature_name, component_registry):
         """
@@ -98,19 +98,11 @@ class FeatureRegistry:
             return False
             
         # If feature-to-feature dependencies exist, propagate check
-        to_check = {feature_name}
-        visited = set()
         compatible = True
-        while to_check:
-            cur_feat_name = to_check.pop()
-            if cur_feat_name in visited:
-                continue
-            visited.add(cur_feat_name)
+        for cur_feat_name in [feature_name] + self.reachability.dependencies(feature_name):
             cur_feat = self.features.get(cur_feat_name)
             if not cur_feat or not component_registry.check_version_compatibility(cur_feat.component):
                 compatible = False
-            # queue dependencies (fan-out to other features)
-            to_check |= set(self.dependency_graph.get(cur_feat_name, []))
         return compatible
 
     def feature_compatibility_risk(self, feature_name, component_registry):
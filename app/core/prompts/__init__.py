@@ -1,3 +1,4 @@
 from .template_engine import PromptTemplateEngine
+from .template_registry import TemplateRegistry, CompiledTemplate
 from .optimizers import PromptOptimizer
-from .parser import ResponseParser
\ No newline at end of file
+from .parser import ResponseParser
@@ -4,30 +4,29 @@ Location: /app/core/prompts/template_engine.py
 Handles template-based prompt generation with support for variables, context, and extensible registration.
 """
 
-import string
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
-class TemplateNotFoundError(Exception):
-    pass
+from .template_registry import TemplateRegistry, TemplateNotFoundError
 
 class PromptTemplateEngine:
     """
     Handles registration and rendering of prompt templates, variable interpolation, and context merging.
+
+    Templates are compiled once on registration by a TemplateRegistry; renders
+    with identical inputs are served from its memo.
     """
 
-    def __init__(self):
-        self._templates = {}
+    def __init__(self, registry: Optional[TemplateRegistry] = None):
+        self.registry = registry or TemplateRegistry()
 
     def register_template(self, name: str, template_str: str):
         """
         Register a new prompt template for later use.
         """
-        self._templates[name] = template_str
+        self.registry.register(name, template_str)
 
     def get_template(self, name: str) -> str:
-        if name not in self._templates:
-            raise TemplateNotFoundError(f"Template '{name}' not registered")
-        return self._templates[name]
+        return self.registry.get(name).source
 
     def render_template(
         self, 
@@ -38,7 +37,7 @@ class PromptTemplateEngine:
         """
         Build a prompt from a template and variables, optionally merging context.
 
-        The template string can use Python format syntax, such as {variable_name}.
+        The template string uses string.Template syntax, such as ${variable_name}.
 
         Args:
             name (str): Template name/key
@@ -48,15 +47,16 @@ class PromptTemplateEngine:
         Returns:
             str: Generated prompt string
         """
-        tmpl = self.get_template(name)
-        combined = dict(variables or {})
-        # Merge context keys if provided (context may contain info like 'history', 'user_profile', etc.)
-        if context:
-            for k, v in context.items():
-                if k not in combined:
-                    combined[k] = v
-        try:
-            return string.Template(tmpl).substitute(combined)
-        except KeyError as ke:
-            missing = ke.args[0]
-            raise ValueError(f"Missing variable for prompt template: '{missing}'") from ke
+        # Context keys (e.g. 'history', 'user_profile') fill placeholders not given in variables
+        return self.registry.render(name, variables, context)
+
+    def render_batch(
+        self,
+        name: str,
+        variable_sets: List[Dict[str, str]],
+        context: Optional[Dict] = None
+    ) -> List[str]:
+        """
+        Render one template for many variable sets (e.g. bulk content processing).
+        """
+        return self.registry.render_batch(name, variable_sets, context)
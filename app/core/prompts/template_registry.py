@@ -0,0 +1,202 @@
+"""
+Prompt Template Registry
+Location: /app/core/prompts/template_registry.py
+Compiles prompt templates once into render plans and caches rendered prompts.
+
+Templates use ``string.Template`` syntax (``$name`` / ``${name}``). Each template is
+parsed at registration into literal segments and placeholder slots, so rendering is
+a single join. Static values can be pre-rendered with ``CompiledTemplate.partial``,
+and identical renders are memoized per template version.
+"""
+
+import string
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+class TemplateNotFoundError(Exception):
+    pass
+
+_PATTERN = string.Template.pattern
+_DELIMITER = string.Template.delimiter
+
+
+class CompiledTemplate:
+    """
+    Immutable render plan for one template version.
+
+    ``segments`` alternates literal text and placeholder slots: a ``str`` entry is
+    literal, a ``(name,)`` tuple is a slot to be substituted.
+    """
+
+    __slots__ = ("name", "version", "source", "segments", "placeholders")
+
+    def __init__(self, name: str, source: str, version: int = 1,
+                 segments: Optional[List[Any]] = None):
+        self.name = name
+        self.version = version
+        self.source = source
+        self.segments = segments if segments is not None else self._compile(source)
+        # Ordered, de-duplicated placeholder names (defines the memo key layout)
+        self.placeholders: Tuple[str, ...] = tuple(
+            dict.fromkeys(seg[0] for seg in self.segments if isinstance(seg, tuple))
+        )
+
+    @staticmethod
+    def _compile(source: str) -> List[Any]:
+        segments: List[Any] = []
+        literal: List[str] = []
+        pos = 0
+        for match in _PATTERN.finditer(source):
+            literal.append(source[pos:match.start()])
+            pos = match.end()
+            if match.group("escaped") is not None:
+                literal.append(_DELIMITER)
+                continue
+            name = match.group("named") or match.group("braced")
+            if name is None:
+                # Same validation string.Template performs lazily at render time
+                lineno = source.count("\n", 0, match.start("invalid")) + 1
+                raise ValueError(f"Invalid placeholder in prompt template at line {lineno}")
+            if literal:
+                segments.append("".join(literal))
+                literal = []
+            segments.append((name,))
+        literal.append(source[pos:])
+        tail = "".join(literal)
+        if tail:
+            segments.append(tail)
+        return [seg for seg in segments if seg != ""]
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        """Substitute every placeholder from ``values``; missing names raise ValueError."""
+        parts = []
+        for seg in self.segments:
+            if isinstance(seg, tuple):
+                try:
+                    parts.append("%s" % (values[seg[0]],))
+                except KeyError:
+                    raise ValueError(f"Missing variable for prompt template: '{seg[0]}'") from None
+            else:
+                parts.append(seg)
+        return "".join(parts)
+
+    def render_many(self, value_sets: Iterable[Mapping[str, Any]]) -> List[str]:
+        return [self.render(values) for values in value_sets]
+
+    def partial(self, values: Mapping[str, Any]) -> "CompiledTemplate":
+        """
+        Pre-render the placeholders present in ``values`` into literal text.
+
+        Remaining placeholders stay open; adjacent literals are merged so the
+        resulting plan has fewer segments to join per render.
+        """
+        merged: List[Any] = []
+        for seg in self.segments:
+            if isinstance(seg, tuple) and seg[0] in values:
+                seg = "%s" % (values[seg[0]],)
+            if isinstance(seg, str) and merged and isinstance(merged[-1], str):
+                merged[-1] += seg
+            else:
+                merged.append(seg)
+        return CompiledTemplate(self.name, self.source, self.version, segments=merged)
+
+
+class TemplateRegistry:
+    """
+    Versioned store of compiled templates with an LRU memo of rendered prompts.
+
+    Re-registering a name bumps its version, so memoized renders of older
+    versions are never served again (they age out of the LRU).
+    """
+
+    def __init__(self, cache_size: int = 1024):
+        self._templates: Dict[str, CompiledTemplate] = {}
+        self._cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def register(self, name: str, source: str) -> CompiledTemplate:
+        with self._lock:
+            previous = self._templates.get(name)
+            version = previous.version + 1 if previous else 1
+            compiled = CompiledTemplate(name, source, version)
+            self._templates[name] = compiled
+            return compiled
+
+    def get(self, name: str) -> CompiledTemplate:
+        try:
+            return self._templates[name]
+        except KeyError:
+            raise TemplateNotFoundError(f"Template '{name}' not registered") from None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._templates
+
+    def render(self, name: str, variables: Optional[Mapping[str, Any]] = None,
+               context: Optional[Mapping[str, Any]] = None) -> str:
+        """Render ``name``; ``variables`` take precedence over ``context`` keys."""
+        compiled = self.get(name)
+        values = self._resolve(compiled, variables, context)
+        # Key only on the values the template actually uses, as their rendered text
+        try:
+            key = (name, compiled.version, tuple("%s" % (values[p],) for p in compiled.placeholders))
+        except KeyError as ke:
+            raise ValueError(f"Missing variable for prompt template: '{ke.args[0]}'") from ke
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached
+        result = compiled.render(values)
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = result
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def render_batch(self, name: str, variable_sets: Iterable[Mapping[str, Any]],
+                     context: Optional[Mapping[str, Any]] = None) -> List[str]:
+        """
+        Render many variable sets against one template.
+
+        Context values used by the template are pre-rendered once, then each
+        variable set is rendered against the reduced plan (bypassing the memo).
+        """
+        compiled = self.get(name)
+        if context:
+            static = {p: context[p] for p in compiled.placeholders if p in context}
+            plan = compiled.partial(static) if static else compiled
+        else:
+            static, plan = {}, compiled
+        results = []
+        for variables in variable_sets:
+            if static and any(p in variables for p in static):
+                # Variable overrides a pre-rendered context value
+                results.append(compiled.render(self._resolve(compiled, variables, context)))
+            else:
+                results.append(plan.render(variables))
+        return results
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = self.misses = 0
+
+    @staticmethod
+    def _resolve(compiled: CompiledTemplate, variables: Optional[Mapping[str, Any]],
+                 context: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+        variables = variables or {}
+        if not context:
+            return variables
+        values = {}
+        for p in compiled.placeholders:
+            if p in variables:
+                values[p] = variables[p]
+            elif p in context:
+                values[p] = context[p]
+        return values
@@ -3,4 +3,23 @@ File Location: /app/core/relationships/__init__.py
 
 This file marks the 'relationships' directory as a Python package 
 and enables relative imports within the core relationships subsystem.
-"""
\ No newline at end of file
+"""
+
+from app.utils.lazy_import import lazy_exports
+
+__all__ = [
+    "KnowledgeGraph", "Node", "Edge", "RelationshipNavigator",
+    "ConceptRelationship", "RelationshipExtractor", "RelationshipFinder", "export_graph_as_json",
+]
+
+# Resolved on first access so importing one submodule does not load the others
+__getattr__, __dir__ = lazy_exports(__name__, {
+    "KnowledgeGraph": ".knowledge_graph",
+    "Node": ".knowledge_graph",
+    "Edge": ".knowledge_graph",
+    "RelationshipNavigator": ".navigation",
+    "ConceptRelationship": ".relationship_extractor",
+    "RelationshipExtractor": ".relationship_extractor",
+    "RelationshipFinder": ".relationship_finder",
+    "export_graph_as_json": ".visualization",
+})
@@ -6,6 +6,11 @@ Defines KnowledgeGraph, Node, and Edge, used throughout the relationships subsys
 
 from typing import List, Dict, Set, Any, Optional, Union, Tuple
 
+from app.utils.lazy_import import lazy_import
+
+# Only needed by to_networkx(); imported on first use
+nx = lazy_import("networkx", "pip install networkx")
+
 class Node:
     """
     Represents a concept or content item in the knowledge graph.
@@ -211,22 +216,20 @@ class KnowledgeGraph:
         Export the graph as a NetworkX graph for advanced analysis.
         Requires NetworkX to be installed.
         """
-        try:
-            import networkx as nx
-            G = nx.DiGraph()
-            
-            # Add nodes with attributes
-            for node_id, node in self.nodes.items():
-                G.add_node(node_id, label=node.label, data=node.data)
-            
-            # Add edges with attributes
-            for edge in self.edges:
-                G.add_edge(edge.source, edge.target, 
-                          relation=edge.relation, **edge.metadata)
-            
-            return G
-        except ImportError:
+        if not nx:
             raise ImportError("NetworkX is required for this feature. Install with 'pip install networkx'")
+        G = nx.DiGraph()
+        
+        # Add nodes with attributes
+        for node_id, node in self.nodes.items():
+            G.add_node(node_id, label=node.label, data=node.data)
+        
+        # Add edges with attributes
+        for edge in self.edges:
+            G.add_edge(edge.source, edge.target, 
+                      relation=edge.relation, **edge.metadata)
+        
+        return G
 
     def __repr__(self):
         return f"KnowledgeGraph(nodes={len(self.nodes)}, edges={len(self.edges)})"
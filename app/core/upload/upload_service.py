@@ -77,6 +77,34 @@ class BackoffStrategy:
         jitter_amount = delay * self.jitter
         return delay + (jitter_amount * (2 * (0.5 - random.random())))
 
+class LocalFileBackend:
+    """
+    Upload backend that writes chunks into files under a local root directory.
+    Used for local deployments, tests and benchmarks.
+    """
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        self._lock = Lock()
+        os.makedirs(root_dir, exist_ok=True)
+
+    def _target_path(self, destination: str) -> str:
+        path = os.path.normpath(os.path.join(self.root_dir, destination.lstrip("/\\")))
+        root = os.path.normpath(self.root_dir)
+        if os.path.commonpath([root, path]) != root:
+            raise ValueError(f"Destination escapes upload root: {destination}")
+        return path
+
+    def upload_chunk(self, upload_id: str, chunk_data: bytes, chunk_number: int, offset: int,
+                     destination: str, metadata: Optional[dict] = None):
+        path = self._target_path(destination)
+        with self._lock:
+            os.makedirs(os.path.dirname(path) or self.root_dir, exist_ok=True)
+            mode = 'r+b' if os.path.exists(path) and chunk_number > 0 else 'wb'
+            with open(path, mode) as f:
+                f.seek(offset)
+                f.write(chunk_data)
+
 class UploadService:
     CHUNK_SIZE = 2 * 1024 * 1024  # 2 MB default chunk size
 
@@ -0,0 +1,343 @@
+"""
+Content sniffing and structural checks for uploaded files.
+
+Location: /app/core/validation/content_sniffer.py
+
+- Identifies the real format from magic bytes instead of trusting the name or mimetype
+- Structural checks read only a few fixed byte ranges (head, tail, and a handful of
+  seeks), so a corrupt or truncated file is rejected in well under a millisecond of
+  I/O regardless of its size:
+    * PDF: %%EOF marker and a startxref offset that points at an xref table/stream
+    * PNG/GIF/BMP/JPEG: header dimensions (and end markers where the format has them)
+    * TIFF/WebP/AVI: header offsets and sizes that fit inside the file
+    * MP4/MOV: top-level box chain (ftyp first, moov present, boxes tile the file)
+- sniff_bytes() works on the first bytes of a stream, so a mislabeled upload can be
+  refused before the rest of it is sent
+- VerdictCache memoizes results by a stat fingerprint (path, device, inode, size, mtime),
+  so a cache hit costs one stat() and no reads
+"""
+
+import codecs
+import os
+import re
+import struct
+import threading
+from collections import OrderedDict, namedtuple
+from typing import BinaryIO, Callable, Dict, Hashable, Optional, Tuple
+
+# Bytes read from the start and the end of a file for sniffing and most checks
+HEAD_BYTES = 4096
+TAIL_BYTES = 2048
+# JPEG markers are walked at most this far looking for the frame header
+JPEG_SCAN_BYTES = 65536
+# MP4 files with more top-level boxes than this are rejected rather than walked
+MAX_TOP_LEVEL_BOXES = 4096
+MAX_IMAGE_DIMENSION = 65535
+
+SniffedType = namedtuple("SniffedType", ["kind", "format", "mimetype"])
+
+PDF = SniffedType("pdf", "pdf", "application/pdf")
+PNG = SniffedType("image", "png", "image/png")
+JPEG = SniffedType("image", "jpeg", "image/jpeg")
+GIF = SniffedType("image", "gif", "image/gif")
+BMP = SniffedType("image", "bmp", "image/bmp")
+TIFF = SniffedType("image", "tiff", "image/tiff")
+WEBP = SniffedType("image", "webp", "image/webp")
+MP4 = SniffedType("video", "mp4", "video/mp4")
+MOV = SniffedType("video", "mov", "video/quicktime")
+AVI = SniffedType("video", "avi", "video/x-msvideo")
+MKV = SniffedType("video", "mkv", "video/x-matroska")
+TEXT = SniffedType("text", "text", "text/plain")
+
+_STARTXREF = re.compile(rb"startxref\s+(\d+)")
+_XREF_TARGET = re.compile(rb"\s*(xref|\d+\s+\d+\s+obj)")
+# UTF-32 first: its little-endian BOM starts with the UTF-16 one
+_TEXT_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+# Bytes allowed in 8-bit text: everything but the C0 controls (other than
+# whitespace and ESC) and DEL
+_TEXT_BYTES = bytes(b for b in range(256) if b >= 0x20 and b != 0x7F or b in b"\t\n\v\f\r\x1b")
+
+
+def sniff_bytes(head: bytes) -> Optional[SniffedType]:
+    """Identify a format from the first bytes of a file (None if unrecognised)."""
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return PNG
+    if head.startswith(b"\xff\xd8\xff"):
+        return JPEG
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return GIF
+    if head[:4] in (b"II*\x00", b"MM\x00*"):
+        return TIFF
+    if head.startswith(b"RIFF") and len(head) >= 12:
+        if head[8:12] == b"WEBP":
+            return WEBP
+        if head[8:12] == b"AVI ":
+            return AVI
+    if head[4:8] == b"ftyp":
+        return MOV if head[8:12] == b"qt  " else MP4
+    if head.startswith(b"\x1a\x45\xdf\xa3"):
+        return MKV
+    # PDF readers accept junk before the header within the first kilobyte
+    if b"%PDF-" in head[:1024]:
+        return PDF
+    if _looks_like_text(head):
+        return TEXT
+    # "BM" alone is weak; real bitmap headers contain zero bytes, so text was ruled out first
+    if head.startswith(b"BM") and len(head) >= 26:
+        return BMP
+    return None
+
+
+def _looks_like_text(head: bytes) -> bool:
+    for bom, encoding in _TEXT_BOMS:
+        if head.startswith(bom) and _decodes(head, encoding):
+            return True
+    if b"\x00" in head:
+        return False
+    if _decodes(head, "utf-8"):
+        return True
+    # 8-bit encodings (cp1252, latin-1, ...) decode any byte, so judge by control bytes
+    return not head.translate(None, _TEXT_BYTES)
+
+
+def _decodes(head: bytes, encoding: str) -> bool:
+    # Incremental, so a multi-byte character cut off by the sample boundary is fine
+    try:
+        text = codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+    except UnicodeDecodeError:
+        return False
+    return "\x00" not in text
+
+
+def _read_at(fh: BinaryIO, offset: int, length: int) -> bytes:
+    fh.seek(offset)
+    return fh.read(length)
+
+
+# -- structural checks -------------------------------------------------------
+# Each check gets (file, size, head) and returns an error detail, or None if the
+# structure is sound.
+
+def _check_pdf(fh, size, head):
+    tail = _read_at(fh, max(0, size - TAIL_BYTES), TAIL_BYTES)
+    if b"%%EOF" not in tail:
+        return "PDF is truncated (no %%EOF marker)"
+    matches = list(_STARTXREF.finditer(tail))
+    if not matches:
+        return "PDF trailer has no startxref"
+    offset = int(matches[-1].group(1))
+    if not 0 < offset < size:
+        return "PDF startxref points outside the file"
+    if not _XREF_TARGET.match(_read_at(fh, offset, 64)):
+        return "PDF startxref does not point at a cross-reference section"
+    return None
+
+
+def _check_dimensions(width, height):
+    if not (0 < width <= MAX_IMAGE_DIMENSION and 0 < height <= MAX_IMAGE_DIMENSION):
+        return f"Image has invalid dimensions {width}x{height}"
+    return None
+
+
+def _check_png(fh, size, head):
+    if len(head) < 33 or head[12:16] != b"IHDR":
+        return "PNG is missing its IHDR header"
+    width, height = struct.unpack(">II", head[16:24])
+    error = _check_dimensions(width, height)
+    if error:
+        return error
+    if b"IEND" not in _read_at(fh, max(0, size - 12), 12):
+        return "PNG is truncated (no IEND chunk)"
+    return None
+
+
+def _check_jpeg(fh, size, head):
+    data = head if size <= len(head) else _read_at(fh, 0, min(size, JPEG_SCAN_BYTES))
+    pos = 2
+    while pos + 9 <= len(data):
+        if data[pos] != 0xFF:
+            return "JPEG marker stream is corrupt"
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            pos += 1
+            continue
+        length = struct.unpack(">H", data[pos + 2:pos + 4])[0]
+        # SOF0..SOF15 carry the frame size; C4 (DHT), C8 (JPG) and CC (DAC) are not frames
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">HH", data[pos + 5:pos + 9])
+            error = _check_dimensions(width, height)
+            if error:
+                return error
+            if b"\xff\xd9" not in _read_at(fh, max(0, size - TAIL_BYTES), TAIL_BYTES):
+                return "JPEG is truncated (no end-of-image marker)"
+            return None
+        if length < 2:
+            return "JPEG segment length is invalid"
+        pos += 2 + length
+    return "JPEG frame header not found"
+
+
+def _check_gif(fh, size, head):
+    if len(head) < 13:
+        return "GIF header is truncated"
+    width, height = struct.unpack("<HH", head[6:10])
+    error = _check_dimensions(width, height)
+    if error:
+        return error
+    if b";" not in _read_at(fh, max(0, size - 16), 16):
+        return "GIF is truncated (no trailer)"
+    return None
+
+
+def _check_bmp(fh, size, head):
+    declared_size = struct.unpack("<I", head[2:6])[0]
+    if declared_size > size:
+        return "BMP is truncated"
+    width, height = struct.unpack("<ii", head[18:26])
+    return _check_dimensions(abs(width), abs(height))
+
+
+def _check_tiff(fh, size, head):
+    if len(head) < 8:
+        return "TIFF header is truncated"
+    fmt = "<I" if head[:2] == b"II" else ">I"
+    offset = struct.unpack(fmt, head[4:8])[0]
+    if not 8 <= offset <= size - 2:
+        return "TIFF directory offset points outside the file"
+    return None
+
+
+def _check_riff(fh, size, head):
+    declared_size = struct.unpack("<I", head[4:8])[0] + 8
+    if declared_size > size:
+        return "RIFF container is truncated"
+    return None
+
+
+def _check_iso_bmff(fh, size, head):
+    pos = 0
+    seen = set()
+    for _ in range(MAX_TOP_LEVEL_BOXES):
+        if pos == size:
+            break
+        header = head[pos:pos + 16] if pos + 16 <= len(head) else _read_at(fh, pos, 16)
+        if len(header) < 8:
+            return "MP4 box header is truncated"
+        box_size, box_type = struct.unpack(">I4s", header[:8])
+        if box_size == 1:
+            if len(header) < 16:
+                return "MP4 box header is truncated"
+            box_size = struct.unpack(">Q", header[8:16])[0]
+        elif box_size == 0:
+            box_size = size - pos
+        if not seen and box_type != b"ftyp":
+            return "MP4 does not start with an ftyp box"
+        if box_size < 8 or pos + box_size > size:
+            return f"MP4 box '{box_type.decode('latin-1')}' runs past the end of the file"
+        seen.add(box_type)
+        pos += box_size
+    else:
+        return "MP4 has too many top-level boxes"
+    if b"moov" not in seen:
+        return "MP4 has no moov box"
+    return None
+
+
+def _check_none(fh, size, head):
+    return None
+
+
+STRUCTURE_CHECKS: Dict[str, Callable[[BinaryIO, int, bytes], Optional[str]]] = {
+    "pdf": _check_pdf,
+    "png": _check_png,
+    "jpeg": _check_jpeg,
+    "gif": _check_gif,
+    "bmp": _check_bmp,
+    "tiff": _check_tiff,
+    "webp": _check_riff,
+    "avi": _check_riff,
+    "mp4": _check_iso_bmff,
+    "mov": _check_iso_bmff,
+    "mkv": _check_none,
+    "text": _check_none,
+}
+
+
+def inspect_file(filepath: str) -> Tuple[Optional[SniffedType], Optional[str]]:
+    """
+    Sniff a file's format and check its structure.
+
+    Returns:
+        (sniffed type or None, error detail or None)
+
+    Raises:
+        OSError if the file cannot be read
+    """
+    with open(filepath, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size == 0:
+            return None, "File is empty"
+        head = fh.read(HEAD_BYTES)
+        sniffed = sniff_bytes(head)
+        if sniffed is None:
+            return None, "Unrecognised file content"
+        try:
+            return sniffed, STRUCTURE_CHECKS[sniffed.format](fh, size, head)
+        except struct.error:
+            return sniffed, f"{sniffed.format.upper()} header is truncated"
+
+
+def content_key(filepath: str) -> Tuple:
+    """
+    Content key: stat fingerprint (realpath, st_dev, st_ino, st_size, st_mtime_ns).
+
+    Any rewrite of the file moves its size or mtime, so a stale verdict is never
+    served, while re-checking an unchanged file costs a single stat() call.
+
+    Raises:
+        OSError if the file cannot be stat'ed
+    """
+    full = os.path.realpath(filepath)
+    stat = os.stat(full)
+    return (full, stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+class VerdictCache:
+    """Thread-safe LRU of validation verdicts keyed by content key (stat fingerprint)."""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, verdict) -> None:
+        with self._lock:
+            self._entries[key] = verdict
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -4,9 +4,13 @@ Format Validation Framework for AeroLearn AI
 - Pluggable architecture (built-in & plugin validators)
 - Example: PDF, image, video, text
 - Supports aerospace/CAD extensions
+- Built-in validators sniff the real content and check its structure
+  (see content_sniffer.py) after the mimetype/extension checks
 """
 
-from typing import Any, Dict, Type
+from typing import Any, Dict, Optional, Type
+
+from .content_sniffer import inspect_file
 
 class ValidationResult:
     def __init__(self, valid: bool, detail: str = '', code: str = ''):
@@ -28,6 +32,21 @@ class BaseValidator:
     def validate(self, filepath: str, mimetype: str) -> ValidationResult:
         raise NotImplementedError("Validator must implement validate()")
 
+    def check_content(self, filepath: str, kind: str) -> Optional[ValidationResult]:
+        """
+        Sniff the file and check its structure.
+        Returns a failing ValidationResult, or None if the content is a sound `kind` file.
+        """
+        try:
+            sniffed, error = inspect_file(filepath)
+        except OSError as e:
+            return ValidationResult(False, f"Unreadable file: {e}", "unreadable")
+        if sniffed is not None and sniffed.kind != kind:
+            return ValidationResult(False, f"Content is {sniffed.format}, not {kind}", "content-mismatch")
+        if error:
+            return ValidationResult(False, error, "corrupt-content" if sniffed else "unrecognised-content")
+        return None
+
 class PDFValidator(BaseValidator):
     def validate(self, filepath: str, mimetype: str) -> ValidationResult:
         # Only accept PDFs with readable content (stub: checks extension/mimetype)
@@ -35,28 +54,25 @@ class PDFValidator(BaseValidator):
             return ValidationResult(False, "Not a PDF", "invalid-mimetype")
         if not filepath.lower().endswith('.pdf'):
             return ValidationResult(False, "File extension mismatch", "invalid-extension")
-        # TODO: Add real PDF parsing/content check
-        return ValidationResult(True)
+        return self.check_content(filepath, "pdf") or ValidationResult(True)
 
 class ImageValidator(BaseValidator):
     def validate(self, filepath: str, mimetype: str) -> ValidationResult:
         if not mimetype.startswith("image/"):
             return ValidationResult(False, "Not an image", "invalid-mimetype")
-        # TODO: Actual image content test (PIL etc)
-        return ValidationResult(True)
+        return self.check_content(filepath, "image") or ValidationResult(True)
 
 class VideoValidator(BaseValidator):
     def validate(self, filepath: str, mimetype: str) -> ValidationResult:
         if not mimetype.startswith("video/"):
             return ValidationResult(False, "Not a video", "invalid-mimetype")
-        # TODO: Extension/content sniff
-        return ValidationResult(True)
+        return self.check_content(filepath, "video") or ValidationResult(True)
 
 class TextValidator(BaseValidator):
     def validate(self, filepath: str, mimetype: str) -> ValidationResult:
         if not (mimetype == "text/plain" or filepath.endswith('.txt')):
             return ValidationResult(False, "Not plain text", "invalid-mimetype")
-        return ValidationResult(True)
+        return self.check_content(filepath, "text") or ValidationResult(True)
 
 # Type alias for validator registry
 ValidatorRegistry = Dict[str, BaseValidator]
@@ -83,6 +99,8 @@ validation_framework.register('pdf', PDFValidator())
 validation_framework.register('image', ImageValidator())
 validation_framework.register('video', VideoValidator())
 validation_framework.register('text', TextValidator())
+# Name used by ValidationSystem and the upload flow
+validators = validation_framework
 
 # Export both class and instance
-__all__ = ['ValidationFramework', 'validation_framework', 'ValidatorRegistry']
+__all__ = ['ValidationFramework', 'validation_framework', 'validators', 'ValidatorRegistry', 'ValidationResult']
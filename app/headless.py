@@ -0,0 +1,71 @@
+"""
+Headless entry profile for AeroLearn AI background workers.
+
+Location: /app/headless.py
+- Counterpart of /app/main.py for processes without a display: upload, grading,
+  extraction and sync workers import their modules through this profile.
+- Never imports PyQt6 or anything under app.ui; load() fails loudly if any
+  module of the profile drags a UI toolkit in.
+- Heavy optional parsers (pdfplumber, python-docx/pptx, OCR, networkx) are
+  lazy (see app/utils/lazy_import.py) and only load when a job needs them.
+
+Check the profile and its cold-start cost with:
+    python -m app.headless
+    python -m app.utils.startup_profiler --headless
+"""
+
+import importlib
+import sys
+from typing import Iterable, List, Sequence
+
+# Modules a background worker may need; keep UI-free
+HEADLESS_MODULES = (
+    "app.core.upload.upload_service",
+    "app.core.assessment.grading",
+    "app.core.extraction",
+    "app.core.relationships",
+    "app.core.db.sync_manager",
+    "integrations.registry",
+)
+
+# Module prefixes that must never be loaded in a headless process
+UI_MODULE_PREFIXES = ("PyQt6", "PyQt5", "PySide6", "app.ui", "matplotlib.pyplot")
+
+
+def ui_modules_loaded(modules: Iterable[str] = None) -> List[str]:
+    """Return loaded modules that belong to a UI toolkit or app.ui."""
+    names = sys.modules if modules is None else modules
+    return sorted(m for m in names
+                  if any(m == p or m.startswith(p + ".") for p in UI_MODULE_PREFIXES))
+
+
+def load(modules: Sequence[str] = HEADLESS_MODULES) -> List[str]:
+    """
+    Import the headless profile and verify no UI module came with it.
+
+    Returns:
+        The imported module names
+
+    Raises:
+        RuntimeError: if a UI module is loaded after importing the profile
+    """
+    for name in modules:
+        importlib.import_module(name)
+    leaked = ui_modules_loaded()
+    if leaked:
+        raise RuntimeError("Headless profile loaded UI modules: " + ", ".join(leaked))
+    return list(modules)
+
+
+def main() -> int:
+    from app.utils.startup_profiler import format_report, profile_import
+
+    profile = profile_import(list(HEADLESS_MODULES))
+    print(format_report(profile))
+    leaked = profile.touched(UI_MODULE_PREFIXES)
+    print("\nUI modules loaded: " + (", ".join(leaked) if leaked else "none"))
+    return 1 if leaked else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -200,13 +200,18 @@ class Course(Base):
         """Bulk enroll users; skip already-enrolled."""
         from sqlalchemy import select
         
-        for user_id in user_ids:
-            # Check if enrollment already exists
-            existing = session.execute(
-                select(Enrollment).filter_by(user_id=user_id, course_id=self.id)
-            ).first()
-            
-            if not existing:
+        # One existence check for the whole batch instead of one query per user
+        user_ids = list(user_ids)
+        already_enrolled = set()
+        for i in range(0, len(user_ids), 500):
+            already_enrolled.update(session.execute(
+                select(Enrollment.user_id).where(
+                    Enrollment.course_id == self.id, Enrollment.user_id.in_(user_ids[i:i + 500])
+                )
+            ).scalars())
+        
+        for user_id in dict.fromkeys(user_ids):
+            if user_id not in already_enrolled:
                 enrollment = Enrollment(
                     user_id=user_id, 
                     course_id=self.id, 
@@ -0,0 +1,308 @@
+"""
+Course tree loader for AeroLearn AI.
+
+Location: app/models/course_tree.py
+Depends on: app/models/course.py, app/models/tag.py, app/models/category.py
+
+Loads whole course hierarchies (courses -> modules -> lessons, plus tags, categories,
+prerequisites and enrollment counts) with a fixed number of batched queries and
+assembles a flat, JSON-serializable structure. ``Course.serialize`` walks lazy
+relationships and issues one query per relationship per row; catalog and course
+pages should use this loader instead.
+
+Projections control what is fetched, so list views can load summary columns only.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.course import (
+    Course, Module, Lesson, Enrollment, EnrollmentStatus,
+    course_prerequisite, module_prerequisite,
+    course_tag_link, module_tag_link, lesson_tag_link,
+    course_category_link, module_category_link, lesson_category_link,
+)
+from app.models.tag import Tag
+from app.models.category import Category
+
+# Keep IN (...) lists under SQLite's bound-parameter limits
+DEFAULT_BATCH_SIZE = 500
+
+@dataclass(frozen=True)
+class CourseProjection:
+    """Which columns and relationships a course tree load includes."""
+    course_columns: Tuple[str, ...] = (
+        "id", "title", "description", "order", "is_template",
+        "template_parent_id", "is_archived", "archived_at",
+    )
+    module_columns: Tuple[str, ...] = ("id", "course_id", "title", "description", "order")
+    lesson_columns: Tuple[str, ...] = ("id", "module_id", "title", "description", "content", "order")
+    include_modules: bool = True
+    include_lessons: bool = True
+    include_tags: bool = True
+    include_categories: bool = True
+    include_prerequisites: bool = True
+    include_enrollment_count: bool = True
+
+# Full course pages
+FULL_PROJECTION = CourseProjection()
+
+# Catalog/list views: summary columns, taxonomy and enrollment counts only
+SUMMARY_PROJECTION = CourseProjection(
+    course_columns=("id", "title", "description", "order", "is_archived"),
+    include_modules=False,
+    include_lessons=False,
+    include_prerequisites=False,
+)
+
+@dataclass
+class CourseTree:
+    """
+    Flat, serializable course hierarchy.
+
+    Entities are keyed by id; parents reference children by id lists
+    (``module_ids``, ``lesson_ids``) and tags/categories by id.
+    """
+    course_order: List[int] = field(default_factory=list)
+    courses: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    modules: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    lessons: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    tags: Dict[int, str] = field(default_factory=dict)
+    categories: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "course_order": self.course_order,
+            "courses": self.courses,
+            "modules": self.modules,
+            "lessons": self.lessons,
+            "tags": self.tags,
+            "categories": self.categories,
+        }
+
+    def nested(self, course_id: int) -> Optional[Dict[str, Any]]:
+        """Rebuild the nested shape produced by Course.serialize for one course."""
+        course = self.courses.get(course_id)
+        if course is None:
+            return None
+        result = {k: v for k, v in course.items() if k != "module_ids"}
+        if "module_ids" in course:
+            modules = []
+            for module_id in course["module_ids"]:
+                module = self.modules[module_id]
+                entry = {k: v for k, v in module.items() if k != "lesson_ids"}
+                if "lesson_ids" in module:
+                    entry["lessons"] = [self.lessons[lid] for lid in module["lesson_ids"]]
+                modules.append(entry)
+            result["modules"] = modules
+        return result
+
+def _chunks(ids: Sequence[int], size: int) -> Iterable[Sequence[int]]:
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+def _serialize_value(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+class CourseTreeLoader:
+    """
+    Batched loader for course hierarchies.
+
+    Query count depends only on the projection (and on id-list chunking for very
+    large batches), never on how many modules, lessons or tags a course has.
+    """
+
+    def __init__(self, session: Session, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.session = session
+        self.batch_size = batch_size
+
+    # ------------------------------------------------------------------ #
+    # Flat loading (core selects, no ORM identity map overhead)
+    # ------------------------------------------------------------------ #
+
+    def load(self, course_ids: Optional[Iterable[int]] = None,
+             projection: CourseProjection = FULL_PROJECTION,
+             include_archived: bool = True) -> CourseTree:
+        """Load the given courses (or every course) into a CourseTree."""
+        tree = CourseTree()
+        course_table = Course.__table__
+        columns = [course_table.c[name] for name in self._with_key(projection.course_columns, "id")]
+        query = select(*columns).order_by(course_table.c.order, course_table.c.id)
+        if not include_archived:
+            query = query.where(course_table.c.is_archived.isnot(True))
+
+        if course_ids is None:
+            rows = self.session.execute(query).mappings().all()
+        else:
+            rows = self._in_batches(query, course_table.c.id, list(course_ids))
+        for row in rows:
+            data = {k: _serialize_value(v) for k, v in row.items()}
+            tree.courses[row["id"]] = data
+            tree.course_order.append(row["id"])
+        ids = tree.course_order
+        if not ids:
+            return tree
+
+        if projection.include_modules:
+            self._load_modules(tree, ids, projection)
+        if projection.include_tags:
+            self._load_tags(tree, projection)
+        if projection.include_categories:
+            self._load_categories(tree, projection)
+        if projection.include_prerequisites:
+            self._load_prerequisites(tree, projection)
+        if projection.include_enrollment_count:
+            self._load_enrollment_counts(tree, ids)
+        return tree
+
+    def load_course(self, course_id: int,
+                    projection: CourseProjection = FULL_PROJECTION) -> Optional[Dict[str, Any]]:
+        """Load one course in the nested Course.serialize shape."""
+        return self.load([course_id], projection).nested(course_id)
+
+    # ------------------------------------------------------------------ #
+    # ORM loading (for callers that need mapped objects)
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def orm_options(projection: CourseProjection = FULL_PROJECTION) -> List[Any]:
+        """selectinload options that eagerly load the projected relationships."""
+        options = []
+        if projection.include_tags:
+            options.append(selectinload(Course.tags))
+        if projection.include_categories:
+            options.append(selectinload(Course.categories))
+        if projection.include_prerequisites:
+            options.append(selectinload(Course.prerequisites))
+        if projection.include_enrollment_count:
+            options.append(selectinload(Course.enrollments))
+        if projection.include_modules:
+            module_path = selectinload(Course.modules)
+            options.append(module_path.selectinload(Module.prerequisites))
+            if projection.include_tags:
+                options.append(selectinload(Course.modules).selectinload(Module.tags))
+            if projection.include_categories:
+                options.append(selectinload(Course.modules).selectinload(Module.categories))
+            if projection.include_lessons:
+                lesson_path = selectinload(Course.modules).selectinload(Module.lessons)
+                options.append(lesson_path)
+                if projection.include_tags:
+                    options.append(selectinload(Course.modules).selectinload(Module.lessons)
+                                   .selectinload(Lesson.tags))
+                if projection.include_categories:
+                    options.append(selectinload(Course.modules).selectinload(Module.lessons)
+                                   .selectinload(Lesson.categories))
+        return options
+
+    def load_orm(self, course_ids: Iterable[int],
+                 projection: CourseProjection = FULL_PROJECTION) -> List[Course]:
+        """Fetch Course objects with their hierarchy eagerly loaded (no N+1 on serialize)."""
+        query = (select(Course).where(Course.id.in_(list(course_ids)))
+                 .options(*self.orm_options(projection)).order_by(Course.order, Course.id))
+        return list(self.session.execute(query).scalars().all())
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _with_key(columns: Sequence[str], *required: str) -> List[str]:
+        return list(dict.fromkeys(list(required) + list(columns)))
+
+    def _in_batches(self, query, column, ids: Sequence[int]) -> List[Any]:
+        rows = []
+        for chunk in _chunks(ids, self.batch_size):
+            rows.extend(self.session.execute(query.where(column.in_(chunk))).mappings().all())
+        return rows
+
+    def _load_modules(self, tree: CourseTree, course_ids: Sequence[int], projection: CourseProjection):
+        module_table = Module.__table__
+        columns = [module_table.c[n] for n in self._with_key(projection.module_columns, "id", "course_id")]
+        query = select(*columns).order_by(module_table.c.order, module_table.c.id)
+        for course_id in course_ids:
+            tree.courses[course_id]["module_ids"] = []
+        for row in self._in_batches(query, module_table.c.course_id, course_ids):
+            data = {k: _serialize_value(v) for k, v in row.items()}
+            if projection.include_lessons:
+                data["lesson_ids"] = []
+            tree.modules[row["id"]] = data
+            tree.courses[row["course_id"]]["module_ids"].append(row["id"])
+
+        if projection.include_lessons and tree.modules:
+            lesson_table = Lesson.__table__
+            columns = [lesson_table.c[n] for n in self._with_key(projection.lesson_columns, "id", "module_id")]
+            query = select(*columns).order_by(lesson_table.c.order, lesson_table.c.id)
+            for row in self._in_batches(query, lesson_table.c.module_id, list(tree.modules)):
+                tree.lessons[row["id"]] = {k: _serialize_value(v) for k, v in row.items()}
+                tree.modules[row["module_id"]]["lesson_ids"].append(row["id"])
+
+    def _levels(self, tree: CourseTree, projection: CourseProjection):
+        """(entity dict, owner column name, tag link, category link) for each loaded level."""
+        levels = [(tree.courses, "course_id", course_tag_link, course_category_link)]
+        if projection.include_modules:
+            levels.append((tree.modules, "module_id", module_tag_link, module_category_link))
+            if projection.include_lessons:
+                levels.append((tree.lessons, "lesson_id", lesson_tag_link, lesson_category_link))
+        return levels
+
+    def _load_tags(self, tree: CourseTree, projection: CourseProjection):
+        tag_table = Tag.__table__
+        for entities, owner, link, _ in self._levels(tree, projection):
+            for entity in entities.values():
+                entity["tag_ids"] = []
+            if not entities:
+                continue
+            query = (select(link.c[owner].label("owner_id"), tag_table.c.id, tag_table.c.name)
+                     .join(tag_table, tag_table.c.id == link.c.tag_id)
+                     .order_by(tag_table.c.name))
+            for row in self._in_batches(query, link.c[owner], list(entities)):
+                entities[row["owner_id"]]["tag_ids"].append(row["id"])
+                tree.tags[row["id"]] = row["name"]
+
+    def _load_categories(self, tree: CourseTree, projection: CourseProjection):
+        category_table = Category.__table__
+        for entities, owner, _, link in self._levels(tree, projection):
+            for entity in entities.values():
+                entity["category_ids"] = []
+            if not entities:
+                continue
+            query = (select(link.c[owner].label("owner_id"), category_table.c.id,
+                            category_table.c.name, category_table.c.slug, category_table.c.parent_id)
+                     .join(category_table, category_table.c.id == link.c.category_id)
+                     .order_by(category_table.c.name))
+            for row in self._in_batches(query, link.c[owner], list(entities)):
+                entities[row["owner_id"]]["category_ids"].append(row["id"])
+                tree.categories[row["id"]] = {
+                    "name": row["name"], "slug": row["slug"], "parent_id": row["parent_id"]
+                }
+
+    def _load_prerequisites(self, tree: CourseTree, projection: CourseProjection):
+        course_table = Course.__table__
+        for course in tree.courses.values():
+            course["prerequisites"] = []
+        query = (select(course_prerequisite.c.course_id.label("owner_id"), course_table.c.id, course_table.c.title)
+                 .join(course_table, course_table.c.id == course_prerequisite.c.prerequisite_id))
+        for row in self._in_batches(query, course_prerequisite.c.course_id, list(tree.courses)):
+            tree.courses[row["owner_id"]]["prerequisites"].append({"id": row["id"], "title": row["title"]})
+
+        if projection.include_modules and tree.modules:
+            module_table = Module.__table__
+            for module in tree.modules.values():
+                module["prerequisites"] = []
+            query = (select(module_prerequisite.c.module_id.label("owner_id"), module_table.c.id, module_table.c.title)
+                     .join(module_table, module_table.c.id == module_prerequisite.c.prerequisite_id))
+            for row in self._in_batches(query, module_prerequisite.c.module_id, list(tree.modules)):
+                tree.modules[row["owner_id"]]["prerequisites"].append({"id": row["id"], "title": row["title"]})
+
+    def _load_enrollment_counts(self, tree: CourseTree, course_ids: Sequence[int]):
+        enrollment_table = Enrollment.__table__
+        for course in tree.courses.values():
+            course["enrollment_count"] = 0
+        query = (select(enrollment_table.c.course_id, func.count().label("n"))
+                 .where(enrollment_table.c.status == EnrollmentStatus.APPROVED)
+                 .group_by(enrollment_table.c.course_id))
+        for row in self._in_batches(query, enrollment_table.c.course_id, course_ids):
+            tree.courses[row["course_id"]]["enrollment_count"] = row["n"]
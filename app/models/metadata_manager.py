@@ -1,4 +1,6 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .metadata_query import Eq, Keyword, MetadataQueryEngine, Predicate, conditions_from_dict
 
 
 class MetadataField:
@@ -64,6 +66,55 @@ class MetadataSchema:
         return [name for name, field in self.fields.items() if not field.required]
 
 
+class IndexedMetadataStore(dict):
+    """
+    content_id -> {'data': {...}, 'content_type': ...} mapping that keeps a
+    MetadataQueryEngine in sync with every write. Entries must be replaced, not
+    mutated in place, for the indexes to see the change.
+    """
+    def __init__(self, engine: MetadataQueryEngine):
+        super().__init__()
+        self.engine = engine
+
+    @staticmethod
+    def _record(entry: Any) -> Dict[str, Any]:
+        data = entry.get("data") if isinstance(entry, dict) else None
+        return data if isinstance(data, dict) else {}
+
+    def __setitem__(self, content_id, entry):
+        super().__setitem__(content_id, entry)
+        self.engine.update(content_id, self._record(entry))
+
+    def __delitem__(self, content_id):
+        super().__delitem__(content_id)
+        self.engine.remove(content_id)
+
+    def pop(self, content_id, *default):
+        if content_id in self:
+            self.engine.remove(content_id)
+        return super().pop(content_id, *default)
+
+    def popitem(self):
+        content_id, entry = super().popitem()
+        self.engine.remove(content_id)
+        return content_id, entry
+
+    def setdefault(self, content_id, default=None):
+        if content_id not in self:
+            self[content_id] = default
+        return self[content_id]
+
+    def update(self, *args, **kwargs):
+        """Bulk write: one engine batch for all entries."""
+        items = dict(*args, **kwargs)
+        super().update(items)
+        self.engine.update_many((cid, self._record(e)) for cid, e in items.items())
+
+    def clear(self):
+        super().clear()
+        self.engine.clear()
+
+
 class MetadataManager:
     """
     Manages metadata across content, supports CRUD, inheritance, editing, and validation.
@@ -96,7 +147,11 @@ class MetadataManager:
             MetadataField("title", str, required=True)
         ])
         
-        self.metadata_store: Dict[str, Dict[str, Any]] = {}  # Keyed by unique content ID
+        # Keyed by unique content ID; writes maintain the field/keyword indexes in self.engine
+        self.engine = MetadataQueryEngine()
+        self.metadata_store: Dict[str, Dict[str, Any]] = IndexedMetadataStore(self.engine)
+        # Secondary engine over items given to index_metadata (keyed by position)
+        self._index_engine = MetadataQueryEngine()
         # For test compatibility
         self._schemas = self.schemas
         self._metadata_records = []
@@ -175,7 +230,7 @@ class MetadataManager:
         if not schema.validate(updated):
             return False
             
-        self.metadata_store[content_id]["data"] = updated
+        self.metadata_store[content_id] = {**self.metadata_store[content_id], "data": updated}
         return True
 
     def get_metadata(self, content_id: str) -> Optional[Dict[str, Any]]:
@@ -205,34 +260,70 @@ class MetadataManager:
             return True
         return False
 
-    def search_metadata(self, query: Dict[str, Any]) -> List[str]:
+    def search_metadata(self, query: Union[Dict[str, Any], Predicate]) -> List[str]:
         """
         Returns content IDs that match all key-value pairs in query.
         
         Args:
-            query: Dictionary of field-value pairs to match
+            query: Dictionary of field-value pairs to match, or a Predicate from
+                app.models.metadata_query (e.g. field("duration").between(10, 60))
             
         Returns:
             List of content IDs matching the query
         """
+        predicate = conditions_from_dict(query) if isinstance(query, dict) else query
+
         # First check the standard metadata store
-        result = []
-        for content_id, md in self.metadata_store.items():
-            data = md.get("data", {})
-            if all(data.get(k) == v for k, v in query.items()):
-                result.append(content_id)
+        result = self.engine.query(predicate)
                 
         # Then check the indexed metadata if available
         if hasattr(self, "_metadata_index"):
-            for item in self._metadata_index:
-                if all(item.get(k) == v for k, v in query.items()):
-                    if "id" in item and item["id"] not in result:
+            seen = set(result)
+            for position in self._index_engine.query(predicate):
+                item = self._metadata_index[position]
+                if "id" in item:
+                    if item["id"] not in seen:
+                        seen.add(item["id"])
                         result.append(item["id"])
-                    # For test compatibility - return the full record if no ID
-                    elif "id" not in item and isinstance(item, dict):
-                        result.append(item)
+                # For test compatibility - return the full record if no ID
+                elif isinstance(item, dict):
+                    result.append(item)
                         
         return result
+
+    def query(self, predicate: Predicate, limit: Optional[int] = None) -> List[str]:
+        """
+        Content IDs in the metadata store matching a predicate, in insertion order.
+        
+        Args:
+            predicate: Predicate built with app.models.metadata_query
+            limit: Maximum number of IDs to return
+            
+        Returns:
+            List of matching content IDs
+        """
+        return self.engine.query(predicate, limit)
+
+    def facets(self, fields: Sequence[str], query: Union[Dict[str, Any], Predicate, None] = None,
+               limit: Optional[int] = None) -> Dict[str, List[Tuple[Any, int]]]:
+        """
+        Value counts per field for faceted browsing.
+        
+        Args:
+            fields: Field names to count values for
+            query: Optional dict or Predicate restricting the counted items
+            limit: Maximum number of values per field (most frequent first)
+            
+        Returns:
+            Dict mapping field name to [(value, count), ...]
+        """
+        predicate = conditions_from_dict(query) if isinstance(query, dict) else query
+        return self.engine.facets(fields, predicate, limit)
+
+    def explain(self, query: Union[Dict[str, Any], Predicate]) -> List[str]:
+        """Return the index plan chosen for a query (for debugging slow searches)."""
+        predicate = conditions_from_dict(query) if isinstance(query, dict) else query
+        return self.engine.explain(predicate)
         
     def search(self, **kwargs) -> List[str]:
         """
@@ -256,14 +347,7 @@ class MetadataManager:
         Returns:
             List of content IDs matching the keyword
         """
-        result = []
-        for content_id, md in self.metadata_store.items():
-            keywords_val = md.get("data", {}).get("keywords", "")
-            if isinstance(keywords_val, str):
-                # Split by comma and check for substring
-                if any(keyword.lower() in k.strip().lower() for k in keywords_val.split(",")):
-                    result.append(content_id)
-        return result
+        return self.engine.query(Keyword(keyword, "keywords"))
         
     def merge_metadata(self, base: Dict[str, Any], overrides: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
         """
@@ -295,7 +379,10 @@ class MetadataManager:
             self._metadata_index = []
         # For test compatibility - store as _metadata_records too
         self._metadata_records = items.copy()
+        start = len(self._metadata_index)
         self._metadata_index.extend(items)
+        self._index_engine.update_many(
+            (start + i, item if isinstance(item, dict) else {}) for i, item in enumerate(items))
 
     def inherit_metadata(self, parent_ids: Union[str, List[str]], child_id: str, 
                          override: bool = False) -> Optional[Dict[str, Any]]:
@@ -359,11 +446,15 @@ class MetadataManager:
         batch_key = f"batch_{batch_id}"
         self.metadata_store[batch_key] = {"data": metadata, "content_type": "batch"}
         
-        # Apply to each file
+        # Merge for every file first, then write all of them in one indexed batch
         results = {}
+        updates = {}
         for file_id in file_ids:
-            success = self._apply_batch_metadata_to_file(batch_id, file_id)
-            results[file_id] = success
+            entry = self._merge_batch_metadata(batch_id, file_id)
+            results[file_id] = entry is not None
+            if entry is not None:
+                updates[file_id] = entry
+        self.metadata_store.update(updates)
             
         return results
     
@@ -378,18 +469,31 @@ class MetadataManager:
         Returns:
             bool: True if successful, False otherwise
         """
+        entry = self._merge_batch_metadata(batch_id, file_id)
+        if entry is None:
+            return False
+        self.metadata_store[file_id] = entry
+        return True
+
+    def _merge_batch_metadata(self, batch_id: str, file_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Build a file's store entry with batch metadata merged in (file values win).
+        
+        Returns:
+            The new {'data', 'content_type'} entry, or None if batch or file is missing
+        """
         batch_key = f"batch_{batch_id}"
         batch_metadata = self.get_metadata(batch_key)
         
         if not batch_metadata or "data" not in batch_metadata:
-            return False
+            return None
             
         # Get existing file metadata
         file_metadata = self.get_metadata(file_id)
         
         if not file_metadata:
             # File doesn't exist yet, need content_type
-            return False
+            return None
             
         # Merge batch metadata with file metadata
         # File metadata takes precedence
@@ -404,11 +508,8 @@ class MetadataManager:
             # File values override batch values
             merged_data.update(file_data)
         
-        # Update the file's metadata
         content_type = file_metadata.get("content_type", "unknown")
-        self.metadata_store[file_id] = {"data": merged_data, "content_type": content_type}
-        
-        return True
+        return {"data": merged_data, "content_type": content_type}
     
     def get_batch_metadata(self, batch_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -434,12 +535,5 @@ class MetadataManager:
         Returns:
             List of file IDs in the batch
         """
-        results = []
-        for file_id, metadata in self.metadata_store.items():
-            if file_id.startswith("batch_"):
-                continue
-                
-            if "data" in metadata and metadata["data"].get("batch_id") == batch_id:
-                results.append(file_id)
-                
-        return results
+        return [file_id for file_id in self.engine.query(Eq("batch_id", batch_id))
+                if not (isinstance(file_id, str) and file_id.startswith("batch_"))]
@@ -0,0 +1,599 @@
+"""
+Indexed metadata query engine.
+
+- Field-level secondary indexes kept up to date on every write:
+  * hash postings (value -> ids) for exact matches, on every field
+  * sorted distinct values over those postings for range predicates
+    (numbers and dates automatically, strings when declared)
+  * inverted keyword index (term -> ids) for comma-separated / list keyword fields
+- A small composable query language: Eq, In, Range, Keyword, And, Or, Not,
+  plus the ``field("name")`` builder (``field("duration").between(10, 60)``).
+- Cost-based planning: And drives from the cheapest child (exact cardinality
+  estimates from the indexes) and either intersects the next child's postings or
+  filters the candidates record by record, whichever touches fewer ids.
+- Facet counts for browsing, served from postings when no filter is applied.
+
+Used by MetadataManager; see app/models/metadata_manager.py.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+DEFAULT_KEYWORD_FIELDS = ("keywords", "tags")
+
+# Bulk writes larger than this rebuild sorted value lists once instead of inserting one by one
+_REBUILD_THRESHOLD = 256
+
+
+def _freeze(value: Any) -> Hashable:
+    """Hashable stand-in for a metadata value (lists/dicts/sets included)."""
+    if isinstance(value, (list, tuple)):
+        return ("__seq__", tuple(_freeze(v) for v in value))
+    if isinstance(value, dict):
+        return ("__map__", tuple(sorted((str(k), _freeze(v)) for k, v in value.items())))
+    if isinstance(value, (set, frozenset)):
+        return ("__set__", frozenset(_freeze(v) for v in value))
+    try:
+        hash(value)
+    except TypeError:
+        return ("__repr__", repr(value))
+    return value
+
+
+def _order_key(value: Any) -> Optional[Tuple[int, Any]]:
+    """Comparable key for range indexes; values of different kinds never compare equal."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return (0, value)
+    if isinstance(value, str):
+        return (1, value)
+    if isinstance(value, datetime):
+        return (2, value)
+    if isinstance(value, date):
+        return (3, value)
+    return None
+
+
+def keyword_terms(value: Any) -> List[str]:
+    """Normalized keyword terms of a field value: comma-separated string or list of strings."""
+    if isinstance(value, str):
+        parts = value.split(",")
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        parts = [v for v in value if isinstance(v, str)]
+    else:
+        return []
+    return [p.strip().lower() for p in parts]
+
+
+class FieldIndex:
+    """Hash postings for one field, with a lazily built sorted list of its distinct values."""
+
+    def __init__(self, name: str, order_strings: bool = False):
+        self.name = name
+        self.order_strings = order_strings
+        self.postings: Dict[Hashable, Set[Hashable]] = {}
+        self.originals: Dict[Hashable, Any] = {}  # frozen key -> a representative original value
+        self.present: Set[Hashable] = set()  # ids that have this field at all
+        self._sorted: Optional[List[Tuple[Tuple[int, Any], Hashable]]] = None
+
+    def _orderable(self, value: Any) -> Optional[Tuple[int, Any]]:
+        key = _order_key(value)
+        if key is not None and key[0] == 1 and not self.order_strings:
+            return None
+        return key
+
+    def add(self, doc_id: Hashable, value: Any, bulk: bool = False) -> None:
+        frozen = _freeze(value)
+        ids = self.postings.get(frozen)
+        if ids is None:
+            ids = self.postings[frozen] = set()
+            self.originals[frozen] = value
+            key = self._orderable(value)
+            if key is not None and self._sorted is not None:
+                if bulk:
+                    self._sorted = None
+                else:
+                    insort(self._sorted, (key, frozen))
+        ids.add(doc_id)
+        self.present.add(doc_id)
+
+    def remove(self, doc_id: Hashable, value: Any) -> None:
+        self.present.discard(doc_id)
+        frozen = _freeze(value)
+        ids = self.postings.get(frozen)
+        if ids is None:
+            return
+        ids.discard(doc_id)
+        if not ids:
+            del self.postings[frozen]
+            original = self.originals.pop(frozen, value)
+            key = self._orderable(original)
+            if key is not None and self._sorted is not None:
+                pos = bisect_left(self._sorted, (key, frozen))
+                if pos < len(self._sorted) and self._sorted[pos] == (key, frozen):
+                    del self._sorted[pos]
+
+    def sorted_values(self) -> List[Tuple[Tuple[int, Any], Hashable]]:
+        if self._sorted is None:
+            entries = []
+            for frozen, original in self.originals.items():
+                key = self._orderable(original)
+                if key is not None:
+                    entries.append((key, frozen))
+            entries.sort(key=lambda e: e[0])
+            self._sorted = entries
+        return self._sorted
+
+    def range_keys(self, low: Any = None, high: Any = None,
+                   include_low: bool = True, include_high: bool = True) -> List[Hashable]:
+        """Frozen values within [low, high] (bounds optional, same kind as the bound)."""
+        entries = self.sorted_values()
+        keys = [e[0] for e in entries] if entries else []
+        bound = low if low is not None else high
+        kind = _order_key(bound)
+        if kind is None:
+            return []
+        if low is not None:
+            lo_key = _order_key(low)
+            start = bisect_left(keys, lo_key) if include_low else bisect_right(keys, lo_key)
+        else:
+            start = bisect_left(keys, (kind[0],))
+        if high is not None:
+            hi_key = _order_key(high)
+            end = bisect_right(keys, hi_key) if include_high else bisect_left(keys, hi_key)
+        else:
+            end = bisect_left(keys, (kind[0] + 1,))
+        return [entries[i][1] for i in range(start, max(start, end))]
+
+
+class KeywordIndex:
+    """Inverted index term -> ids; substring lookups scan the (small) vocabulary, not records."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.postings: Dict[str, Set[Hashable]] = {}
+
+    def add(self, doc_id: Hashable, value: Any) -> None:
+        for term in keyword_terms(value):
+            self.postings.setdefault(term, set()).add(doc_id)
+
+    def remove(self, doc_id: Hashable, value: Any) -> None:
+        for term in keyword_terms(value):
+            ids = self.postings.get(term)
+            if ids is not None:
+                ids.discard(doc_id)
+                if not ids:
+                    del self.postings[term]
+
+    def matching_terms(self, term: str, substring: bool = True) -> List[str]:
+        term = term.strip().lower()
+        if not substring:
+            return [term] if term in self.postings else []
+        return [t for t in self.postings if term in t]
+
+
+# ---------------------------------------------------------------------------
+# Query language
+# ---------------------------------------------------------------------------
+
+class Predicate:
+    """Base predicate. Combine with ``&`` (And), ``|`` (Or) and ``~`` (Not)."""
+
+    def __and__(self, other: "Predicate") -> "Predicate":
+        return And(self, other)
+
+    def __or__(self, other: "Predicate") -> "Predicate":
+        return Or(self, other)
+
+    def __invert__(self) -> "Predicate":
+        return Not(self)
+
+    def estimate(self, engine: "MetadataQueryEngine") -> int:
+        """Upper bound on the number of matching ids, from the indexes."""
+        raise NotImplementedError
+
+    def evaluate(self, engine: "MetadataQueryEngine") -> Set[Hashable]:
+        """Matching ids, computed from the indexes."""
+        raise NotImplementedError
+
+    def matches(self, record: Dict[str, Any]) -> bool:
+        """Check a single record directly (used to filter small candidate sets)."""
+        raise NotImplementedError
+
+    def describe(self) -> str:
+        return repr(self)
+
+
+class Eq(Predicate):
+    """Exact match; ``Eq(f, None)`` also matches records without the field (like dict.get)."""
+
+    def __init__(self, field_name: str, value: Any):
+        self.field, self.value = field_name, value
+
+    def estimate(self, engine):
+        index = engine.fields.get(self.field)
+        if self.value is None:
+            return len(engine)
+        return len(index.postings.get(_freeze(self.value), ())) if index else 0
+
+    def evaluate(self, engine):
+        index = engine.fields.get(self.field)
+        if self.value is None:
+            missing = set(engine.records) - index.present if index else set(engine.records)
+            return missing | set(index.postings.get(None, ())) if index else missing
+        return set(index.postings.get(_freeze(self.value), ())) if index else set()
+
+    def matches(self, record):
+        return record.get(self.field) == self.value
+
+    def __repr__(self):
+        return f"{self.field} == {self.value!r}"
+
+
+class In(Predicate):
+    def __init__(self, field_name: str, values: Iterable[Any]):
+        self.field, self.values = field_name, list(values)
+
+    def estimate(self, engine):
+        return sum(Eq(self.field, v).estimate(engine) for v in self.values)
+
+    def evaluate(self, engine):
+        result: Set[Hashable] = set()
+        for v in self.values:
+            result |= Eq(self.field, v).evaluate(engine)
+        return result
+
+    def matches(self, record):
+        return self.field in record and any(record[self.field] == v for v in self.values)
+
+    def __repr__(self):
+        return f"{self.field} in {self.values!r}"
+
+
+class Range(Predicate):
+    def __init__(self, field_name: str, low: Any = None, high: Any = None,
+                 include_low: bool = True, include_high: bool = True):
+        if low is None and high is None:
+            raise ValueError("Range needs at least one bound")
+        self.field, self.low, self.high = field_name, low, high
+        self.include_low, self.include_high = include_low, include_high
+
+    def _keys(self, engine):
+        index = engine.fields.get(self.field)
+        if index is None:
+            return None, []
+        return index, index.range_keys(self.low, self.high, self.include_low, self.include_high)
+
+    def estimate(self, engine):
+        index, keys = self._keys(engine)
+        return sum(len(index.postings[k]) for k in keys) if index else 0
+
+    def evaluate(self, engine):
+        index, keys = self._keys(engine)
+        result: Set[Hashable] = set()
+        for k in keys:
+            result |= index.postings[k]
+        return result
+
+    def matches(self, record):
+        key = _order_key(record.get(self.field))
+        if key is None:
+            return False
+        if self.low is not None:
+            low = _order_key(self.low)
+            if key[0] != low[0] or key < low or (key == low and not self.include_low):
+                return False
+        if self.high is not None:
+            high = _order_key(self.high)
+            if key[0] != high[0] or key > high or (key == high and not self.include_high):
+                return False
+        return True
+
+    def __repr__(self):
+        lo = "[" if self.include_low else "("
+        hi = "]" if self.include_high else ")"
+        return f"{self.field} in {lo}{self.low!r}, {self.high!r}{hi}"
+
+
+class Keyword(Predicate):
+    """Keyword term match on an inverted-index field (substring by default, case-insensitive)."""
+
+    def __init__(self, term: str, field_name: str = "keywords", substring: bool = True):
+        self.term, self.field, self.substring = term, field_name, substring
+
+    def estimate(self, engine):
+        index = engine.keywords.get(self.field)
+        if index is None:
+            return 0
+        return sum(len(index.postings[t]) for t in index.matching_terms(self.term, self.substring))
+
+    def evaluate(self, engine):
+        index = engine.keywords.get(self.field)
+        result: Set[Hashable] = set()
+        if index is not None:
+            for t in index.matching_terms(self.term, self.substring):
+                result |= index.postings[t]
+        return result
+
+    def matches(self, record):
+        term = self.term.strip().lower()
+        terms = keyword_terms(record.get(self.field))
+        return any(term in t for t in terms) if self.substring else term in terms
+
+    def __repr__(self):
+        op = "contains" if self.substring else "has"
+        return f"{self.field} {op} {self.term!r}"
+
+
+class And(Predicate):
+    def __init__(self, *children: Predicate):
+        self.children = [c for child in children
+                         for c in (child.children if isinstance(child, And) else [child])]
+
+    def estimate(self, engine):
+        return min((c.estimate(engine) for c in self.children), default=len(engine))
+
+    def plan(self, engine) -> List[Tuple[str, Predicate, int]]:
+        """Execution plan: drive from the cheapest child, then intersect or filter."""
+        ranked = sorted(((c.estimate(engine), i, c) for i, c in enumerate(self.children)),
+                        key=lambda e: (e[0], e[1]))
+        steps = []
+        candidates = None
+        for cost, _, child in ranked:
+            if candidates is None:
+                steps.append(("drive", child, cost))
+                candidates = cost
+            elif cost <= candidates:
+                # Reading the child's postings touches fewer ids than checking every candidate
+                steps.append(("intersect", child, cost))
+                candidates = min(candidates, cost)
+            else:
+                steps.append(("filter", child, candidates))
+        return steps
+
+    def evaluate(self, engine):
+        if not self.children:
+            return set(engine.records)
+        result: Optional[Set[Hashable]] = None
+        for action, child, _ in self.plan(engine):
+            if action == "drive":
+                result = child.evaluate(engine)
+            elif action == "intersect":
+                result &= child.evaluate(engine)
+            else:
+                records = engine.records
+                result = {i for i in result if child.matches(records[i])}
+            if not result:
+                break
+        return result
+
+    def matches(self, record):
+        return all(c.matches(record) for c in self.children)
+
+    def __repr__(self):
+        return "(" + " AND ".join(map(repr, self.children)) + ")"
+
+
+class Or(Predicate):
+    def __init__(self, *children: Predicate):
+        self.children = [c for child in children
+                         for c in (child.children if isinstance(child, Or) else [child])]
+
+    def estimate(self, engine):
+        return min(sum(c.estimate(engine) for c in self.children), len(engine))
+
+    def evaluate(self, engine):
+        result: Set[Hashable] = set()
+        for child in self.children:
+            result |= child.evaluate(engine)
+        return result
+
+    def matches(self, record):
+        return any(c.matches(record) for c in self.children)
+
+    def __repr__(self):
+        return "(" + " OR ".join(map(repr, self.children)) + ")"
+
+
+class Not(Predicate):
+    def __init__(self, child: Predicate):
+        self.child = child
+
+    def estimate(self, engine):
+        return len(engine)
+
+    def evaluate(self, engine):
+        return set(engine.records) - self.child.evaluate(engine)
+
+    def matches(self, record):
+        return not self.child.matches(record)
+
+    def __repr__(self):
+        return f"NOT {self.child!r}"
+
+
+class FieldRef:
+    """Builder: ``field("duration") >= 10``, ``field("instructor") == "Dr. Smith"``."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __eq__(self, value):  # type: ignore[override]
+        return Eq(self.name, value)
+
+    def __ne__(self, value):  # type: ignore[override]
+        return Not(Eq(self.name, value))
+
+    def __ge__(self, value):
+        return Range(self.name, low=value)
+
+    def __gt__(self, value):
+        return Range(self.name, low=value, include_low=False)
+
+    def __le__(self, value):
+        return Range(self.name, high=value)
+
+    def __lt__(self, value):
+        return Range(self.name, high=value, include_high=False)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def between(self, low, high, inclusive: bool = True) -> Range:
+        return Range(self.name, low, high, inclusive, inclusive)
+
+    def isin(self, values: Iterable[Any]) -> In:
+        return In(self.name, values)
+
+    def contains(self, term: str) -> Keyword:
+        return Keyword(term, self.name)
+
+    def has(self, term: str) -> Keyword:
+        return Keyword(term, self.name, substring=False)
+
+
+def field(name: str) -> FieldRef:
+    return FieldRef(name)
+
+
+def conditions_from_dict(query: Dict[str, Any]) -> Predicate:
+    """{'instructor': 'Dr. Smith', 'semester': 'Fall'} -> And(Eq, Eq)."""
+    return And(*[Eq(k, v) for k, v in query.items()])
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+class MetadataQueryEngine:
+    """
+    Secondary indexes over metadata records keyed by id.
+
+    Records are plain dicts; add/update/remove keep every index in sync and
+    update_many applies a whole batch with one rebuild of affected sorted lists.
+    """
+
+    def __init__(self, keyword_fields: Sequence[str] = DEFAULT_KEYWORD_FIELDS,
+                 ordered_string_fields: Sequence[str] = ()):
+        self.keyword_fields = set(keyword_fields)
+        self.ordered_string_fields = set(ordered_string_fields)
+        self.records: Dict[Hashable, Dict[str, Any]] = {}
+        self.fields: Dict[str, FieldIndex] = {}
+        self.keywords: Dict[str, KeywordIndex] = {}
+        self._seq: Dict[Hashable, int] = {}
+        self._next_seq = 0
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __contains__(self, doc_id) -> bool:
+        return doc_id in self.records
+
+    def add_ordered_field(self, name: str) -> None:
+        """Allow range queries over string values of a field (e.g. ISO dates, titles)."""
+        self.ordered_string_fields.add(name)
+        index = self.fields.get(name)
+        if index is not None:
+            index.order_strings = True
+            index._sorted = None
+
+    def _field_index(self, name: str) -> FieldIndex:
+        index = self.fields.get(name)
+        if index is None:
+            index = self.fields[name] = FieldIndex(name, name in self.ordered_string_fields)
+        return index
+
+    def _index(self, doc_id, record, bulk=False):
+        for name, value in record.items():
+            self._field_index(name).add(doc_id, value, bulk)
+            if name in self.keyword_fields:
+                self.keywords.setdefault(name, KeywordIndex(name)).add(doc_id, value)
+
+    def _unindex(self, doc_id, record):
+        for name, value in record.items():
+            index = self.fields.get(name)
+            if index is not None:
+                index.remove(doc_id, value)
+            if name in self.keyword_fields and name in self.keywords:
+                self.keywords[name].remove(doc_id, value)
+
+    def update(self, doc_id: Hashable, record: Dict[str, Any], _bulk: bool = False) -> None:
+        """Insert or replace the record stored under doc_id."""
+        old = self.records.get(doc_id)
+        if old is not None:
+            self._unindex(doc_id, old)
+        else:
+            self._seq[doc_id] = self._next_seq
+            self._next_seq += 1
+        record = dict(record or {})
+        self.records[doc_id] = record
+        self._index(doc_id, record, _bulk)
+
+    add = update
+
+    def update_many(self, items: Iterable[Tuple[Hashable, Dict[str, Any]]]) -> int:
+        """Apply a batch of inserts/replacements; large batches rebuild sorted lists once."""
+        items = list(items)
+        bulk = len(items) > _REBUILD_THRESHOLD
+        for doc_id, record in items:
+            self.update(doc_id, record, _bulk=bulk)
+        return len(items)
+
+    def remove(self, doc_id: Hashable) -> bool:
+        old = self.records.pop(doc_id, None)
+        if old is None:
+            return False
+        self._unindex(doc_id, old)
+        self._seq.pop(doc_id, None)
+        return True
+
+    def clear(self) -> None:
+        self.records.clear()
+        self.fields.clear()
+        self.keywords.clear()
+        self._seq.clear()
+
+    def ordered(self, ids: Iterable[Hashable]) -> List[Hashable]:
+        """Ids in insertion order."""
+        seq = self._seq
+        return sorted(ids, key=seq.__getitem__)
+
+    def query(self, predicate: Predicate, limit: Optional[int] = None) -> List[Hashable]:
+        """Matching ids in insertion order."""
+        result = self.ordered(predicate.evaluate(self))
+        return result[:limit] if limit is not None else result
+
+    def count(self, predicate: Predicate) -> int:
+        return len(predicate.evaluate(self))
+
+    def explain(self, predicate: Predicate) -> List[str]:
+        """Human-readable plan with index cardinality estimates."""
+        if isinstance(predicate, And):
+            return [f"{action} {child!r} (~{cost} ids)" for action, child, cost in predicate.plan(self)]
+        return [f"drive {predicate!r} (~{predicate.estimate(self)} ids)"]
+
+    def facets(self, fields: Sequence[str], predicate: Optional[Predicate] = None,
+               limit: Optional[int] = None) -> Dict[str, List[Tuple[Any, int]]]:
+        """
+        Value counts per field, optionally restricted to records matching predicate.
+        Without a predicate the counts come straight from the postings.
+        """
+        matching = predicate.evaluate(self) if predicate is not None else None
+        result = {}
+        for name in fields:
+            index = self.fields.get(name)
+            counts: List[Tuple[Any, int]] = []
+            if index is not None:
+                for frozen, ids in index.postings.items():
+                    if matching is None:
+                        n = len(ids)
+                    elif len(ids) < len(matching):
+                        n = sum(1 for i in ids if i in matching)
+                    else:
+                        n = sum(1 for i in matching if i in ids)
+                    if n:
+                        counts.append((index.originals[frozen], n))
+                counts.sort(key=lambda c: -c[1])
+            result[name] = counts[:limit] if limit is not None else counts
+        return result
@@ -7,8 +7,10 @@ Data models for student progress tracking across modules, lessons, quizzes, with
 Location: app/models/progress.py
 """
 
+from bisect import bisect_left, bisect_right
+from datetime import datetime
 from enum import Enum
-from typing import List, Dict, Optional, Any, Union
+from typing import List, Dict, Optional, Any, Tuple, Union
 import json
 
 class ProgressStatus(Enum):
@@ -124,3 +126,128 @@ class Progress:
         """Create Progress object from JSON string"""
         data = json.loads(json_str)
         return cls.deserialize(data)
+
+
+class ProgressMetricType(Enum):
+    COMPLETION_PERCENTAGE = "completion_percentage"
+    STEPS_COMPLETED = "steps_completed"
+    SCORE = "score"
+    TIME_SPENT = "time_spent"
+
+
+class ProgressEntry:
+    """A single metric sample in a progress timeline."""
+    def __init__(self, metric: ProgressMetricType, value: float, timestamp: Optional[datetime] = None):
+        self.metric = metric
+        self.value = value
+        self.timestamp = timestamp or datetime.utcnow()
+
+    def serialize(self) -> Dict[str, Any]:
+        return {"metric": self.metric.value, "value": self.value, "timestamp": self.timestamp.isoformat()}
+
+    def __repr__(self) -> str:
+        return f"<ProgressEntry {self.metric.value}={self.value} @ {self.timestamp.isoformat()}>"
+
+
+class ProgressTimeline:
+    """
+    Append-only metric series for one user in one course.
+
+    Samples are stored per metric as parallel, time-ordered arrays, so reads
+    never rebuild or re-sort the series; long ranges are downsampled on read
+    (largest-triangle-three-buckets) to at most ``max_points`` samples.
+    An optional ``sink`` with ``append_point(user_id, course_id, entry)``
+    (e.g. SQLiteProgressStore) persists each sample as it is added.
+    """
+    def __init__(self, user_id: str, course_id: str, sink: Any = None):
+        self.user_id = user_id
+        self.course_id = course_id
+        self.sink = sink
+        self._times: Dict[ProgressMetricType, List[float]] = {}
+        self._values: Dict[ProgressMetricType, List[float]] = {}
+
+    def add_entry(self, entry: ProgressEntry, persist: bool = True) -> None:
+        """Append a sample; a late (out-of-order) sample is inserted at its place."""
+        times = self._times.setdefault(entry.metric, [])
+        values = self._values.setdefault(entry.metric, [])
+        ts = entry.timestamp.timestamp()
+        if not times or ts >= times[-1]:
+            times.append(ts)
+            values.append(entry.value)
+        else:
+            pos = bisect_right(times, ts)
+            times.insert(pos, ts)
+            values.insert(pos, entry.value)
+        if persist and self.sink is not None:
+            self.sink.append_point(self.user_id, self.course_id, entry)
+
+    def record(self, metric: ProgressMetricType, value: float, timestamp: Optional[datetime] = None) -> ProgressEntry:
+        entry = ProgressEntry(metric, value, timestamp)
+        self.add_entry(entry)
+        return entry
+
+    def __len__(self) -> int:
+        return sum(len(t) for t in self._times.values())
+
+    def latest(self, metric: ProgressMetricType) -> Optional[ProgressEntry]:
+        times = self._times.get(metric)
+        if not times:
+            return None
+        return ProgressEntry(metric, self._values[metric][-1], datetime.fromtimestamp(times[-1]))
+
+    def get_metric_over_time(self, metric: ProgressMetricType, start: Optional[datetime] = None,
+                             end: Optional[datetime] = None, max_points: Optional[int] = None) -> List[ProgressEntry]:
+        """
+        Samples of a metric in time order, optionally restricted to [start, end]
+        and downsampled to at most max_points (first and last samples are kept).
+        """
+        times = self._times.get(metric, [])
+        values = self._values.get(metric, [])
+        lo = bisect_left(times, start.timestamp()) if start else 0
+        hi = bisect_right(times, end.timestamp()) if end else len(times)
+        indices = range(lo, hi)
+        if max_points is not None and hi - lo > max_points:
+            indices = _lttb_indices(times, values, lo, hi, max_points)
+        return [ProgressEntry(metric, values[i], datetime.fromtimestamp(times[i])) for i in indices]
+
+
+def _lttb_indices(xs: List[float], ys: List[float], lo: int, hi: int, threshold: int) -> List[int]:
+    """Largest-triangle-three-buckets: pick `threshold` indices of xs[lo:hi] that preserve the shape."""
+    if threshold < 3:
+        return [lo, hi - 1][:max(threshold, 1)]
+    picked = [lo]
+    bucket = (hi - lo - 2) / (threshold - 2)
+    a = lo
+    for i in range(threshold - 2):
+        start = lo + 1 + int(i * bucket)
+        stop = lo + 1 + int((i + 1) * bucket)
+        next_stop = min(lo + 1 + int((i + 2) * bucket), hi)
+        # Average of the next bucket is the third triangle vertex
+        if i == threshold - 3:
+            avg_x, avg_y = xs[hi - 1], ys[hi - 1]
+        else:
+            n = max(next_stop - stop, 1)
+            avg_x = sum(xs[stop:next_stop]) / n
+            avg_y = sum(ys[stop:next_stop]) / n
+        best, best_area = start, -1.0
+        for j in range(start, max(stop, start + 1)):
+            area = abs((xs[a] - avg_x) * (ys[j] - ys[a]) - (xs[a] - xs[j]) * (avg_y - ys[a]))
+            if area > best_area:
+                best, best_area = j, area
+        picked.append(best)
+        a = best
+    picked.append(hi - 1)
+    return picked
+
+
+class ComparativeProgress:
+    """One metric compared across students or groups (e.g. for cohort bar charts)."""
+    def __init__(self, metric: ProgressMetricType):
+        self.metric = metric
+        self.values: Dict[str, float] = {}
+
+    def set_value(self, entity_id: str, value: float) -> None:
+        self.values[entity_id] = value
+
+    def ranked(self, descending: bool = True) -> List[Tuple[str, float]]:
+        return sorted(self.values.items(), key=lambda kv: kv[1], reverse=descending)
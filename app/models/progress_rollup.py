@@ -0,0 +1,358 @@
+"""
+app/models/progress_rollup.py
+=============================
+
+Incremental progress rollups for dashboards.
+
+- ProgressRollup keeps the latest Progress of every (user, objective) and
+  applies each update as a delta to per-student, per-module, per-course and
+  per-student-in-course summaries, so reads never re-aggregate records.
+- Summaries report the same totals and status rule as Progress.aggregate.
+- SQLiteProgressStore persists objective states, the materialized summaries
+  and append-only timeline points; verify() rebuilds every summary from the
+  objective states and reports any drift, rebuild() repairs it.
+
+Location: app/models/progress_rollup.py
+"""
+
+import sqlite3
+import threading
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.models.progress import (
+    Progress, ProgressStatus, ProgressEntry, ProgressMetricType, ProgressTimeline, ComparativeProgress
+)
+
+STUDENT = "student"
+MODULE = "module"
+COURSE = "course"
+STUDENT_COURSE = "student_course"
+
+
+@dataclass
+class RollupSummary:
+    """Precomputed aggregate over a set of objectives."""
+    total_steps: int = 0
+    completed_steps: int = 0
+    objectives: int = 0
+    started: int = 0        # objectives with completed_steps > 0
+    completed: int = 0      # objectives with status COMPLETED
+    failed: int = 0
+
+    def apply(self, state: "ObjectiveState", sign: int) -> None:
+        self.total_steps += sign * state.total_steps
+        self.completed_steps += sign * state.completed_steps
+        self.objectives += sign
+        self.started += sign * (state.completed_steps > 0)
+        self.completed += sign * (state.status == ProgressStatus.COMPLETED)
+        self.failed += sign * (state.status == ProgressStatus.FAILED)
+
+    @property
+    def status(self) -> ProgressStatus:
+        """Same rule as Progress.aggregate."""
+        if self.objectives and self.completed == self.objectives:
+            return ProgressStatus.COMPLETED
+        if self.started:
+            return ProgressStatus.IN_PROGRESS
+        return ProgressStatus.NOT_STARTED
+
+    @property
+    def percent_complete(self) -> float:
+        return min(100.0, self.completed_steps / self.total_steps * 100.0) if self.total_steps else 0.0
+
+    def to_progress(self, user_id: str = "aggregate") -> Progress:
+        return Progress(user_id=user_id, objective_id="aggregate", total_steps=self.total_steps,
+                        completed_steps=self.completed_steps, status=self.status)
+
+
+@dataclass
+class ObjectiveState:
+    """Latest known progress of one user on one objective, with its placement."""
+    user_id: str
+    objective_id: str
+    module_id: Optional[str]
+    course_id: Optional[str]
+    total_steps: int
+    completed_steps: int
+    status: ProgressStatus
+
+    def scopes(self) -> List[Tuple[str, Any]]:
+        keys = [(STUDENT, self.user_id)]
+        if self.module_id is not None:
+            keys.append((MODULE, self.module_id))
+        if self.course_id is not None:
+            keys.append((COURSE, self.course_id))
+            keys.append((STUDENT_COURSE, (self.user_id, self.course_id)))
+        return keys
+
+
+class ProgressRollup:
+    """
+    Incrementally maintained progress aggregates.
+
+    Feed it every progress update with record(); dashboards read summary(),
+    cohort() and comparative() which are O(1)/O(cohort) lookups.
+    """
+
+    def __init__(self, store: Optional["SQLiteProgressStore"] = None):
+        self.store = store
+        self._lock = threading.RLock()
+        self._objectives: Dict[Tuple[str, str], ObjectiveState] = {}
+        self._summaries: Dict[Tuple[str, Any], RollupSummary] = {}
+        self._course_students: Dict[str, Dict[str, None]] = {}
+        self._timelines: Dict[Tuple[str, str], ProgressTimeline] = {}
+        if store is not None:
+            self._load(store)
+
+    # --- updates ---
+
+    def record(self, progress: Progress, module_id: Optional[str] = None, course_id: Optional[str] = None,
+               timestamp: Optional[datetime] = None) -> RollupSummary:
+        """
+        Apply the latest progress of one objective.
+
+        module_id/course_id default to progress.extra["module_id"/"course_id"]
+        or the placement recorded earlier for the same objective.
+
+        Returns:
+            The updated per-student summary
+        """
+        key = (progress.user_id, progress.objective_id)
+        with self._lock:
+            old = self._objectives.get(key)
+            if module_id is None:
+                module_id = progress.extra.get("module_id", old.module_id if old else None)
+            if course_id is None:
+                course_id = progress.extra.get("course_id", old.course_id if old else None)
+            new = ObjectiveState(progress.user_id, progress.objective_id, module_id, course_id,
+                                 progress.total_steps, progress.completed_steps, progress.status)
+            touched = set()
+            if old is not None:
+                for scope in old.scopes():
+                    # A loaded store may lack a scope's summary row; verify() reports the drift
+                    self._summaries.setdefault(scope, RollupSummary()).apply(old, -1)
+                    touched.add(scope)
+            for scope in new.scopes():
+                self._summaries.setdefault(scope, RollupSummary()).apply(new, +1)
+                touched.add(scope)
+            self._objectives[key] = new
+            if course_id is not None:
+                self._course_students.setdefault(course_id, {})[progress.user_id] = None
+                course_summary = self._summaries[(STUDENT_COURSE, (progress.user_id, course_id))]
+                self.timeline(progress.user_id, course_id).record(
+                    ProgressMetricType.COMPLETION_PERCENTAGE, course_summary.percent_complete, timestamp)
+            if self.store is not None:
+                self.store.save(new, {scope: self._summaries[scope] for scope in touched})
+            return self._summaries[(STUDENT, progress.user_id)]
+
+    def record_many(self, updates: Iterable[Tuple[Progress, Optional[str], Optional[str]]]) -> int:
+        """Apply (progress, module_id, course_id) updates; the store commits once for the batch."""
+        count = 0
+        with self._lock:
+            if self.store is not None:
+                with self.store.batch():
+                    for progress, module_id, course_id in updates:
+                        self.record(progress, module_id, course_id)
+                        count += 1
+            else:
+                for progress, module_id, course_id in updates:
+                    self.record(progress, module_id, course_id)
+                    count += 1
+        return count
+
+    # --- reads ---
+
+    def summary(self, scope: str, key: Any) -> RollupSummary:
+        """Precomputed summary for (STUDENT, user), (MODULE, module), (COURSE, course) or (STUDENT_COURSE, (user, course))."""
+        with self._lock:
+            found = self._summaries.get((scope, key))
+            return RollupSummary(**asdict(found)) if found else RollupSummary()
+
+    def student(self, user_id: str) -> RollupSummary:
+        return self.summary(STUDENT, user_id)
+
+    def module(self, module_id: str) -> RollupSummary:
+        return self.summary(MODULE, module_id)
+
+    def course(self, course_id: str) -> RollupSummary:
+        return self.summary(COURSE, course_id)
+
+    def cohort(self, course_id: str) -> Dict[str, RollupSummary]:
+        """Per-student summaries for everyone with progress in a course."""
+        with self._lock:
+            return {user_id: self.summary(STUDENT_COURSE, (user_id, course_id))
+                    for user_id in self._course_students.get(course_id, ())}
+
+    def comparative(self, course_id: str,
+                    metric: ProgressMetricType = ProgressMetricType.COMPLETION_PERCENTAGE) -> ComparativeProgress:
+        comparison = ComparativeProgress(metric)
+        for user_id, summary in self.cohort(course_id).items():
+            if metric == ProgressMetricType.STEPS_COMPLETED:
+                comparison.set_value(user_id, summary.completed_steps)
+            else:
+                comparison.set_value(user_id, summary.percent_complete)
+        return comparison
+
+    def timeline(self, user_id: str, course_id: str) -> ProgressTimeline:
+        key = (user_id, course_id)
+        with self._lock:
+            timeline = self._timelines.get(key)
+            if timeline is None:
+                timeline = self._timelines[key] = ProgressTimeline(user_id, course_id, sink=self.store)
+            return timeline
+
+    # --- verification ---
+
+    def recompute(self) -> Dict[Tuple[str, Any], RollupSummary]:
+        """Aggregate every summary from scratch from the objective states."""
+        with self._lock:
+            fresh: Dict[Tuple[str, Any], RollupSummary] = {}
+            for state in self._objectives.values():
+                for scope in state.scopes():
+                    fresh.setdefault(scope, RollupSummary()).apply(state, +1)
+            return fresh
+
+    def verify(self) -> List[Tuple[str, Any]]:
+        """Scopes whose materialized summary differs from a full recomputation (empty if consistent)."""
+        with self._lock:
+            fresh = self.recompute()
+            materialized = {k: v for k, v in self._summaries.items() if v.objectives}
+            if self.store is not None:
+                materialized = {k: v for k, v in self.store.load_summaries().items() if v.objectives}
+            return sorted((k for k in set(fresh) | set(materialized) if fresh.get(k) != materialized.get(k)),
+                          key=repr)
+
+    def rebuild(self) -> int:
+        """Replace every summary with a full recomputation. Returns the number of scopes."""
+        with self._lock:
+            self._summaries = self.recompute()
+            if self.store is not None:
+                self.store.replace_summaries(self._summaries)
+            return len(self._summaries)
+
+    def _load(self, store: "SQLiteProgressStore") -> None:
+        for state in store.load_objectives():
+            self._objectives[(state.user_id, state.objective_id)] = state
+            if state.course_id is not None:
+                self._course_students.setdefault(state.course_id, {})[state.user_id] = None
+        self._summaries = store.load_summaries()
+        for user_id, course_id, entry in store.load_points():
+            self.timeline(user_id, course_id).add_entry(entry, persist=False)
+
+
+def _encode_key(scope: str, key: Any) -> str:
+    return "\x1f".join(map(str, key)) if scope == STUDENT_COURSE else str(key)
+
+
+def _decode_key(scope: str, raw: str) -> Any:
+    return tuple(raw.split("\x1f", 1)) if scope == STUDENT_COURSE else raw
+
+
+class SQLiteProgressStore:
+    """
+    Persistence for ProgressRollup: objective states (source of truth),
+    materialized summaries, and append-only timeline points.
+    """
+
+    def __init__(self, db_path: str = ":memory:"):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS progress_objective (
+                user_id TEXT, objective_id TEXT, module_id TEXT, course_id TEXT,
+                total_steps INTEGER, completed_steps INTEGER, status TEXT,
+                PRIMARY KEY (user_id, objective_id));
+            CREATE TABLE IF NOT EXISTS progress_summary (
+                scope TEXT, key TEXT, total_steps INTEGER, completed_steps INTEGER,
+                objectives INTEGER, started INTEGER, completed INTEGER, failed INTEGER,
+                PRIMARY KEY (scope, key));
+            CREATE TABLE IF NOT EXISTS progress_timeline (
+                user_id TEXT, course_id TEXT, metric TEXT, ts REAL, value REAL);
+            CREATE INDEX IF NOT EXISTS idx_progress_timeline
+                ON progress_timeline (user_id, course_id, metric, ts);
+        """)
+
+    def batch(self):
+        """Context manager: defer commits until the outermost batch exits."""
+        store = self
+
+        class _Batch:
+            def __enter__(self):
+                store._lock.acquire()
+                store._batch_depth += 1
+
+            def __exit__(self, exc_type, exc, tb):
+                store._batch_depth -= 1
+                try:
+                    if store._batch_depth == 0:
+                        if exc_type is None:
+                            store._conn.commit()
+                        else:
+                            store._conn.rollback()
+                finally:
+                    store._lock.release()
+                return False
+
+        return _Batch()
+
+    def _commit(self) -> None:
+        if self._batch_depth == 0:
+            self._conn.commit()
+
+    def save(self, state: ObjectiveState, summaries: Dict[Tuple[str, Any], RollupSummary]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO progress_objective VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (state.user_id, state.objective_id, state.module_id, state.course_id,
+                 state.total_steps, state.completed_steps, state.status.value))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO progress_summary VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(scope, _encode_key(scope, key), s.total_steps, s.completed_steps,
+                  s.objectives, s.started, s.completed, s.failed)
+                 for (scope, key), s in summaries.items()])
+            self._commit()
+
+    def append_point(self, user_id: str, course_id: str, entry: ProgressEntry) -> None:
+        with self._lock:
+            self._conn.execute("INSERT INTO progress_timeline VALUES (?, ?, ?, ?, ?)",
+                               (user_id, course_id, entry.metric.value, entry.timestamp.timestamp(), entry.value))
+            self._commit()
+
+    def replace_summaries(self, summaries: Dict[Tuple[str, Any], RollupSummary]) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM progress_summary")
+            self._batch_depth += 1
+            try:
+                self._conn.executemany(
+                    "INSERT INTO progress_summary VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(scope, _encode_key(scope, key), s.total_steps, s.completed_steps,
+                      s.objectives, s.started, s.completed, s.failed)
+                     for (scope, key), s in summaries.items()])
+            finally:
+                self._batch_depth -= 1
+            self._commit()
+
+    def load_objectives(self) -> List[ObjectiveState]:
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM progress_objective").fetchall()
+        return [ObjectiveState(u, o, m, c, t, d, ProgressStatus(s)) for u, o, m, c, t, d, s in rows]
+
+    def load_summaries(self) -> Dict[Tuple[str, Any], RollupSummary]:
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM progress_summary").fetchall()
+        return {(scope, _decode_key(scope, key)): RollupSummary(*values) for scope, key, *values in rows}
+
+    def load_points(self) -> List[Tuple[str, str, ProgressEntry]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT user_id, course_id, metric, ts, value FROM progress_timeline ORDER BY ts").fetchall()
+        return [(u, c, ProgressEntry(ProgressMetricType(m), v, datetime.fromtimestamp(ts)))
+                for u, c, m, ts, v in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,7 +1,15 @@
 # /app/models/tag_search.py
 
+import heapq
+import math
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import event, func, inspect, select, union_all
 from sqlalchemy.orm import Session
-from app.models.course import Course, Module, Lesson
+from app.models.course import Course, Module, Lesson, course_tag_link, module_tag_link, lesson_tag_link
 from app.models.tag import Tag
 
 def search_courses_by_tag(session: Session, tag_name: str):
@@ -16,10 +24,286 @@ def search_lessons_by_tag(session: Session, tag_name: str):
     """Return all lessons tagged with the given tag name."""
     return session.query(Lesson).join(Lesson.tags).filter(Tag.name.ilike(tag_name)).all()
 
-def search_courses_by_tag_partial(session: Session, tag_fragment: str):
-    """Return all courses with a tag *containing* the given string."""
+def search_courses_by_tag_partial(session: Session, tag_fragment: str, index: Optional["TagIndex"] = None):
+    """Return all courses with a tag *containing* the given string.
+
+    With a TagIndex the fragment is resolved to tag names in memory, so the
+    query filters on an indexable name IN (...) instead of ilike('%...%').
+    """
+    if index is not None:
+        names = index.matching_names(tag_fragment)
+        if not names:
+            return []
+        return session.query(Course).join(Course.tags).filter(Tag.name.in_(names)).all()
     return session.query(Course).join(Course.tags).filter(Tag.name.ilike(f"%{tag_fragment}%")).all()
 
 def search_courses_by_tags(session: Session, tags_list):
     """Return all courses matching ANY tag in the list."""
-    return session.query(Course).join(Course.tags).filter(Tag.name.in_(tags_list)).all()
\ No newline at end of file
+    return session.query(Course).join(Course.tags).filter(Tag.name.in_(tags_list)).all()
+
+# --- In-memory tag index for autocomplete ---------------------------------
+#
+# ilike('%term%') cannot use a B-tree index, so every keystroke scanned the
+# whole tag table. TagIndex keeps tag names in memory with:
+#   - a sorted list for prefix ranges (bisect) and one for word starts,
+#   - trigram postings for substring and fuzzy matches,
+#   - usage counts so popular tags rank first within a match tier.
+# Keep it in sync with the tag table via watch(); build it with from_session().
+
+# Tier bonuses: a match in a better tier always outranks any popularity bonus
+_TIER = {"exact": 4.0, "prefix": 3.0, "word": 2.0, "substring": 1.0, "fuzzy": 0.0}
+_PREFIX_CACHE_LEN = 2
+
+
+class TagMatch(NamedTuple):
+    name: str
+    score: float
+    kind: str  # exact | prefix | word | substring | fuzzy
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TagIndex:
+    """Ranked prefix/substring/fuzzy tag lookup with incremental updates."""
+
+    def __init__(self, popularity_weight: float = 0.9, fuzzy_threshold: float = 0.3):
+        self.popularity_weight = popularity_weight
+        self.fuzzy_threshold = fuzzy_threshold
+        self._names: Dict[str, str] = {}          # lowercase key -> display name
+        self._popularity: Dict[str, int] = {}
+        self._keys: List[str] = []                 # sorted lowercase keys
+        self._words: List[Tuple[str, str]] = []    # sorted (word, key) for non-leading words
+        self._trigrams: Dict[str, Set[str]] = {}
+        self._prefix_cache: Dict[str, List[str]] = {}
+        self._max_popularity = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return name.strip().lower() in self._names
+
+    # --- updates ---------------------------------------------------------
+
+    def add(self, name: str, popularity: Optional[int] = None) -> None:
+        """Add a tag (or update its display name / popularity if already indexed)."""
+        key = name.strip().lower()
+        if not key:
+            return
+        with self._lock:
+            if key in self._names:
+                self._names[key] = name.strip()
+                if popularity is not None:
+                    self.set_popularity(name, popularity)
+                return
+            popularity = popularity or 0
+            self._names[key] = name.strip()
+            self._popularity[key] = popularity
+            self._max_popularity = max(self._max_popularity, popularity)
+            insort(self._keys, key)
+            for word in key.split()[1:]:
+                insort(self._words, (word, key))
+            for gram in _trigrams(key):
+                self._trigrams.setdefault(gram, set()).add(key)
+            self._invalidate(key)
+
+    def add_many(self, tags: Iterable[Tuple[str, int]]) -> None:
+        """Bulk load (name, popularity) pairs; sorts once instead of inserting one by one."""
+        with self._lock:
+            for name, popularity in tags:
+                key = name.strip().lower()
+                if not key:
+                    continue
+                if key not in self._names:
+                    for word in key.split()[1:]:
+                        self._words.append((word, key))
+                    for gram in _trigrams(key):
+                        self._trigrams.setdefault(gram, set()).add(key)
+                self._names[key] = name.strip()
+                self._popularity[key] = popularity
+                self._max_popularity = max(self._max_popularity, popularity)
+            self._keys = sorted(self._names)
+            self._words = sorted(set(self._words))
+            self._prefix_cache.clear()
+
+    def remove(self, name: str) -> bool:
+        key = name.strip().lower()
+        with self._lock:
+            if key not in self._names:
+                return False
+            del self._names[key]
+            self._popularity.pop(key, None)
+            del self._keys[bisect_left(self._keys, key)]
+            for word in key.split()[1:]:
+                pos = bisect_left(self._words, (word, key))
+                if pos < len(self._words) and self._words[pos] == (word, key):
+                    del self._words[pos]
+            for gram in _trigrams(key):
+                keys = self._trigrams.get(gram)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._trigrams[gram]
+            self._invalidate(key)
+            return True
+
+    def rename(self, old_name: str, new_name: str) -> None:
+        with self._lock:
+            popularity = self._popularity.get(old_name.strip().lower(), 0)
+            self.remove(old_name)
+            self.add(new_name, popularity)
+
+    def set_popularity(self, name: str, popularity: int) -> None:
+        key = name.strip().lower()
+        with self._lock:
+            if key in self._popularity:
+                self._popularity[key] = popularity
+                self._max_popularity = max(self._max_popularity, popularity)
+                self._invalidate(key)
+
+    def bump(self, name: str, delta: int = 1) -> None:
+        """Adjust a tag's usage count (e.g. when it is attached to a course)."""
+        key = name.strip().lower()
+        with self._lock:
+            if key in self._popularity:
+                self.set_popularity(key, self._popularity[key] + delta)
+
+    def _invalidate(self, key: str) -> None:
+        words = key.split()
+        for n in range(1, _PREFIX_CACHE_LEN + 1):
+            for word in words:
+                self._prefix_cache.pop(word[:n], None)
+
+    # --- lookup ----------------------------------------------------------
+
+    def _score(self, key: str, kind: str) -> float:
+        bonus = 0.0
+        if self._max_popularity > 0:
+            bonus = math.log1p(self._popularity.get(key, 0)) / math.log1p(self._max_popularity)
+        return _TIER[kind] + self.popularity_weight * bonus
+
+    def _most_popular(self, keys: Iterable[str], n: int) -> List[str]:
+        return heapq.nlargest(n, keys, key=lambda k: (self._popularity.get(k, 0), k))
+
+    def _prefix_keys(self, sorted_items: List, prefix: str, get_key: Callable) -> Iterable[str]:
+        start = bisect_left(sorted_items, (prefix,) if get_key is not None else prefix)
+        for i in range(start, len(sorted_items)):
+            item = sorted_items[i]
+            text = item[0] if get_key is not None else item
+            if not text.startswith(prefix):
+                break
+            yield get_key(item) if get_key is not None else item
+
+    def _top_prefix(self, prefix: str, limit: int) -> List[str]:
+        # Short prefixes cover a large slice of the vocabulary; cache their top tags
+        if len(prefix) <= _PREFIX_CACHE_LEN:
+            cached = self._prefix_cache.get(prefix)
+            if cached is None or len(cached) < limit:
+                cached = self._most_popular(self._prefix_keys(self._keys, prefix, None), max(limit, 50))
+                self._prefix_cache[prefix] = cached
+            return cached[:limit]
+        return self._most_popular(self._prefix_keys(self._keys, prefix, None), limit)
+
+    def _substring_keys(self, term: str) -> Set[str]:
+        grams = _trigrams(term)
+        if not grams:
+            return {k for k in self._keys if term in k}
+        postings = sorted((self._trigrams.get(g, set()) for g in grams), key=len)
+        candidates = set(postings[0])
+        for keys in postings[1:]:
+            candidates &= keys
+            if not candidates:
+                break
+        return {k for k in candidates if term in k}
+
+    def matching_names(self, term: str) -> List[str]:
+        """All tag names containing term (case-insensitive), like ilike('%term%')."""
+        with self._lock:
+            return sorted(self._names[k] for k in self._substring_keys(term.strip().lower()))
+
+    def search(self, term: str, limit: int = 10, fuzzy: bool = True) -> List[TagMatch]:
+        """
+        Ranked matches for term: exact, then prefix, word-prefix, substring and
+        (optionally) trigram-similar tags; popularity breaks ties within a tier.
+        """
+        query = term.strip().lower()
+        if not query or limit <= 0:
+            return []
+        with self._lock:
+            found: Dict[str, str] = {}
+
+            def take(keys, kind):
+                for key in keys:
+                    if key not in found:
+                        found[key] = kind
+
+            if query in self._names:
+                found[query] = "exact"
+            take(self._top_prefix(query, limit), "prefix")
+            if len(found) < limit:
+                words = self._prefix_keys(self._words, query, lambda item: item[1])
+                take(self._most_popular(set(words), limit), "word")
+            if len(found) < limit and len(query) >= 3:
+                take(self._most_popular(self._substring_keys(query) - found.keys(), limit), "substring")
+            if fuzzy and len(found) < limit and len(query) >= 3:
+                take(self._fuzzy_keys(query, limit, found), "fuzzy")
+
+            matches = [TagMatch(self._names[k], self._score(k, kind), kind) for k, kind in found.items()]
+        matches.sort(key=lambda m: (-m.score, m.name))
+        return matches[:limit]
+
+    def _fuzzy_keys(self, query: str, limit: int, exclude) -> List[str]:
+        grams = _trigrams(query)
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._trigrams.get(gram, ()))
+        scored = []
+        for key, common in shared.items():
+            if key in exclude:
+                continue
+            similarity = common / (len(grams) + max(len(key) - 2, 0) - common)
+            if similarity >= self.fuzzy_threshold:
+                scored.append((similarity, self._popularity.get(key, 0), key))
+        return [key for _, _, key in heapq.nlargest(limit, scored)]
+
+    # --- database integration --------------------------------------------
+
+    @classmethod
+    def from_session(cls, session: Session, **kwargs) -> "TagIndex":
+        """Build an index of all tags, with usage counts across course/module/lesson links."""
+        links = union_all(*(select(t.c.tag_id) for t in (course_tag_link, module_tag_link, lesson_tag_link))).subquery()
+        usage = dict(session.execute(select(links.c.tag_id, func.count()).group_by(links.c.tag_id)).all())
+        index = cls(**kwargs)
+        index.add_many((name, usage.get(tag_id, 0)) for tag_id, name in session.query(Tag.id, Tag.name))
+        return index
+
+    def watch(self, tag_model=Tag) -> Callable[[], None]:
+        """Keep the index in sync with tag inserts, renames and deletes. Returns an unwatch callable."""
+        def after_insert(mapper, connection, target):
+            self.add(target.name)
+
+        def after_update(mapper, connection, target):
+            history = inspect(target).attrs.name.history
+            if history.deleted:
+                self.rename(history.deleted[0], target.name)
+
+        def after_delete(mapper, connection, target):
+            self.remove(target.name)
+
+        listeners = [("after_insert", after_insert), ("after_update", after_update), ("after_delete", after_delete)]
+        for name, fn in listeners:
+            event.listen(tag_model, name, fn)
+
+        def unwatch():
+            for name, fn in listeners:
+                if event.contains(tag_model, name, fn):
+                    event.remove(tag_model, name, fn)
+        return unwatch
+
+
+def search_tags(index: TagIndex, term: str, limit: int = 10) -> List[str]:
+    """Autocomplete suggestions for term, best first."""
+    return [m.name for m in index.search(term, limit)]
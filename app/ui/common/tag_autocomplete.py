@@ -1,20 +1,57 @@
 # /app/ui/common/tag_autocomplete.py
 
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QLineEdit, QListWidget, QPushButton, QListWidgetItem, QCompleter
-from PyQt6.QtCore import Qt, QStringListModel
+from PyQt6.QtCore import Qt, QStringListModel, QTimer, QObject, QRunnable, QThreadPool, pyqtSignal
+
+from app.models.tag_search import TagIndex
+
+
+class _TagQuerySignals(QObject):
+    finished = pyqtSignal(int, list)  # (query generation, suggestions)
+
+
+class _TagQueryTask(QRunnable):
+    """Runs a slow search function (e.g. DB-backed) off the UI thread."""
+    def __init__(self, generation, term, search_fn, limit):
+        super().__init__()
+        self.generation = generation
+        self.term = term
+        self.search_fn = search_fn
+        self.limit = limit
+        self.signals = _TagQuerySignals()
+
+    def run(self):
+        try:
+            results = list(self.search_fn(self.term, self.limit))
+        except Exception:
+            results = []
+        self.signals.finished.emit(self.generation, results)
+
 
 class TagAutocomplete(QWidget):
     """
     UI for assigning tags with autocomplete and free entry.
+
+    Keystrokes are debounced: a query is dispatched only after the user pauses
+    for `debounce_ms`, and every new keystroke cancels the pending query and
+    invalidates any result still in flight. Suggestions come from a ranked
+    in-memory TagIndex (answered inline, well under a frame), or from
+    `search_fn(term, limit)` which runs on the Qt thread pool.
     """
-    def __init__(self, all_tags=None, selected_tags=None, parent=None):
+    suggestions_ready = pyqtSignal(list)
+
+    DEBOUNCE_MS = 120
+
+    def __init__(self, all_tags=None, selected_tags=None, parent=None,
+                 tag_index=None, search_fn=None, debounce_ms=None, suggestion_limit=10):
         super().__init__(parent)
         self.setWindowTitle("Assign Tags")
         self.layout = QVBoxLayout(self)
         self.tag_input = QLineEdit()
         self.tag_input.setPlaceholderText("Enter or select tags...")
         self.completer = QCompleter()
-        self._update_completer(all_tags or [])
+        # Suggestions are already ranked by the index; don't let the completer re-filter them
+        self.completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
         self.tag_input.setCompleter(self.completer)
         self.layout.addWidget(QLabel("Tags:"))
         self.layout.addWidget(self.tag_input)
@@ -24,12 +61,58 @@ class TagAutocomplete(QWidget):
         self.layout.addWidget(self.add_button)
         self.tags = set(selected_tags or [])
         self.all_tags = set(all_tags or [])
+
+        self.tag_index = tag_index if tag_index is not None else TagIndex()
+        if all_tags:
+            self.tag_index.add_many((tag, 0) for tag in all_tags if tag not in self.tag_index)
+        self.search_fn = search_fn
+        self.suggestion_limit = suggestion_limit
+        self._generation = 0
+        self._thread_pool = QThreadPool.globalInstance()
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(self.DEBOUNCE_MS if debounce_ms is None else debounce_ms)
+        self._debounce.timeout.connect(self._dispatch_query)
+
+        self._update_completer([])
         self._refresh_list()
         self.add_button.clicked.connect(self._add_tag)
+        self.tag_input.textEdited.connect(self._schedule_query)
 
     def _update_completer(self, tag_list):
         self.completer.setModel(QStringListModel(list(tag_list)))
 
+    def _schedule_query(self, _text=None):
+        self.cancel_pending_query()
+        self._debounce.start()
+
+    def cancel_pending_query(self):
+        """Drop the pending debounced query and any result still being computed."""
+        self._debounce.stop()
+        self._generation += 1
+
+    def _dispatch_query(self):
+        generation = self._generation
+        term = self.tag_input.text().strip()
+        if not term:
+            self._apply_suggestions(generation, [])
+            return
+        if self.search_fn is None:
+            names = [m.name for m in self.tag_index.search(term, self.suggestion_limit)]
+            self._apply_suggestions(generation, names)
+        else:
+            task = _TagQueryTask(generation, term, self.search_fn, self.suggestion_limit)
+            task.signals.finished.connect(self._apply_suggestions)
+            self._thread_pool.start(task)
+
+    def _apply_suggestions(self, generation, names):
+        if generation != self._generation:
+            return  # superseded by a newer keystroke
+        self._update_completer(names)
+        if names and self.tag_input.hasFocus():
+            self.completer.complete()
+        self.suggestions_ready.emit(names)
+
     def _refresh_list(self):
         self.selected_list.clear()
         for tag in sorted(self.tags):
@@ -39,7 +122,13 @@ class TagAutocomplete(QWidget):
     def _add_tag(self):
         tag = self.tag_input.text().strip()
         if tag:
+            self.cancel_pending_query()
             self.tags.add(tag)
+            if tag not in self.tag_index:
+                self.all_tags.add(tag)
+                self.tag_index.add(tag)
+            else:
+                self.tag_index.bump(tag)
             self._refresh_list()
             self.tag_input.clear()
 
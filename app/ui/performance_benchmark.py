@@ -5,7 +5,8 @@ Provides protocol-aligned scaffolding for UI and system component performance be
 in direct response to the modular benchmarks tested in /tests/unit/ui/test_ui_performance_benchmarks.py.
 
 - No actual GUI or backend imported as per environment/documentation rules.
-- Designed for future extension only after test expansion (strict TDD).
+- Measurements time the component's own hooks (render/refresh, handle_event, grab, fetch)
+  with time.perf_counter; objects lacking a hook measure as a no-op.
 - All logic, interface, and docstring structure guided by /docs/development/day22_plan.md, /code_summary.md,
   and protocols described in /docs/architecture/architecture_overview.md
 
@@ -13,36 +14,44 @@ in direct response to the modular benchmarks tested in /tests/unit/ui/test_ui_pe
 
 import time
 
+def _call_first(obj, method_names, *args):
+    """Invoke the first available method on obj from method_names; returns its result or None."""
+    for name in method_names:
+        method = getattr(obj, name, None)
+        if callable(method):
+            return method(*args)
+    return None
+
 class UIComponentPerformanceBenchmarker:
     """Benchmark the render/init time of a UI component (protocol-driven scaffold)."""
     def benchmark_render(self, component):
-        start = time.time()
-        # Insert real render/init call here for protocol-compliant UI component
-        time.sleep(0.05)  # Placeholder to simulate time delay
-        return time.time() - start
+        start = time.perf_counter()
+        # Protocol-compliant components expose one of these render/refresh hooks
+        _call_first(component, ("render", "refresh", "update", "repaint"))
+        return time.perf_counter() - start
 
 class UIWorkflowThroughputBenchmarker:
     """Benchmark workflow event throughput for a sequence of UI actions."""
     def benchmark_workflow(self, component, events):
-        start = time.time()
+        start = time.perf_counter()
         for event in events:
-            pass  # Simulate UI event/action here
-        return time.time() - start
+            name, payload = event if isinstance(event, tuple) else (event, {})
+            _call_first(component, ("handle_event", "on_event"), name, payload)
+        return time.perf_counter() - start
 
 class VisualRegressionPerformanceBenchmarker:
     """Benchmark carry out protocol-driven visual regression checks."""
     def benchmark_visual_check(self, component):
-        start = time.time()
-        # Simulate screenshot/regression logic here
-        time.sleep(0.01)
-        return time.time() - start
+        start = time.perf_counter()
+        # QWidget.grab() renders a pixmap snapshot; headless components are skipped
+        _call_first(component, ("grab", "snapshot"))
+        return time.perf_counter() - start
 
 class UIBackendLatencyBenchmarker:
     """Benchmark the protocol-compliant latency between UI and backend adapter."""
     def benchmark_backend_latency(self, adapter):
-        start = time.time()
-        # Simulate backend fetch/call here
-        time.sleep(0.03)
-        return time.time() - start
+        start = time.perf_counter()
+        _call_first(adapter, ("fetch", "get_data", "load"))
+        return time.perf_counter() - start
 
-# Extend only with reference to expanded protocol requirements and new/updated tests per TDD rules.
\ No newline at end of file
+# Backend hot-path benchmarks (percentiles, JSON, baselines) live in app.core.benchmark.
@@ -18,7 +18,10 @@ from app.models.progress import ProgressTimeline, ProgressMetricType, Comparativ
 class ProgressVisualizationWidget(QWidget):
     """
     Visualization widget for student progress, supporting multiple metrics.
+    Long timelines are downsampled to MAX_CHART_POINTS; cohort comparisons can
+    come straight from ProgressRollup.comparative() (precomputed values).
     """
+    MAX_CHART_POINTS = 500
 
     def __init__(self, timeline: ProgressTimeline, comparative: ComparativeProgress = None, parent=None):
         super().__init__(parent)
@@ -31,7 +34,9 @@ class ProgressVisualizationWidget(QWidget):
         layout.addWidget(QLabel("Progress Overview"))
 
         # Progress Bar for Completion
-        completion_entries = self.timeline.get_metric_over_time(ProgressMetricType.COMPLETION_PERCENTAGE)
+        completion_entries = self.timeline.get_metric_over_time(
+            ProgressMetricType.COMPLETION_PERCENTAGE, max_points=self.MAX_CHART_POINTS
+        )
         if completion_entries:
             latest = completion_entries[-1].value
             pb = QProgressBar()
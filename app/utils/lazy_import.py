@@ -0,0 +1,119 @@
+"""
+File: /app/utils/lazy_import.py
+Purpose: Deferred imports for heavy optional dependencies and package exports.
+
+Two helpers:
+
+- ``lazy_import("pdfplumber")`` returns a module proxy that performs the real
+  import on first attribute access. The proxy is truthy only if the module can
+  be found, so the existing ``if not pdfplumber: raise ImportError(...)``
+  guards keep working without paying for the import up front.
+- ``lazy_exports(__name__, {...})`` builds a PEP 562 module ``__getattr__`` /
+  ``__dir__`` pair so a package ``__init__`` can re-export names without
+  importing every submodule when the package is imported.
+
+Use ``python -m app.utils.startup_profiler`` to see what an import costs.
+"""
+
+import importlib
+import importlib.util
+import sys
+import threading
+import types
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports the real module on first attribute access."""
+
+    def __init__(self, name: str, install_hint: Optional[str] = None):
+        super().__init__(name)
+        self.__dict__["_lazy_install_hint"] = install_hint
+        self.__dict__["_lazy_module"] = None
+        self.__dict__["_lazy_available"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    try:
+                        module = importlib.import_module(self.__name__)
+                    except ImportError as exc:
+                        hint = self.__dict__["_lazy_install_hint"]
+                        if hint:
+                            raise ImportError(f"{self.__name__} is required for this feature "
+                                              f"(install with '{hint}')") from exc
+                        raise
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __dir__(self) -> List[str]:
+        return dir(self._load())
+
+    def __bool__(self) -> bool:
+        """True if the module is importable; checked without importing it."""
+        available = self.__dict__["_lazy_available"]
+        if available is None:
+            if self.__dict__["_lazy_module"] is not None or self.__name__ in sys.modules:
+                available = True
+            else:
+                try:
+                    available = importlib.util.find_spec(self.__name__) is not None
+                except (ImportError, ValueError):
+                    available = False
+            self.__dict__["_lazy_available"] = available
+        return available
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the real import has happened."""
+        return self.__dict__["_lazy_module"] is not None
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name: str, install_hint: Optional[str] = None) -> LazyModule:
+    """
+    Return a proxy for module `name` that is imported on first use.
+
+    Args:
+        name: Absolute module name, e.g. "pptx" or "PIL.Image"
+        install_hint: Shown in the ImportError if the module is missing
+    """
+    return LazyModule(name, install_hint)
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build module-level ``__getattr__`` and ``__dir__`` for lazy package exports.
+
+    Args:
+        package: The package's ``__name__``
+        exports: Exported name -> submodule (relative, e.g. ".text_extractor")
+
+    Example:
+        __getattr__, __dir__ = lazy_exports(__name__, {"TextExtractor": ".text_extractor"})
+    """
+    package_module = sys.modules[package]
+
+    def __getattr__(name: str) -> Any:
+        submodule = exports.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(submodule, package), name)
+        # Cache on the package so later lookups bypass __getattr__
+        setattr(package_module, name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(package_module.__dict__) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,171 @@
+"""
+File: /app/utils/startup_profiler.py
+Purpose: Report the per-module import cost of a cold start.
+
+Each profile runs a fresh interpreter with ``python -X importtime`` and
+imports the requested modules, so the numbers reflect a real cold start
+instead of whatever the current process has already loaded.
+
+Usage:
+    python -m app.utils.startup_profiler app.core.extraction integrations.registry
+    python -m app.utils.startup_profiler --headless          # the app.headless worker profile
+    python -m app.utils.startup_profiler app.core.upload.upload_service --forbid PyQt6 --json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_MARKER = "--aerolearn-profile-start--"
+
+
+@dataclass
+class ImportRecord:
+    """One line of ``-X importtime`` output (times in microseconds)."""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportProfile:
+    """Import cost of a set of target modules measured in a fresh interpreter."""
+    targets: List[str]
+    records: List[ImportRecord] = field(default_factory=list)
+    loaded_modules: List[str] = field(default_factory=list)
+
+    @property
+    def total_us(self) -> int:
+        """Cumulative import time of the targets (top-level records only)."""
+        return sum(r.cumulative_us for r in self.records if r.depth == 0)
+
+    @property
+    def total_ms(self) -> float:
+        return round(self.total_us / 1000.0, 2)
+
+    def top(self, n: int = 15, by: str = "self") -> List[ImportRecord]:
+        """Most expensive modules by self or cumulative time."""
+        key = (lambda r: r.self_us) if by == "self" else (lambda r: r.cumulative_us)
+        return sorted(self.records, key=key, reverse=True)[:n]
+
+    def by_package(self) -> Dict[str, int]:
+        """Self time aggregated per top-level package, most expensive first."""
+        totals: Dict[str, int] = {}
+        for record in self.records:
+            package = record.module.split(".", 1)[0]
+            totals[package] = totals.get(package, 0) + record.self_us
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def touched(self, prefixes: Iterable[str]) -> List[str]:
+        """Loaded modules equal to, or nested under, any of the prefixes."""
+        prefixes = tuple(prefixes)
+        return [m for m in self.loaded_modules
+                if any(m == p or m.startswith(p + ".") for p in prefixes)]
+
+    def to_dict(self, top: int = 15) -> Dict:
+        return {
+            "targets": self.targets,
+            "total_ms": self.total_ms,
+            "modules_imported": len(self.records),
+            "top_self": [r.__dict__ for r in self.top(top)],
+            "by_package_ms": {k: round(v / 1000.0, 2) for k, v in list(self.by_package().items())[:top]},
+        }
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """Parse ``-X importtime`` stderr, keeping only lines after the profile marker if present."""
+    lines = output.splitlines()
+    if _MARKER in lines:
+        lines = lines[lines.index(_MARKER) + 1:]
+    records = []
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        name = parts[2].rstrip()
+        stripped = name.lstrip(" ")
+        depth = (len(name) - len(stripped) - 1) // 2
+        records.append(ImportRecord(stripped, int(parts[0]), int(parts[1]), max(depth, 0)))
+    return records
+
+
+def profile_import(modules: Sequence[str], python: Optional[str] = None,
+                   env: Optional[Dict[str, str]] = None, timeout: float = 120.0) -> ImportProfile:
+    """
+    Import ``modules`` in a fresh interpreter and return the measured profile.
+
+    Raises:
+        RuntimeError: if the import fails in the child interpreter
+    """
+    code = (
+        "import sys, json\n"
+        f"sys.stderr.write({_MARKER!r} + '\\n'); sys.stderr.flush()\n"
+        + "".join(f"import {m}\n" for m in modules)
+        + "print(json.dumps(sorted(sys.modules)))\n"
+    )
+    child_env = dict(os.environ if env is None else env)
+    child_env["PYTHONPATH"] = os.pathsep.join(p for p in (PROJECT_ROOT, child_env.get("PYTHONPATH")) if p)
+    proc = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=PROJECT_ROOT, env=child_env, timeout=timeout,
+    )
+    if proc.returncode != 0:
+        errors = [l for l in proc.stderr.splitlines() if not l.startswith("import time:")]
+        raise RuntimeError(f"Importing {', '.join(modules)} failed:\n" + "\n".join(errors[-15:]))
+    loaded = json.loads(proc.stdout.strip().splitlines()[-1])
+    return ImportProfile(list(modules), parse_importtime(proc.stderr), loaded)
+
+
+def format_report(profile: ImportProfile, top: int = 15) -> str:
+    lines = [f"Cold import of {', '.join(profile.targets)}: {profile.total_ms:.1f} ms "
+             f"({len(profile.records)} modules)", "", "Top modules by self time:"]
+    for record in profile.top(top):
+        lines.append(f"  {record.self_us / 1000.0:8.2f} ms  (cum {record.cumulative_us / 1000.0:8.2f} ms)  {record.module}")
+    lines += ["", "Self time by top-level package:"]
+    for package, micros in list(profile.by_package().items())[:top]:
+        lines.append(f"  {micros / 1000.0:8.2f} ms  {package}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Per-module cold import cost")
+    parser.add_argument("modules", nargs="*", help="modules to import")
+    parser.add_argument("--headless", action="store_true",
+                        help="profile the headless worker profile (app.headless) and forbid UI modules")
+    parser.add_argument("--forbid", default="", help="comma-separated module prefixes that must not load")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    modules = list(args.modules)
+    forbidden = [p for p in args.forbid.split(",") if p]
+    if args.headless:
+        from app.headless import HEADLESS_MODULES, UI_MODULE_PREFIXES
+        modules.extend(HEADLESS_MODULES)
+        forbidden.extend(UI_MODULE_PREFIXES)
+    if not modules:
+        parser.error("give at least one module or --headless")
+
+    profile = profile_import(modules)
+    leaked = profile.touched(forbidden)
+    if args.json:
+        report = profile.to_dict(args.top)
+        report["forbidden_loaded"] = leaked
+        print(json.dumps(report, indent=2))
+    else:
+        print(format_report(profile, args.top))
+        if forbidden:
+            print("\nForbidden modules loaded: " + (", ".join(leaked) if leaked else "none"))
+    return 1 if leaked else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,16 +9,27 @@ This script:
 2. Extracts key information (imports, classes, functions, docstrings)
 3. Creates a structured summary
 4. Optionally enhances the summary using DeepSeek API
+
+Files are parsed in a process pool (AST work is CPU-bound) and per-file results are
+cached on disk keyed by path, mtime/size and content hash, so re-running after a few
+edits only reparses those files and re-resolves the affected dependency graph edges.
+The resolved dependency graph is saved with the cache, so a new process starts from
+it instead of resolving every file again.
 """
 
 import os
 import ast
 import re
 import json
+import hashlib
 import argparse
-from typing import Dict, List, Optional, Set, Tuple, Union
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union, TextIO
 import requests
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
+
+CACHE_VERSION = 2
+# Fewer changed files than this are parsed in-process (pool startup would dominate)
+MIN_FILES_FOR_PROCESS_POOL = 16
 
 # ANSI colors for terminal output
 class Colors:
@@ -37,7 +48,9 @@ class CodeSummarizer:
                  deepseek_api_key: str = None,
                  max_files: int = None,
                  exclude_patterns: List[str] = None,
-                 max_threads: int = 10):
+                 max_threads: int = 10,
+                 cache_path: Optional[str] = None,
+                 use_cache: bool = True):
         """
         Initialize the CodeSummarizer.
         
@@ -47,7 +60,9 @@ class CodeSummarizer:
             deepseek_api_key: Optional API key for DeepSeek
             max_files: Maximum number of files to process (None for all)
             exclude_patterns: List of regex patterns to exclude files/directories
-            max_threads: Maximum number of threads for parallel processing
+            max_threads: Maximum number of worker processes for parallel parsing
+            cache_path: Per-file results cache (default: project_path/.code_summary_cache.json)
+            use_cache: Load and save the on-disk cache
         """
         self.project_path = os.path.abspath(project_path)
         self.output_path = output_path or os.path.join(self.project_path, "code_summary.md")
@@ -72,6 +87,17 @@ class CodeSummarizer:
         self.file_count = 0
         self.imports_cache = {}
         self.dependencies = {}
+        self.cache_path = cache_path or os.path.join(self.project_path, ".code_summary_cache.json")
+        self.use_cache = use_cache
+        self.parsed_files: List[str] = []  # rel paths reparsed by the last scan
+        # Dependency graph indexes, updated incrementally between scans
+        self._graph_files: List[str] = []
+        self._module_to_file: Dict[str, str] = {}
+        self._submodules: Dict[str, Set[str]] = {}  # module prefix -> modules below it
+        self._importers: Dict[str, Set[str]] = {}  # imported name -> files importing it
+        self._file_imports: Dict[str, List[Tuple[str, str]]] = {}
+        # rel_path -> {"mtime_ns", "size", "hash", "info"}; also restores the graph indexes
+        self._file_cache: Dict[str, Dict] = self._load_cache() if use_cache else {}
 
     def scan_project(self) -> Dict:
         """Scan the project and build a representation of the codebase."""
@@ -85,21 +111,118 @@ class CodeSummarizer:
             "files": {}
         }
         
-        # Process files in parallel
-        with ThreadPoolExecutor(max_workers=self.max_threads) as executor:
-            file_infos = list(executor.map(self._process_file, python_files))
+        # Reuse cached results; parse the rest in parallel
+        file_infos = self._process_files(python_files)
         
         # Add processed files to project info
-        for file_path, file_info in zip(python_files, file_infos):
+        for file_path in python_files:
+            file_info = file_infos.get(file_path)
             if file_info:  # Only add if file was successfully processed
                 rel_path = os.path.relpath(file_path, self.project_path)
                 project_info["files"][rel_path] = file_info
         
         # Build dependency graph
-        self._build_dependency_graph(project_info)
+        self._build_dependency_graph(project_info, changed=set(self.parsed_files))
         
+        if self.use_cache:
+            self._save_cache(project_info["files"])
         return project_info
 
+    def _process_files(self, python_files: List[str]) -> Dict[str, Dict]:
+        """
+        Return file_path -> file info. Files whose mtime and size match the cache are not
+        read; files whose content hash matches are not parsed; the rest are parsed in a
+        process pool when there are enough of them.
+        """
+        results = {}
+        jobs = []
+        stats = {}
+        for file_path in python_files:
+            rel_path = os.path.relpath(file_path, self.project_path)
+            entry = self._file_cache.get(rel_path)
+            try:
+                st = os.stat(file_path)
+                stats[file_path] = st
+            except OSError:
+                st = None
+            if entry and st and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+                results[file_path] = entry["info"]
+                self.imports_cache[rel_path] = entry["info"]["imports"]
+                continue
+            jobs.append((file_path, entry["hash"] if entry else None))
+
+        cached_count = len(results)
+        self.parsed_files = []
+        for (file_path, _), (file_info, digest, error) in zip(jobs, self._parse_files(jobs)):
+            rel_path = os.path.relpath(file_path, self.project_path)
+            if error is not None:
+                print(f"{Colors.FAIL}Error processing {rel_path}: {error}{Colors.ENDC}")
+                self._file_cache.pop(rel_path, None)
+                continue
+            if file_info is None:
+                # Touched but unchanged
+                file_info = self._file_cache[rel_path]["info"]
+                cached_count += 1
+            else:
+                self.parsed_files.append(rel_path)
+                self.file_count += 1
+                print(f"{Colors.GREEN}Processed {self.file_count}: {rel_path}{Colors.ENDC}")
+            st = stats.get(file_path)
+            self._file_cache[rel_path] = {
+                "mtime_ns": st.st_mtime_ns if st else None,
+                "size": st.st_size if st else None,
+                "hash": digest,
+                "info": file_info,
+            }
+            self.imports_cache[rel_path] = file_info["imports"]
+            results[file_path] = file_info
+        if cached_count:
+            print(f"{Colors.BLUE}Reused cached results for {cached_count} unchanged files{Colors.ENDC}")
+        return results
+
+    def _parse_files(self, jobs: List[Tuple[str, Optional[str]]]) -> List[Tuple[Optional[Dict], Optional[str], Optional[str]]]:
+        if len(jobs) < MIN_FILES_FOR_PROCESS_POOL or self.max_threads <= 1:
+            return [_parse_file(job) for job in jobs]
+        workers = min(self.max_threads, os.cpu_count() or 1, len(jobs))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_parse_file, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != CACHE_VERSION:
+            return {}
+        files = data.get("files", {})
+        self._restore_graph(data.get("graph"), files)
+        return files
+
+    def _restore_graph(self, graph: Optional[Dict], files: Dict[str, Dict]) -> None:
+        """Rebuild the graph indexes from a saved graph and the cached imports of its files."""
+        if not graph or any(file_path not in files for file_path in graph["files"]):
+            return
+        file_list = graph["files"]
+        self._rebuild_module_index(file_list)
+        for file_path in file_list:
+            self._index_imports(file_path, self._import_names(files[file_path]["info"]))
+        self.dependencies = {file_path: graph["dependencies"].get(file_path, []) for file_path in file_list}
+        self._graph_files = list(file_list)
+
+    def _save_cache(self, files: Dict[str, Dict]) -> None:
+        # Only keep entries for files that are still part of the project
+        self._file_cache = {rel: entry for rel, entry in self._file_cache.items() if rel in files}
+        graph = {
+            "files": self._graph_files,
+            "dependencies": {file_path: self.dependencies.get(file_path, []) for file_path in self._graph_files},
+        }
+        try:
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": CACHE_VERSION, "files": self._file_cache, "graph": graph}, f)
+        except OSError as e:
+            print(f"{Colors.WARNING}Could not write cache {self.cache_path}: {e}{Colors.ENDC}")
+
     def _find_python_files(self) -> List[str]:
         """Find all Python files in the project directory."""
         python_files = []
@@ -158,42 +281,26 @@ class CodeSummarizer:
     def _process_file(self, file_path: str) -> Optional[Dict]:
         """Extract information from a Python file."""
         rel_path = os.path.relpath(file_path, self.project_path)
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                file_content = f.read()
-            
-            # Parse the file
-            tree = ast.parse(file_content)
-            
-            # Extract imports
-            imports = self._extract_imports(tree)
-            self.imports_cache[rel_path] = imports
-            
-            # Extract classes and functions
-            classes = self._extract_classes(tree)
-            functions = self._extract_functions(tree, module_level=True)
-            
-            # Extract module docstring
-            module_docstring = ast.get_docstring(tree)
-            
-            file_info = {
-                "imports": imports,
-                "classes": classes,
-                "functions": functions,
-                "module_docstring": module_docstring
-            }
-            
-            self.file_count += 1
-            print(f"{Colors.GREEN}Processed {self.file_count}: {rel_path}{Colors.ENDC}")
-            
-            return file_info
-            
-        except Exception as e:
-            print(f"{Colors.FAIL}Error processing {rel_path}: {str(e)}{Colors.ENDC}")
+        file_info, _, error = _parse_file((file_path, None))
+        if error is not None:
+            print(f"{Colors.FAIL}Error processing {rel_path}: {error}{Colors.ENDC}")
             return None
+        self.imports_cache[rel_path] = file_info["imports"]
+        self.file_count += 1
+        print(f"{Colors.GREEN}Processed {self.file_count}: {rel_path}{Colors.ENDC}")
+        return file_info
 
-    def _extract_imports(self, tree: ast.Module) -> List[Dict]:
+    @staticmethod
+    def _summarize_tree(tree: ast.Module) -> Dict:
+        return {
+            "imports": CodeSummarizer._extract_imports(tree),
+            "classes": CodeSummarizer._extract_classes(tree),
+            "functions": CodeSummarizer._extract_functions(tree, module_level=True),
+            "module_docstring": ast.get_docstring(tree)
+        }
+
+    @staticmethod
+    def _extract_imports(tree: ast.Module) -> List[Dict]:
         """Extract all imports from an AST."""
         imports = []
         
@@ -217,20 +324,21 @@ class CodeSummarizer:
         
         return imports
 
-    def _extract_classes(self, tree: ast.Module) -> List[Dict]:
+    @staticmethod
+    def _extract_classes(tree: ast.Module) -> List[Dict]:
         """Extract all classes from an AST."""
         classes = []
         
         for node in tree.body:
             if isinstance(node, ast.ClassDef):
                 # Get base classes
-                bases = [self._get_name(base) for base in node.bases]
+                bases = [CodeSummarizer._get_name(base) for base in node.bases]
                 
                 # Get docstring
                 docstring = ast.get_docstring(node)
                 
                 # Get methods
-                methods = self._extract_functions(node)
+                methods = CodeSummarizer._extract_functions(node)
                 
                 # Get class variables
                 class_vars = []
@@ -260,7 +368,8 @@ class CodeSummarizer:
         
         return classes
 
-    def _extract_functions(self, node: Union[ast.Module, ast.ClassDef], module_level: bool = False) -> List[Dict]:
+    @staticmethod
+    def _extract_functions(node: Union[ast.Module, ast.ClassDef], module_level: bool = False) -> List[Dict]:
         """Extract all functions from an AST node (module or class)."""
         functions = []
         
@@ -284,9 +393,9 @@ class CodeSummarizer:
                     if isinstance(decorator, ast.Name):
                         decorators.append(decorator.id)
                     elif isinstance(decorator, ast.Attribute):
-                        decorators.append(self._get_name(decorator))
+                        decorators.append(CodeSummarizer._get_name(decorator))
                     elif isinstance(decorator, ast.Call):
-                        decorators.append(self._get_name(decorator.func))
+                        decorators.append(CodeSummarizer._get_name(decorator.func))
                 
                 functions.append({
                     "name": item.name,
@@ -297,23 +406,69 @@ class CodeSummarizer:
         
         return functions
 
-    def _get_name(self, node: ast.AST) -> str:
+    @staticmethod
+    def _get_name(node: ast.AST) -> str:
         """Get the full name of an AST node."""
         if isinstance(node, ast.Name):
             return node.id
         elif isinstance(node, ast.Attribute):
-            return f"{self._get_name(node.value)}.{node.attr}"
+            return f"{CodeSummarizer._get_name(node.value)}.{node.attr}"
         elif isinstance(node, ast.Call):
-            return self._get_name(node.func)
+            return CodeSummarizer._get_name(node.func)
         return "unknown"
 
-    def _build_dependency_graph(self, project_info: Dict):
-        """Build a dependency graph between files."""
-        dependency_graph = {}
-        
-        # Build a mapping of module names to files
+    def _build_dependency_graph(self, project_info: Dict, changed: Optional[Set[str]] = None):
+        """
+        Build a dependency graph between files.
+
+        The module index and the import index are kept between scans. When `changed` is
+        given, only those files, plus files importing modules that appeared or
+        disappeared, have their edges re-resolved.
+        """
+        files = project_info["files"]
+        file_list = list(files)
+        if changed is None or not self._graph_files:
+            stale = set(file_list)
+            self._rebuild_module_index(file_list)
+        elif file_list != self._graph_files:
+            old_modules = set(self._module_to_file.items())
+            self._rebuild_module_index(file_list)
+            moved = old_modules.symmetric_difference(self._module_to_file.items())
+            stale = set(changed) | (set(file_list) - set(self._graph_files))
+            for module_name, _ in moved:
+                # "import a" depends on a.* too, so importers of every prefix are affected
+                parts = module_name.split('.')
+                for n in range(1, len(parts) + 1):
+                    stale |= self._importers.get('.'.join(parts[:n]), set())
+        else:
+            stale = set(changed)
+
+        for file_path in set(self._file_imports) - set(files):
+            self._index_imports(file_path, [])
+            self.dependencies.pop(file_path, None)
+        for file_path in stale:
+            if file_path not in files:
+                continue
+            imports = self._import_names(files[file_path])
+            self._index_imports(file_path, imports)
+            self.dependencies[file_path] = self._resolve_dependencies(imports)
+        self._graph_files = file_list
+
+        # Add dependency graph to project info
+        project_info["dependencies"] = {file_path: self.dependencies.get(file_path, []) for file_path in file_list}
+
+    @staticmethod
+    def _import_names(file_info: Dict) -> List[Tuple[str, str]]:
+        """(import type, imported module) pairs of one file."""
+        return [
+            (info["type"], info["name"] if info["type"] == "import" else info["module"])
+            for info in file_info.get("imports", [])
+        ]
+
+    def _rebuild_module_index(self, file_list: List[str]) -> None:
+        """Map module names to files, and module prefixes to the modules below them."""
         module_to_file = {}
-        for file_path in project_info["files"]:
+        for file_path in file_list:
             # Convert file path to potential module name
             module_name = file_path.replace('/', '.').replace('\\', '.').replace('.py', '')
             module_to_file[module_name] = file_path
@@ -323,57 +478,64 @@ class CodeSummarizer:
                 # The directory itself can be imported
                 package_name = os.path.dirname(file_path).replace('/', '.').replace('\\', '.')
                 module_to_file[package_name] = file_path
-        
-        # Find dependencies
-        for file_path, file_info in project_info["files"].items():
-            dependencies = set()
-            
-            for import_info in file_info.get("imports", []):
-                if import_info["type"] == "import":
-                    # Try to find this module in our project
-                    module_name = import_info["name"]
-                    if module_name in module_to_file:
-                        dependencies.add(module_to_file[module_name])
-                    # Check for submodules
-                    for potential_module in module_to_file:
-                        if potential_module.startswith(module_name + '.'):
-                            dependencies.add(module_to_file[potential_module])
-                
-                elif import_info["type"] == "import_from":
-                    # Try to find this module in our project
-                    module_name = import_info["module"]
-                    if module_name in module_to_file:
-                        dependencies.add(module_to_file[module_name])
-            
-            dependency_graph[file_path] = list(dependencies)
-        
-        # Add dependency graph to project info
-        project_info["dependencies"] = dependency_graph
+        submodules: Dict[str, Set[str]] = {}
+        for module_name in module_to_file:
+            parts = module_name.split('.')
+            for n in range(1, len(parts)):
+                submodules.setdefault('.'.join(parts[:n]), set()).add(module_name)
+        self._module_to_file = module_to_file
+        self._submodules = submodules
+
+    def _index_imports(self, file_path: str, imports: List[Tuple[str, str]]) -> None:
+        for _, name in self._file_imports.pop(file_path, []):
+            importers = self._importers.get(name)
+            if importers:
+                importers.discard(file_path)
+        if imports:
+            self._file_imports[file_path] = imports
+            for _, name in imports:
+                self._importers.setdefault(name, set()).add(file_path)
+
+    def _resolve_dependencies(self, imports: List[Tuple[str, str]]) -> List[str]:
+        dependencies = set()
+        module_to_file = self._module_to_file
+        for import_type, module_name in imports:
+            # Try to find this module in our project
+            if module_name in module_to_file:
+                dependencies.add(module_to_file[module_name])
+            if import_type == "import":
+                # Check for submodules
+                for submodule in self._submodules.get(module_name, ()):
+                    dependencies.add(module_to_file[submodule])
+        return sorted(dependencies)
 
     def generate_summary(self, project_info: Dict) -> str:
         """Generate a markdown summary of the project."""
+        return "\n".join(self.iter_summary(project_info))
+
+    def iter_summary(self, project_info: Dict) -> Iterator[str]:
+        """Yield the markdown summary line by line (joined with newlines by generate_summary)."""
         print(f"{Colors.BLUE}Generating summary...{Colors.ENDC}")
         
-        summary = []
-        summary.append(f"# Project Summary: {project_info['project_name']}\n")
-        summary.append(f"*Generated on {os.path.basename(self.output_path)}*\n")
-        summary.append(f"Total Python files: {project_info['file_count']}\n")
+        yield f"# Project Summary: {project_info['project_name']}\n"
+        yield f"*Generated on {os.path.basename(self.output_path)}*\n"
+        yield f"Total Python files: {project_info['file_count']}\n"
         
         # Table of contents
-        summary.append("## Table of Contents\n")
-        summary.append("1. [Project Structure](#project-structure)")
-        summary.append("2. [Key Files](#key-files)")
-        summary.append("3. [Dependencies](#dependencies)")
-        summary.append("4. [Detailed Code Analysis](#detailed-code-analysis)\n")
+        yield "## Table of Contents\n"
+        yield "1. [Project Structure](#project-structure)"
+        yield "2. [Key Files](#key-files)"
+        yield "3. [Dependencies](#dependencies)"
+        yield "4. [Detailed Code Analysis](#detailed-code-analysis)\n"
         
         # Project structure
-        summary.append("## Project Structure\n")
-        summary.append("```")
-        summary.append(self._format_directory_structure(project_info["directory_structure"]))
-        summary.append("```\n")
+        yield "## Project Structure\n"
+        yield "```"
+        yield self._format_directory_structure(project_info["directory_structure"])
+        yield "```\n"
         
         # Key files - identify important files based on number of dependencies
-        summary.append("## Key Files\n")
+        yield "## Key Files\n"
         key_files = self._identify_key_files(project_info)
         for file_path, importance in key_files[:10]:  # Top 10 most important files
             rel_path = file_path
@@ -381,20 +543,20 @@ class CodeSummarizer:
             docstring = file_info.get("module_docstring", "")
             docstring_short = docstring[:150] + "..." if docstring and len(docstring) > 150 else docstring
             
-            summary.append(f"### {rel_path}\n")
+            yield f"### {rel_path}\n"
             if docstring_short:
-                summary.append(f"{docstring_short}\n")
+                yield f"{docstring_short}\n"
             
             # Count number of classes and functions
             classes_count = len(file_info.get("classes", []))
             functions_count = len(file_info.get("functions", []))
-            summary.append(f"- Classes: {classes_count}")
-            summary.append(f"- Functions: {functions_count}")
-            summary.append(f"- Dependency Score: {importance:.2f}\n")
+            yield f"- Classes: {classes_count}"
+            yield f"- Functions: {functions_count}"
+            yield f"- Dependency Score: {importance:.2f}\n"
         
         # Dependencies visualization
-        summary.append("## Dependencies\n")
-        summary.append("Key file relationships (files with most dependencies):\n")
+        yield "## Dependencies\n"
+        yield "Key file relationships (files with most dependencies):\n"
         
         # Create a simplified dependency graph for the top files
         top_files = [file for file, _ in key_files[:10]]
@@ -402,12 +564,12 @@ class CodeSummarizer:
             deps = project_info["dependencies"].get(file_path, [])
             deps_in_top = [d for d in deps if d in top_files]
             if deps_in_top:
-                summary.append(f"- **{file_path}** depends on: {', '.join(deps_in_top)}")
+                yield f"- **{file_path}** depends on: {', '.join(deps_in_top)}"
         
-        summary.append("\n")
+        yield "\n"
         
         # Detailed code analysis
-        summary.append("## Detailed Code Analysis\n")
+        yield "## Detailed Code Analysis\n"
         
         # Sort files by importance
         sorted_files = [file for file, _ in key_files]
@@ -416,46 +578,44 @@ class CodeSummarizer:
             if file_path in project_info["files"]:
                 file_info = project_info["files"][file_path]
                 
-                summary.append(f"### {file_path}\n")
+                yield f"### {file_path}\n"
                 
                 # Module docstring
                 if file_info.get("module_docstring"):
-                    summary.append("**Description:**\n")
-                    summary.append(f"{file_info['module_docstring']}\n")
+                    yield "**Description:**\n"
+                    yield f"{file_info['module_docstring']}\n"
                 
                 # Classes
                 if file_info.get("classes"):
-                    summary.append("**Classes:**\n")
+                    yield "**Classes:**\n"
                     for class_info in file_info["classes"]:
-                        summary.append(f"- `{class_info['name']}`")
+                        yield f"- `{class_info['name']}`"
                         if class_info["bases"]:
-                            summary.append(f" (inherits from: {', '.join(class_info['bases'])})")
-                        summary.append("\n")
+                            yield f" (inherits from: {', '.join(class_info['bases'])})"
+                        yield "\n"
                         
                         if class_info.get("docstring"):
                             docstring_lines = class_info["docstring"].split("\n")
-                            summary.append(f"  {docstring_lines[0]}\n")
+                            yield f"  {docstring_lines[0]}\n"
                         
                         if class_info.get("methods"):
                             method_names = [f"`{m['name']}()`" for m in class_info["methods"]]
                             if len(method_names) > 5:
                                 method_names = method_names[:5] + [f"... ({len(class_info['methods']) - 5} more)"]
-                            summary.append(f"  Methods: {', '.join(method_names)}\n")
+                            yield f"  Methods: {', '.join(method_names)}\n"
                 
                 # Functions
                 if file_info.get("functions"):
-                    summary.append("**Functions:**\n")
+                    yield "**Functions:**\n"
                     for func_info in file_info["functions"]:
                         params = ", ".join(func_info["parameters"])
-                        summary.append(f"- `{func_info['name']}({params})`\n")
+                        yield f"- `{func_info['name']}({params})`\n"
                         
                         if func_info.get("docstring"):
                             docstring_lines = func_info["docstring"].split("\n")
-                            summary.append(f"  {docstring_lines[0]}\n")
+                            yield f"  {docstring_lines[0]}\n"
                 
-                summary.append("\n")
-        
-        return "\n".join(summary)
+                yield "\n"
 
     def _format_directory_structure(self, structure: Dict, prefix: str = "") -> str:
         """Format the directory structure as a string."""
@@ -520,6 +680,19 @@ class CodeSummarizer:
         
         print(f"{Colors.GREEN}Summary saved to {self.output_path}{Colors.ENDC}")
 
+    def stream_summary(self, project_info: Dict) -> str:
+        """Write the summary to the output file as it is generated; returns the full text."""
+        parts = []
+        with open(self.output_path, 'w', encoding='utf-8') as f:
+            for i, part in enumerate(self.iter_summary(project_info)):
+                if i:
+                    f.write("\n")
+                f.write(part)
+                parts.append(part)
+        
+        print(f"{Colors.GREEN}Summary saved to {self.output_path}{Colors.ENDC}")
+        return "\n".join(parts)
+
     def enhance_with_deepseek(self, project_info: Dict, summary: str) -> str:
         """Enhance the summary using DeepSeek API."""
         if not self.deepseek_api_key:
@@ -604,14 +777,36 @@ class CodeSummarizer:
     def run(self) -> str:
         """Run the full analysis and generate the summary."""
         project_info = self.scan_project()
-        summary = self.generate_summary(project_info)
+        if not self.deepseek_api_key:
+            return self.stream_summary(project_info)
         
-        if self.deepseek_api_key:
-            summary = self.enhance_with_deepseek(project_info, summary)
+        summary = self.generate_summary(project_info)
+        summary = self.enhance_with_deepseek(project_info, summary)
             
         self.save_summary(summary)
         return summary
 
+def _parse_file(job: Tuple[str, Optional[str]]) -> Tuple[Optional[Dict], Optional[str], Optional[str]]:
+    """
+    Parse one file (module-level so it can run in a worker process).
+
+    Args:
+        job: (file_path, content hash from the cache or None)
+    Returns:
+        (file info, content hash, error); file info is None when the hash matches
+    """
+    file_path, known_hash = job
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        if digest == known_hash:
+            return None, digest, None
+        tree = ast.parse(data.decode('utf-8'))
+        return CodeSummarizer._summarize_tree(tree), digest, None
+    except Exception as e:
+        return None, None, str(e)
+
 def main():
     """
     Main function that can be run both from command line and directly from an IDE.
@@ -630,7 +825,7 @@ def main():
         parser.add_argument("--deepseek-api-key", help="DeepSeek API key for enhanced summaries")
         parser.add_argument("--max-files", type=int, help="Maximum number of files to process")
         parser.add_argument("--exclude", nargs="+", help="Regex patterns to exclude files/directories")
-        parser.add_argument("--threads", type=int, default=10, help="Number of threads for parallel processing")
+        parser.add_argument("--threads", type=int, default=10, help="Number of worker processes for parallel parsing")
         
         args = parser.parse_args()
         
@@ -245,6 +245,7 @@ class ContentEventType:
     INDEXED = "content.indexed"
     ANALYZED = "content.analyzed"
     SIMILARITY_DETECTED = "content.similarity.detected"
+    CHANGE_SET = "content.change_set"  # Batched DB row changes of one committed transaction
 
 
 # Common User Events
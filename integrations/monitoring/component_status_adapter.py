@@ -3,6 +3,7 @@
 from enum import Enum
 from datetime import datetime
 from integrations.monitoring.component_status import ComponentStatusProvider, ComponentStatusTracker
+from integrations.monitoring.status_propagation import DependencyIndex, StatusPropagator, history_buffer
 from app.core.monitoring.metrics import SystemMetricsManager, MetricType
 try:
     from app.core.monitoring.metrics import AlertLevel
@@ -36,6 +37,14 @@ LEGAL_TRANSITIONS = {
     'IMPAIRED': {'HEALTHY', 'RUNNING', 'DEGRADED', 'FAILED', 'DOWN', 'RECOVERING'}  # Special case for cascaded status
 }
 
+def _state_name(state):
+    """Normalize a ComponentState, string, or other state value to its upper-case name."""
+    if isinstance(state, ComponentState):
+        return state.name
+    if isinstance(state, str):
+        return state.upper()
+    return str(state).upper()
+
 # --- SimpleStatusTracker for protocol compliance and test imports ---
 class SimpleStatusTracker:
     """
@@ -289,7 +298,7 @@ class EnhancedComponentStatusTracker(ComponentStatusTracker):
         """
         self.status_providers[component_id] = provider
         if component_id not in self.status_history:
-            self.status_history[component_id] = []
+            self.status_history[component_id] = history_buffer()
         self.last_state_change[component_id] = datetime.now()
         
         # Initialize status by calling update_component_status with just the component_id
@@ -340,7 +349,10 @@ class EnhancedComponentStatusTracker(ComponentStatusTracker):
                 
         status = ComponentStatus(component_id, state, details)
         self._status[component_id] = status
-        self.status_history.setdefault(component_id, []).append(status)
+        history = self.status_history.get(component_id)
+        if history is None:
+            history = self.status_history[component_id] = history_buffer()
+        history.append(status)
         self.last_state_change[component_id] = datetime.now()
         return True
         
@@ -363,8 +375,8 @@ class EnhancedComponentStatusTracker(ComponentStatusTracker):
         return None
         
     def get_status_history(self, component_id):
-        """Get the status history of a component"""
-        return self.status_history.get(component_id, [])
+        """Get the status history of a component (bounded to the most recent records)"""
+        return list(self.status_history.get(component_id, ()))
         
     def update_all_statuses(self):
         """
@@ -425,6 +437,13 @@ class EnhancedComponentStatusTracker(ComponentStatusTracker):
     def _dependency_graph(self, graph):
         self.__dependency_graph = graph
 
+    @property
+    def dependency_version(self):
+        """Change token of the registry's dependency graph, or None when it can't be tracked."""
+        if self._registry and hasattr(self._registry, 'get_dependency_graph'):
+            return getattr(self._registry, 'dependency_version', None)
+        return None
+
 # --- Registry with explicit instantiation ---
 class ComponentRegistry:
     """
@@ -437,11 +456,18 @@ class ComponentRegistry:
         """Initialize a new ComponentRegistry instance."""
         self.components = {}
         self.dependencies = {}  # e.g. {A: [B, C]}
+        self._dependency_version = 0  # Bumped on every dependency change
+        
+    @property
+    def dependency_version(self):
+        """Token that changes whenever the dependency graph changes (used by status propagation)."""
+        return self._dependency_version
         
     def clear(self):
         """Clear all components and dependencies for test isolation"""
         self.components.clear()
         self.dependencies.clear()
+        self._dependency_version += 1
         
     def register_component(self, name, state=None, metadata=None, component_type=None, version=None):
         """
@@ -465,6 +491,7 @@ class ComponentRegistry:
         """Declare that component depends on depends_on"""
         if depends_on is not None:
             self.dependencies.setdefault(component, []).append(depends_on)
+            self._dependency_version += 1
             
     def get_dependency_graph(self):
         """Return the dependency graph"""
@@ -485,6 +512,7 @@ class ComponentRegistry:
         for component, deps in list(self.dependencies.items()):
             if name in deps:
                 self.dependencies[component].remove(name)
+        self._dependency_version += 1
 
 # --- Factory functions for creating instances ---
 def make_registry():
@@ -702,11 +730,9 @@ class ServiceHealthDashboard:
         # Initialize statuses dict for protocol compliance
         self._statuses = {}
         
-        # Initialize dependency cache for faster lookups
-        self._dependency_cache = {}
-        
-        # Track processed components to prevent cascading cycles
-        self._cascade_processed = set()
+        # Reverse-dependency index, refreshed only when the registry's graph changes
+        self._dependency_index = DependencyIndex()
+        self._propagator = StatusPropagator(self._dependency_index)
         
         # Maintain status callbacks for protocol/test support
         self._status_callbacks = []
@@ -795,9 +821,6 @@ class ServiceHealthDashboard:
             # Protocol compliance: always call callbacks on every update
             self._trigger_status_change(component_id, state)
         
-        # Reset cascade processing set for each new update
-        self._cascade_processed = set()
-        
         # Cascade status changes if supported
         if self.supports_cascading_status():
             self._cascade_status(component_id, state, details)
@@ -808,65 +831,49 @@ class ServiceHealthDashboard:
         """
         Cascade status changes to dependent components.
         
+        Dependents are reached breadth-first through the reverse-dependency index, each
+        at most once. A dependent that is already in the cascaded state or a worse one is
+        left alone and its own dependents are not revisited, so only real deltas move.
+        
         Args:
             component_id: The ID of the component that changed
             state: The new state of the component
             details: Optional details about the component's status
         """
-        # Prevent infinite recursion in cyclic dependencies
-        if component_id in self._cascade_processed:
-            return
-        self._cascade_processed.add(component_id)
-        
-        # Normalize state for comparison
-        if isinstance(state, ComponentState):
-            state_name = state.name
-        elif isinstance(state, str):
-            state_name = state.upper()
-        else:
-            state_name = str(state).upper()
+        state_name = _state_name(state)
             
         # Per protocol: only propagate if in a bad state
         if state_name not in ("DEGRADED", "DOWN", "FAILED", "CRITICAL", "IMPAIRED"):
             return
             
-        # Get all direct dependents of this component
-        dependents = self.get_dependents(component_id)
+        self._sync_dependency_index()
+        cascaded = {component_id: (state, state_name, details)}
         
-        # If no dependents, nothing to cascade
-        if not dependents:
-            return
+        def visit(dep_id, via):
+            via_state, via_state_name, via_details = cascaded[via]
+            cascade_state = self._determine_cascade_state(via_state)
+            cascade_state_name = _state_name(cascade_state)
             
-        # Determine cascade state based on original state
-        cascade_state = self._determine_cascade_state(state)
-        
-        for dep_id in dependents:
-            # Get current state of dependent
-            current_state = None
+            # Leave dependents that are already this bad (or worse) untouched;
+            # this prevents "healing" components that are in a worse state
             if dep_id in self._statuses:
-                current_state = self._statuses[dep_id][0]
-            
-            # Only update if dependent is in a better state than what we'd cascade to
-            # This prevents "healing" components that are already in a worse state
-            if current_state is not None:
-                current_state_name = current_state.name if isinstance(current_state, ComponentState) else str(current_state).upper()
-                cascade_state_name = cascade_state.name if isinstance(cascade_state, ComponentState) else str(cascade_state).upper()
-                
-                # Skip if current state is already worse than what we'd cascade
-                if self._is_state_worse_than(current_state_name, cascade_state_name):
-                    continue
+                current_state_name = _state_name(self._statuses[dep_id][0])
+                if (current_state_name == cascade_state_name
+                        or self._is_state_worse_than(current_state_name, cascade_state_name)):
+                    return False
             
             # Create cascade details with proper protocol fields
-            cascade_details = dict(details or {})
-            cascade_details['cascaded'] = component_id
-            cascade_details['reason'] = f"Depends on {component_id} which is {state_name}"
+            cascade_details = dict(via_details or {})
+            cascade_details['cascaded'] = via
+            cascade_details['reason'] = f"Depends on {via} which is {via_state_name}"
             
             # Update both internal status and tracker
             self._statuses[dep_id] = (cascade_state, cascade_details)
             self.status_tracker.update_component_status(dep_id, cascade_state, cascade_details)
+            cascaded[dep_id] = (cascade_state, cascade_state_name, cascade_details)
+            return True
             
-            # Recursively cascade to this dependent's dependents
-            self._cascade_status(dep_id, cascade_state, cascade_details)
+        self._propagator.propagate(component_id, visit)
             
     def _is_state_worse_than(self, state1, state2):
         """
@@ -963,10 +970,15 @@ class ServiceHealthDashboard:
         """Get the dependency graph from the registry"""
         return self.status_tracker._registry.get_dependency_graph()
         
+    def _sync_dependency_index(self):
+        """Rebuild the reverse-dependency index if the registry's graph changed."""
+        version = getattr(self.status_tracker._registry, 'dependency_version', None)
+        self._dependency_index.sync(self.get_dependency_graph, version)
+        
     def get_dependents(self, component_id):
         """
         Get all components that directly depend on the given component.
-        Uses caching for better performance.
+        Uses the reverse-dependency index, so the lookup doesn't scan the graph.
         
         Args:
             component_id: The ID of the component to get dependents for
@@ -974,23 +986,8 @@ class ServiceHealthDashboard:
         Returns:
             List of component IDs that depend on this component
         """
-        # Check cache first
-        if component_id in self._dependency_cache:
-            return self._dependency_cache[component_id]
-            
-        # Get dependency graph from registry
-        dep_graph = self.get_dependency_graph()
-        
-        # Find direct dependents
-        dependents = []
-        for dep, deps in dep_graph.items():
-            if component_id in deps:
-                dependents.append(dep)
-                
-        # Cache result for future lookups
-        self._dependency_cache[component_id] = dependents
-        
-        return dependents
+        self._sync_dependency_index()
+        return self._dependency_index.dependents(component_id)
         
     def get_all_dependents(self, component_id, visited=None):
         """
@@ -998,37 +995,26 @@ class ServiceHealthDashboard:
         
         Args:
             component_id: The ID of the component to get dependents for
-            visited: Set of already visited components to prevent cycles
+            visited: Set of already visited components to exclude
             
         Returns:
             Set of component IDs that depend on this component
         """
-        if visited is None:
-            visited = set()
-            
-        # Skip if we've already visited this component
-        if component_id in visited:
+        if visited and component_id in visited:
             return set()
-            
-        # Add this component to visited set
-        visited.add(component_id)
-        
-        # Get direct dependents
-        direct_dependents = set(self.get_dependents(component_id))
-        
-        # Find indirect dependents recursively
-        all_dependents = set(direct_dependents)
-        for dep_id in direct_dependents:
-            if dep_id not in visited:
-                indirect_deps = self.get_all_dependents(dep_id, visited)
-                all_dependents.update(indirect_deps)
-                
-        return all_dependents
+        self._sync_dependency_index()
+        dependents = set(self._dependency_index.transitive_dependents(component_id))
+        if visited:
+            dependents.difference_update(visited)
+            visited.add(component_id)
+            visited.update(dependents)
+        return dependents
     
     def clear(self):
         """Clear all status tracking data"""
         self._statuses.clear()
-        self._dependency_cache.clear()
+        self._dependency_index.clear()
+        self._propagator.clear()
         self._status_callbacks = []
         self._status_state.clear()
         self.status_tracker.clear()
@@ -1114,6 +1100,8 @@ class ComponentStatusAdapter:
             self._component_watchers = SYSTEM_STATUS_TRACKER._component_watchers
             self._status_providers = SYSTEM_STATUS_TRACKER._status_providers
             self._component_history = SYSTEM_STATUS_TRACKER._component_history
+            self._dependency_index = SYSTEM_STATUS_TRACKER._dependency_index
+            self._propagator = SYSTEM_STATUS_TRACKER._propagator
             
             # Make this instance the global singleton
             SYSTEM_STATUS_TRACKER = self
@@ -1138,7 +1126,9 @@ class ComponentStatusAdapter:
             self._last_component_states = {}  # For alert deduplication
             self._component_watchers = {}  # {component_id: set(callback)}
             self._status_providers = {}    # Registry for providers keyed by name
-            self._component_history = {}   # History tracking per component
+            self._component_history = {}   # History tracking per component (bounded buffers)
+            self._dependency_index = DependencyIndex()  # Reverse-dependency index for cascades
+            self._propagator = StatusPropagator(self._dependency_index)
             
             # Set global SYSTEM_STATUS_TRACKER
             SYSTEM_STATUS_TRACKER = self
@@ -1164,6 +1154,10 @@ class ComponentStatusAdapter:
         Raises:
             ValueError: If the transition from current state to new state is not allowed by protocol
         """
+        # Release cascades of flapping components whose debounce window has elapsed
+        if not skip_cascade and self._propagator.has_pending():
+            self.flush_pending_cascades(force=False)
+            
         # If no state provided, get it from the component in registry
         if state is None:
             component = self.registry.get_component(component_id)
@@ -1227,18 +1221,21 @@ class ComponentStatusAdapter:
                 
             # Add to component history for protocol/test compatibility
             status = ComponentStatus(component_id, state, details, timestamp=datetime.now())
-            self._component_history.setdefault(component_id, []).append(status)
+            history = self._component_history.get(component_id)
+            if history is None:
+                history = self._component_history[component_id] = history_buffer()
+            history.append(status)
             
             # Create a ComponentStatus object for callbacks
             status_obj = ComponentStatus(component_id, state, details, timestamp=datetime.now())
             
             # Trigger callbacks after updating status but before cascading
             # This ensures the component's own status is updated before dependents
-            self._trigger_callbacks(component_id, status_obj, details)
+            self._trigger_callbacks(component_id, status_obj, details, cascade=not skip_cascade)
         
         return result
 
-    def _trigger_callbacks(self, component_id, status, details=None):
+    def _trigger_callbacks(self, component_id, status, details=None, cascade=True):
         """
         Trigger all registered callbacks for a component.
         
@@ -1246,6 +1243,7 @@ class ComponentStatusAdapter:
             component_id: The ID of the component that changed
             status: The new status of the component (ComponentStatus object)
             details: Optional details/metrics about the component's status
+            cascade: If False, don't cascade the change to dependent components
         """
         # Extract state from status object if it's a ComponentStatus
         if isinstance(status, ComponentStatus):
@@ -1331,172 +1329,122 @@ class ComponentStatusAdapter:
             pass
             
         # Cascade status changes if supported by dashboard
-        if self.dashboard and hasattr(self.dashboard, 'supports_cascading_status') and self.dashboard.supports_cascading_status():
-            # Use recursive cascading with cycle detection
+        if cascade and self.dashboard and hasattr(self.dashboard, 'supports_cascading_status') and self.dashboard.supports_cascading_status():
             self._cascade_status_changes(component_id, state, details)
             
+    def _sync_dependency_index(self):
+        """Rebuild the reverse-dependency index if the registry's graph changed."""
+        version = getattr(self.registry, 'dependency_version', None)
+        self._dependency_index.sync(self.registry.get_dependency_graph, version)
+        
     def get_all_dependents(self, component_id, visited=None):
         """
         Get all components that depend on this component, recursively.
         
         Args:
             component_id: The ID of the component to get dependents for
-            visited: Set of already visited components to prevent cycles
+            visited: Set of already visited components to exclude
             
         Returns:
             Set of component IDs that depend on this component
         """
-        if visited is None:
-            visited = set()
-            
-        # Skip if we've already visited this component
-        if component_id in visited:
+        if visited and component_id in visited:
             return set()
-            
-        # Add this component to visited set
-        visited.add(component_id)
-        
-        # Get dependency graph from registry
-        dep_graph = self.registry.get_dependency_graph()
-        
-        # Find direct dependents
-        direct_dependents = set()
-        for dep, deps in dep_graph.items():
-            if component_id in deps:
-                direct_dependents.add(dep)
-                
-        # Find indirect dependents recursively
-        all_dependents = set(direct_dependents)
-        for dep_id in direct_dependents:
-            if dep_id not in visited:
-                indirect_deps = self.get_all_dependents(dep_id, visited)
-                all_dependents.update(indirect_deps)
-                
-        return all_dependents
+        self._sync_dependency_index()
+        dependents = set(self._dependency_index.transitive_dependents(component_id))
+        if visited:
+            dependents.difference_update(visited)
+            visited.add(component_id)
+            visited.update(dependents)
+        return dependents
         
     def _cascade_status_changes(self, component_id, state, details=None, visited=None):
         """
-        Recursively cascade status changes to all dependent components based on dependency graph.
+        Cascade a status change to all components that (transitively) depend on component_id.
+        
+        Dependents are reached breadth-first through the reverse-dependency index and each
+        is visited at most once. A dependent already in the cascaded state is not updated
+        and its own dependents are not revisited, so only actual deltas are pushed. While
+        a component flaps inside the configured debounce window its changes are coalesced
+        and released by flush_pending_cascades().
         
         Args:
             component_id: The ID of the component that changed
             state: The new state of the component
             details: Optional details/metrics about the component's status
-            visited: Set of already visited components to prevent cycles
+            visited: Optional set of components that must not be updated
+            
+        Returns:
+            List of dependent component IDs whose status changed
         """
-        # Initialize visited set if not provided to prevent infinite recursion in cyclic dependencies
-        if visited is None:
-            visited = set()
+        if not self._propagator.submit(component_id, _state_name(state), (state, details)):
+            return []
+        return self._dispatch_cascade(component_id, state, details, visited)
         
-        # Skip if we've already visited this component
-        if component_id in visited:
-            return
-            
-        # Add this component to visited set
-        visited.add(component_id)
+    def _dispatch_cascade(self, component_id, state, details=None, excluded=None):
+        """Push one status change of component_id to its dependents (see _cascade_status_changes)."""
+        self._sync_dependency_index()
+        excluded = excluded or ()
+        cascaded = {component_id: (state, details)}
         
-        # Get dependency graph from registry
-        dep_graph = self.registry.get_dependency_graph()
+        def visit(dep_id, via):
+            if dep_id in excluded:
+                return False
+            via_state, via_details = cascaded[via]
+            cascade_state = self._cascade_state_for(via_state)
+            if self._last_component_states.get(dep_id) == _state_name(cascade_state):
+                return False
+            
+            # Create cascade details with proper protocol fields
+            cascade_details = dict(via_details or {})
+            cascade_details['cascaded'] = via  # Use 'cascaded' key for protocol compliance
+            cascade_details['reason'] = f"Depends on {via}={via_state}"
+            
+            # Force the update to bypass transition validation for cascaded status changes;
+            # listeners, alerts, watchers and metrics fire through the normal update path
+            self.update_component_status(dep_id, cascade_state, cascade_details, skip_cascade=True, force=True)
+            cascaded[dep_id] = (cascade_state, cascade_details)
+            return True
+            
+        return self._propagator.propagate(component_id, visit)
+        
+    @staticmethod
+    def _cascade_state_for(state):
+        """State that dependents take on when a dependency enters `state`."""
+        state_name = _state_name(state)
+        # Use IMPAIRED for dependent components when source is DOWN/FAILED/CRITICAL
+        if state_name in ("DOWN", "FAILED", "CRITICAL"):
+            return ComponentState.IMPAIRED
+        if state_name == "HEALTHY":
+            return ComponentState.HEALTHY
+        return state
         
-        # Normalize state to string for comparison
-        if isinstance(state, ComponentState):
-            state_name = state.name
-        elif isinstance(state, str):
-            state_name = state.upper()
-        else:
-            state_name = str(state).upper()
+    def configure_propagation(self, debounce_seconds=None):
+        """
+        Configure cascading status propagation.
         
-        # Find components that depend on this component
-        dependents = []
-        for dep, deps in dep_graph.items():
-            if component_id in deps:
-                dependents.append(dep)
-                
-        for dep_id in dependents:
-            # Skip if we've already visited this dependent
-            if dep_id in visited:
-                continue
-                
-            # Create cascade details with proper protocol fields
-            cascade_details = dict(details or {})
-            cascade_details['cascaded'] = component_id  # Use 'cascaded' key for protocol compliance
-            cascade_details['reason'] = f"Depends on {component_id}={state}"
-            
-            # Determine cascade state based on original state
-            # Use IMPAIRED for dependent components when source is DOWN/FAILED/CRITICAL
-            if state_name in ("DOWN", "FAILED", "CRITICAL"):
-                # Check if we should use a different state for dependents
-                if hasattr(ComponentState, "IMPAIRED"):
-                    cascade_state = ComponentState.IMPAIRED
-                elif hasattr(ComponentState, "DEGRADED"):
-                    cascade_state = ComponentState.DEGRADED
-                else:
-                    # Fall back to string value for older systems
-                    cascade_state = "IMPAIRED"
-            else:
-                # For non-critical states, use HEALTHY or original state
-                if state_name == "HEALTHY":
-                    cascade_state = ComponentState.HEALTHY if hasattr(ComponentState, "HEALTHY") else "HEALTHY"
-                else:
-                    cascade_state = state
-            
-            # Update the dependent component status
-            # This will trigger callbacks for the dependent component
-            # Force the update to bypass transition validation for cascaded status changes
-            self.update_component_status(dep_id, cascade_state, cascade_details, force=True)
-            
-            # Guarantee listeners are always notified immediately after status update
-            # Trigger global listeners for all components
-            for callback in self.legacy_listeners.get('global', set()):
-                callback(dep_id, cascade_state, cascade_details)
-                
-            # Trigger component-specific listeners
-            for callback in self.legacy_listeners.get(dep_id, set()):
-                callback(dep_id, cascade_state, cascade_details)
-                
-            # Trigger alert callbacks if state is IMPAIRED, DEGRADED, FAILED, DOWN, or CRITICAL
-            if isinstance(cascade_state, ComponentState):
-                state_name = cascade_state.name
-            else:
-                state_name = str(cascade_state).upper()
-                
-            if state_name in ("IMPAIRED", "DEGRADED", "FAILED", "DOWN", "CRITICAL"):
-                try:
-                    from app.core.monitoring.metrics import AlertLevel
-                    alert_level = AlertLevel.CRITICAL if state_name in ("FAILED", "DOWN", "CRITICAL") else AlertLevel.WARNING
-                    
-                    for callback in self.alert_callbacks:
-                        try:
-                            # New protocol: callback(component_id, alert_level, reason)
-                            reason = cascade_details.get('reason', f"Cascaded from {component_id}={state}")
-                            callback(dep_id, alert_level, reason)
-                        except Exception:
-                            # Fall back to old protocol: callback(component_id, state, details)
-                            callback(dep_id, cascade_state, cascade_details)
-                except ImportError:
-                    # Fall back if AlertLevel not available
-                    for callback in self.alert_callbacks:
-                        callback(dep_id, cascade_state, cascade_details)
+        Args:
+            debounce_seconds: Window within which repeated changes of one component are
+                coalesced into a single cascade (0 disables debouncing)
+        """
+        if debounce_seconds is not None:
+            self._propagator.debounce_seconds = debounce_seconds
             
-            # Trigger component watchers
-            for callback in self._component_watchers.get(dep_id, set()):
-                callback(dep_id, cascade_state, cascade_details)
+    def flush_pending_cascades(self, force=True):
+        """
+        Dispatch cascades that were held back by the debounce window.
+        
+        Args:
+            force: If False, only release changes whose window has elapsed
             
-            # Update metrics for the dependent component
-            try:
-                metrics = SystemMetricsManager()
-                metrics.report_metric(
-                    name=MetricType.COMPONENT_HEALTH.value,
-                    type_=MetricType.COMPONENT_HEALTH,
-                    value=cascade_state,
-                    component_id=dep_id
-                )
-            except Exception:
-                # Don't let metrics reporting failure affect component status updates
-                pass
-                
-            # Recursively cascade to this dependent's dependents
-            self._cascade_status_changes(dep_id, cascade_state, cascade_details, visited)
+        Returns:
+            List of component IDs whose pending change was propagated
+        """
+        flushed = []
+        for component_id, _, (state, details) in self._propagator.drain(force=force):
+            self._dispatch_cascade(component_id, state, details)
+            flushed.append(component_id)
+        return flushed
 
     def register_status_listener(self, callback):
         """
@@ -1620,7 +1568,7 @@ class ComponentStatusAdapter:
             List of ComponentStatus objects representing the component's history
         """
         # First try internal history
-        history = self._component_history.get(component_id, [])
+        history = list(self._component_history.get(component_id, ()))
         
         # If no internal history, fall back to status tracker
         if not history:
@@ -1693,6 +1641,7 @@ class ComponentStatusAdapter:
             del self._component_watchers[component_id]
         if component_id in self._last_component_states:
             del self._last_component_states[component_id]
+        self._propagator.forget(component_id)
 
     def clear(self):
         """
@@ -1707,6 +1656,8 @@ class ComponentStatusAdapter:
         self._component_watchers.clear()
         self._status_providers.clear()
         self._component_history.clear()
+        self._dependency_index.clear()
+        self._propagator.clear()
         
         # If dashboard exists, clear it too
         if self.dashboard:
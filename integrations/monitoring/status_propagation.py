@@ -0,0 +1,259 @@
+# status_propagation.py
+# Location: /integrations/monitoring/status_propagation.py
+# Purpose: Incremental cascading of component status changes over the dependency graph.
+"""
+Incremental status propagation for the health dashboards.
+
+Dependency maps throughout monitoring have the shape ``{component: [dependencies]}``,
+so finding who depends on a component means scanning every edge. ``DependencyIndex``
+keeps a reverse adjacency for that map and only rebuilds it when the source graph
+changes (detected through a ``dependency_version`` counter where the registry
+exposes one, or a snapshot comparison otherwise).
+
+``StatusPropagator`` walks that index breadth-first from a changed component. Each
+affected node is visited at most once per cascade, and the walk stops descending
+wherever the visitor reports that the node's effective status did not change, so
+the cost of a cascade is proportional to the nodes whose status actually moves.
+Sources that flap inside ``debounce_seconds`` are coalesced: the first change is
+dispatched immediately, later changes in the window collapse into one pending
+change that is dispatched by ``drain()`` only if it still differs from what was
+last propagated.
+"""
+
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+# Per-component history buffers are bounded so long-running dashboards do not grow without limit
+DEFAULT_HISTORY_LIMIT = 500
+
+
+def history_buffer(limit: Optional[int] = DEFAULT_HISTORY_LIMIT) -> deque:
+    """Return an empty per-component status history buffer holding at most `limit` records."""
+    return deque(maxlen=limit)
+
+
+class DependencyIndex:
+    """
+    Forward and reverse adjacency for a ``{component: [dependencies]}`` map.
+
+    Dependents are kept in first-declared order so cascades are deterministic.
+    """
+
+    def __init__(self, graph: Optional[Dict[Hashable, Iterable[Hashable]]] = None, version: Any = None):
+        self._forward: Dict[Hashable, Tuple[Hashable, ...]] = {}
+        self._reverse: Dict[Hashable, List[Hashable]] = {}
+        self._version = None
+        self._built = False
+        if graph is not None:
+            self.rebuild(graph, version)
+
+    @property
+    def version(self):
+        return self._version
+
+    def rebuild(self, graph: Dict[Hashable, Iterable[Hashable]], version: Any = None) -> None:
+        """Replace the index contents with `graph`."""
+        forward = {node: tuple(deps or ()) for node, deps in graph.items()}
+        reverse: Dict[Hashable, List[Hashable]] = {}
+        for node, deps in forward.items():
+            for dep in deps:
+                dependents = reverse.setdefault(dep, [])
+                if node not in dependents:
+                    dependents.append(node)
+        self._forward = forward
+        self._reverse = reverse
+        self._version = version
+        self._built = True
+
+    def sync(self, graph_source: Callable[[], Dict[Hashable, Iterable[Hashable]]], version: Any = None) -> bool:
+        """
+        Bring the index up to date with `graph_source()`.
+
+        When `version` is given and matches the indexed version, the graph is not fetched
+        at all. Without a version, the fetched graph is compared with the indexed one.
+
+        Returns:
+            True if the index was rebuilt
+        """
+        if version is not None and self._built and version == self._version:
+            return False
+        graph = graph_source() or {}
+        if version is None and self._built and self._same_graph(graph):
+            return False
+        self.rebuild(graph, version)
+        return True
+
+    def _same_graph(self, graph) -> bool:
+        if len(graph) != len(self._forward):
+            return False
+        for node, deps in graph.items():
+            if self._forward.get(node) != tuple(deps or ()):
+                return False
+        return True
+
+    def add_dependency(self, component: Hashable, depends_on: Hashable) -> None:
+        """Record a single edge without rebuilding."""
+        deps = self._forward.get(component, ())
+        if depends_on not in deps:
+            self._forward[component] = deps + (depends_on,)
+        self._forward.setdefault(depends_on, ())
+        dependents = self._reverse.setdefault(depends_on, [])
+        if component not in dependents:
+            dependents.append(component)
+        self._built = True
+
+    def remove_component(self, component: Hashable) -> None:
+        """Drop a component and every edge touching it."""
+        for dep in self._forward.pop(component, ()):
+            dependents = self._reverse.get(dep)
+            if dependents and component in dependents:
+                dependents.remove(component)
+        for dependent in self._reverse.pop(component, ()):
+            deps = self._forward.get(dependent)
+            if deps:
+                self._forward[dependent] = tuple(d for d in deps if d != component)
+
+    def clear(self) -> None:
+        self._forward.clear()
+        self._reverse.clear()
+        self._version = None
+        self._built = False
+
+    def dependencies(self, component: Hashable) -> List[Hashable]:
+        return list(self._forward.get(component, ()))
+
+    def dependents(self, component: Hashable) -> List[Hashable]:
+        """Components that directly depend on `component`."""
+        return list(self._reverse.get(component, ()))
+
+    def transitive_dependents(self, component: Hashable) -> List[Hashable]:
+        """All components that directly or indirectly depend on `component`, in breadth-first order."""
+        seen = {component}
+        order = []
+        queue = deque([component])
+        reverse = self._reverse
+        while queue:
+            for dependent in reverse.get(queue.popleft(), ()):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    order.append(dependent)
+                    queue.append(dependent)
+        return order
+
+    def __contains__(self, component) -> bool:
+        return component in self._forward or component in self._reverse
+
+    def __len__(self) -> int:
+        return len(self._forward)
+
+
+class StatusPropagator:
+    """
+    Pushes status deltas from a changed component to its dependents.
+
+    Usage:
+        propagator = StatusPropagator(index, debounce_seconds=0.5)
+        if propagator.submit("db", ComponentState.DOWN):
+            propagator.propagate("db", visit)
+        ...
+        for source, state, payload in propagator.drain():
+            propagator.propagate(source, visit)
+
+    `visit(dependent, via)` applies the cascaded status to `dependent` (reached through
+    `via`) and returns True only if the dependent's status actually changed; dependents
+    of unchanged nodes are not visited.
+    """
+
+    def __init__(self, index: Optional[DependencyIndex] = None, debounce_seconds: float = 0.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.index = index if index is not None else DependencyIndex()
+        self.debounce_seconds = debounce_seconds
+        self._clock = clock
+        self._last_dispatch: Dict[Hashable, Tuple[float, Any]] = {}  # source -> (time, state)
+        self._pending: Dict[Hashable, Tuple[Any, Any]] = {}  # source -> (latest state, payload)
+        self.visited_count = 0  # nodes touched by the most recent propagate()
+        self.coalesced_count = 0  # changes absorbed by the debounce window
+
+    def propagate(self, source: Hashable, visit: Callable[[Hashable, Hashable], bool]) -> List[Hashable]:
+        """
+        Breadth-first walk from `source` over its dependents.
+
+        Returns:
+            Dependents whose status changed, in the order they were updated
+        """
+        reverse = self.index._reverse
+        seen = {source}
+        changed = []
+        queue = deque([source])
+        visited = 0
+        while queue:
+            via = queue.popleft()
+            for dependent in reverse.get(via, ()):
+                if dependent in seen:
+                    continue
+                seen.add(dependent)
+                visited += 1
+                if visit(dependent, via):
+                    changed.append(dependent)
+                    queue.append(dependent)
+        self.visited_count = visited
+        return changed
+
+    def submit(self, source: Hashable, state: Any, payload: Any = None) -> bool:
+        """
+        Register a status change of `source`.
+
+        Returns:
+            True if the caller should propagate it now, False if it was coalesced
+            into a pending change (dispatched later by `drain`)
+        """
+        if self.debounce_seconds <= 0:
+            return True
+        now = self._clock()
+        last = self._last_dispatch.get(source)
+        if source not in self._pending and (last is None or now - last[0] >= self.debounce_seconds):
+            self._last_dispatch[source] = (now, state)
+            return True
+        self._pending[source] = (state, payload)
+        self.coalesced_count += 1
+        return False
+
+    def drain(self, force: bool = False) -> List[Tuple[Hashable, Any, Any]]:
+        """
+        Release pending changes whose debounce window has elapsed (all of them if `force`).
+
+        A pending change whose final state equals the state last propagated for that
+        source (e.g. DOWN -> HEALTHY -> DOWN inside one window) is dropped.
+
+        Returns:
+            List of (source, state, payload) to propagate
+        """
+        if not self._pending:
+            return []
+        now = self._clock()
+        ready = []
+        for source, (state, payload) in list(self._pending.items()):
+            last = self._last_dispatch.get(source)
+            if not force and last is not None and now - last[0] < self.debounce_seconds:
+                continue
+            del self._pending[source]
+            if last is not None and last[1] == state:
+                continue
+            self._last_dispatch[source] = (now, state)
+            ready.append((source, state, payload))
+        return ready
+
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def forget(self, source: Hashable) -> None:
+        """Drop debounce bookkeeping for a component that was removed."""
+        self._last_dispatch.pop(source, None)
+        self._pending.pop(source, None)
+
+    def clear(self) -> None:
+        self._last_dispatch.clear()
+        self._pending.clear()
+        self.visited_count = 0
+        self.coalesced_count = 0
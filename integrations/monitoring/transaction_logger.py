@@ -14,12 +14,23 @@ import uuid
 import threading
 import time
 import json
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
 
 from integrations.events.event_types import Event, EventCategory, EventPriority
+from integrations.monitoring.tracing import ChromeTraceExporter, SamplingProfiler, Tracer
 from integrations.registry.component_registry import Component
 
 
+# Innermost transaction running in the current context; nested transactions default to it as parent
+_current_transaction: ContextVar[Optional["Transaction"]] = ContextVar("aerolearn_current_transaction", default=None)
+
+
+def current_transaction() -> Optional[Transaction]:
+    """Return the innermost transaction active in the current context, if any."""
+    return _current_transaction.get()
+
+
 class TransactionStage(Enum):
     """Stages of a transaction lifecycle."""
     CREATED = auto()    # Transaction has been created
@@ -49,7 +60,12 @@ class TransactionEvent(Event):
             component_id: ID of the component that generated the event
             metadata: Additional data related to the transaction
         """
-        super().__init__()
+        super().__init__(
+            event_type=f"transaction.{stage.name.lower()}",
+            category=EventCategory.SYSTEM,
+            source_component=component_id,
+            data={'transaction_id': transaction_id, **(metadata or {})}
+        )
         self.transaction_id = transaction_id
         self.stage = stage
         self.component_id = component_id
@@ -60,7 +76,7 @@ class TransactionEvent(Event):
         # Higher priority for failed transactions
         self.priority = (
             EventPriority.HIGH if stage == TransactionStage.FAILED
-            else EventPriority.MEDIUM
+            else EventPriority.NORMAL
         )
     
     def to_dict(self) -> Dict[str, Any]:
@@ -358,6 +374,7 @@ class TransactionContext:
         self.action = action
         self.logger = logger
         self._transaction_started = False
+        self._trace_state = None
     
     def __enter__(self) -> Transaction:
         """Start the transaction and return it."""
@@ -367,6 +384,9 @@ class TransactionContext:
         
         self.transaction.process(self.component_id, self.action)
         
+        if self.logger:
+            self._trace_state = self.logger._enter_trace(self.transaction, self.component_id, self.action)
+        
         if self.logger:
             self.logger.update_transaction(self.transaction)
             
@@ -392,6 +412,7 @@ class TransactionContext:
             self.transaction.complete(self.component_id)
             
         if self.logger:
+            self.logger._exit_trace(self.transaction, self._trace_state)
             self.logger.update_transaction(self.transaction)
             
         # Don't suppress the exception
@@ -411,7 +432,12 @@ class TransactionLogger(Component):
         self,
         max_transactions: int = 1000,
         auto_prune: bool = True,
-        persistent_storage: bool = False
+        persistent_storage: bool = False,
+        storage_path: Optional[str] = None,
+        tracer: Optional[Tracer] = None,
+        trace_path: Optional[str] = None,
+        slow_threshold: Optional[float] = None,
+        profiler: Optional[SamplingProfiler] = None
     ):
         """
         Initialize the transaction logger.
@@ -420,13 +446,19 @@ class TransactionLogger(Component):
             max_transactions: Maximum number of transactions to keep in memory
             auto_prune: Whether to automatically prune old transactions
             persistent_storage: Whether to persist transactions to storage
+            storage_path: JSON-lines file finished transactions are persisted to
+            tracer: Tracer recording a span per transaction (and nested spans)
+            trace_path: Shortcut for a Tracer exporting Chrome trace events to this file
+            slow_threshold: If set, transactions are sampled by a profiler and the
+                profile is kept for those lasting at least this many seconds
+            profiler: Profiler to use with slow_threshold (a 5 ms sampler if None)
         """
         super().__init__(
             component_id="system.transaction_logger",
+            name="Transaction Logger",
             component_type="monitoring",
             version="1.0.0"
         )
-        self.name = "Transaction Logger"
         self.max_transactions = max_transactions
         self.auto_prune = auto_prune
         self.persistent_storage = persistent_storage
@@ -436,6 +468,12 @@ class TransactionLogger(Component):
         self.transactions_by_tag: Dict[str, List[str]] = {}
         self._lock = threading.RLock()
         self._next_id = 0
+        self.storage_path = storage_path
+        if tracer is None and trace_path:
+            tracer = Tracer(exporter=ChromeTraceExporter(trace_path))
+        self.tracer = tracer
+        self.slow_threshold = slow_threshold
+        self.profiler = profiler or (SamplingProfiler() if slow_threshold is not None else None)
     
     def create_transaction(
         self,
@@ -647,6 +685,8 @@ class TransactionLogger(Component):
         Returns:
             Transaction context manager
         """
+        if parent_id is None and _current_transaction.get() is not None:
+            parent_id = _current_transaction.get().transaction_id
         transaction = self.create_transaction(
             name=name, 
             parent_id=parent_id,
@@ -858,8 +898,8 @@ class TransactionLogger(Component):
         """
         Persist a transaction to storage.
         
-        In a real implementation, this would write to a database or log file.
-        Here we'll just simulate persistence with a print statement.
+        Appends one JSON line per transaction to storage_path; without a
+        path the record is only printed.
         
         Args:
             transaction: Transaction to persist
@@ -868,11 +908,84 @@ class TransactionLogger(Component):
             return
             
         # Convert to JSON for storage
-        json_data = json.dumps(transaction.to_dict())
+        json_data = json.dumps(transaction.to_dict(), default=str)
         
-        # In a real implementation, would store to database or file
-        # For now, just print
-        print(f"Persisting transaction: {json_data[:100]}...")
+        if self.storage_path:
+            with open(self.storage_path, "a", encoding="utf-8") as handle:
+                handle.write(json_data + "\n")
+        else:
+            print(f"Persisting transaction: {json_data[:100]}...")
+    
+    def span(self, name: str, **attributes: Any):
+        """
+        Open a nested span under the active transaction or span.
+        
+        Args:
+            name: Operation name
+            **attributes: Span attributes
+            
+        Returns:
+            Context manager yielding the Span (or None when tracing is disabled)
+            
+        Example:
+            with logger.transaction_context('ai.search', name='Search') as tx:
+                with logger.span('embed_query', model='minilm'):
+                    ...
+        """
+        if self.tracer is None:
+            return nullcontext()
+        return self.tracer.start_span(name, attributes)
+    
+    def flush_traces(self) -> None:
+        """Export any spans still buffered by the tracer."""
+        if self.tracer is not None:
+            self.tracer.flush()
+    
+    def _enter_trace(self, transaction: Transaction, component_id: str, action: str = "") -> Tuple:
+        """
+        Make the transaction current, open its span and start profiling if enabled.
+        
+        Returns:
+            Opaque state to hand back to _exit_trace
+        """
+        outermost = _current_transaction.get() is None
+        token = _current_transaction.set(transaction)
+        span = None
+        if self.tracer is not None:
+            span = self.tracer.open_span(transaction.name, {
+                'category': 'transaction',
+                'transaction_id': transaction.transaction_id,
+                'component_id': component_id,
+                'action': action,
+            })
+            transaction.metadata.setdefault('trace_id', span.trace_id)
+            transaction.metadata.setdefault('span_id', span.span_id)
+        # Profile only the outermost transaction of a context; nested ones share its samples
+        stacks = self.profiler.start() if self.profiler is not None and outermost else None
+        return token, span, stacks
+    
+    def _exit_trace(self, transaction: Transaction, state: Optional[Tuple]) -> None:
+        """Stop profiling, keep the profile if the transaction was slow and close its span."""
+        if not state:
+            return
+        token, span, stacks = state
+        if stacks is not None:
+            self.profiler.stop()
+            duration = transaction.duration() or 0.0
+            if duration >= self.slow_threshold and stacks:
+                transaction.metadata['profile'] = SamplingProfiler.top_frames(stacks)
+                if span is not None:
+                    span.set_attribute('profile.samples', sum(stacks.values()))
+                    span.set_attribute('profile.top', transaction.metadata['profile'][0]['frame'])
+        if span is not None:
+            span.set_attribute('stage', transaction.stage.name)
+            if transaction.stage == TransactionStage.FAILED:
+                span.status = "error"
+            self.tracer.close_span(span)
+        try:
+            _current_transaction.reset(token)
+        except ValueError:
+            _current_transaction.set(None)
     
     def log_transaction(self, source: str, target: str, type_: str, data: Any) -> None:
         """
@@ -934,6 +1047,9 @@ class TransactionLogger(Component):
                 # Do work
                 tx.add_metadata('key', 'value')
         """
+        if parent_id is None and _current_transaction.get() is not None:
+            parent_id = _current_transaction.get().transaction_id
+        trace_state = None
         try:
             # Create and start the transaction
             transaction = self.create_transaction(
@@ -945,6 +1061,7 @@ class TransactionLogger(Component):
             transaction.start(component_id)
             transaction.process(component_id, action)
             self.update_transaction(transaction)
+            trace_state = self._enter_trace(transaction, component_id, action)
             
             # Yield the transaction to the caller
             yield transaction
@@ -956,7 +1073,9 @@ class TransactionLogger(Component):
                 TransactionStage.CANCELED
             ):
                 transaction.complete(component_id)
-                self.update_transaction(transaction)
+            self._exit_trace(transaction, trace_state)
+            trace_state = None
+            self.update_transaction(transaction)
                 
         except Exception as e:
             # If an exception occurred, mark the transaction as failed
@@ -966,7 +1085,9 @@ class TransactionLogger(Component):
                 TransactionStage.CANCELED
             ):
                 transaction.fail(component_id, e)
-                self.update_transaction(transaction)
+            if trace_state is not None:
+                self._exit_trace(transaction, trace_state)
+            self.update_transaction(transaction)
             
             # Re-raise the exception
             raise
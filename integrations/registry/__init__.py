@@ -5,12 +5,31 @@ Created: 2025-04-24
 This module is part of the AeroLearn AI project.
 """
 
-from .component import Component
-from .dependency_graph import DependencyGraph
-from .component_registry import ComponentRegistry
+import importlib
 
 __all__ = [
     "Component",
     "DependencyGraph",
     "ComponentRegistry"
 ]
+
+# Exports are resolved on first access (PEP 562) so importing one submodule does not
+# load the rest. Kept inline so importing the registry does not pull in the app package.
+_EXPORTS = {
+    "Component": ".component",
+    "DependencyGraph": ".dependency_graph",
+    "ComponentRegistry": ".component_registry",
+}
+
+
+def __getattr__(name):
+    submodule = _EXPORTS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(submodule, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -16,9 +16,16 @@ Key Features:
 from .component import Component
 from .component_state import ComponentState
 from .dependency_graph import DependencyGraph
-import asyncio
+import inspect
 from typing import Dict, Optional, List, Union, Any
 
+async def _gather(tasks):
+    # asyncio is imported here rather than at module level: it is only needed once an
+    # event loop is running (and is then already loaded), so sync users skip its import cost
+    import asyncio
+    await asyncio.gather(*tasks)
+
+
 class ComponentRegistry:
     """
     Protocol-compliant registry for registering components and declaring dependencies.
@@ -34,6 +41,7 @@ class ComponentRegistry:
         self._dependency_graph = DependencyGraph()
         self._registration_order = []  # Preserve registration order for deterministic operations
         self._id_counter = 0  # Counter for generating unique component IDs
+        self._graph_generation = 0  # Bumped when the dependency graph is replaced (see clear)
         
     def _extract_id(self, component_or_id):
         """
@@ -188,6 +196,14 @@ class ComponentRegistry:
         # Delegate to dependency graph for edge management
         return self._dependency_graph.get_all_edges()
 
+    @property
+    def dependency_version(self):
+        """
+        Opaque token that changes whenever the dependency graph changes.
+        Lets status propagation reuse its reverse-dependency index between updates.
+        """
+        return (self._graph_generation, self._dependency_graph.version)
+
     def get_component(self, component_or_id):
         """
         Get a component by its ID (from component.component_id).
@@ -209,21 +225,21 @@ class ComponentRegistry:
     async def initialize_component(self, component_or_id):
         component_id = self._extract_id(component_or_id)
         component = self.get_component(component_id)
-        if component and hasattr(component, "initialize") and asyncio.iscoroutinefunction(component.initialize):
+        if component and hasattr(component, "initialize") and inspect.iscoroutinefunction(component.initialize):
             return await component.initialize()
         return None
 
     async def start_component(self, component_or_id):
         component_id = self._extract_id(component_or_id)
         component = self.get_component(component_id)
-        if component and hasattr(component, "start") and asyncio.iscoroutinefunction(component.start):
+        if component and hasattr(component, "start") and inspect.iscoroutinefunction(component.start):
             return await component.start()
         return None
 
     async def stop_component(self, component_or_id):
         component_id = self._extract_id(component_or_id)
         component = self.get_component(component_id)
-        if component and hasattr(component, "stop") and asyncio.iscoroutinefunction(component.stop):
+        if component and hasattr(component, "stop") and inspect.iscoroutinefunction(component.stop):
             return await component.stop()
         return None
 
@@ -234,10 +250,10 @@ class ComponentRegistry:
         tasks = []
         for component_id in self._registration_order:
             comp = self._components[component_id]
-            if hasattr(comp, "initialize") and asyncio.iscoroutinefunction(comp.initialize):
+            if hasattr(comp, "initialize") and inspect.iscoroutinefunction(comp.initialize):
                 tasks.append(comp.initialize())
         if tasks:
-            await asyncio.gather(*tasks)
+            await _gather(tasks)
         return None
 
     async def start_all_components(self):
@@ -247,10 +263,10 @@ class ComponentRegistry:
         tasks = []
         for component_id in self._registration_order:
             comp = self._components[component_id]
-            if hasattr(comp, "start") and asyncio.iscoroutinefunction(comp.start):
+            if hasattr(comp, "start") and inspect.iscoroutinefunction(comp.start):
                 tasks.append(comp.start())
         if tasks:
-            await asyncio.gather(*tasks)
+            await _gather(tasks)
         return None
 
     async def stop_all_components(self):
@@ -261,10 +277,10 @@ class ComponentRegistry:
         # Reverse order for stopping to respect dependencies
         for component_id in reversed(self._registration_order):
             comp = self._components[component_id]
-            if hasattr(comp, "stop") and asyncio.iscoroutinefunction(comp.stop):
+            if hasattr(comp, "stop") and inspect.iscoroutinefunction(comp.stop):
                 tasks.append(comp.stop())
         if tasks:
-            await asyncio.gather(*tasks)
+            await _gather(tasks)
         return None
         
     def analyze_dependency_impact(self, component_or_id):
@@ -336,4 +352,5 @@ class ComponentRegistry:
         self._components.clear()
         self.components = self._components  # refresh mapping in case of external references
         self._dependency_graph = DependencyGraph()  # Create a new instance for clean state
+        self._graph_generation += 1
         self._registration_order.clear()
@@ -6,11 +6,13 @@ class DependencyGraph:
         from collections import OrderedDict, deque
         self._nodes = OrderedDict()  # node_id -> ordered list of dependency_ids
         self._deque = deque  # Store deque class for BFS traversals
+        self.version = 0  # Bumped on every structural change so indexes can detect staleness
 
     def add_node(self, node_id):
         """Add a node to the dependency graph"""
         if node_id not in self._nodes:
             self._nodes[node_id] = []
+            self.version += 1
             
     # Alias for backward compatibility
     add_component = add_node
@@ -18,7 +20,8 @@ class DependencyGraph:
     def remove_node(self, node_id):
         """Remove a node and all its dependencies from the graph"""
         # Remove the node itself
-        self._nodes.pop(node_id, None)
+        if self._nodes.pop(node_id, None) is not None:
+            self.version += 1
         # Remove as dependency from all other nodes
         for deps in self._nodes.values():
             if node_id in deps:
@@ -37,6 +40,7 @@ class DependencyGraph:
         # Maintain insertion order and prevent duplicates
         if to_node not in self._nodes[from_node]:
             self._nodes[from_node].append(to_node)
+            self.version += 1
         return True
         
     # Alias for backward compatibility
@@ -46,6 +50,7 @@ class DependencyGraph:
         """Remove a dependency relationship if it exists"""
         if from_node in self._nodes and to_node in self._nodes[from_node]:
             self._nodes[from_node].remove(to_node)
+            self.version += 1
             
     # Alias for backward compatibility
     remove_dependency = remove_edge
@@ -112,6 +117,7 @@ class DependencyGraph:
         Used for protocol-compliant test reset by registry.
         """
         self._nodes.clear()
+        self.version += 1
         
     def get_nodes(self):
         """Return a list of all nodes in the graph"""
@@ -6,11 +6,12 @@ component dependencies and ensuring proper component initialization order.
 """
 import logging
 from typing import Dict, List, Set, Tuple, Any, Optional
-import networkx as nx  # You may need to install this package: pip install networkx
-import semver
 
 from .component_registry import ComponentRegistry, Component, ComponentState
 
+# networkx and semver are imported inside the methods that use them: they dominate
+# this module's import time, and the registry package must not depend on app.*
+
 logger = logging.getLogger(__name__)
 
 
@@ -64,6 +65,8 @@ class DependencyTracker:
         Returns:
             List of component ID lists, each representing a cycle
         """
+        import networkx as nx
+        import semver
         # Build directed graph of dependencies
         graph = nx.DiGraph()
         
@@ -104,6 +107,8 @@ class DependencyTracker:
         Raises:
             CircularDependencyError: If circular dependencies prevent ordering
         """
+        import networkx as nx
+        import semver
         # Check for circular dependencies first
         cycles = self.detect_circular_dependencies()
         if cycles:
@@ -181,6 +186,7 @@ class DependencyTracker:
             node: Tree node to add dependencies to
             visited: Set of already visited component IDs
         """
+        import semver
         # Add component type dependencies
         for dep_type, dep_info in component.dependencies.items():
             dep_node = {
@@ -264,6 +270,7 @@ class DependencyTracker:
         Returns:
             DOT format string for visualization with GraphViz
         """
+        import semver
         graph = [
             "digraph Dependencies {",
             "    rankdir=LR;",
@@ -0,0 +1,108 @@
+# Location: /tests/core/ai/test_conversation_store.py
+# Unit tests for conversation windowing/summarization and SQLiteConversationStore
+# in /app/core/ai/conversation_store.py and /app/core/ai/conversation.py.
+
+import os
+import pytest
+from app.core.ai.conversation import ConversationManager, ConversationHistory
+from app.core.ai.conversation_store import (
+    ExtractiveSummarizer,
+    SQLiteConversationStore,
+    estimate_tokens,
+)
+
+def echo_handler(user_input, user_id, state, extra):
+    return f"ECHO: {user_input}"
+
+def make_manager(store=None, max_context_tokens=64):
+    mgr = ConversationManager(store=store, user_validator=lambda uid: True,
+                              max_context_tokens=max_context_tokens)
+    mgr.register_handler("echo", echo_handler)
+    mgr.set_default_handler("echo")
+    return mgr
+
+def test_history_window_stays_within_budget():
+    history = ConversationHistory(max_context_tokens=50, summarizer=ExtractiveSummarizer(max_tokens=40))
+    for i in range(500):
+        history.add_turn("user", f"Question number {i} about lift and drag. More detail follows here.")
+    summary, turns = history.get_context()
+    assert history.token_count <= 50
+    assert sum(t["tokens"] for t in turns) == history.token_count
+    assert history.total_turns == 500
+    assert estimate_tokens(summary) <= 60
+    assert "Question number" in summary
+    assert "More detail" not in summary
+
+def test_unbounded_history_when_no_budget():
+    history = ConversationHistory()
+    for i in range(30):
+        history.add_turn("user", "hello")
+    assert len(history.turns) == 30
+    assert history.summary == ""
+
+def test_manager_keeps_memory_flat_for_long_sessions():
+    mgr = make_manager(max_context_tokens=64)
+    sid = mgr.start_session("stu1")
+    for i in range(200):
+        mgr.handle_input(sid, f"Explain the Bernoulli principle, attempt {i}.")
+    state = mgr.get_state(sid)
+    assert state.history.token_count <= 64
+    assert len(state.history.turns) < 20
+    assert state.history.summary
+
+def test_sqlite_store_persists_across_instances(tmp_path):
+    db_path = os.path.join(str(tmp_path), "conversations.db")
+    store = SQLiteConversationStore(db_path)
+    mgr = make_manager(store=store)
+    sid = mgr.start_session("stu2")
+    mgr.handle_input(sid, "What is thrust?")
+    store.close()
+
+    reopened = SQLiteConversationStore(db_path)
+    state = reopened.get(sid)
+    assert state is not None
+    assert state.user_id == "stu2"
+    assert [t["role"] for t in state.history.get_history()] == ["user", "bot"]
+    assert reopened.all_sessions() == [sid]
+    reopened.delete(sid)
+    assert reopened.get(sid) is None
+    reopened.close()
+
+def test_sqlite_store_bounds_cached_states():
+    store = SQLiteConversationStore(cache_size=3)
+    mgr = make_manager(store=store)
+    sids = [mgr.start_session(f"user{i}") for i in range(10)]
+    assert len(store._cache) == 3
+    # Evicted states are reloaded from SQLite on demand
+    assert store.get(sids[0]).user_id == "user0"
+    assert store.prune_inactive(-1) == 10
+    assert store.all_sessions() == []
+
+def test_sqlite_store_writes_turns_incrementally(tmp_path):
+    db_path = os.path.join(str(tmp_path), "conversations.db")
+    store = SQLiteConversationStore(db_path)
+    mgr = make_manager(store=store, max_context_tokens=64)
+    sid = mgr.start_session("stu3")
+    header_sizes = []
+    for i in range(100):
+        mgr.handle_input(sid, f"Explain the Bernoulli principle, attempt {i}.")
+        header_sizes.append(len(store._conn.execute(
+            'SELECT state FROM conversation_state WHERE session_id=?', (sid,)).fetchone()[0]))
+    state = mgr.get_state(sid)
+    # Only the live window is stored, and the pickled header does not grow with the turns
+    stored = store._conn.execute('SELECT COUNT(*) FROM conversation_turns WHERE session_id=?', (sid,)).fetchone()[0]
+    assert stored == len(state.history.turns)
+    assert max(header_sizes[10:]) < 2 * min(header_sizes[10:])
+    assert state.history.get_history(3) == list(state.history.turns)[-3:]
+    store.close()
+
+    reopened = SQLiteConversationStore(db_path)
+    loaded = reopened.get(sid)
+    assert list(loaded.history.turns) == list(state.history.turns)
+    assert loaded.history.summary == state.history.summary
+    reopened_mgr = make_manager(store=reopened)
+    reopened_mgr.handle_input(sid, "One more question.")
+    assert reopened.get(sid).history.get_history(2)[0]["text"] == "One more question."
+    reopened.delete(sid)
+    assert reopened._conn.execute('SELECT COUNT(*) FROM conversation_turns').fetchone()[0] == 0
+    reopened.close()
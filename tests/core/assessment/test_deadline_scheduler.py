@@ -0,0 +1,92 @@
+"""
+File: test_deadline_scheduler.py
+Location: /tests/core/assessment/
+Purpose: Unit tests for the shared DeadlineScheduler and its use by assessment sessions.
+
+Ensure expiry, warnings, pause/extend, cancellation and constant thread usage.
+"""
+
+import threading
+import time
+import pytest
+from app.core.assessment.deadline_scheduler import DeadlineScheduler, EVENT_EXPIRED, EVENT_WARNING
+from app.core.assessment.session_manager import AssessmentSessionManager, AssessmentSessionStatus
+
+
+class DummyAssessment: pass
+
+
+@pytest.fixture
+def scheduler():
+    sched = DeadlineScheduler()
+    yield sched
+    sched.shutdown(timeout=1)
+
+
+def _recorder():
+    events = []
+    done = threading.Event()
+
+    def callback(event, key, remaining):
+        events.append((event, key, remaining))
+        if event == EVENT_EXPIRED:
+            done.set()
+    return events, done, callback
+
+
+def test_deadline_expires_and_emits_warning(scheduler):
+    events, done, callback = _recorder()
+    scheduler.schedule("s1", 0.2, callback, warnings=[0.1])
+    assert done.wait(2)
+    assert [e[0] for e in events] == [EVENT_WARNING, EVENT_EXPIRED]
+    assert not scheduler.is_scheduled("s1")
+
+
+def test_cancel_prevents_expiry(scheduler):
+    events, done, callback = _recorder()
+    scheduler.schedule("s1", 0.1, callback)
+    assert scheduler.cancel("s1")
+    assert not done.wait(0.3)
+    assert events == []
+
+
+def test_extend_and_pause_move_deadline(scheduler):
+    events, done, callback = _recorder()
+    scheduler.schedule("s1", 0.1, callback)
+    scheduler.extend("s1", 0.3)
+    assert not done.wait(0.2)
+    scheduler.pause("s1")
+    frozen = scheduler.remaining("s1")
+    time.sleep(0.3)
+    assert scheduler.remaining("s1") == frozen
+    scheduler.resume("s1")
+    assert done.wait(2)
+
+
+def test_many_sessions_share_one_thread(scheduler):
+    manager = AssessmentSessionManager(scheduler=scheduler)
+    before = threading.active_count()
+    sessions = [manager.create_session(DummyAssessment(), f"user{i}", duration_seconds=0.2) for i in range(300)]
+    for session in sessions:
+        session.start()
+    assert threading.active_count() <= before + 1
+    deadline = time.time() + 3
+    while time.time() < deadline and any(s.status == AssessmentSessionStatus.IN_PROGRESS for s in sessions):
+        time.sleep(0.05)
+    assert all(s.status == AssessmentSessionStatus.TIMED_OUT for s in sessions)
+
+
+def test_session_pause_preserves_time_and_warns(scheduler):
+    manager = AssessmentSessionManager(scheduler=scheduler)
+    session = manager.create_session(DummyAssessment(), "user1", duration_seconds=0.3, warning_seconds=[0.2])
+    seen = []
+    session.add_listener(lambda name, info: seen.append(name))
+    session.start()
+    session.pause()
+    time.sleep(0.4)
+    assert session.status == AssessmentSessionStatus.PAUSED
+    session.resume()
+    session.extend_time(0.1)
+    time.sleep(0.8)
+    assert session.status == AssessmentSessionStatus.TIMED_OUT
+    assert seen.index('time_warning') < seen.index('timed_out')
@@ -0,0 +1,59 @@
+"""
+File: test_benchmark_runner.py
+Location: /tests/core/benchmark/
+Purpose: Unit tests for BenchmarkRunner statistics, JSON output and baseline comparison.
+"""
+
+import json
+import pytest
+from app.core.benchmark.runner import (
+    BenchmarkRunner, BenchmarkScenario, compare_to_baseline, percentile, results_to_json
+)
+
+def test_percentile_interpolates():
+    samples = [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert percentile(samples, 50) == 3.0
+    assert percentile(samples, 0) == 1.0
+    assert percentile(samples, 100) == 5.0
+    assert percentile(samples, 95) == pytest.approx(4.8)
+    assert percentile([], 50) == 0.0
+
+def test_runner_warmup_setup_and_teardown():
+    calls = {"setup": 0, "run": 0, "teardown": 0}
+
+    def setup():
+        calls["setup"] += 1
+        return {"n": 0}
+
+    def run(state):
+        calls["run"] += 1
+        sum(range(1000))
+
+    def teardown(state):
+        calls["teardown"] += 1
+
+    runner = BenchmarkRunner(warmup=2, repetitions=5)
+    runner.register(BenchmarkScenario("sum", run, setup, teardown, ops_per_run=10))
+    result = runner.run_scenario("sum")
+    assert calls == {"setup": 1, "run": 7, "teardown": 1}
+    assert result.repetitions == 5 and len(result.samples) == 5
+    assert result.min <= result.p50 <= result.p95 <= result.p99 <= result.max
+    assert result.throughput == pytest.approx(10 * 5 / sum(result.samples))
+
+def test_unknown_scenario_raises():
+    with pytest.raises(KeyError):
+        BenchmarkRunner().run_scenario("missing")
+
+def test_json_report_and_baseline_regressions():
+    runner = BenchmarkRunner(warmup=0, repetitions=3)
+    runner.register(BenchmarkScenario("noop", lambda state: None))
+    results = runner.run()
+    report = json.loads(results_to_json(results))
+    assert set(report["results"]["noop"]) >= {"p50", "p95", "p99", "throughput"}
+    assert "samples" not in report["results"]["noop"]
+
+    faster = {"results": {"noop": {"p50": results[0].p50 / 10, "p95": results[0].p95 / 10}}}
+    regressions = compare_to_baseline(results, faster, threshold=0.5)
+    assert {r.metric for r in regressions} == {"p50", "p95"}
+    slower = {"results": {"noop": {"p50": results[0].p50 * 10, "p95": results[0].p95 * 10}}}
+    assert compare_to_baseline(results, slower, threshold=0.5) == []
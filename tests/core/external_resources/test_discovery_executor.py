@@ -0,0 +1,89 @@
+# File: /tests/core/external_resources/test_discovery_executor.py
+
+import threading
+import time
+import pytest
+from app.core.ai.resource_discovery import ResourceDiscoveryOrchestrator
+from app.core.external_resources.discovery_executor import (
+    CircuitBreaker, DiscoveryExecutor, TTLCache
+)
+from app.core.external_resources.providers import MockProvider
+
+class DummyCourse:
+    def __init__(self, title):
+        self.title = title
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+def test_providers_run_concurrently_under_deadline():
+    providers = [MockProvider(latency=0.2, name=f"Slowish{i}") for i in range(5)]
+    executor = DiscoveryExecutor(providers, deadline_seconds=2.0)
+    start = time.monotonic()
+    outcome = executor.discover(DummyCourse("Aerodynamics"))
+    elapsed = time.monotonic() - start
+    assert elapsed < 0.6  # sequential would be ~1.0s
+    assert len(outcome.results) == 15
+    assert not outcome.is_partial
+    executor.shutdown()
+
+def test_slow_provider_yields_partial_results_then_cache():
+    fast, slow = MockProvider(name="Fast"), MockProvider(latency=0.5, name="Slow")
+    executor = DiscoveryExecutor([fast, slow], deadline_seconds=0.1)
+    outcome = executor.discover(DummyCourse("Propulsion"))
+    assert outcome.timed_out == ["Slow"]
+    assert {name for name, _ in outcome.results} == {"Fast"}
+    # The late answer still lands in the cache for the next request
+    time.sleep(0.6)
+    outcome = executor.discover(DummyCourse("Propulsion"))
+    assert sorted(outcome.cached) == ["Fast", "Slow"]
+    assert slow.calls == 1
+    executor.shutdown()
+
+def test_failing_provider_trips_circuit_breaker():
+    clock = FakeClock()
+    broken = MockProvider(error=RuntimeError("boom"), name="Broken")
+    with DiscoveryExecutor([broken], failure_threshold=2, reset_timeout=30, cache_ttl=0, clock=clock) as executor:
+        # Completion callbacks may run just after discover() returns; wait for them
+        breaker = executor.breaker_for(broken)
+        recorded = threading.Semaphore(0)
+        record_failure = breaker.record_failure
+        breaker.record_failure = lambda: (record_failure(), recorded.release())
+        for topic in ("a", "b"):
+            assert executor.discover(DummyCourse(topic)).failed == ["Broken"]
+            assert recorded.acquire(timeout=5)
+        assert executor.discover(DummyCourse("c")).skipped == ["Broken"]
+        assert broken.calls == 2
+        clock.now += 31  # half-open: one trial call allowed
+        assert executor.discover(DummyCourse("d")).failed == ["Broken"]
+        assert broken.calls == 3
+    assert executor._pool._shutdown
+
+def test_circuit_breaker_recovers_after_success():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+    clock.now = 10
+    assert breaker.allow() and not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_ttl_cache_expires_entries():
+    clock = FakeClock()
+    cache = TTLCache(ttl_seconds=5, clock=clock)
+    cache.set(("topic", "Mock"), [1])
+    assert cache.get(("topic", "Mock")) == [1]
+    clock.now = 6
+    assert cache.get(("topic", "Mock")) is None
+
+def test_orchestrator_reports_sources_and_survives_failures():
+    providers = [MockProvider(name="Good"), MockProvider(error=ValueError("down"), name="Bad")]
+    with ResourceDiscoveryOrchestrator(providers=providers, deadline_seconds=1.0) as orchestrator:
+        results = orchestrator.find_relevant_resources(DummyCourse("Orbital Mechanics"))
+        assert len(results) == 3
+        assert all(r.metadata["source"] == "MockProvider" for r in results)
+        assert orchestrator.last_outcome.failed == ["Bad"]
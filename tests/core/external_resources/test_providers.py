@@ -1,6 +1,8 @@
 # File: /tests/core/external_resources/test_providers.py
 
 import pytest
+import requests
+from app.core.external_resources.discovery_executor import CircuitBreaker, DiscoveryExecutor
 from app.core.external_resources.providers import DeepSeekResourceProvider
 
 class DummyCourse:
@@ -19,4 +21,21 @@ def test_deepseek_api(monkeypatch):
     prov = DeepSeekResourceProvider()
     monkeypatch.setattr(prov, "fetch_resources", lambda course: [{"title": "X", "url": "Y", "description": "Z"}])
     results = prov.fetch_resources(DummyCourse("Physics"))
-    assert  isinstance(results, list)
\ No newline at end of file
+    assert  isinstance(results, list)
+
+class _TimingOutSession:
+    def post(self, *args, **kwargs):
+        raise requests.Timeout("read timed out")
+
+def test_deepseek_errors_trip_breaker_and_are_not_cached(monkeypatch):
+    monkeypatch.setattr("app.core.external_resources.providers.AI_API_KEY", "test-key")
+    prov = DeepSeekResourceProvider()
+    prov._session = _TimingOutSession()
+    with pytest.raises(requests.Timeout):
+        prov.fetch_resources(DummyCourse("Physics"))
+
+    with DiscoveryExecutor([prov], failure_threshold=1, deadline_seconds=5.0) as executor:
+        assert executor.discover(DummyCourse("Physics")).failed == ["DeepSeek"]
+        executor.shutdown(wait_for_pending=True)  # completion callbacks have run
+        assert executor.breaker_for(prov).state == CircuitBreaker.OPEN
+        assert len(executor.cache) == 0
@@ -1,6 +1,9 @@
 # File: /tests/core/external_resources/test_scoring.py
 
-from app.core.external_resources.scoring import score_resource
+import pytest
+from app.core.external_resources.scoring import (
+    ResourceScorer, ScoringWeights, TfidfResourceScorer, score_resource
+)
 
 class DummyCourse:
     def __init__(self, title):
@@ -11,4 +14,64 @@ def test_score_resource():
     course = DummyCourse("Math")
     score = score_resource(res, course)
     assert isinstance(score, float)
-    assert 0 <= score <= 1.2
\ No newline at end of file
+    assert 0 <= score <= 1.2
+
+def test_batch_scores_rank_relevant_titles_first():
+    scorer = ResourceScorer()
+    resources = [
+        {"title": "Cooking pasta at home", "description": "recipes"},
+        {"title": "Introduction to aerodynamic lift", "description": "wings and airfoils"},
+        {"title": "Aerodynamics basics", "description": ""},
+    ]
+    course = DummyCourse("Introduction to Aerodynamics")
+    scores = scorer.score_many(resources, course)
+    assert len(scores) == 3
+    assert scores[1] > scores[0] and scores[2] > scores[0]
+    assert all(0 <= s <= 1.1 for s in scores)
+    ranked = scorer.rank(resources, course, explain=True, top_k=2)
+    assert [r.resource for r in ranked] == sorted(resources[1:], key=lambda r: -scores[resources.index(r)])
+    explanation = ranked[0].explanation
+    assert {"title_similarity", "description_similarity", "description_bonus", "matched_terms"} <= set(explanation)
+
+
+def test_weights_are_configurable():
+    resource = {"title": "Aerodynamics", "description": "flight"}
+    course = DummyCourse("Aerodynamics")
+    title_only = ResourceScorer(ScoringWeights(title=1.0, description=0.0, description_bonus=0.0))
+    assert title_only.score(resource, course) == pytest.approx(1.0, abs=1e-3)
+    bonus_only = ResourceScorer(ScoringWeights(title=0.0, description=0.0, description_bonus=0.25))
+    assert bonus_only.score(resource, course) == 0.25
+
+
+def test_empty_and_stopword_text_scores_zero():
+    assert score_resource({"title": "", "description": ""}, DummyCourse("Math")) == 0.0
+    assert ResourceScorer().score_many([], DummyCourse("Math")) == []
+    assert score_resource({"title": "the of and", "description": ""}, DummyCourse("!!")) == 0.0
+
+
+def test_fitted_vocabulary_is_reused():
+    scorer = TfidfResourceScorer().fit(["orbital mechanics", "aerodynamic lift", "jet propulsion"])
+    scores = scorer.score_many([{"title": "orbital mechanics"}, {"title": "unknown words"}], "Orbital Mechanics")
+    assert scores[0] > 0.7 and scores[1] < 0.3
+
+
+def test_filter_by_score_batches_unscored_resources():
+    scorer = ResourceScorer()
+    resources = [
+        {"title": "Aerodynamics", "description": "lift"},
+        {"title": "Knitting", "description": ""},
+        {"title": "Preset", "score": 0.9},
+    ]
+    kept = scorer.filter_by_score(resources, min_score=0.7, course_content=DummyCourse("Aerodynamics"))
+    assert kept == [resources[0], resources[2]]
+
+
+def test_ranking_hundreds_of_candidates_is_fast():
+    import time
+    resources = [{"title": f"Lecture {i} on {'lift' if i % 2 else 'drag'}", "description": "wing " * 30}
+                 for i in range(500)]
+    scorer = ResourceScorer()
+    scorer.rank(resources, DummyCourse("Lift and drag"))  # warm the per-text n-gram cache
+    start = time.perf_counter()
+    scorer.rank(resources, DummyCourse("Lift and drag"))
+    assert time.perf_counter() - start < 0.25
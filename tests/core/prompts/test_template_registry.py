@@ -0,0 +1,49 @@
+import pytest
+from app.core.prompts.template_registry import TemplateRegistry, CompiledTemplate, TemplateNotFoundError
+
+def test_compiled_template_matches_string_template():
+    source = "Cost: $$${amount} for $item (${item})"
+    compiled = CompiledTemplate("cost", source)
+    assert compiled.placeholders == ("amount", "item")
+    assert compiled.render({"amount": 5, "item": "wing"}) == "Cost: $5 for wing (wing)"
+
+def test_invalid_placeholder_rejected_at_compile_time():
+    with pytest.raises(ValueError):
+        CompiledTemplate("bad", "Price: $ 5")
+
+def test_partial_prerenders_static_segments():
+    compiled = CompiledTemplate("p", "Course ${course}: explain ${topic} to ${level} students.")
+    partial = compiled.partial({"course": "AE101", "level": "novice"})
+    assert partial.placeholders == ("topic",)
+    assert partial.render({"topic": "lift"}) == "Course AE101: explain lift to novice students."
+
+def test_render_memoizes_and_ignores_unused_context():
+    registry = TemplateRegistry()
+    registry.register("greet", "Hello, ${name}!")
+    assert registry.render("greet", {"name": "Ann"}, {"history": "a"}) == "Hello, Ann!"
+    assert registry.render("greet", {"name": "Ann"}, {"history": "b"}) == "Hello, Ann!"
+    assert registry.hits == 1 and registry.misses == 1
+
+def test_reregistration_invalidates_cached_renders():
+    registry = TemplateRegistry()
+    registry.register("greet", "Hello, ${name}!")
+    registry.render("greet", {"name": "Ann"})
+    registry.register("greet", "Hi ${name}.")
+    assert registry.get("greet").version == 2
+    assert registry.render("greet", {"name": "Ann"}) == "Hi Ann."
+
+def test_render_batch_with_context_and_overrides():
+    registry = TemplateRegistry()
+    registry.register("q", "[${course}] Summarize: ${text}")
+    out = registry.render_batch("q", [{"text": "a"}, {"text": "b", "course": "X"}], context={"course": "AE"})
+    assert out == ["[AE] Summarize: a", "[X] Summarize: b"]
+    with pytest.raises(ValueError):
+        registry.render_batch("q", [{"course": "AE"}])
+
+def test_missing_template_and_variable():
+    registry = TemplateRegistry()
+    with pytest.raises(TemplateNotFoundError):
+        registry.render("nope", {})
+    registry.register("t", "${a}")
+    with pytest.raises(ValueError):
+        registry.render("t", {})
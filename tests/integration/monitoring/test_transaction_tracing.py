@@ -0,0 +1,139 @@
+"""
+Tests for span tracing and the sampling profiler built into TransactionLogger.
+"""
+import asyncio
+import threading
+import time
+import contextvars
+
+import pytest
+
+from integrations.monitoring.tracing import (
+    ChromeTraceExporter, SamplingProfiler, Tracer, current_span, measure_overhead
+)
+from integrations.monitoring.transaction_logger import TransactionLogger, TransactionStage
+
+
+def test_nested_spans_share_trace_and_link_parents():
+    tracer = Tracer()
+    with tracer.start_span("root", {"user": "u1"}) as root:
+        with tracer.start_span("child") as child:
+            assert current_span() is child
+            with tracer.start_span("grandchild") as grandchild:
+                pass
+        assert current_span() is root
+    assert current_span() is None
+    assert child.parent_id == root.span_id and grandchild.parent_id == child.span_id
+    assert {s.trace_id for s in (root, child, grandchild)} == {root.trace_id}
+    assert [s.name for s in tracer.spans_for_trace(root.trace_id)] == ["grandchild", "child", "root"]
+    assert root.attributes["user"] == "u1" and root.duration >= child.duration
+
+
+def test_span_records_errors_and_context_follows_copied_threads():
+    tracer = Tracer()
+    seen = {}
+    with pytest.raises(ValueError):
+        with tracer.start_span("failing") as span:
+            ctx = contextvars.copy_context()
+            worker = threading.Thread(target=ctx.run, args=(lambda: seen.setdefault("parent", current_span()),))
+            worker.start()
+            worker.join()
+            raise ValueError("bad input")
+    assert seen["parent"] is span
+    assert span.status == "error" and "bad input" in span.attributes["error"]
+
+
+def test_sampling_is_decided_at_the_root():
+    tracer = Tracer(sample_rate=0.0)
+    with tracer.start_span("root"):
+        with tracer.start_span("child"):
+            pass
+    assert not tracer.finished
+
+
+def test_transaction_logger_exports_chrome_trace(tmp_path):
+    trace_file = tmp_path / "trace.json"
+    logger = TransactionLogger(trace_path=str(trace_file))
+    with logger.transaction_context("ai.search", name="Search", action="query") as outer:
+        with logger.span("embed_query", model="minilm"):
+            pass
+        with logger.transaction_context("vector_db", name="Lookup") as inner:
+            pass
+    logger.flush_traces()
+
+    assert inner.parent_id == outer.transaction_id
+    assert outer.stage == TransactionStage.COMPLETED
+    events = ChromeTraceExporter.read(str(trace_file))
+    by_name = {e["name"]: e for e in events}
+    assert set(by_name) == {"Search", "embed_query", "Lookup"}
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+    root = by_name["Search"]["args"]
+    assert by_name["embed_query"]["args"]["parent_id"] == root["span_id"]
+    assert by_name["Lookup"]["args"]["trace_id"] == root["trace_id"]
+    assert by_name["embed_query"]["args"]["model"] == "minilm"
+    assert outer.metadata["trace_id"] == root["trace_id"]
+
+
+def test_failed_transaction_span_is_marked_error(tmp_path):
+    logger = TransactionLogger(tracer=Tracer())
+    with pytest.raises(RuntimeError):
+        with logger.start_transaction("upload", name="Upload"):
+            raise RuntimeError("disk full")
+    span = logger.tracer.finished[-1]
+    assert span.status == "error" and span.attributes["stage"] == "FAILED"
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(100))
+
+
+def test_profile_kept_only_for_slow_transactions():
+    logger = TransactionLogger(slow_threshold=0.05, profiler=SamplingProfiler(interval=0.002))
+    with logger.transaction_context("grading", name="Fast") as fast:
+        pass
+    with logger.transaction_context("grading", name="Slow") as slow:
+        _busy(0.15)
+    assert "profile" not in fast.metadata
+    profile = slow.metadata["profile"]
+    assert profile and any("_busy" in entry["frame"] for entry in profile)
+
+
+def test_tracing_overhead_is_small():
+    def request_handler():
+        # Stand-in for one traced unit of work (a query, a scoring call): ~0.5 ms
+        sum(i * i for i in range(10000))
+    # Best of three runs filters out scheduler noise on a loaded machine
+    span_cost = min(measure_overhead(lambda: None, Tracer(), iterations=2000)["per_span_seconds"]
+                    for _ in range(3))
+    ratio = min(measure_overhead(request_handler, Tracer(), iterations=200)["overhead_ratio"]
+                for _ in range(3))
+    assert span_cost < 10e-6
+    assert ratio < 0.03
+
+
+def test_profiler_keeps_concurrent_tasks_on_one_thread_apart():
+    profiler = SamplingProfiler(interval=0.002)
+
+    def spin_a(seconds):
+        _busy(seconds)
+
+    def spin_b(seconds):
+        _busy(seconds)
+
+    async def job(spin):
+        stacks = profiler.start()
+        for _ in range(10):
+            spin(0.01)
+            await asyncio.sleep(0)
+        assert profiler.stop() is stacks
+        return stacks
+
+    async def main():
+        return await asyncio.gather(job(spin_a), job(spin_b))
+
+    stacks_a, stacks_b = asyncio.run(main())
+    assert stacks_a and stacks_b
+    assert all("spin_a" in stack and "spin_b" not in stack for stack in stacks_a)
+    assert all("spin_b" in stack and "spin_a" not in stack for stack in stacks_b)
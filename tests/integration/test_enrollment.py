@@ -1,6 +1,6 @@
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from app.models.base import Base
 from app.models.user import User
@@ -78,3 +78,57 @@ def test_get_enrollment_status(service, db_session, dummy_user, dummy_approver,
     service.approve_enrollment(dummy_course.id, dummy_user.id, dummy_approver.id)
     status = service.get_enrollment_status(dummy_course.id, dummy_user.id)
     assert status == EnrollmentStatus.APPROVED
+
+def _students(db_session, n):
+    users = [User(username=f"bulk{i}", email=f"bulk{i}@ex.com") for i in range(n)]
+    db_session.add_all(users)
+    db_session.commit()
+    return [u.id for u in users]
+
+def test_enroll_many_single_transaction(service, db_session, dummy_approver, dummy_course):
+    user_ids = _students(db_session, 50)
+    service.request_enrollment(dummy_course.id, user_ids[0])
+    commits = []
+    event.listen(db_session, "after_commit", lambda s: commits.append(1))
+    result = service.enroll_many(dummy_course.id, user_ids + user_ids[:5], approver_id=dummy_approver.id)
+    assert len(commits) == 1
+    assert result.count == 49 and result.skipped == [user_ids[0]]
+    assert sorted(service.get_enrolled_students(dummy_course.id)) == sorted(user_ids[1:])
+    assert service.get_student_courses(user_ids[1]) == [dummy_course.id]
+    assert db_session.query(Enrollment).count() == 50
+
+def test_unenroll_many_updates_index(service, db_session, dummy_approver, dummy_course):
+    user_ids = _students(db_session, 10)
+    service.enroll_many(dummy_course.id, user_ids, approver_id=dummy_approver.id)
+    result = service.unenroll_many(dummy_course.id, user_ids[:4] + [999])
+    assert result.changed == user_ids[:4] and result.missing == [999]
+    assert service.get_enrolled_students(dummy_course.id) == user_ids[4:]
+    assert service.get_enrollment_status(dummy_course.id, user_ids[0]) == EnrollmentStatus.CANCELLED
+    # Re-enrolling reopens cancelled enrollments instead of duplicating them
+    assert service.enroll_many(dummy_course.id, user_ids[:2]).changed == user_ids[:2]
+    assert db_session.query(Enrollment).count() == 10
+
+def test_enroll_many_approver_id_zero_approves(service, db_session, dummy_course):
+    user_ids = _students(db_session, 3)
+    service.enroll_many(dummy_course.id, user_ids, approver_id=0)
+    assert sorted(service.get_enrolled_students(dummy_course.id)) == sorted(user_ids)
+    enrollment = db_session.query(Enrollment).filter_by(user_id=user_ids[0]).one()
+    assert enrollment.approved_by == 0 and enrollment.status_history[-1]["by"] == 0
+
+def test_enroll_many_unknown_course(service):
+    with pytest.raises(ValueError):
+        service.enroll_many(12345, [1, 2])
+
+def test_catalog_cache_is_versioned(service, db_session, dummy_course):
+    queries = []
+    event.listen(db_session.get_bind(), "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: queries.append(statement))
+    assert [c.title for c in service.browse_courses()] == ["Intro AI"]
+    service.browse_courses()
+    service.search_courses("intro")
+    service.search_courses("intro")
+    selects = [q for q in queries if q.startswith("SELECT") and "FROM course" in q]
+    assert len(selects) == 2
+    db_session.add(Course(title="Intro Robotics"))
+    db_session.commit()
+    assert len(service.search_courses("intro")) == 2
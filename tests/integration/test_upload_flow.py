@@ -11,7 +11,11 @@ def upload_service():
 
 def test_full_upload_validation_flow(tmp_path, upload_service):
     sample_file = tmp_path / "example.pdf"
-    sample_file.write_bytes(b"%PDF-1.4 fake content")
+    sample_file.write_bytes(
+        b"%PDF-1.4\n1 0 obj\n<< /Type /Catalog >>\nendobj\n"
+        b"xref\n0 2\n0000000000 65535 f \n0000000009 00000 n \n"
+        b"trailer\n<< /Size 2 /Root 1 0 R >>\nstartxref\n45\n%%EOF\n"
+    )
     mimetype = "application/pdf"
 
     # --- Validate
@@ -16,7 +16,7 @@ def in_memory_db():
     Base.metadata.create_all(engine)
     Session = sessionmaker(bind=engine)
     yield Session()
-    clear_mappers()
+    # clear_mappers()  # <-- Removed per ORM mapping safety
 
 def test_category_assignment_and_removal(in_memory_db):
     session = in_memory_db
@@ -15,7 +15,7 @@ def in_memory_db():
     Base.metadata.create_all(engine)
     Session = sessionmaker(bind=engine)
     yield Session()
-    clear_mappers()
+    # clear_mappers()  # <-- Removed per ORM mapping safety
 
 def test_course_module_lesson_hierarchy(in_memory_db):
     session = in_memory_db
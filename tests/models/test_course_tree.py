@@ -0,0 +1,110 @@
+# /tests/models/test_course_tree.py
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # registers every mapped class before create_all
+from app.models.base import Base
+from app.models.course import Course, Module, Lesson, Enrollment, EnrollmentStatus
+from app.models.category import Category
+from app.models.tag import Tag
+from app.models.course_tree import CourseTreeLoader, SUMMARY_PROJECTION, FULL_PROJECTION
+
+@pytest.fixture()
+def session_and_counter():
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    session = sessionmaker(bind=engine)()
+    yield session, statements
+    session.close()
+    engine.dispose()
+
+def _build_course(session, title, modules, lessons_per_module, tag, category):
+    course = Course(title=title, description=f"{title} description")
+    course.tags.append(tag)
+    course.categories.append(category)
+    for m in range(modules):
+        module = Module(title=f"{title} M{m}", order=m)
+        module.tags.append(tag)
+        for l in range(lessons_per_module):
+            lesson = Lesson(title=f"{title} M{m} L{l}", content="...", order=l)
+            lesson.tags.append(tag)
+            module.lessons.append(lesson)
+        course.modules.append(module)
+    session.add(course)
+    return course
+
+def _query_count(session, statements, fn):
+    statements.clear()
+    result = fn()
+    return result, len(statements)
+
+def test_query_count_independent_of_course_size(session_and_counter):
+    session, statements = session_and_counter
+    tag = Tag(name="aero")
+    cat = Category(name="Engineering", slug="engineering")
+    small = _build_course(session, "Small", 1, 1, tag, cat)
+    large = _build_course(session, "Large", 12, 15, tag, cat)
+    session.commit()
+
+    loader = CourseTreeLoader(session)
+    _, small_queries = _query_count(session, statements, lambda: loader.load([small.id]))
+    tree, large_queries = _query_count(session, statements, lambda: loader.load([large.id]))
+    assert small_queries == large_queries
+    assert len(tree.modules) == 12 and len(tree.lessons) == 180
+    assert tree.tags == {tag.id: "aero"}
+
+def test_nested_matches_course_serialize(session_and_counter):
+    session, _ = session_and_counter
+    tag = Tag(name="flight")
+    cat = Category(name="Physics", slug="physics")
+    pre = Course(title="Intro Flight")
+    course = _build_course(session, "Aerodynamics", 2, 3, tag, cat)
+    course.prerequisites.append(pre)
+    session.add(Enrollment(course=course, user_id=1, status=EnrollmentStatus.APPROVED))
+    session.add(Enrollment(course=course, user_id=2, status=EnrollmentStatus.PENDING))
+    session.commit()
+
+    nested = CourseTreeLoader(session).load_course(course.id)
+    expected = course.serialize()
+    assert nested["title"] == expected["title"]
+    assert nested["prerequisites"] == expected["prerequisites"]
+    assert nested["enrollment_count"] == expected["enrollment_count"] == 1
+    assert [m["title"] for m in nested["modules"]] == [m["title"] for m in expected["modules"]]
+    assert ([l["title"] for l in nested["modules"][1]["lessons"]]
+            == [l["title"] for l in expected["modules"][1]["lessons"]])
+
+def test_summary_projection_skips_hierarchy(session_and_counter):
+    session, statements = session_and_counter
+    tag = Tag(name="space")
+    cat = Category(name="Astro", slug="astro")
+    for i in range(5):
+        _build_course(session, f"Course {i}", 3, 3, tag, cat)
+    session.commit()
+
+    tree, queries = _query_count(session, statements,
+                                 lambda: CourseTreeLoader(session).load(projection=SUMMARY_PROJECTION))
+    assert queries == 4  # courses, tags, categories, enrollment counts
+    assert len(tree.courses) == 5 and not tree.modules
+    assert set(next(iter(tree.courses.values()))) == {
+        "id", "title", "description", "order", "is_archived", "tag_ids", "category_ids", "enrollment_count"
+    }
+
+def test_orm_options_avoid_lazy_loads(session_and_counter):
+    session, statements = session_and_counter
+    tag = Tag(name="orbit")
+    cat = Category(name="Orbits", slug="orbits")
+    course = _build_course(session, "Orbital Mechanics", 4, 4, tag, cat)
+    session.commit()
+    course_id = course.id
+    session.expunge_all()
+
+    loader = CourseTreeLoader(session)
+    courses = loader.load_orm([course_id], FULL_PROJECTION)
+    statements.clear()
+    courses[0].serialize()
+    assert statements == []
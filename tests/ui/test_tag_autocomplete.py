@@ -0,0 +1,37 @@
+from app.models.tag_search import TagIndex
+from app.ui.common.tag_autocomplete import TagAutocomplete
+
+
+def test_debounced_query_emits_ranked_suggestions(qapp):
+    index = TagIndex()
+    index.add_many([("aerodynamics", 5), ("aero structures", 20), ("python", 1)])
+    widget = TagAutocomplete(tag_index=index, debounce_ms=0)
+    received = []
+    widget.suggestions_ready.connect(received.append)
+
+    widget.tag_input.setText("aer")
+    widget._schedule_query()
+    widget.tag_input.setText("aero")
+    widget._schedule_query()  # cancels the pending "aer" query
+    assert widget._debounce.isActive()
+    widget._debounce.stop()
+    widget._dispatch_query()
+    assert received == [["aero structures", "aerodynamics"]]
+
+
+def test_stale_results_are_dropped(qapp):
+    widget = TagAutocomplete(all_tags=["python"], debounce_ms=0)
+    received = []
+    widget.suggestions_ready.connect(received.append)
+    stale = widget._generation
+    widget.cancel_pending_query()
+    widget._apply_suggestions(stale, ["python"])
+    assert received == []
+
+
+def test_new_tags_are_indexed(qapp):
+    widget = TagAutocomplete(all_tags=["python"])
+    widget.tag_input.setText("propulsion")
+    widget._add_tag()
+    assert "propulsion" in widget.tag_index
+    assert widget.get_selected_tags() == ["propulsion"]
@@ -0,0 +1,70 @@
+"""
+Tests for the compiled prerequisite graph behind learning path generation
+(/app/core/ai/learning_path_planner.py) and cohort path generation.
+"""
+
+import time
+
+from app.core.ai.learning_path import generate_cohort_paths, generate_learning_path
+from app.core.ai.learning_path_planner import LearningPathPlanner
+
+CATALOG = [
+    {"id": "intro", "type": "Lesson", "prerequisites": [], "difficulty": "easy"},
+    {"id": "aero1", "type": "Lesson", "prerequisites": ["intro"], "difficulty": "medium"},
+    {"id": "aero2", "type": "Lesson", "prerequisites": ["aero1"], "difficulty": "hard"},
+    {"id": "lab", "type": "Module", "prerequisites": ["aero1", "safety"], "difficulty": "easy"},
+    {"id": "safety", "type": "Module", "prerequisites": [], "difficulty": "easy"},
+    {"id": "loop_a", "type": "Quiz", "prerequisites": ["loop_b"], "difficulty": "easy"},
+    {"id": "loop_b", "type": "Quiz", "prerequisites": ["loop_a"], "difficulty": "easy"},
+]
+
+
+def _student(completed=(), **extra):
+    return dict({"id": "stu", "level": "intro", "completed_content": list(completed),
+                 "performance": {"x": 0.5}}, **extra)
+
+
+def test_topological_levels_and_cycles():
+    planner = LearningPathPlanner(CATALOG)
+    assert planner.topological_levels() == [["intro", "safety"], ["aero1"], ["aero2", "lab"]]
+    assert "loop_a" not in planner.levels
+
+
+def test_multi_step_path_unlocks_dependents():
+    out = generate_learning_path(_student(), CATALOG, adaptivity=False)
+    ids = [step["content_id"] for step in out["steps"]]
+    assert ids == ["intro", "safety", "aero1", "lab", "aero2"]
+    assert all(step["prerequisites_satisfied"] for step in out["steps"])
+    assert out["steps"][3]["justification"].startswith("Follows earlier steps")
+
+
+def test_state_updates_incrementally():
+    planner = LearningPathPlanner(CATALOG)
+    state = planner.state_for(["intro"])
+    assert state.available() == ["aero1", "safety"]
+    assert state.complete("aero1") == ["aero2"]
+    assert state.complete("safety") == ["lab"]
+    assert state.available() == ["aero2", "lab"]
+    # Planning does not consume the student's state
+    planner.plan(_student(), state=state)
+    assert state.available() == ["aero2", "lab"]
+    assert [c["id"] for c in planner.plan(_student(), state=state, adaptivity=False)] == ["lab", "aero2"]
+
+
+def test_cohort_shares_compiled_catalog_and_plans():
+    catalog = [{"id": "c0", "prerequisites": [], "difficulty": "easy"}]
+    catalog += [{"id": f"c{i}", "prerequisites": [f"c{i - 1}"], "difficulty": "medium"} for i in range(1, 3000)]
+    students = [_student(["c0"], id=f"s{i}") for i in range(200)]
+    students.append(_student(["c0", "c1"], id="ahead"))
+
+    started = time.perf_counter()
+    paths = generate_cohort_paths(students, catalog, max_length=5)
+    elapsed = time.perf_counter() - started
+
+    assert [p["student_id"] for p in paths][:2] == ["s0", "s1"]
+    assert [s["content_id"] for s in paths[0]["steps"]] == ["c1", "c2", "c3", "c4", "c5"]
+    assert [s["content_id"] for s in paths[-1]["steps"]][0] == "c2"
+    # Plans are shared, the returned step dicts are not
+    paths[0]["steps"][0]["order"] = 99
+    assert paths[1]["steps"][0]["order"] == 1
+    assert elapsed < 1.0
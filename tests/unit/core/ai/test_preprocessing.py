@@ -0,0 +1,72 @@
+"""
+Tests for ContentPreprocessor cleaning, memoization and process-pool batches
+(/app/core/ai/preprocessing.py).
+"""
+
+import re
+
+from app.core.ai.preprocessing import CleanTextCache, ContentPreprocessor
+
+
+def _reference_clean(text, to_lower=True, remove_punct=True):
+    if to_lower:
+        text = text.lower()
+    text = re.sub(r"\s+", " ", text)
+    if remove_punct:
+        text = re.sub(r"[^\w\s]", "", text)
+    return text.strip()
+
+
+SAMPLES = [
+    "  Lift, Drag & Thrust!\n\tBernoulli's   principle. ",
+    "Über-schall: Mach 1.2 — très rapide…",
+    "snake_case stays; \x00control\x1f chars\x7f go",
+    "",
+]
+
+
+def test_clean_text_matches_regex_semantics():
+    pre = ContentPreprocessor(cache=CleanTextCache())
+    for text in SAMPLES:
+        for to_lower in (True, False):
+            for remove_punct in (True, False):
+                assert pre.clean_text(text, to_lower, remove_punct) == _reference_clean(text, to_lower, remove_punct)
+
+
+def test_cleaned_text_is_memoized_per_options():
+    cache = CleanTextCache()
+    stage_a = ContentPreprocessor(cache=cache)
+    stage_b = ContentPreprocessor(cache=cache)
+    long_text = "Wing Loading. " * 200
+    stage_a.clean_text(long_text)
+    stage_b.clean_text(long_text)
+    stage_b.clean_text(long_text, to_lower=False)
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_batch_preserves_order_and_dedupes():
+    cache = CleanTextCache()
+    pre = ContentPreprocessor(cache=cache)
+    texts = SAMPLES + SAMPLES[:2]
+    assert pre.preprocess_batch(texts) == [_reference_clean(t) for t in texts]
+    assert len(cache._entries) == len(SAMPLES)
+
+
+def test_cache_is_bounded_by_characters():
+    cache = CleanTextCache(max_chars=10_000)
+    pre = ContentPreprocessor(cache=cache)
+    for i in range(20):
+        pre.clean_text(f"{i} " + "x" * 3000)
+    assert cache.size_chars <= 10_000 and len(cache._entries) == 3
+    pre.clean_text("y" * 20_000)  # larger than the whole budget: cleaned, not cached
+    assert len(cache._entries) == 3
+    pre.clean_text("short text")
+    assert cache.size_chars == sum(len(v) + (len(k[0]) if isinstance(k[0], str) else 0)
+                                   for k, v in cache._entries.items())
+
+
+def test_parallel_batch_matches_sequential():
+    texts = [f"Chapter {i}: Orbital   Mechanics, part {i % 7}!" * 20 for i in range(200)]
+    parallel = ContentPreprocessor(cache=CleanTextCache(), max_workers=2).preprocess_batch(texts, parallel=True)
+    assert parallel == [_reference_clean(t) for t in texts]
+    assert ContentPreprocessor._chunk(texts, 8)[0][0] == texts[0]
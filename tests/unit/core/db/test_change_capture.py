@@ -0,0 +1,172 @@
+"""
+Tests for batched ORM change capture and the change-set outbox
+(/app/core/db/change_capture.py).
+"""
+
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from app.core.db.change_capture import ChangeCapture, publish_to_event_bus
+from integrations.events.event_bus import EventBus
+
+Base = declarative_base()
+
+
+class Lesson(Base):
+    __tablename__ = "capture_lessons"
+    id = Column(Integer, primary_key=True)
+    title = Column(String)
+
+
+class Note(Base):
+    __tablename__ = "capture_notes"
+    id = Column(Integer, primary_key=True)
+    body = Column(String)
+
+
+class Publisher:
+    def __init__(self, ok=True):
+        self.ok = ok
+        self.sets = []
+
+    def __call__(self, change_set):
+        self.sets.append(change_set)
+        return self.ok
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'capture.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    captures = []
+
+    def make(**kwargs):
+        publisher = kwargs.pop("publisher", None) or Publisher()
+        capture = ChangeCapture(publisher=publisher, **kwargs).install(Session)
+        captures.append(capture)
+        return capture, publisher
+
+    yield engine, Session, make
+    for capture in captures:
+        capture.uninstall()
+    engine.dispose()
+
+
+def test_bulk_insert_publishes_one_change_set_after_commit(db):
+    engine, Session, make = db
+    _, published = make(models=[Lesson])
+    session = Session()
+    started = time.perf_counter()
+    for start in range(0, 10000, 2000):
+        session.add_all(Lesson(id=i, title=f"L{i}") for i in range(start, start + 2000))
+        session.flush()
+    session.add(Note(id=1, body="not monitored"))
+    assert published.sets == []
+    session.commit()
+    elapsed = time.perf_counter() - started
+
+    assert len(published.sets) == 1
+    change_set = published.sets[0]
+    assert change_set["count"] == 10000 and list(change_set["tables"]) == ["capture_lessons"]
+    assert change_set["tables"]["capture_lessons"]["created"][5]["values"]["title"] in {f"L{i}" for i in range(10000)}
+    assert elapsed < 10
+
+
+def test_rollback_and_savepoint_rollback_discard_changes(db):
+    engine, Session, make = db
+    _, published = make()
+    session = Session()
+    session.add(Lesson(id=1, title="a"))
+    session.flush()
+    session.rollback()
+    session.commit()
+    assert published.sets == []
+
+    session.add(Lesson(id=2, title="kept"))
+    session.flush()
+    savepoint = session.begin_nested()
+    session.add(Lesson(id=3, title="dropped"))
+    session.flush()
+    savepoint.rollback()
+    session.commit()
+    rows = published.sets[0]["tables"]["capture_lessons"]["created"]
+    assert [row["primary_key"] for row in rows] == [{"id": 2}]
+
+
+def test_repeated_row_changes_are_coalesced_per_table(db):
+    engine, Session, make = db
+    _, published = make(coalesce=["capture_lessons"])
+    session = Session()
+    session.add(Lesson(id=1, title="draft"))
+    session.flush()
+    session.get(Lesson, 1).title = "final"
+    session.flush()
+    session.add(Lesson(id=2, title="temp"))
+    note = Note(id=1, body="v1")
+    session.add(note)
+    session.flush()
+    session.delete(session.get(Lesson, 2))
+    note.body = "v2"
+    session.commit()
+
+    lessons = published.sets[0]["tables"]["capture_lessons"]
+    assert lessons == {"created": [{"model": "Lesson", "primary_key": {"id": 1}, "values": {"id": 1, "title": "final"}}]}
+    notes = published.sets[0]["tables"]["capture_notes"]
+    assert len(notes["created"]) == 1 and notes["updated"][0]["old_values"] == {"body": "v1"}
+
+
+def test_outbox_keeps_undelivered_change_sets_for_redelivery(db):
+    engine, Session, make = db
+    publisher = Publisher(ok=False)
+    capture, _ = make(outbox=True, outbox_limit=2, publisher=publisher)
+    session = Session()
+    for i in range(4):
+        session.add(Lesson(id=i, title=str(i)))
+        session.commit()
+    assert len(publisher.sets) == 4
+    # Bounded: only the newest change sets are kept
+    pending = capture.pending_outbox(engine)
+    assert [cs["tables"]["capture_lessons"]["created"][0]["values"]["id"] for _, cs in pending] == [2, 3]
+
+    publisher.ok = True
+    assert capture.redeliver(engine) == 2
+    assert capture.pending_outbox(engine) == []
+    session.add(Lesson(id=10, title="x"))
+    session.commit()
+    assert capture.pending_outbox(engine) == []
+
+
+def test_outbox_row_is_kept_until_a_scheduled_publish_succeeds(db):
+    engine, Session, make = db
+    capture, _ = make(outbox=True, publisher=publish_to_event_bus)
+    bus = EventBus()
+
+    async def failing_publish(event):
+        raise RuntimeError("bus unavailable")
+
+    async def commit_on_running_loop():
+        await bus.start()
+        try:
+            session = Session()
+            session.add(Lesson(id=1, title="a"))
+            session.commit()
+            # Publish is only scheduled: the row must survive until it has run
+            assert len(capture.pending_outbox(engine)) == 1
+            await asyncio.sleep(0.01)
+            assert capture.pending_outbox(engine) == []
+
+            bus.publish = failing_publish
+            session.add(Lesson(id=2, title="b"))
+            session.commit()
+            await asyncio.sleep(0.01)
+            assert len(capture.pending_outbox(engine)) == 1
+        finally:
+            vars(bus).pop("publish", None)
+            await bus.stop()
+
+    asyncio.run(commit_on_running_loop())
@@ -0,0 +1,90 @@
+"""
+Tests for shared engines, SQLite pragmas and pool metrics
+(/app/core/db/engine_registry.py) and batched migrations (/app/core/db/migrations.py).
+"""
+
+import os
+import threading
+
+import pytest
+from sqlalchemy import text
+
+from app.core.db import migrations
+from app.core.db.engine_registry import DEFAULT_SQLITE_PRAGMAS, EngineRegistry, engine_registry
+
+
+@pytest.fixture
+def registry():
+    reg = EngineRegistry()
+    yield reg
+    reg.dispose()
+
+
+def test_engines_are_shared_per_url_with_pragmas(registry, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    engine = registry.get_engine("sqlite:///shared.db")
+    assert registry.get_engine(f"sqlite:///{os.path.join(tmp_path, 'shared.db')}") is engine
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+        # Foreign key enforcement is opt-in, as with a plain SQLite connection
+        assert connection.execute(text("PRAGMA foreign_keys")).scalar() == 0
+    assert registry.get_engine("sqlite:///:memory:").pool.__class__.__name__ != "QueuePool"
+
+
+def test_foreign_keys_opt_in_and_env_defaults_read_per_registry(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "2.5")
+    registry = EngineRegistry()
+    assert registry.defaults.pool_size == 3 and registry.defaults.pool_timeout == 2.5
+    url = f"sqlite:///{tmp_path / 'fk.db'}"
+    registry.configure(url, sqlite_pragmas={**DEFAULT_SQLITE_PRAGMAS, "foreign_keys": "ON"})
+    engine = registry.get_engine(url)
+    assert engine.pool.size() == 3
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA foreign_keys")).scalar() == 1
+    registry.dispose()
+
+
+def test_concurrent_writers_share_a_bounded_pool(registry, tmp_path):
+    url = f"sqlite:///{tmp_path / 'workers.db'}"
+    registry.configure(url, pool_size=4, max_overflow=0)
+    engine = registry.get_engine(url)
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE hits (worker INTEGER, n INTEGER)"))
+    errors = []
+
+    def worker(w):
+        try:
+            for n in range(25):
+                with engine.begin() as connection:
+                    connection.execute(text("INSERT INTO hits VALUES (:w, :n)"), {"w": w, "n": n})
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM hits")).scalar() == 200
+    stats = registry.metrics(url)[url]
+    assert stats["connects"] <= 4 and stats["pool_size"] == 4
+    assert stats["checkouts"] == stats["checkins"] == 202 and stats["checked_out"] == 0
+
+
+def test_migration_steps_commit_in_batches(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'migrate.db'}"
+    monkeypatch.setattr(migrations, "DB_URL", url)
+    steps = ["CREATE TABLE versions (n INTEGER)"] + [f"INSERT INTO versions VALUES ({n})" for n in range(9)]
+    assert migrations.apply_migration_steps(steps, batch_size=4) == 10
+
+    with pytest.raises(Exception):
+        migrations.apply_migration_steps(["INSERT INTO versions VALUES (100)", "INSERT INTO missing VALUES (1)"])
+    engine = migrations.get_engine(url)
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM versions")).scalar() == 9
+    engine_registry.dispose(url)
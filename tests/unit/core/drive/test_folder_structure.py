@@ -0,0 +1,136 @@
+"""
+Unit tests for breadth-first folder enumeration (/app/core/drive/folder_structure.py)
+and the flat FolderTree it returns.
+"""
+
+import os
+import threading
+import time
+
+from app.core.drive.folder_structure import FolderStructure
+from app.core.drive.folder_tree import FolderListing
+
+
+class InMemoryBackend:
+    """Folder backend with optional per-call latency; counts list calls."""
+
+    def __init__(self, folders, latency=0.0):
+        self.folders = {path: list(children) for path, children in folders.items()}
+        self.latency = latency
+        self.list_calls = 0
+        self._lock = threading.Lock()
+
+    def create_folder(self, path):
+        self.folders.setdefault(os.path.dirname(path), []).append(os.path.basename(path))
+        self.folders[path] = []
+        return True
+
+    def folder_exists(self, path):
+        return path in self.folders
+
+    def list_folders(self, path):
+        with self._lock:
+            self.list_calls += 1
+        time.sleep(self.latency)
+        if path not in self.folders:
+            raise FileNotFoundError(path)
+        return list(self.folders[path])
+
+
+class BatchBackend(InMemoryBackend):
+    """Backend with one-call-per-level listing and per-folder change tokens."""
+
+    def __init__(self, folders):
+        super().__init__(folders)
+        self.versions = {path: 1 for path in folders}
+        self.batch_calls = 0
+        self.unchanged = 0
+
+    def create_folder(self, path):
+        self.versions[path] = 1
+        return super().create_folder(path)
+
+    def touch(self, path):
+        self.versions[path] += 1
+
+    def list_folders_batch(self, requests):
+        self.batch_calls += 1
+        results = {}
+        for path, token in requests.items():
+            if path not in self.folders:
+                continue
+            if token == self.versions[path]:
+                self.unchanged += 1
+                results[path] = FolderListing(None, token)
+            else:
+                results[path] = FolderListing(list(self.folders[path]), self.versions[path])
+        return results
+
+
+def _course_share(width=10, depth=3):
+    folders = {"/course": []}
+    level = ["/course"]
+    for _ in range(depth):
+        next_level = []
+        for parent in level:
+            for i in range(width):
+                child = os.path.join(parent, f"f{i}")
+                folders[parent].append(f"f{i}")
+                folders[child] = []
+                next_level.append(child)
+        level = next_level
+    return folders
+
+
+def test_nested_tree_matches_recursive_shape():
+    backend = InMemoryBackend({"/r": ["a", "b"], "/r/a": ["c"], "/r/b": [], "/r/a/c": []})
+    tree = FolderStructure(backend).get_folder_tree("/r")
+    assert tree == {"/r": [{"/r/a": [{"/r/a/c": []}]}, {"/r/b": []}]}
+    assert FolderStructure(backend).get_folder_tree("/missing") == {}
+
+
+def test_round_trips_bounded_by_depth():
+    backend = BatchBackend(_course_share(width=10, depth=3))
+    structure = FolderStructure(backend)
+    tree = structure.walk("/course")
+    assert len(tree) == 1 + 10 + 100 + 1000
+    # One batch per level, plus the final (empty) leaf level
+    assert backend.batch_calls == 4
+    assert tree.depth() == 3
+    assert tree.children("/course/f1")[:2] == ["/course/f1/f0", "/course/f1/f1"]
+    assert len(tree.descendants("/course/f2")) == 110
+
+
+def test_levels_are_listed_concurrently_without_batch_call():
+    backend = InMemoryBackend(_course_share(width=6, depth=2), latency=0.02)
+    structure = FolderStructure(backend, max_workers=8)
+    started = time.perf_counter()
+    tree = structure.walk("/course")
+    elapsed = time.perf_counter() - started
+    assert len(tree) == 43 and backend.list_calls == 43
+    assert structure.round_trips == 3
+    assert elapsed < 43 * 0.02 / 2
+
+
+def test_refresh_uses_change_tokens_and_update_patches_subtree():
+    backend = BatchBackend(_course_share(width=3, depth=2))
+    structure = FolderStructure(backend)
+    tree = structure.walk("/course")
+
+    structure.refresh(tree)
+    assert backend.unchanged == len(tree)
+
+    backend.create_folder("/course/f0/new")
+    backend.create_folder("/course/f0/new/deeper")
+    backend.folders["/course/f1"].remove("f2")
+    del backend.folders["/course/f1/f2"]
+    for path in ("/course/f0", "/course/f1"):
+        backend.touch(path)
+
+    calls = backend.batch_calls
+    structure.update(tree, ["/course/f0", "/course/f1"])
+    assert "/course/f0/new/deeper" in tree
+    assert "/course/f1/f2" not in tree
+    # Changed folders, then the new folder, then its new child
+    assert backend.batch_calls - calls == 3
+    assert tree.to_nested("/course/f0/new") == {"/course/f0/new": [{"/course/f0/new/deeper": []}]}
@@ -0,0 +1,123 @@
+"""
+Unit tests for block-level range reads, the on-disk block cache
+(/app/core/drive/streaming.py) and the local streaming provider
+(/app/core/drive/local_streaming.py).
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from app.core.drive.file_operations import FileOperations
+from app.core.drive.local_streaming import LocalStreamingProvider
+from app.core.drive.streaming import BlockCache, BlockReader, SourceChangedError
+
+BLOCK = 4096
+
+
+@pytest.fixture
+def recording(tmp_path):
+    root = tmp_path / "lectures"
+    root.mkdir()
+    data = os.urandom(BLOCK * 256 + 123)  # ~1 MB, last block partial
+    (root / "recording.mp4").write_bytes(data)
+    return root, data
+
+
+def _counting_provider(root, cache=None, read_ahead=2):
+    provider = LocalStreamingProvider(str(root), cache=cache, block_size=BLOCK, read_ahead=read_ahead)
+    reads = []
+    original = provider._pread
+    provider._pread = lambda full, offset, length: reads.append(offset) or original(full, offset, length)
+    return provider, reads
+
+
+def test_ranges_match_file_contents(recording):
+    root, data = recording
+    provider, _ = _counting_provider(root)
+    for start, end in [(0, 0), (10, BLOCK * 3 + 7), (len(data) - 200, len(data) + 500), (BLOCK, BLOCK - 1)]:
+        chunk, item = asyncio.run(provider.get_content_range("recording.mp4", start, end))
+        assert chunk == data[start:end + 1]
+    assert item.size_bytes == len(data) and item.mime_type == "video/mp4"
+    with pytest.raises(PermissionError):
+        asyncio.run(provider.get_content_range("../outside", 0, 1))
+    provider.close()
+
+
+def test_first_chunk_needs_only_leading_blocks(recording):
+    root, data = recording
+
+    async def first_chunk():
+        stream = provider.stream_file("recording.mp4", chunk_size=1024)
+        chunk = await stream.__anext__()
+        await stream.aclose()
+        return chunk
+
+    provider, reads = _counting_provider(root, read_ahead=2)
+    assert asyncio.run(first_chunk()) == data[:1024]
+    provider._executor.shutdown(wait=True)
+    # The first block plus at most the read-ahead window, out of 257 blocks
+    assert sorted(reads) == [0, BLOCK, 2 * BLOCK]
+
+
+def test_full_stream_and_file_object(recording):
+    root, data = recording
+    provider, reads = _counting_provider(root)
+
+    async def collect():
+        return b"".join([chunk async for chunk in provider.stream_file("recording.mp4", chunk_size=1000)])
+
+    assert asyncio.run(collect()) == data
+    assert len(reads) == len(set(reads)) == 257  # read-ahead never fetched a block twice
+
+    with FileOperations(provider).open_stream("recording.mp4") as f:
+        f.seek(-5, os.SEEK_END)
+        assert f.read() == data[-5:]
+        f.seek(BLOCK - 2)
+        assert f.read(4) == data[BLOCK - 2:BLOCK + 2]
+    provider.close()
+
+
+def test_block_cache_evicts_lru_and_survives_restart(tmp_path, recording):
+    root, data = recording
+    cache = BlockCache(str(tmp_path / "cache"), max_bytes=BLOCK * 8)
+    provider, reads = _counting_provider(root, cache=cache, read_ahead=0)
+    asyncio.run(provider.get_content_range("recording.mp4", 0, BLOCK * 4 - 1))
+    assert len(reads) == 4 and cache.size_bytes == BLOCK * 4
+
+    # A new provider (fresh readers) reads the same blocks from disk
+    reopened = BlockCache(str(tmp_path / "cache"), max_bytes=BLOCK * 8)
+    provider2, reads2 = _counting_provider(root, cache=reopened, read_ahead=0)
+    assert asyncio.run(provider2.get_content_range("recording.mp4", 0, BLOCK * 4 - 1))[0] == data[:BLOCK * 4]
+    assert reads2 == [] and reopened.hits == 4
+
+    reader = BlockReader(lambda offset, length: data[offset:offset + length], len(data), "other", reopened, BLOCK, 0)
+    reader.read(0, BLOCK * 6 - 1)
+    assert reopened.size_bytes == BLOCK * 8
+    assert reopened.get(reader.key, 5) == data[BLOCK * 5:BLOCK * 6]
+    assert len(os.listdir(tmp_path / "cache")) == 8
+    provider.close()
+    provider2.close()
+
+
+def test_file_truncated_mid_stream_raises_and_caches_no_short_block(tmp_path, recording):
+    root, data = recording
+    cache = BlockCache(str(tmp_path / "cache"), max_bytes=BLOCK * 64)
+    provider, _ = _counting_provider(root, cache=cache, read_ahead=0)
+
+    async def consume():
+        received = []
+        stream = provider.stream_file("recording.mp4", chunk_size=BLOCK)
+        async for chunk in stream:
+            received.append(chunk)
+            if len(received) == 1:
+                with open(root / "recording.mp4", "r+b") as f:
+                    f.truncate(BLOCK * 2 + 10)
+        return received
+
+    with pytest.raises(SourceChangedError):
+        asyncio.run(asyncio.wait_for(consume(), timeout=10))
+    # Blocks 0 and 1 were whole; the short block 2 was not cached
+    assert cache.size_bytes == BLOCK * 2
+    provider.close()
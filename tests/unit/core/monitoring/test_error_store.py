@@ -0,0 +1,93 @@
+"""
+Tests for the bounded, indexed error storage behind ErrorLogger.
+"""
+
+import tracemalloc
+
+from app.core.monitoring.error_logging import ErrorLogger, ErrorSeverity
+from app.core.monitoring.error_store import ErrorStore, fingerprint
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_fingerprint_ignores_volatile_parts():
+    a = fingerprint("db", "io", ErrorSeverity.WARNING, "timeout after 30s on conn 0x7f3a")
+    b = fingerprint("db", "io", ErrorSeverity.WARNING, "Timeout after 45s on conn 0x1b2c")
+    assert a == b
+    assert a != fingerprint("db", "io", ErrorSeverity.CRITICAL, "timeout after 30s on conn 0x7f3a")
+
+
+def test_repeats_are_deduplicated_within_window():
+    clock = FakeClock()
+    store = ErrorStore(dedup_window=60, clock=clock)
+    for i in range(5):
+        clock.now += 1
+        store.add("db", f"query {i} failed", ErrorSeverity.WARNING, "io")
+    clock.now += 120
+    store.add("db", "query 9 failed", ErrorSeverity.WARNING, "io")
+    records = store.query(component="db")
+    assert [r.count for r in records] == [5, 1]
+    assert store.stats()["count"] == 6
+    assert store.top_fingerprints(1)[0]["count"] == 6
+
+
+def test_ring_is_bounded_and_indexes_follow_eviction():
+    store = ErrorStore(capacity=100, dedup_window=0)
+    for i in range(1000):
+        store.add(f"c{i % 3}", f"error {i}", ErrorSeverity.WARNING if i % 2 else ErrorSeverity.CRITICAL, "x")
+    assert len(store) == 100
+    assert sum(len(ids) for ids in store._index["component"].values()) == 100
+    critical_c0 = store.query(component="c0", severity=ErrorSeverity.CRITICAL)
+    assert all(r.component == "c0" and r.severity == ErrorSeverity.CRITICAL for r in critical_c0)
+    assert len(critical_c0) == len([r for r in store.query() if r.component == "c0" and r.severity == ErrorSeverity.CRITICAL])
+
+
+def test_time_range_and_predicates():
+    clock = FakeClock(0.0)
+    store = ErrorStore(dedup_window=0, bucket_seconds=60, clock=clock)
+    for minute in range(10):
+        clock.now = minute * 60.0 + 5
+        store.add("api", f"minute {minute}", ErrorSeverity.INFO, "http", {"status": 500 + minute})
+    window = store.query(since=120, until=300)
+    assert [r.message for r in window] == ["minute 2", "minute 3", "minute 4"]
+    assert [r.message for r in store.query(where=lambda r: r.metadata["status"] >= 508)] == ["minute 8", "minute 9"]
+    assert [r.message for r in store.query(severity=[ErrorSeverity.INFO], limit=2)] == ["minute 8", "minute 9"]
+
+
+def test_spill_to_sqlite_with_rotation(tmp_path):
+    store = ErrorStore(capacity=10, dedup_window=0, spill_path=str(tmp_path / "errors.db"),
+                       max_spill_rows=50, severity_type=ErrorSeverity)
+    for i in range(200):
+        store.add("worker", f"job {i} crashed", ErrorSeverity.CRITICAL, "jobs")
+    everything = store.query(component="worker", include_spilled=True)
+    assert len(everything) == 60  # 10 in memory + 50 retained on disk
+    assert everything[-1].message == "job 199 crashed"
+    assert everything[0].severity == ErrorSeverity.CRITICAL
+    store.close()
+
+
+def test_memory_stays_flat_for_long_running_logger():
+    logger = ErrorLogger()
+    logger.configure_storage(capacity=1000, dedup_window=0)
+    try:
+        for i in range(2000):
+            logger.log_error("svc", f"failure {i}", ErrorSeverity.WARNING, "runtime")
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        for i in range(20000):
+            logger.log_error("svc", f"failure {i}", ErrorSeverity.WARNING, "runtime", {"i": i})
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        growth = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+        assert growth < 2_000_000
+        assert len(logger.query_errors(component="svc")) == 1000
+        assert logger.aggregate_errors()["count"] == 22000
+    finally:
+        logger.configure_storage()
+        logger.clear()
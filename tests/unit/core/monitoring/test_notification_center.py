@@ -33,8 +33,7 @@ def _make_simple_notification(
 
 def setup_function():
     # Reset the notification_center instance before each test for isolation
-    notification_center._subscriptions.clear()
-    notification_center._history._history.clear()
+    notification_center.clear()
 
 def test_basic_notification_delivery_and_history():
     recipient_id = "user1"
@@ -53,6 +52,7 @@ def test_subscription_and_callback(monkeypatch):
     notification_center.subscribe(subscriber_id=recipient_id, callback=callback)
     notif = _make_simple_notification(recipient_id=recipient_id)
     notification_center.notify(notif)
+    notification_center.flush_callbacks()
     assert received
     assert received[0].notification_id == notif.notification_id
 
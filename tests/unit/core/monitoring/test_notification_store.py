@@ -0,0 +1,143 @@
+"""
+Tests for the SQLite-backed notification storage (/app/core/monitoring/notification_store.py)
+and the paged inbox API of NotificationCenter built on it.
+"""
+
+import time
+
+from app.core.monitoring.notification_center import (
+    Notification, NotificationCategory, NotificationCenter, NotificationPriority, NotificationStatus
+)
+from app.core.monitoring.notification_store import NotificationStore, RetentionPolicy
+
+
+def _notification(recipient_id=None, category=NotificationCategory.SYSTEM,
+                  priority=NotificationPriority.NORMAL, title="Test"):
+    return Notification(title=title, message="body", category=category, priority=priority,
+                        recipient_id=recipient_id, source="unit_test")
+
+
+def test_inbox_paging_and_counts():
+    center = NotificationCenter(async_callbacks=False)
+    sent = [_notification("u1", title=f"n{i}") for i in range(25)]
+    for n in sent:
+        center.notify(n)
+    center.notify(_notification("u2"))
+
+    first = center.get_notifications("u1", limit=10)
+    second = center.get_notifications("u1", limit=10, offset=10)
+    assert [n.title for n in first] == [f"n{i}" for i in range(10)]
+    assert [n.title for n in second] == [f"n{i}" for i in range(10, 20)]
+    assert center.get_notifications("u1", limit=3, newest_first=True)[0].title == "n24"
+
+    center.mark_as_read("u1", sent[0].notification_id)
+    assert center.count_notifications("u1") == 25
+    assert center.count_notifications("u1", status=NotificationStatus.UNREAD) == 24
+    assert len(center.get_notifications("u1", unread_only=True)) == 24
+    # Another recipient cannot change u1's notification
+    assert center.archive_notification("u2", sent[1].notification_id) is False
+
+
+def test_broadcast_reaches_large_audience_with_one_write():
+    center = NotificationCenter(async_callbacks=False)
+    for i in range(20000):
+        center.subscribe(f"student{i}", categories={NotificationCategory.COURSE})
+    late = "student-late"
+
+    started = time.perf_counter()
+    announcement = _notification(category=NotificationCategory.COURSE)
+    center.notify(announcement)
+    assert time.perf_counter() - started < 0.5
+    assert center._store._conn.execute("SELECT COUNT(*) FROM inbox").fetchone()[0] == 0
+
+    assert [n.notification_id for n in center.get_notifications("student123")] == [announcement.notification_id]
+    # Subscribing after the broadcast does not backfill it
+    center.subscribe(late)
+    assert center.get_notifications(late) == []
+
+
+def test_broadcast_status_is_per_recipient():
+    center = NotificationCenter(async_callbacks=False)
+    center.subscribe("a")
+    center.subscribe("b")
+    broadcast = _notification()
+    center.notify(broadcast)
+
+    assert center.mark_as_read("a", broadcast.notification_id)
+    assert center.get_notifications("a")[0].status == NotificationStatus.READ
+    assert center.get_notifications("b")[0].status == NotificationStatus.UNREAD
+    assert center.count_notifications("b", status=NotificationStatus.UNREAD) == 1
+    # Not subscribed when it was sent
+    assert center.mark_as_read("c", broadcast.notification_id) is False
+
+
+def test_unsubscribe_keeps_received_broadcasts():
+    center = NotificationCenter(async_callbacks=False)
+    center.subscribe("u")
+    kept = _notification()
+    center.notify(kept)
+    center.unsubscribe("u")
+    center.notify(_notification())
+    assert [n.notification_id for n in center.get_notifications("u")] == [kept.notification_id]
+
+
+def test_callbacks_run_off_the_notifying_thread_in_order():
+    center = NotificationCenter()
+    received = []
+    center.subscribe("u", callback=lambda n: received.append(n.title))
+    center.subscribe("other", callback=lambda n: received.append("other:" + n.title))
+    center.subscribe("failing", callback=lambda n: 1 / 0)
+    for i in range(5):
+        center.notify(_notification("u", title=str(i)))
+    center.notify(_notification(title="all"))
+    assert center.flush_callbacks(timeout=5)
+    assert received[:5] == ["0", "1", "2", "3", "4"]
+    assert sorted(received[5:]) == ["all", "other:all"]
+    assert center.callback_errors == 1
+
+
+def test_retention_by_age_and_inbox_size():
+    center = NotificationCenter(async_callbacks=False)
+    old = _notification("u")
+    center.notify(old)
+    center._store._conn.execute("UPDATE notifications SET ts = ts - 1000 WHERE notification_id=?",
+                                (old.notification_id,))
+    for i in range(6):
+        center.notify(_notification("u", title=str(i)))
+
+    assert center.apply_retention(RetentionPolicy(max_age_seconds=500)) == 1
+    assert center.get_notification(old.notification_id) is None
+    assert center.apply_retention(RetentionPolicy(max_per_recipient=4)) == 2
+    assert [n.title for n in center.get_notifications("u")] == ["2", "3", "4", "5"]
+
+
+def test_inbox_size_limit_counts_broadcasts_and_keeps_them_trimmed():
+    center = NotificationCenter(async_callbacks=False)
+    center.subscribe("u")
+    center.subscribe("other")
+    broadcast = _notification(title="t")
+    center.notify(broadcast)
+    center.mark_as_read("u", broadcast.notification_id)
+    center.notify(_notification("u", title="d1"))
+    center.notify(_notification("u", title="d2"))
+
+    center.apply_retention(RetentionPolicy(max_per_recipient=2))
+    assert [(n.title, n.status) for n in center.get_notifications("u")] == [
+        ("d1", NotificationStatus.UNREAD), ("d2", NotificationStatus.UNREAD)]
+    assert center.count_notifications("u") == 2
+    assert center.mark_as_read("u", broadcast.notification_id) is False
+    # The broadcast stays for subscribers whose inbox still has room
+    assert [n.title for n in center.get_notifications("other")] == ["t"]
+    # Newer broadcasts still arrive
+    center.notify(_notification(title="t2"))
+    assert [n.title for n in center.get_notifications("u")] == ["d1", "d2", "t2"]
+    center.apply_retention(RetentionPolicy(max_per_recipient=2))
+    assert [n.title for n in center.get_notifications("u")] == ["d2", "t2"]
+
+
+def test_store_sequence_survives_retention():
+    store = NotificationStore()
+    seq = store.add("a", 0.0, "t", "m", "system", 3, "u", {}, None)
+    store.apply_retention(RetentionPolicy(max_age_seconds=1), now=100.0)
+    assert store.get("a") is None
+    assert store.add("b", 100.0, "t", "m", "system", 3, "u", {}, None) > seq
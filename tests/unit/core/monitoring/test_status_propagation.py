@@ -0,0 +1,226 @@
+"""
+Tests for incremental cascading status propagation (/integrations/monitoring/status_propagation.py)
+and its use by the health dashboards.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.monitoring.ServiceHealthDashboard_Class import ComponentState as CoreState
+from app.core.monitoring.ServiceHealthDashboard_Class import ServiceHealthDashboard as CoreDashboard
+import integrations.monitoring.component_status_adapter as adapter_module
+from integrations.monitoring.component_status_adapter import (
+    ComponentState,
+    ComponentStatusAdapter,
+    EnhancedComponentStatusTracker,
+    ServiceHealthDashboard,
+    make_registry,
+)
+from integrations.monitoring.status_propagation import DependencyIndex, StatusPropagator
+
+
+class FakeClock:
+    def __init__(self, now=100.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class GraphRegistry:
+    """Plain registry whose components carry a settable state."""
+
+    def __init__(self):
+        self.components = {}
+        self.dependencies = {}
+        self.dependency_version = 0
+        self.graph_reads = 0
+
+    def add(self, name, state=CoreState.HEALTHY):
+        self.components[name] = SimpleNamespace(state=state)
+
+    def declare_dependency(self, component, depends_on):
+        self.dependencies.setdefault(component, []).append(depends_on)
+        self.dependency_version += 1
+
+    def get_component(self, name):
+        return self.components.get(name)
+
+    def get_dependency_graph(self):
+        self.graph_reads += 1
+        return {k: list(v) for k, v in self.dependencies.items()}
+
+
+def test_index_reverse_lookup_and_transitive_order():
+    index = DependencyIndex({"api": ["db", "cache"], "web": ["api"], "jobs": ["db"], "db": []})
+    assert index.dependents("db") == ["api", "jobs"]
+    assert index.transitive_dependents("db") == ["api", "jobs", "web"]
+    index.add_dependency("db", "web")  # introduce a cycle
+    assert index.transitive_dependents("db") == ["api", "jobs", "web"]
+    index.remove_component("api")
+    assert index.transitive_dependents("db") == ["jobs"]
+    assert index.dependencies("web") == []
+
+
+def test_sync_skips_rebuild_when_version_unchanged():
+    reads = []
+
+    def source():
+        reads.append(1)
+        return {"b": ["a"]}
+
+    index = DependencyIndex()
+    assert index.sync(source, version=1) is True
+    assert index.sync(source, version=1) is False
+    assert len(reads) == 1
+    # Without a version the graph is compared with the indexed one
+    assert index.sync(source) is False
+    assert len(reads) == 2
+    assert index.sync(lambda: {"b": ["a"], "c": ["b"]}) is True
+    assert index.transitive_dependents("a") == ["b", "c"]
+
+
+def test_propagate_stops_at_unchanged_nodes():
+    index = DependencyIndex({"b": ["a"], "c": ["b"], "d": ["a"], "e": ["d"]})
+    propagator = StatusPropagator(index)
+    changed = propagator.propagate("a", lambda node, via: node != "d")
+    assert changed == ["b", "c"]
+    assert "e" not in changed
+    assert propagator.visited_count == 3
+
+
+def test_debounce_coalesces_flapping_source():
+    clock = FakeClock()
+    propagator = StatusPropagator(DependencyIndex(), debounce_seconds=1.0, clock=clock)
+    assert propagator.submit("db", "DOWN") is True
+    clock.now += 0.1
+    assert propagator.submit("db", "HEALTHY") is False
+    clock.now += 0.1
+    assert propagator.submit("db", "DOWN") is False
+    clock.now += 1.0
+    # Net change inside the window is nil, so nothing is released
+    assert propagator.drain() == []
+    assert propagator.coalesced_count == 2
+
+    clock.now += 5
+    assert propagator.submit("db", "HEALTHY") is True
+    assert propagator.submit("db", "DEGRADED", "payload") is False
+    assert propagator.drain() == []  # window still open
+    assert propagator.drain(force=True) == [("db", "DEGRADED", "payload")]
+
+
+def test_adapter_dashboard_cascades_only_to_affected_components():
+    registry = make_registry()
+    dashboard = ServiceHealthDashboard(registry=registry)
+    # 300 independent chains of three components each
+    for i in range(300):
+        for name in (f"db{i}", f"api{i}", f"web{i}"):
+            registry.register_component(name, state=ComponentState.HEALTHY)
+        registry.declare_dependency(f"api{i}", f"db{i}")
+        registry.declare_dependency(f"web{i}", f"api{i}")
+
+    for name in ("db7", "api7", "web7"):
+        dashboard.update_component_status(name, ComponentState.HEALTHY, {})
+
+    dashboard._cascade_status("db7", ComponentState.DEGRADED)
+    assert dashboard._propagator.visited_count == 2
+    assert dashboard._statuses["api7"][0] == ComponentState.DEGRADED
+    assert dashboard._statuses["web7"][1]["cascaded"] == "api7"
+    assert "api8" not in dashboard._statuses
+
+    # Repeating the change finds every dependent already degraded: no further updates
+    dashboard._cascade_status("db7", ComponentState.DEGRADED)
+    assert dashboard._propagator.visited_count == 1
+
+    assert dashboard.get_all_dependents("db3") == {"api3", "web3"}
+    registry.declare_dependency("web3", "db4")
+    assert sorted(dashboard.get_dependents("db4")) == ["api4", "web3"]
+
+
+@pytest.fixture
+def adapter(monkeypatch):
+    # Build a private adapter instead of joining the module-level singleton
+    monkeypatch.setattr(adapter_module, "SYSTEM_STATUS_TRACKER", None)
+    registry = make_registry()
+    tracker = EnhancedComponentStatusTracker(registry)
+    dashboard = ServiceHealthDashboard(tracker, registry)
+    return ComponentStatusAdapter(dashboard=dashboard, registry=registry, status_tracker=tracker)
+
+
+def test_adapter_notifies_each_dependent_once_and_only_on_change(adapter):
+    adapter.registry.declare_dependency("api", "db")
+    adapter.registry.declare_dependency("web", "api")
+    for name in ("db", "api", "web"):
+        adapter.update_component_status(name, ComponentState.HEALTHY, force=True)
+    log = []
+    adapter.register_status_listener(lambda cid, status, details: log.append((cid, status.state)))
+
+    adapter.update_component_status("db", ComponentState.DOWN, force=True)
+    assert log == [("db", ComponentState.DOWN), ("api", ComponentState.IMPAIRED),
+                   ("web", ComponentState.IMPAIRED)]
+    assert adapter.get_component_history("web")[-1].details["cascaded"] == "api"
+
+    log.clear()
+    adapter.update_component_status("db", ComponentState.DOWN, force=True)
+    assert log == [("db", ComponentState.DOWN)]
+    assert adapter.get_all_dependents("db") == {"api", "web"}
+
+
+@pytest.fixture
+def core_dashboard():
+    CoreDashboard._reset_for_test()
+    registry = GraphRegistry()
+    dashboard = CoreDashboard(registry=registry, status_tracker=SimpleNamespace())
+    yield dashboard, registry
+    CoreDashboard._reset_for_test()
+
+
+def test_core_dashboard_cascade_uses_index_and_skips_failed(core_dashboard):
+    dashboard, registry = core_dashboard
+    for name in ("db", "api", "web", "worker", "report"):
+        registry.add(name)
+    registry.declare_dependency("api", "db")
+    registry.declare_dependency("web", "api")
+    registry.declare_dependency("worker", "db")
+    registry.declare_dependency("report", "worker")
+    registry.components["worker"].state = CoreState.FAILED
+
+    dashboard.update_component_status("db", CoreState.DOWN)
+    assert registry.components["api"].state == CoreState.DEGRADED
+    assert registry.components["web"].state == CoreState.DEGRADED
+    # A failed dependent keeps its state and shields what sits behind it
+    assert registry.components["worker"].state == CoreState.FAILED
+    assert registry.components["report"].state == CoreState.HEALTHY
+    assert dashboard.get_status_history("web")[-1].metrics["cascaded_from"] == "db"
+
+    reads = registry.graph_reads
+    dashboard.update_component_status("db", CoreState.HEALTHY)
+    dashboard.update_component_status("db", CoreState.DEGRADED)
+    assert registry.graph_reads == reads  # graph unchanged, index reused
+    assert dashboard._find_dependent_components("db") == ["api", "worker", "web", "report"]
+
+
+def test_core_dashboard_debounce_and_bounded_history(core_dashboard):
+    dashboard, registry = core_dashboard
+    registry.add("db")
+    registry.add("api")
+    registry.declare_dependency("api", "db")
+    clock = FakeClock()
+    dashboard._propagator._clock = clock
+    dashboard.configure_propagation(debounce_seconds=5.0, history_limit=10)
+
+    dashboard.update_component_status("db", CoreState.DOWN)
+    assert len(dashboard.get_status_history("api")) == 1
+    for state in (CoreState.HEALTHY, CoreState.DOWN) * 20:
+        dashboard.update_component_status("db", state)
+    assert len(dashboard.get_status_history("api")) == 1
+    assert len(dashboard.get_status_history("db")) == 10
+
+    # The flap ended in DOWN, which was already propagated
+    assert dashboard.flush_pending_cascades() == []
+    clock.now += 10
+    dashboard.update_component_status("db", CoreState.HEALTHY)
+    dashboard.update_component_status("db", CoreState.DEGRADED)
+    assert dashboard.flush_pending_cascades() == ["db"]
+    assert dashboard.get_status_history("api")[-1].metrics["cascade_debug"]["source_state"] == "DEGRADED"
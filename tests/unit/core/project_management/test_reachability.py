@@ -0,0 +1,108 @@
+"""
+Tests for the transitive-closure index behind change impact analysis
+(/app/core/project_management/reachability.py) and its callers.
+"""
+
+import random
+
+from app.core.project_management.change_modeler import ChangeModeler
+from app.core.project_management.change_propagation_analyzer import ChangePropagationAnalyzer
+from app.core.project_management.feature_tracker import FeatureRegistry
+from app.core.project_management.reachability import ReachabilityIndex
+
+
+def _walk_dependents(graph, node):
+    seen, queue = set(), [node]
+    while queue:
+        current = queue.pop()
+        for other, deps in graph.items():
+            if current in deps and other not in seen:
+                seen.add(other)
+                queue.append(other)
+    return seen
+
+
+def _random_graph(rng, size=60, edges=90):
+    graph = {f"n{i}": [] for i in range(size)}
+    for _ in range(edges):
+        a, b = rng.sample(sorted(graph), 2)
+        if b not in graph[a]:
+            graph[a].append(b)
+    return graph
+
+
+def test_closure_matches_graph_walk_with_cycles():
+    rng = random.Random(7)
+    graph = _random_graph(rng)
+    graph["n0"].append("n0")
+    index = ReachabilityIndex(graph)
+    for node in graph:
+        assert set(index.dependents(node)) == _walk_dependents(graph, node)
+        assert index.blast_radius(node) == len(_walk_dependents(graph, node))
+    assert index.depends_on("n0", "n0")
+
+
+def test_incremental_edges_match_rebuild_and_removal_recomputes():
+    rng = random.Random(11)
+    graph = _random_graph(rng)
+    index = ReachabilityIndex()
+    for node, deps in graph.items():
+        for dep in deps:
+            index.add_dependency(node, dep)
+    for node in graph:
+        index.add_node(node)
+    rebuilt = ReachabilityIndex(graph)
+    for node in graph:
+        assert set(index.dependents(node)) == set(rebuilt.dependents(node))
+        assert set(index.dependencies(node)) == set(rebuilt.dependencies(node))
+
+    index.remove_node("n1")
+    del graph["n1"]
+    for deps in graph.values():
+        if "n1" in deps:
+            deps.remove("n1")
+    for node in graph:
+        assert set(index.dependents(node)) == _walk_dependents(graph, node)
+
+
+class _Registry:
+    def __init__(self, graph):
+        self.graph = graph
+        self.dependency_version = 0
+        self.fetches = 0
+
+    def get_dependency_graph(self):
+        self.fetches += 1
+        return {k: list(v) for k, v in self.graph.items()}
+
+
+def test_analyzer_reuses_index_until_graph_version_changes():
+    registry = _Registry({"A": ["B"], "B": ["C"], "C": []})
+    change = ChangeModeler.simulate_change("B", change_type="code", description="Upgrade")
+    assert ChangePropagationAnalyzer.analyze(registry, change) == ["B", "A"]
+    assert ChangePropagationAnalyzer.blast_radius(registry, "C") == 2
+    assert registry.fetches == 1
+
+    registry.graph["D"] = ["A"]
+    registry.dependency_version += 1
+    assert ChangePropagationAnalyzer.analyze(registry, change) == ["B", "A", "D"]
+    assert registry.fetches == 2
+
+
+def test_feature_impact_follows_feature_dependencies():
+    class Components:
+        def analyze_dependency_impact(self, name):
+            return ["API"] if name == "Database" else []
+
+    features = FeatureRegistry()
+    features.register_feature("UserAuth", component="API")
+    features.register_feature("ContentStorage", component="Database")
+    features.register_feature("UI", component="Frontend")
+    features.register_feature("Docs", component="Wiki")
+    features.link_feature_dependency("UI", "UserAuth")
+    features.link_feature_dependency("UserAuth", "ContentStorage")
+
+    assert features._transitive_deps("ContentStorage") == {"UserAuth", "UI"}
+    assert features.feature_blast_radius("ContentStorage") == 2
+    assert features.analyze_feature_impact_from_component_change("Database", Components()) == [
+        "UserAuth", "ContentStorage", "UI"]
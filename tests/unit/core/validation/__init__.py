@@ -0,0 +1 @@
+# This file enables Python and pytest to recognize the directory as a package.
@@ -0,0 +1,161 @@
+"""
+Unit tests for content sniffing, structural checks and ValidationSystem caching/batching.
+
+Location: /tests/unit/core/validation/test_content_validation.py
+"""
+
+import os
+import struct
+import time
+
+import pytest
+
+from app.core.validation.content_sniffer import VerdictCache, inspect_file, sniff_bytes
+from app.core.validation.format_validator import validators
+from app.core.validation.main import ValidationSystem
+
+
+def _pdf():
+    body = b"%PDF-1.4\n1 0 obj\n<< /Type /Catalog >>\nendobj\n"
+    xref_at = len(body)
+    return body + (b"xref\n0 2\n0000000000 65535 f \n0000000009 00000 n \n"
+                   b"trailer\n<< /Size 2 /Root 1 0 R >>\nstartxref\n" + str(xref_at).encode() + b"\n%%EOF\n")
+
+
+def _png(width=4, height=3):
+    ihdr = struct.pack(">II", width, height) + b"\x08\x02\x00\x00\x00"
+    return (b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + ihdr + b"\x00" * 4
+            + b"\x00\x00\x00\x00IEND\xaeB`\x82")
+
+
+def _jpeg(width=8, height=6):
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\x00" + b"\x00" * 9
+    sof = b"\xff\xc0" + struct.pack(">HBHHB", 11, 8, height, width, 1) + b"\x01\x11\x00"
+    return b"\xff\xd8" + app0 + sof + b"\xff\xda\x00\x02" + b"\x00" * 32 + b"\xff\xd9"
+
+
+def _box(box_type, payload=b""):
+    return struct.pack(">I", 8 + len(payload)) + box_type + payload
+
+
+def _mp4(mdat_size=1024):
+    return _box(b"ftyp", b"isom\x00\x00\x02\x00") + _box(b"moov", b"\x00" * 64) + _box(b"mdat", b"\x00" * mdat_size)
+
+
+@pytest.fixture
+def write(tmp_path):
+    def _write(name, data):
+        path = tmp_path / name
+        path.write_bytes(data)
+        return str(path)
+    return _write
+
+
+def test_sniff_identifies_formats_from_magic_bytes():
+    assert sniff_bytes(_pdf()).format == "pdf"
+    assert sniff_bytes(_png()).format == "png"
+    assert sniff_bytes(_jpeg()).format == "jpeg"
+    assert sniff_bytes(_mp4()).format == "mp4"
+    assert sniff_bytes(b"GIF89a" + b"\x00" * 10).kind == "image"
+    assert sniff_bytes("lecture notes é".encode()).format == "text"
+    assert sniff_bytes(b"\x00\x01\x02\x03garbage") is None
+
+
+@pytest.mark.parametrize("name,data", [
+    ("notes.pdf", _pdf()),
+    ("diagram.png", _png()),
+    ("photo.jpg", _jpeg()),
+    ("lecture.mp4", _mp4()),
+    ("readme.txt", b"plain text"),
+    ("cafe.txt", "caf\u00e9 menu\r\n".encode("cp1252")),          # 8-bit encoding, not UTF-8
+    ("notes.txt", "lecture notes\n".encode("utf-16")),             # BOM-marked UTF-16
+    ("notes32.txt", "lecture notes\n".encode("utf-32")),           # BOM-marked UTF-32
+])
+def test_well_formed_files_pass(write, name, data):
+    assert ValidationSystem().check(write(name, data)).valid
+
+
+@pytest.mark.parametrize("name,data,code", [
+    ("notes.pdf", _pdf()[:-30], "corrupt-content"),               # truncated trailer
+    ("notes.pdf", _pdf().replace(b"startxref\n45", b"startxref\n99"), "corrupt-content"),
+    ("diagram.png", _png()[:-12], "corrupt-content"),             # no IEND
+    ("diagram.png", _png(width=0), "corrupt-content"),
+    ("photo.jpg", _jpeg()[:-2], "corrupt-content"),
+    ("lecture.mp4", _mp4()[:-100], "corrupt-content"),             # mdat runs past EOF
+    ("lecture.mp4", _box(b"ftyp", b"isom") + _box(b"mdat"), "corrupt-content"),  # no moov
+    ("notes.pdf", _png(), "content-mismatch"),                     # mislabeled
+    ("lecture.mp4", b"\x00\x01\x02binary", "unrecognised-content"),
+    ("readme.txt", b"caf\xe9\x01\x02\x03", "unrecognised-content"),  # control bytes are not text
+])
+def test_corrupt_and_mislabeled_files_are_rejected(write, name, data, code):
+    result = ValidationSystem().check(write(name, data))
+    assert not result.valid
+    assert result.code == code
+
+
+def test_structural_checks_read_bounded_ranges(write):
+    # A large, valid MP4 is checked by walking box headers, not by reading the payload
+    path = write("big.mp4", _mp4(mdat_size=32 * 1024 * 1024))
+    started = time.perf_counter()
+    sniffed, error = inspect_file(path)
+    assert time.perf_counter() - started < 0.05
+    assert sniffed.format == "mp4" and error is None
+
+
+def test_verdicts_are_cached_by_stat_fingerprint(write, monkeypatch):
+    cache = VerdictCache()
+    system = ValidationSystem(verdict_cache=cache)
+    first = write("a.pdf", _pdf())
+    assert system.check(first).valid
+    # A hit is served from stat() alone; the file is not opened again
+    monkeypatch.setattr("builtins.open", lambda *a, **k: pytest.fail("file was read on a cache hit"))
+    assert system.check(first).valid
+    monkeypatch.undo()
+    assert (cache.hits, cache.misses) == (1, 1)
+    # Rewriting the file moves its size/mtime, so the key changes
+    write("a.pdf", _pdf()[:-30])
+    assert not system.check(first).valid
+    assert cache.misses == 2
+    # Same size, new mtime: still re-validated
+    stat = os.stat(first)
+    write("a.pdf", _pdf()[:-31] + b"\n")
+    os.utime(first, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    system.check(first)
+    assert cache.misses == 3
+
+
+def test_same_size_files_differing_in_the_middle_get_their_own_verdict(write):
+    body = b"%PDF-1.4\n1 0 obj\n<< /Type /Catalog >>\nendobj\n" + b"%" + b"x" * 6000 + b"\n"
+    xref = b"xref\n0 2\n0000000000 65535 f \n0000000009 00000 n \n"
+    tail = (b"%" + b"y" * 4000 + b"\ntrailer\n<< /Size 2 /Root 1 0 R >>\nstartxref\n"
+            + str(len(body)).encode() + b"\n%%EOF\n")
+    good = body + xref + tail
+    broken = body + b"XXXX" + xref[4:] + tail
+    assert len(good) == len(broken) and good[:4096] == broken[:4096] and good[-2048:] == broken[-2048:]
+
+    system = ValidationSystem(verdict_cache=VerdictCache())
+    assert system.check(write("good.pdf", good)).valid
+    verdict = system.check(write("broken.pdf", broken))
+    assert not verdict.valid and verdict.code == "corrupt-content"
+
+
+def test_check_many_validates_batch_in_parallel(write):
+    good = [write(f"n{i}.pdf", _pdf()) for i in range(5)]
+    bad = write("bad.png", b"not an image")
+    results = ValidationSystem().check_many(good + [(bad, "image/png"), good[0]])
+    assert len(results) == 6
+    assert all(results[path].valid for path in good)
+    assert results[bad].code == "content-mismatch"
+
+
+def test_check_header_rejects_before_upload():
+    system = ValidationSystem()
+    assert system.check_header(_png()[:64], "diagram.png").valid
+    assert system.check_header(_png()[:64], "slides.pdf").code == "content-mismatch"
+    assert system.check_header(b"\x00\x00garbage", "clip.mp4").code == "unrecognised-content"
+
+
+def test_registry_validators_check_content(write):
+    path = write("slides.pdf", b"%PDF-1.4 but nothing else")
+    assert not validators.validate("pdf", path, "application/pdf").valid
+    assert validators.validate("pdf", write("ok.pdf", _pdf()), "application/pdf").valid
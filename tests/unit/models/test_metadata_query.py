@@ -0,0 +1,85 @@
+import time
+
+from app.models.metadata_manager import MetadataManager
+from app.models.metadata_query import And, Eq, Keyword, MetadataQueryEngine, Or, Range, field
+
+
+def make_engine():
+    e = MetadataQueryEngine()
+    e.update_many([
+        ("a", {"instructor": "Smith", "duration": 30, "keywords": "aerodynamics, lift"}),
+        ("b", {"instructor": "Jones", "duration": 90, "keywords": "propulsion"}),
+        ("c", {"instructor": "Smith", "duration": 60, "keywords": ["Lift", "Drag"]}),
+        ("d", {"instructor": "Lee", "duration": 5}),
+    ])
+    return e
+
+
+def test_exact_range_and_keyword():
+    e = make_engine()
+    assert e.query(field("instructor") == "Smith") == ["a", "c"]
+    assert e.query(field("duration").between(30, 60)) == ["a", "c"]
+    assert e.query(field("duration") > 30) == ["b", "c"]
+    assert e.query(field("keywords").contains("lif")) == ["a", "c"]
+    assert e.query(Keyword("lift", substring=False)) == ["a", "c"]
+
+
+def test_boolean_combinations_match_record_filter():
+    e = make_engine()
+    pred = (field("instructor") == "Smith") & (field("duration") >= 45) | Eq("instructor", "Lee")
+    expected = [i for i, r in e.records.items() if pred.matches(r)]
+    assert e.query(pred) == expected == ["c", "d"]
+    assert e.query(~(field("instructor") == "Smith")) == ["b", "d"]
+    assert e.query(Or(Range("duration", high=10), Keyword("propulsion"))) == ["b", "d"]
+
+
+def test_updates_and_removals_keep_indexes_in_sync():
+    e = make_engine()
+    e.update("a", {"instructor": "Jones", "duration": 120})
+    assert e.query(field("instructor") == "Smith") == ["c"]
+    assert e.query(field("duration") >= 100) == ["a"]
+    assert e.query(Keyword("aero")) == []
+    e.remove("c")
+    assert e.query(field("keywords").contains("lift")) == []
+    assert e.query(field("duration").between(50, 70)) == []
+
+
+def test_plan_drives_from_most_selective_index():
+    e = MetadataQueryEngine()
+    e.update_many((i, {"semester": "Fall", "course": f"C{i % 100}"}) for i in range(1000))
+    plan = e.explain(And(Eq("semester", "Fall"), Eq("course", "C7")))
+    assert plan[0].startswith("drive course == 'C7'")
+    assert plan[1].startswith("filter semester")
+
+
+def test_manager_search_uses_indexes():
+    m = MetadataManager()
+    m.set_metadata("v1", "video", {"title": "Intro", "duration": 10, "instructor": "Smith"})
+    m.set_metadata("v2", "video", {"title": "Wings", "duration": 50, "instructor": "Smith"})
+    m.update_metadata("v1", {"duration": 70})
+    assert m.search_metadata(field("duration") > 60) == ["v1"]
+    assert m.search(instructor="Smith") == ["v1", "v2"]
+    m.delete_metadata("v2")
+    assert m.facets(["instructor"]) == {"instructor": [("Smith", 1)]}
+
+
+def test_batch_metadata_is_indexed():
+    m = MetadataManager()
+    for i in range(3):
+        m.set_metadata(f"f{i}", "pdf", {"title": f"T{i}"})
+    results = m.apply_batch_metadata("b1", {"instructor": "Smith"}, ["f0", "f2", "missing"])
+    assert results == {"f0": True, "f2": True, "missing": False}
+    assert m.get_batch_files("b1") == ["f0", "f2"]
+    assert m.search(instructor="Smith") == ["f0", "f2", "batch_b1"]
+
+
+def test_facets_over_large_catalog_are_interactive():
+    e = MetadataQueryEngine()
+    types = ["pdf", "video", "cad", "sim"]
+    e.update_many((i, {"content_type": types[i % 4], "instructor": f"I{i % 50}",
+                       "duration": i % 120}) for i in range(200_000))
+    start = time.perf_counter()
+    facets = e.facets(["content_type", "instructor"], field("duration").between(0, 10), limit=5)
+    elapsed = time.perf_counter() - start
+    assert sum(n for _, n in facets["content_type"]) == len(e.query(field("duration") <= 10))
+    assert elapsed < 1.0
@@ -95,3 +95,35 @@ class TestProgressModel:
         assert p3.extra == p.extra
         assert p3.completed_steps == p.completed_steps
         assert p3.total_steps == p.total_steps
+
+
+class TestProgressTimeline:
+
+    def test_append_and_range(self):
+        from datetime import datetime, timedelta
+        from app.models.progress import ProgressTimeline, ProgressEntry, ProgressMetricType
+
+        metric = ProgressMetricType.COMPLETION_PERCENTAGE
+        base = datetime(2024, 1, 1)
+        timeline = ProgressTimeline("u", "c")
+        for i in [0, 1, 3, 2]:  # one late sample
+            timeline.add_entry(ProgressEntry(metric, i * 10, base + timedelta(hours=i)))
+        assert [e.value for e in timeline.get_metric_over_time(metric)] == [0, 10, 20, 30]
+        window = timeline.get_metric_over_time(metric, start=base + timedelta(hours=1), end=base + timedelta(hours=2))
+        assert [e.value for e in window] == [10, 20]
+        assert timeline.latest(metric).value == 30
+
+    def test_downsampling_keeps_shape(self):
+        from datetime import datetime, timedelta
+        from app.models.progress import ProgressTimeline, ProgressMetricType
+
+        metric = ProgressMetricType.COMPLETION_PERCENTAGE
+        base = datetime(2024, 1, 1)
+        timeline = ProgressTimeline("u", "c")
+        for i in range(10_000):
+            timeline.record(metric, 100.0 if i == 5_000 else i / 100.0, base + timedelta(minutes=i))
+        points = timeline.get_metric_over_time(metric, max_points=200)
+        assert len(points) == 200
+        assert points[0].value == 0 and points[-1].value == 99.99
+        assert any(p.value == 100.0 for p in points)  # spike survives downsampling
+        assert all(a.timestamp < b.timestamp for a, b in zip(points, points[1:]))
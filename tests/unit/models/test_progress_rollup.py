@@ -0,0 +1,74 @@
+"""
+Unit tests for incremental progress rollups in app/models/progress_rollup.py.
+"""
+
+import random
+
+from app.models.progress import Progress, ProgressStatus
+from app.models.progress_rollup import ProgressRollup, SQLiteProgressStore, STUDENT_COURSE
+
+
+def _progress(user, objective, done, total=4):
+    p = Progress(user_id=user, objective_id=objective, total_steps=total)
+    p.update_status(completed_steps=done)
+    return p
+
+
+class TestProgressRollup:
+
+    def test_incremental_updates_match_aggregate(self):
+        rollup = ProgressRollup()
+        rollup.record(_progress("u1", "a", 4), module_id="m1", course_id="c1")
+        rollup.record(_progress("u1", "b", 1), module_id="m1", course_id="c1")
+        rollup.record(_progress("u2", "a", 0), module_id="m1", course_id="c1")
+        rollup.record(_progress("u1", "b", 4), module_id="m1", course_id="c1")  # update, not a new objective
+
+        expected = Progress.aggregate([_progress("u1", "a", 4), _progress("u1", "b", 4)])
+        student = rollup.student("u1")
+        assert (student.total_steps, student.completed_steps, student.status) == \
+            (expected.total_steps, expected.completed_steps, expected.status)
+        assert rollup.module("m1").objectives == 3
+        assert rollup.course("c1").status == ProgressStatus.IN_PROGRESS
+        assert rollup.comparative("c1").values == {"u1": 100.0, "u2": 0.0}
+        assert [e.value for e in rollup.timeline("u1", "c1").get_metric_over_time(
+            rollup.comparative("c1").metric)] == [100.0, 62.5, 100.0]
+
+    def test_verify_and_rebuild(self):
+        rollup = ProgressRollup()
+        rng = random.Random(3)
+        for _ in range(500):
+            user, obj = f"u{rng.randrange(20)}", f"o{rng.randrange(30)}"
+            rollup.record(_progress(user, obj, rng.randrange(5)), module_id=f"m{obj[1:]}", course_id="c")
+        assert rollup.verify() == []
+        rollup._summaries[(STUDENT_COURSE, ("u1", "c"))].completed_steps += 1
+        assert rollup.verify() == [(STUDENT_COURSE, ("u1", "c"))]
+        rollup.rebuild()
+        assert rollup.verify() == []
+
+    def test_persisted_summaries_survive_reload(self, tmp_path):
+        path = str(tmp_path / "progress.db")
+        store = SQLiteProgressStore(path)
+        rollup = ProgressRollup(store)
+        rollup.record_many([(_progress(f"u{i}", "quiz", i % 5), "m1", "c1") for i in range(50)])
+        store.close()
+
+        reloaded = ProgressRollup(SQLiteProgressStore(path))
+        assert reloaded.course("c1") == rollup.course("c1")
+        assert reloaded.summary(STUDENT_COURSE, ("u3", "c1")).completed_steps == 3
+        assert len(reloaded.cohort("c1")) == 50
+        assert len(reloaded.timeline("u3", "c1")) == 1
+        assert reloaded.verify() == []
+
+    def test_update_with_missing_persisted_summary(self, tmp_path):
+        path = str(tmp_path / "progress.db")
+        store = SQLiteProgressStore(path)
+        ProgressRollup(store).record(_progress("u1", "quiz", 1), "m1", "c1")
+        store._conn.execute("DELETE FROM progress_summary WHERE scope='module'")
+        store._conn.commit()
+
+        reloaded = ProgressRollup(store)
+        reloaded.record(_progress("u1", "quiz", 3), "m1", "c1")
+        assert reloaded.student("u1").completed_steps == 3
+        assert reloaded.verify() == [("module", "m1")]
+        reloaded.rebuild()
+        assert reloaded.module("m1").completed_steps == 3 and reloaded.verify() == []
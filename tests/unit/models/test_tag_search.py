@@ -0,0 +1,79 @@
+import random
+import string
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.course import Base, Course
+from app.models.tag import Tag
+from app.models.tag_search import TagIndex, search_courses_by_tag_partial
+
+
+def make_index():
+    index = TagIndex()
+    index.add_many([("Python", 50), ("python basics", 5), ("Machine Learning", 40),
+                    ("learning paths", 2), ("aerodynamics", 10), ("aero structures", 30)])
+    return index
+
+
+def test_ranking_tiers_and_popularity():
+    index = make_index()
+    assert [m.kind for m in index.search("python")][:2] == ["exact", "prefix"]
+    assert [m.name for m in index.search("aero")] == ["aero structures", "aerodynamics"]
+    learning = index.search("learn")
+    assert learning[0].name == "learning paths" and learning[0].kind == "prefix"
+    assert ("Machine Learning", "word") in [(m.name, m.kind) for m in learning]
+    assert index.search("dynam")[0].kind == "substring"
+    assert index.search("aerodinamics")[0].name == "aerodynamics"
+    assert index.search("aerodinamics", fuzzy=False) == []
+
+
+def test_incremental_updates():
+    index = make_index()
+    index.add("aeronautics", 100)
+    assert index.search("aer")[0].name == "aeronautics"
+    index.remove("aeronautics")
+    assert "aeronautics" not in [m.name for m in index.search("aer")]
+    index.bump("aerodynamics", 1000)
+    assert index.search("aero")[0].name == "aerodynamics"
+    index.rename("Python", "CPython")
+    assert index.matching_names("pyth") == ["CPython", "python basics"]
+
+
+def test_watch_and_partial_search_against_database():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    course = Course(title="Flight")
+    course.tags.append(Tag(name="aerodynamics"))
+    session.add(course)
+    session.commit()
+
+    index = TagIndex.from_session(session)
+    unwatch = index.watch()
+    try:
+        session.add(Tag(name="aeroelasticity"))
+        session.commit()
+        assert index.matching_names("aero") == ["aerodynamics", "aeroelasticity"]
+        assert index.search("aero")[0].name == "aerodynamics"  # used by a course
+        assert search_courses_by_tag_partial(session, "dynam", index=index) == [course]
+        assert search_courses_by_tag_partial(session, "missing", index=index) == []
+    finally:
+        unwatch()
+        session.close()
+
+
+def test_autocomplete_within_frame_budget():
+    rng = random.Random(7)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 9))) for _ in range(5000)]
+    index = TagIndex()
+    index.add_many((" ".join(rng.sample(words, rng.randint(1, 3))), rng.randint(0, 500)) for _ in range(100_000))
+    typed = "".join(rng.choice(words)[:6])
+    timings = []
+    for i in range(1, len(typed) + 1):
+        start = time.perf_counter()
+        index.search(typed[:i])
+        timings.append(time.perf_counter() - start)
+    assert max(timings) < 0.016
@@ -0,0 +1,96 @@
+"""
+Tests for the per-file results cache and the incremental dependency graph of
+code_summarizer.py (project root script).
+"""
+
+import os
+
+import pytest
+
+from code_summarizer import CodeSummarizer
+
+
+def _write(path, text):
+    """Write a file and move its mtime forward, so the edit is seen even on coarse clocks."""
+    previous = os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    mtime = max(os.stat(path).st_mtime_ns, previous + 1_000_000_000)
+    os.utime(path, ns=(mtime, mtime))
+
+
+@pytest.fixture
+def project(tmp_path):
+    root = tmp_path / "proj"
+    _write(str(root / "pkg" / "__init__.py"), "")
+    _write(str(root / "pkg" / "x.py"), "import os\n")
+    _write(str(root / "pkg" / "y.py"), "from pkg import x\n")
+    _write(str(root / "main.py"), "import pkg.x\n")
+    _write(str(root / "cli.py"), "import pkg\n")
+    return root
+
+
+def _summarizer(root, tmp_path, use_cache=True):
+    return CodeSummarizer(str(root), cache_path=str(tmp_path / "cache.json"), use_cache=use_cache, max_threads=1)
+
+
+def _full_rebuild(root, tmp_path):
+    return _summarizer(root, tmp_path, use_cache=False).scan_project()["dependencies"]
+
+
+def test_cache_hits_until_a_file_is_edited(project, tmp_path):
+    _summarizer(project, tmp_path).scan_project()
+
+    rerun = _summarizer(project, tmp_path)
+    rerun.scan_project()
+    assert rerun.parsed_files == []
+
+    # Touched without a content change: read and hashed, but not reparsed
+    stat = os.stat(project / "main.py")
+    os.utime(project / "main.py", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    touched = _summarizer(project, tmp_path)
+    touched.scan_project()
+    assert touched.parsed_files == []
+
+    _write(str(project / "main.py"), "import pkg.x\nimport pkg.y\n")
+    edited = _summarizer(project, tmp_path)
+    info = edited.scan_project()
+    assert edited.parsed_files == ["main.py"]
+    assert [i["name"] for i in info["files"]["main.py"]["imports"]] == ["pkg.x", "pkg.y"]
+
+
+def test_incremental_graph_matches_full_rebuild(project, tmp_path):
+    incremental = _summarizer(project, tmp_path)
+    assert incremental.scan_project()["dependencies"] == _full_rebuild(project, tmp_path)
+
+    edits = [
+        # Add an import
+        lambda: _write(str(project / "main.py"), "import pkg.x\nimport pkg.y\n"),
+        # Remove an import
+        lambda: _write(str(project / "pkg" / "y.py"), "VALUE = 1\n"),
+        # Rename an imported module; its importer and the new module change together
+        lambda: (os.rename(project / "pkg" / "x.py", project / "pkg" / "z.py"),
+                 _write(str(project / "main.py"), "import pkg.z\nimport pkg.y\n")),
+        # A module appears that an unchanged file's "import pkg" now also covers
+        lambda: _write(str(project / "pkg" / "w.py"), ""),
+    ]
+    for edit in edits:
+        edit()
+        expected = _full_rebuild(project, tmp_path)
+        assert incremental.scan_project()["dependencies"] == expected
+        # A new process starts from the persisted graph and stays consistent
+        assert _summarizer(project, tmp_path).scan_project()["dependencies"] == expected
+
+
+def test_persisted_graph_is_reused_by_a_new_process(project, tmp_path):
+    first = _summarizer(project, tmp_path)
+    graph = first.scan_project()["dependencies"]
+
+    second = _summarizer(project, tmp_path)
+    assert second._graph_files
+    resolved = []
+    original = second._resolve_dependencies
+    second._resolve_dependencies = lambda imports: resolved.append(imports) or original(imports)
+    assert second.scan_project()["dependencies"] == graph
+    assert resolved == []
@@ -0,0 +1,70 @@
+# --- UNIVERSAL PROJECT ROOT IMPORT PATCH ---
+import os
+import sys
+
+def _add_project_root_to_syspath():
+    here = os.path.abspath(os.path.dirname(__file__))
+    root = here
+    while root and not (os.path.isdir(os.path.join(root, "app")) and os.path.isdir(os.path.join(root, "tests"))):
+        parent = os.path.dirname(root)
+        if parent == root: break
+        root = parent
+    if root not in sys.path:
+        sys.path.insert(0, root)
+_add_project_root_to_syspath()
+# --- END PATCH ---
+
+import pytest
+
+from app.utils.lazy_import import lazy_import
+from app.utils.startup_profiler import parse_importtime, profile_import
+
+
+def test_lazy_module_defers_import_and_reports_availability():
+    sys.modules.pop("colorsys", None)
+    proxy = lazy_import("colorsys")
+    assert not proxy.is_loaded and "colorsys" not in sys.modules
+    assert proxy  # importable, checked without importing
+    assert "colorsys" not in sys.modules
+    assert proxy.rgb_to_hsv(1, 0, 0)[0] == 0.0
+    assert proxy.is_loaded
+
+
+def test_missing_module_is_falsy_and_raises_with_hint():
+    proxy = lazy_import("aerolearn_not_a_module", "pip install aerolearn-extra")
+    assert not proxy
+    with pytest.raises(ImportError, match="pip install aerolearn-extra"):
+        proxy.anything
+
+
+def test_package_exports_resolve_lazily():
+    from app.core.extraction import TextExtractor
+    from app.core.relationships import KnowledgeGraph
+    from integrations.registry import ComponentRegistry
+    assert TextExtractor.__name__ == "TextExtractor"
+    assert KnowledgeGraph().nodes == {}
+    assert ComponentRegistry().components == {}
+
+
+def test_parse_importtime_tracks_depth():
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   child\n"
+        "import time:       300 |        420 | parent\n"
+    )
+    records = parse_importtime(output)
+    assert [(r.module, r.depth) for r in records] == [("child", 1), ("parent", 0)]
+
+
+def test_cold_imports_skip_heavy_optional_dependencies():
+    extraction = profile_import(["app.core.extraction"])
+    assert not extraction.touched(["pdfplumber", "docx", "pptx", "pytesseract", "PIL"])
+    registry = profile_import(["integrations.registry"])
+    assert not registry.touched(["asyncio", "networkx", "app"])
+    assert registry.total_ms > 0
+
+
+def test_headless_profile_never_loads_ui_modules():
+    from app.headless import HEADLESS_MODULES, UI_MODULE_PREFIXES
+    profile = profile_import(list(HEADLESS_MODULES))
+    assert profile.touched(UI_MODULE_PREFIXES) == []